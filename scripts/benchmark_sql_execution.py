@@ -0,0 +1,84 @@
+"""
+FILE: benchmark_sql_execution.py
+STATUS: Active
+RESPONSIBILITY: Latency of SQLDatabase.run + literal_eval vs typed read-only sqlite3 execution on 1/100/10k-row results
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from langchain_community.utilities import SQLDatabase
+
+from src.core.config import settings
+from src.tools.sql_executor import ReadOnlySQLExecutor
+from src.tools.sql_tool import _parse_run_output
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+# Player rows repeated through a cross join, so any row count is available
+_QUERY = (
+    "SELECT p.name, p.team_abbr, ps.gp, ps.pts, ps.reb, ps.ast, ps.fg_pct, ps.three_pct, ps.ts_pct "
+    "FROM players p JOIN player_stats ps ON p.id = ps.player_id CROSS JOIN players x LIMIT {rows}"
+)
+
+
+def time_ms(func, repeat: int) -> list[float]:
+    """Durations of repeated calls in milliseconds (after one warm-up call)."""
+    func()
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+def main() -> None:
+    """Time both execution paths per result size and print a table."""
+    parser = argparse.ArgumentParser(description="Benchmark SQL execution paths of NBAGSQLTool")
+    parser.add_argument("--db", type=Path, default=settings.stats_database_path, help="Stats database")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10_000], help="Result sizes")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per path and size")
+    args = parser.parse_args()
+
+    db = SQLDatabase.from_uri(f"sqlite:///{args.db}")
+    executor = ReadOnlySQLExecutor(str(args.db))
+
+    print("=" * 96)
+    print(f"{'rows':>8} {'SQLDatabase p50 (ms)':>22} {'native p50 (ms)':>17} {'speedup':>9} {'same values':>12} {'types':>20}")
+    print("-" * 96)
+    for rows in args.rows:
+        sql = _QUERY.format(rows=rows)
+        legacy = _parse_run_output(db.run(sql, include_columns=True))
+        native = executor.execute(sql).as_dicts()
+        same = legacy == native
+        types = sorted({type(value).__name__ for row in legacy[:100] for value in row.values()})
+
+        legacy_ms = statistics.median(
+            time_ms(lambda sql=sql: _parse_run_output(db.run(sql, include_columns=True)), args.repeat)
+        )
+        native_ms = statistics.median(time_ms(lambda sql=sql: executor.execute(sql).as_dicts(), args.repeat))
+        print(
+            f"{len(native):>8,} {legacy_ms:>22.3f} {native_ms:>17.3f} {legacy_ms / native_ms:>8.1f}x "
+            f"{str(same):>12} {'/'.join(types):>20}"
+        )
+    print("=" * 96)
+    executor.close()
+
+
+if __name__ == "__main__":
+    main()
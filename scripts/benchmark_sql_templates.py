@@ -0,0 +1,152 @@
+"""
+FILE: benchmark_sql_templates.py
+STATUS: Active
+RESPONSIBILITY: Coverage, result agreement and latency saved by the SQL template fast path on the SQL test cases
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import argparse
+import logging
+import sqlite3
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import settings
+from src.evaluation.test_cases.sql_test_cases import SQL_TEST_CASES
+from src.tools.sql_templates import SQLTemplateCompiler
+from src.tools.sql_tool import NBAGSQLTool, _load_dictionary_from_db
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def _values(row: tuple) -> set:
+    """Comparable cell values of a result row (floats rounded to 1 decimal)."""
+    return {round(v, 1) if isinstance(v, float) else v for v in row}
+
+
+def agrees(conn: sqlite3.Connection, compiled_sql: str, params: dict, expected_sql: str) -> bool | None:
+    """Whether the template query returns the expected query's first row.
+
+    Columns may differ (the reference SQL often selects extra context), so
+    the check is that every value of the expected first row appears in the
+    template's first row.
+
+    Returns:
+        True/False, or None if the expected SQL can't be run
+    """
+    try:
+        expected = conn.execute(expected_sql).fetchmany(1)
+    except sqlite3.Error:
+        return None
+    actual = conn.execute(compiled_sql, params).fetchmany(1)
+    if not expected:
+        return not actual
+    return bool(actual) and _values(expected[0]) <= _values(actual[0])
+
+
+def main() -> None:
+    """Compile every SQL test case and print coverage and latency tables."""
+    parser = argparse.ArgumentParser(description="Benchmark the SQL template fast path on the SQL test cases")
+    parser.add_argument("--db", type=Path, default=settings.stats_database_path, help="Stats database")
+    parser.add_argument("--repeat", type=int, default=100, help="Compilations per question for timing")
+    parser.add_argument(
+        "--measure-llm",
+        action="store_true",
+        help="Also time LLM SQL generation for the covered questions (needs GOOGLE_API_KEY)",
+    )
+    parser.add_argument("--show-misses", action="store_true", help="List questions left to the LLM")
+    args = parser.parse_args()
+
+    compiler = SQLTemplateCompiler.from_database(str(args.db), _load_dictionary_from_db(str(args.db)))
+    conn = sqlite3.connect(str(args.db))
+
+    by_category: dict[str, Counter] = {}
+    shapes: Counter = Counter()
+    compile_ms: list[float] = []
+    execute_ms: list[float] = []
+    hits, misses, disagreements = [], [], []
+    for case in SQL_TEST_CASES:
+        counts = by_category.setdefault(case.category, Counter())
+        counts["total"] += 1
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            compiled = compiler.compile(case.question)
+        compile_ms.append((time.perf_counter() - start) * 1000 / args.repeat)
+        if compiled is None:
+            misses.append(case.question)
+            continue
+
+        counts["hits"] += 1
+        shapes[compiled.shape] += 1
+        hits.append(case.question)
+
+        start = time.perf_counter()
+        conn.execute(compiled.sql, compiled.params).fetchall()
+        execute_ms.append((time.perf_counter() - start) * 1000)
+
+        if case.expected_sql:
+            agreement = agrees(conn, compiled.sql, compiled.params, case.expected_sql)
+            counts["checked"] += agreement is not None
+            counts["agree"] += bool(agreement)
+            if agreement is False:
+                disagreements.append((case.question, compiled.render(), case.expected_sql))
+
+    print("=" * 72)
+    print(f"{'category':<40} {'cases':>7} {'hits':>7} {'agree':>12}")
+    print("-" * 72)
+    for category, counts in sorted(by_category.items()):
+        agree = f"{counts['agree']}/{counts['checked']}"
+        print(f"{category:<40} {counts['total']:>7} {counts['hits']:>7} {agree:>12}")
+    total = len(SQL_TEST_CASES)
+    print("-" * 72)
+    print(f"{'TOTAL':<40} {total:>7} {len(hits):>7} ({len(hits) / total:.0%} coverage)")
+    print("=" * 72)
+    print("Shapes: " + ", ".join(f"{shape}={count}" for shape, count in shapes.most_common()))
+    print(
+        f"Template compile: p50 {statistics.median(compile_ms):.3f} ms, max {max(compile_ms):.3f} ms "
+        f"(misses included); execution p50 {statistics.median(execute_ms or [0]):.2f} ms"
+    )
+
+    if args.measure_llm and hits:
+        tool = NBAGSQLTool(db_path=str(args.db))
+        llm_ms = []
+        for question in hits:
+            start = time.perf_counter()
+            try:
+                tool.generate_sql(question)
+            except Exception as e:
+                logger.warning("LLM generation failed for %r: %s", question, e)
+                continue
+            llm_ms.append((time.perf_counter() - start) * 1000)
+        if llm_ms:
+            saved = statistics.mean(llm_ms) * len(hits) / total
+            print(
+                f"LLM generation on covered questions: p50 {statistics.median(llm_ms):.0f} ms, "
+                f"mean {statistics.mean(llm_ms):.0f} ms -> about {saved:.0f} ms saved per SQL question on average"
+            )
+    else:
+        print("LLM generation time not measured (run with --measure-llm to estimate the latency saved)")
+
+    for question, template_sql, expected_sql in disagreements:
+        print(f"\nDIFFERENT RESULT: {question}\n  template: {template_sql}\n  expected: {expected_sql}")
+    if args.show_misses:
+        print("\nLeft to the LLM:")
+        for question in misses:
+            print(f"  {question}")
+
+
+if __name__ == "__main__":
+    main()
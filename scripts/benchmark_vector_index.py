@@ -0,0 +1,295 @@
+"""
+FILE: benchmark_vector_index.py
+STATUS: Active
+RESPONSIBILITY: Recall@k, latency and memory benchmark of FAISS index types (synthetic or real corpus)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.config import settings
+from src.repositories.vector_store import (
+    INDEX_TYPES,
+    RERANK_INDEX_TYPES,
+    _base_index,
+    create_faiss_index,
+    rerank_candidates,
+    set_search_params,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def make_corpus(
+    n_vectors: int, dimension: int, n_queries: int, seed: int = 42
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate a clustered, L2-normalized synthetic corpus and queries.
+
+    Real embeddings are clustered by topic, so uniform random vectors would make
+    ANN recall look much worse than it is in practice.
+
+    Args:
+        n_vectors: Corpus size
+        dimension: Embedding dimension
+        n_queries: Number of query vectors
+        seed: Random seed
+
+    Returns:
+        (corpus, queries) float32 arrays
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(1, n_vectors // 1000)
+    centers = rng.standard_normal((n_clusters, dimension), dtype=np.float32)
+
+    def sample(n: int) -> np.ndarray:
+        labels = rng.integers(0, n_clusters, size=n)
+        x = centers[labels] + 0.5 * rng.standard_normal((n, dimension), dtype=np.float32)
+        faiss.normalize_L2(x)
+        return x
+
+    return sample(n_vectors), sample(n_queries)
+
+
+def load_corpus(
+    index_path: Path, n_queries: int, seed: int = 42
+) -> tuple[np.ndarray, np.ndarray]:
+    """Load the vectors of an existing index and derive queries from them.
+
+    Queries are corpus vectors with a little noise, so each has a close but
+    not identical neighbor (like a user question against its source chunk).
+
+    Args:
+        index_path: Saved FAISS index whose vectors are exact (flat/sq/HNSW)
+        n_queries: Number of query vectors
+        seed: Random seed
+
+    Returns:
+        (corpus, queries) float32 arrays
+    """
+    saved = faiss.read_index(str(index_path))
+    index = _base_index(saved)  # view into saved, which must stay referenced
+    corpus = index.reconstruct_n(0, index.ntotal)
+    faiss.normalize_L2(corpus)
+
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(corpus), size=n_queries)
+    queries = corpus[picks] + 0.02 * rng.standard_normal((n_queries, corpus.shape[1]), dtype=np.float32)
+    faiss.normalize_L2(queries)
+    return corpus, queries
+
+
+def index_memory_mb(index: faiss.Index) -> float:
+    """Size of the index as loaded into RAM (its serialized size), in MB."""
+    return len(faiss.serialize_index(index)) / 2**20
+
+
+def recall_at_k(ground_truth: np.ndarray, results: np.ndarray) -> float:
+    """Fraction of the exact top-k neighbors found by the ANN search.
+
+    Args:
+        ground_truth: Exact neighbor ids (n_queries x k)
+        results: ANN neighbor ids (n_queries x k)
+
+    Returns:
+        Mean recall@k
+    """
+    k = ground_truth.shape[1]
+    hits = sum(len(np.intersect1d(gt, res)) for gt, res in zip(ground_truth, results))
+    return hits / (len(ground_truth) * k)
+
+
+def measure_latency(
+    index: faiss.Index,
+    queries: np.ndarray,
+    k: int,
+    rerank_vectors: np.ndarray | None = None,
+    k_factor: int = 1,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Run single-query searches (as the API does) and record per-query latency.
+
+    Args:
+        index: FAISS index
+        queries: Query vectors
+        k: Neighbors per query
+        rerank_vectors: Float32 corpus to re-rank k * k_factor candidates with
+            (as the repository does for pq indexes)
+        k_factor: Candidates fetched per result when re-ranking
+
+    Returns:
+        (result ids, latencies in ms)
+    """
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    latencies = np.empty(len(queries))
+    for i in range(len(queries)):
+        query = queries[i : i + 1]
+        start = time.perf_counter()
+        if rerank_vectors is None:
+            _, ids[i] = index.search(query, k)
+        else:
+            _, candidates = index.search(query, k * k_factor)
+            _, ids[i] = rerank_candidates(query, candidates, rerank_vectors, k)
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return ids, latencies
+
+
+def benchmark(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    index_types: list[str],
+    k: int,
+    nprobe: int,
+    ef_search: int,
+    k_factor: int = settings.rerank_k_factor,
+    label: str = "synthetic",
+) -> list[dict]:
+    """Benchmark each index type against exact flat search on one corpus.
+
+    Args:
+        corpus: L2-normalized corpus vectors
+        queries: L2-normalized query vectors
+        index_types: Index types to compare (flat is always the reference)
+        k: Neighbors per query
+        nprobe: IVF clusters scanned per query
+        ef_search: HNSW candidate list size per query
+        k_factor: Re-rank candidates per result for pq
+        label: Corpus name for the results table
+
+    Returns:
+        One result row per index type
+    """
+    flat = create_faiss_index(corpus, "flat")
+    _, ground_truth = flat.search(queries, k)
+    flat_mb = index_memory_mb(flat)
+    del flat
+
+    rows = []
+    for index_type in index_types:
+        start = time.perf_counter()
+        index = create_faiss_index(
+            corpus,
+            index_type,
+            nlist=settings.ivf_nlist,
+            hnsw_m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            pq_m=settings.pq_m,
+            pq_nbits=settings.pq_nbits,
+        )
+        build_s = time.perf_counter() - start
+        set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+
+        rerank = index_type in RERANK_INDEX_TYPES
+        ids, latencies = measure_latency(
+            index, queries, k, rerank_vectors=corpus if rerank else None, k_factor=k_factor
+        )
+        memory_mb = index_memory_mb(index)
+        rows.append(
+            {
+                "corpus": label,
+                "n_vectors": len(corpus),
+                "index_type": index_type,
+                "build_s": build_s,
+                "memory_mb": memory_mb,
+                "compression": flat_mb / memory_mb,
+                # pq keeps float32 vectors on disk (memory-mapped) for re-ranking
+                "disk_mb": memory_mb + (corpus.nbytes / 2**20 if rerank else 0),
+                "recall": recall_at_k(ground_truth, ids),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+            }
+        )
+        del index
+
+    return rows
+
+
+def main() -> None:
+    """Parse arguments, run the benchmark and print a results table."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark FAISS index types (recall@k, latency, memory)"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="*",
+        default=[100_000, 1_000_000],
+        help="Synthetic corpus sizes to benchmark (none: only --corpus-index)",
+    )
+    parser.add_argument(
+        "--dim", type=int, default=1024, help="Embedding dimension (mistral-embed: 1024)"
+    )
+    parser.add_argument(
+        "--index-types",
+        nargs="+",
+        default=list(INDEX_TYPES),
+        choices=INDEX_TYPES,
+        help="Index types to compare",
+    )
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query (recall@k)")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of queries")
+    parser.add_argument("--nprobe", type=int, default=settings.ivf_nprobe, help="IVF nprobe")
+    parser.add_argument(
+        "--ef-search", type=int, default=settings.hnsw_ef_search, help="HNSW efSearch"
+    )
+    parser.add_argument(
+        "--k-factor", type=int, default=settings.rerank_k_factor, help="pq re-rank candidates per result"
+    )
+    parser.add_argument(
+        "--corpus-index",
+        type=Path,
+        default=None,
+        help="Also benchmark the vectors of an existing index (e.g. data/vector/faiss_index.idx)",
+    )
+    args = parser.parse_args()
+
+    rows = []
+    if args.corpus_index is not None:
+        logger.info("Loading corpus vectors from %s", args.corpus_index)
+        corpus, queries = load_corpus(args.corpus_index, args.queries)
+        rows.extend(
+            benchmark(
+                corpus, queries, args.index_types, args.k, args.nprobe, args.ef_search,
+                k_factor=args.k_factor, label=args.corpus_index.name,
+            )
+        )
+    for n_vectors in args.sizes:
+        logger.info("Generating corpus: %d vectors x %d dims", n_vectors, args.dim)
+        corpus, queries = make_corpus(n_vectors, args.dim, args.queries)
+        rows.extend(
+            benchmark(
+                corpus, queries, args.index_types, args.k, args.nprobe, args.ef_search,
+                k_factor=args.k_factor,
+            )
+        )
+        del corpus
+
+    print("=" * 120)
+    print(f"{'corpus':>16} {'vectors':>10} {'index':>9} {'build (s)':>10} {'RAM (MB)':>10} "
+          f"{'x smaller':>9} {'disk (MB)':>10} {f'recall@{args.k}':>10} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+    print("-" * 120)
+    for row in rows:
+        print(
+            f"{row['corpus']:>16} {row['n_vectors']:>10,} {row['index_type']:>9} {row['build_s']:>10.1f} "
+            f"{row['memory_mb']:>10.1f} {row['compression']:>9.1f} {row['disk_mb']:>10.1f} "
+            f"{row['recall']:>10.3f} {row['p50_ms']:>9.3f} {row['p99_ms']:>9.3f}"
+        )
+    print("=" * 120)
+
+
+if __name__ == "__main__":
+    main()
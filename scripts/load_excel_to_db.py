@@ -2,7 +2,7 @@
 FILE: load_excel_to_db.py
 STATUS: Active
 RESPONSIBILITY: Excel to database ingestion pipeline with Pydantic validation
-LAST MAJOR UPDATE: 2026-02-11
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -404,6 +404,9 @@ def main(excel_file: str, db_path: str | None = None, drop_existing: bool = Fals
         # Load statistics
         stats_count = load_stats_to_db(db, df, player_ids)
 
+        # Pre-joined per-game table and ranking indexes for generated SQL
+        derived = db.build_derived_tables()
+
         # Summary
         with db.get_session() as session:
             counts = db.count_records(session)
@@ -415,6 +418,7 @@ def main(excel_file: str, db_path: str | None = None, drop_existing: bool = Fals
         logger.info(f"  - Teams: {counts['teams']}")
         logger.info(f"  - Players: {counts['players']}")
         logger.info(f"  - Stats records: {counts['player_stats']}")
+        logger.info(f"  - player_stats_full rows: {derived['player_stats_full']} ({derived['indexes']} indexes)")
         logger.info("=" * 80)
 
     except Exception as e:
@@ -444,7 +448,19 @@ if __name__ == "__main__":
         action="store_true",
         help="Drop existing tables before loading (WARNING: deletes all data)",
     )
+    parser.add_argument(
+        "--derived-only",
+        action="store_true",
+        help="Only rebuild player_stats_full and the ranking indexes of an existing database",
+    )
 
     args = parser.parse_args()
 
-    main(args.excel, args.db, args.drop)
+    if args.derived_only:
+        db = NBADatabase(args.db)
+        try:
+            db.build_derived_tables()
+        finally:
+            db.close()
+    else:
+        main(args.excel, args.db, args.drop)
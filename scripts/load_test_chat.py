@@ -0,0 +1,245 @@
+"""
+FILE: load_test_chat.py
+STATUS: Active
+RESPONSIBILITY: Concurrent load test of the chat endpoint (sync threadpool route vs async achat route)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.models.chat import ChatRequest, ChatResponse
+from src.models.document import DocumentChunk
+from src.repositories.vector_store import VectorStoreRepository
+from src.services.chat import ChatService
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+# The pipeline logs per-request warnings; keep the results table readable
+logging.getLogger("src").setLevel(logging.ERROR)
+
+DIMENSION = 64
+QUESTIONS = [
+    "What did analysts say about the Nuggets defense in the playoffs?",
+    "Why do fans think Jokic is underrated?",
+    "What makes the Celtics offense so efficient?",
+    "How did the Lakers rebuild their bench this season?",
+]
+
+
+class _FakeResponse:
+    """Gemini response stand-in."""
+
+    text = "Simulated answer [1]."
+
+
+class _FakeModels:
+    """Gemini `client.models` / `client.aio.models` with fixed latency."""
+
+    def __init__(self, latency: float, is_async: bool):
+        self._latency = latency
+        self._is_async = is_async
+
+    def generate_content(self, **kwargs):
+        if self._is_async:
+            return self._agenerate_content()
+        time.sleep(self._latency)
+        return _FakeResponse()
+
+    async def _agenerate_content(self):
+        await asyncio.sleep(self._latency)
+        return _FakeResponse()
+
+
+class _FakeGeminiClient:
+    """Gemini client stand-in (sync and async surfaces)."""
+
+    def __init__(self, latency: float):
+        self.models = _FakeModels(latency, is_async=False)
+        self.aio = type("Aio", (), {"models": _FakeModels(latency, is_async=True)})()
+
+
+class _FakeEmbeddingService:
+    """EmbeddingService stand-in with fixed API latency."""
+
+    def __init__(self, latency: float):
+        self._latency = latency
+        self._rng = np.random.default_rng(0)
+
+    def _vector(self) -> np.ndarray:
+        vector = self._rng.standard_normal(DIMENSION).astype(np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        time.sleep(self._latency)
+        return self._vector()
+
+    async def aembed_query(self, query: str) -> np.ndarray:
+        await asyncio.sleep(self._latency)
+        return self._vector()
+
+
+def build_simulated_service(llm_latency: float, embed_latency: float) -> ChatService:
+    """ChatService on a small in-memory index, with simulated Gemini/Mistral latency.
+
+    SQL is disabled, so every question takes the contextual path:
+    embedding -> FAISS + BM25 search -> LLM.
+    """
+    rng = np.random.default_rng(42)
+    embeddings = rng.standard_normal((500, DIMENSION)).astype(np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+    chunks = [
+        DocumentChunk(id=f"doc_{i}", text=f"Basketball analysis chunk {i}", metadata={"source": f"doc_{i % 20}.txt"})
+        for i in range(len(embeddings))
+    ]
+    vector_store = VectorStoreRepository()
+    vector_store.build_index(chunks, embeddings)
+
+    service = ChatService(
+        vector_store=vector_store,
+        embedding_service=_FakeEmbeddingService(embed_latency),
+        api_key="simulated",
+        enable_sql=False,
+    )
+    service._client = _FakeGeminiClient(llm_latency)
+    return service
+
+
+def build_app(service: ChatService):
+    """FastAPI app exposing the chat pipeline as a sync route and as an async route."""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.post("/sync/chat")
+    def sync_chat(request: ChatRequest) -> ChatResponse:
+        # Pre-async route: FastAPI runs it on the anyio threadpool
+        return service.chat(request)
+
+    @app.post("/async/chat")
+    async def async_chat(request: ChatRequest) -> ChatResponse:
+        return await service.achat(request)
+
+    return app
+
+
+async def run_load(
+    client: httpx.AsyncClient, path: str, n_requests: int, concurrency: int
+) -> dict[str, float]:
+    """Send n_requests chat requests with `concurrency` in flight.
+
+    Returns:
+        Throughput (req/s), latency percentiles (ms) and error count
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def one(i: int) -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post(path, json={"query": QUESTIONS[i % len(QUESTIONS)]})
+            latencies.append((time.perf_counter() - start) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "throughput": n_requests / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "errors": errors,
+    }
+
+
+async def simulate(args: argparse.Namespace) -> None:
+    """Compare sync and async routes in-process (one worker, same threadpool)."""
+    import anyio.to_thread
+
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    if args.threadpool_size:
+        limiter.total_tokens = args.threadpool_size
+
+    service = build_simulated_service(args.llm_latency_ms / 1000, args.embed_latency_ms / 1000)
+    app = build_app(service)
+    transport = httpx.ASGITransport(app=app)
+
+    print(
+        f"Simulated upstream latency: embedding {args.embed_latency_ms:.0f} ms, "
+        f"LLM {args.llm_latency_ms:.0f} ms; threadpool {int(limiter.total_tokens)} threads; "
+        f"{args.requests} requests at concurrency {args.concurrency}\n"
+    )
+    print(f"{'Route':<8} {'req/s':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'errors':>7}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=300) as client:
+        for name in ("sync", "async"):
+            # Warm up lazy initialization (classifier, expander) outside the measurement
+            await client.post(f"/{name}/chat", json={"query": QUESTIONS[0]})
+            stats = await run_load(client, f"/{name}/chat", args.requests, args.concurrency)
+            print(
+                f"{name:<8} {stats['throughput']:>8.1f} {stats['p50']:>10.0f} "
+                f"{stats['p95']:>10.0f} {stats['errors']:>7}"
+            )
+
+
+async def against_server(args: argparse.Namespace) -> None:
+    """Load test a running API server."""
+    print(f"{args.requests} requests at concurrency {args.concurrency} -> {args.url}")
+    async with httpx.AsyncClient(base_url=args.url, timeout=300) as client:
+        stats = await run_load(client, "/api/v1/chat", args.requests, args.concurrency)
+    print(
+        f"{stats['throughput']:.1f} req/s, p50 {stats['p50']:.0f} ms, "
+        f"p95 {stats['p95']:.0f} ms, {stats['errors']} errors"
+    )
+
+
+def main() -> None:
+    """Parse arguments and run the load test."""
+    parser = argparse.ArgumentParser(
+        description="Concurrent load test of the chat endpoint (sync vs async route)"
+    )
+    parser.add_argument(
+        "--url",
+        help="Base URL of a running API (e.g. http://localhost:8000); default: in-process simulation",
+    )
+    parser.add_argument("--requests", type=int, default=400, help="Total requests")
+    parser.add_argument("--concurrency", type=int, default=100, help="Requests in flight")
+    parser.add_argument(
+        "--llm-latency-ms", type=float, default=300.0, help="Simulated Gemini latency"
+    )
+    parser.add_argument(
+        "--embed-latency-ms", type=float, default=50.0, help="Simulated Mistral embedding latency"
+    )
+    parser.add_argument(
+        "--threadpool-size",
+        type=int,
+        default=0,
+        help="anyio threadpool size for sync routes (default: anyio's 40)",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(against_server(args) if args.url else simulate(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@
 FILE: dependencies.py
 STATUS: Active
 RESPONSIBILITY: API dependency injection for service instances
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -34,3 +34,12 @@ def get_chat_service() -> ChatService:
     if _chat_service is None:
         raise RuntimeError("Chat service not initialized")
     return _chat_service
+
+
+def flush_pending_interactions() -> None:
+    """Wait until queued chat interactions are written (no-op before startup).
+
+    Call before reading interactions straight from the database.
+    """
+    if _chat_service is not None:
+        _chat_service.flush_interactions()
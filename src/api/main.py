@@ -2,7 +2,7 @@
 FILE: main.py
 STATUS: Active
 RESPONSIBILITY: FastAPI application factory with middleware, CORS, and exception handlers
-LAST MAJOR UPDATE: 2026-02-11
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -10,6 +10,7 @@ MAINTAINER: Shahu
 import os
 os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")
 
+import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
@@ -20,7 +21,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from src.api.dependencies import get_chat_service, set_chat_service
-from src.api.routes import chat, conversation, feedback, health
+from src.api.routes import admin, chat, conversation, feedback, health
 from src.core.config import settings
 from src.core.exceptions import (
     AppException,
@@ -40,6 +41,24 @@ logging.basicConfig(
 )
 
 
+async def watch_index_snapshots(service: ChatService, interval: float) -> None:
+    """Poll the current snapshot pointer and hot reload the index when it moves.
+
+    Loading runs in a worker thread; requests keep using the previous index
+    until the swap.
+
+    Args:
+        service: Chat service to reload
+        interval: Seconds between checks
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await asyncio.to_thread(service.reload_index_if_changed)
+        except Exception as e:
+            logger.error("Index snapshot reload failed: %s", e)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler.
@@ -59,10 +78,20 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     except IndexNotFoundError:
         logger.warning("Vector index not found - run indexer first")
 
+    watcher = None
+    if settings.vector_snapshot_watch_interval > 0:
+        watcher = asyncio.create_task(
+            watch_index_snapshots(service, settings.vector_snapshot_watch_interval)
+        )
+
     yield
 
     # Cleanup
     logger.info("Shutting down application...")
+    if watcher is not None:
+        watcher.cancel()
+    # Queued interaction writes must reach the database before the process exits
+    await asyncio.to_thread(service.close)
     set_chat_service(None)
 
 
@@ -148,6 +177,7 @@ def create_app() -> FastAPI:
     app.include_router(chat.router, prefix="/api/v1", tags=["Chat"])
     app.include_router(conversation.router, prefix="/api/v1", tags=["Conversations"])
     app.include_router(feedback.router, prefix="/api/v1", tags=["Feedback"])
+    app.include_router(admin.router, prefix="/api/v1", tags=["Admin"])
 
     return app
 
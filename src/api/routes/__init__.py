@@ -1,5 +1,5 @@
 """API route modules."""
 
-from src.api.routes import chat, conversation, feedback, health
+from src.api.routes import admin, chat, conversation, feedback, health
 
-__all__ = ["chat", "conversation", "feedback", "health"]
+__all__ = ["admin", "chat", "conversation", "feedback", "health"]
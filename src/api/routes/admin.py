@@ -0,0 +1,181 @@
+"""
+FILE: admin.py
+STATUS: Active
+RESPONSIBILITY: Admin endpoints (vector index hot reload, answer cache, interaction queue and latency statistics)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+
+from fastapi import APIRouter
+
+from src.api.dependencies import get_chat_service
+from src.core.latency import latency_registry
+from src.models.chat import (
+    CacheStatsResponse,
+    IndexReloadRequest,
+    IndexReloadResponse,
+    InteractionQueueStatsResponse,
+    LatencyStatsResponse,
+    ResponseCacheStatsResponse,
+    SemanticCacheStatsResponse,
+    StageLatencyResponse,
+)
+from src.repositories.response_cache import ResponseCache
+from src.services.semantic_cache import SemanticAnswerCache
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin")
+
+
+@router.post(
+    "/index/reload",
+    response_model=IndexReloadResponse,
+    summary="Hot Reload Vector Index",
+    description=(
+        "Load an index snapshot (default: the current one) and swap it in. "
+        "Requests keep being served by the previous index until the swap."
+    ),
+)
+def reload_index(request: IndexReloadRequest | None = None) -> IndexReloadResponse:
+    """Hot reload the vector index from a published snapshot.
+
+    Sync endpoint: runs in the threadpool, so loading doesn't block the
+    event loop serving other requests.
+
+    Args:
+        request: Optional snapshot version
+
+    Returns:
+        Previous and new snapshot versions
+    """
+    version = request.version if request else None
+    service = get_chat_service()
+    previous_version = service.index_version
+
+    logger.info("Index reload requested (version=%s)", version or "current")
+    version = service.reload_index(version)
+
+    return IndexReloadResponse(
+        previous_version=previous_version,
+        version=version,
+        index_size=service.vector_store.index_size,
+    )
+
+
+@router.get(
+    "/cache/stats",
+    response_model=CacheStatsResponse,
+    summary="Answer Cache Statistics",
+    description="Hit rates and sizes of the exact-match response cache and the semantic answer cache.",
+)
+async def cache_stats() -> CacheStatsResponse:
+    """Report answer cache statistics.
+
+    Returns:
+        Counters since each cache was created
+    """
+    service = get_chat_service()
+    return CacheStatsResponse(
+        response=_response_cache_stats(service.response_cache),
+        semantic=_semantic_cache_stats(service.semantic_cache),
+    )
+
+
+@router.get(
+    "/interactions/stats",
+    response_model=InteractionQueueStatsResponse,
+    summary="Interaction Writer Statistics",
+    description="Queue depth, batching and backpressure of the background interaction writer.",
+)
+async def interaction_queue_stats() -> InteractionQueueStatsResponse:
+    """Report background interaction writer statistics.
+
+    Returns:
+        Counters since the writer was created
+    """
+    writer = get_chat_service().interaction_writer
+    if writer is None:
+        return InteractionQueueStatsResponse(enabled=False)
+
+    stats = writer.stats
+    return InteractionQueueStatsResponse(
+        enabled=True,
+        queue_depth=writer.queue_depth,
+        max_queue_depth=stats.max_queue_depth,
+        enqueued=stats.enqueued,
+        written=stats.written,
+        failed=stats.failed,
+        batches=stats.batches,
+        mean_batch=stats.mean_batch,
+        backpressure_waits=stats.backpressure_waits,
+        backpressure_wait_ms=stats.backpressure_wait_ms,
+    )
+
+
+@router.get(
+    "/latency",
+    response_model=LatencyStatsResponse,
+    summary="Pipeline Latency Percentiles",
+    description="p50/p95/p99 per chat pipeline stage over a rolling window (this worker only).",
+)
+async def latency_stats() -> LatencyStatsResponse:
+    """Report rolling per-stage latency percentiles.
+
+    Returns:
+        Percentiles of every stage measured in the window
+    """
+    return LatencyStatsResponse(
+        window_seconds=latency_registry.window_seconds,
+        stages={
+            name: StageLatencyResponse(
+                count=summary.count,
+                mean_ms=round(summary.mean_ms, 3),
+                p50_ms=round(summary.p50_ms, 3),
+                p95_ms=round(summary.p95_ms, 3),
+                p99_ms=round(summary.p99_ms, 3),
+                max_ms=round(summary.max_ms, 3),
+            )
+            for name, summary in latency_registry.summaries().items()
+        },
+    )
+
+
+def _response_cache_stats(cache: ResponseCache | None) -> ResponseCacheStatsResponse:
+    """Statistics of the exact-match response cache (None = disabled)."""
+    if cache is None:
+        return ResponseCacheStatsResponse(enabled=False)
+
+    stats = cache.stats
+    return ResponseCacheStatsResponse(
+        enabled=True,
+        entries=len(cache),
+        memory_hits=stats.memory_hits,
+        disk_hits=stats.disk_hits,
+        misses=stats.misses,
+        stale=stats.stale,
+        stores=stats.stores,
+        evictions=stats.evictions,
+        hit_rate=stats.hit_rate,
+    )
+
+
+def _semantic_cache_stats(cache: SemanticAnswerCache | None) -> SemanticCacheStatsResponse:
+    """Statistics of the semantic answer cache (None = disabled)."""
+    if cache is None:
+        return SemanticCacheStatsResponse(enabled=False)
+
+    stats = cache.stats
+    return SemanticCacheStatsResponse(
+        enabled=True,
+        entries=len(cache),
+        hits=stats.hits,
+        misses=stats.misses,
+        bypasses=stats.bypasses,
+        stores=stats.stores,
+        evictions=stats.evictions,
+        expirations=stats.expirations,
+        hit_rate=stats.hit_rate,
+    )
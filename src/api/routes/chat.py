@@ -1,20 +1,33 @@
 """
 FILE: chat.py
 STATUS: Active
-RESPONSIBILITY: Chat API endpoints (chat, search, ask)
-LAST MAJOR UPDATE: 2026-02-06
+RESPONSIBILITY: Chat API endpoints (chat, streaming chat, search, batch search, ask)
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import json
 import logging
 import re
 import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import Any
 
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from src.api.dependencies import get_chat_service
-from src.models.chat import ChatRequest, ChatResponse, SearchResult, Visualization
+from src.core.exceptions import AppException
+from src.core.security import sanitize_query
+from src.models.chat import (
+    BatchSearchRequest,
+    BatchSearchResponse,
+    ChatRequest,
+    ChatResponse,
+    SearchResult,
+    Visualization,
+)
 from src.services.chat import ChatService
 
 logger = logging.getLogger(__name__)
@@ -34,9 +47,13 @@ router = APIRouter()
         503: {"description": "Vector index not available"},
     },
 )
-def chat(request: ChatRequest) -> ChatResponse:
+async def chat(request: ChatRequest) -> ChatResponse:
     """Process a chat request through the RAG pipeline.
 
+    Async endpoint: ChatService.achat awaits the embedding, LLM and SQL
+    calls on the event loop, so concurrent chats are not capped by the
+    threadpool size.
+
     Args:
         request: Chat request containing the query and parameters
 
@@ -51,7 +68,7 @@ def chat(request: ChatRequest) -> ChatResponse:
     try:
         service = get_chat_service()
         logger.debug(f"Service obtained: {type(service)}")
-        response = service.chat(request)
+        response = await service.achat(request)
         logger.debug(f"Response type: {type(response)}")
 
         logger.info(
@@ -70,6 +87,60 @@ def chat(request: ChatRequest) -> ChatResponse:
         raise
 
 
+@router.post(
+    "/chat/stream",
+    summary="Chat with RAG (streaming)",
+    description="Same pipeline as POST /chat, streamed as Server-Sent Events: `routing` "
+    "(query classification), `sources`, `token` (answer text as it is generated), an "
+    "optional `reset` (answer replaced by the vector-search fallback), `visualization` "
+    "and finally `done`. Errors after the stream has started arrive as an `error` event.",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Event stream", "content": {"text/event-stream": {}}},
+        422: {"description": "Validation error in request"},
+    },
+)
+async def chat_stream(request: ChatRequest) -> StreamingResponse:
+    """Stream a chat response: routing and sources first, then answer tokens.
+
+    Args:
+        request: Chat request containing the query and parameters
+
+    Returns:
+        text/event-stream response
+    """
+    logger.info("Streaming chat request received: %s", request.query[:50])
+    # Reject invalid queries with a 422 before the 200 stream starts
+    sanitize_query(request.query)
+
+    service = get_chat_service()
+    return StreamingResponse(
+        _sse_events(service.astream_chat(request)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _sse_events(events: AsyncIterator[tuple[str, dict[str, Any]]]) -> AsyncIterator[str]:
+    """Format service events as SSE frames; failures become a final error event."""
+    try:
+        async for event, data in events:
+            yield _sse_frame(event, data)
+    except AppException as e:
+        logger.warning("Streaming chat error: %s: %s", type(e).__name__, e.message)
+        yield _sse_frame("error", e.to_dict())
+    except Exception as e:
+        logger.exception("Streaming chat error: %s: %s", type(e).__name__, e)
+        yield _sse_frame(
+            "error", {"error": {"code": "INTERNAL_ERROR", "message": "An unexpected error occurred"}}
+        )
+
+
+def _sse_frame(event: str, data: dict[str, Any]) -> str:
+    """One Server-Sent Events frame (JSON payloads never contain raw newlines)."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
 @router.get(
     "/search",
     response_model=list[SearchResult],
@@ -117,3 +188,26 @@ async def search(
     return results
 
 
+@router.post(
+    "/search/batch",
+    response_model=BatchSearchResponse,
+    summary="Batch Search Knowledge Base",
+    description="Search for several queries at once (one embedding call, one index scan).",
+)
+def search_batch(request: BatchSearchRequest) -> BatchSearchResponse:
+    """Search the knowledge base for several queries in one request.
+
+    Args:
+        request: Batch search request with queries and parameters
+
+    Returns:
+        Matching documents per query, in request order
+    """
+    logger.info("Batch search request: %d queries (k=%d)", len(request.queries), request.k)
+
+    service = get_chat_service()
+    results = service.search_many(request.queries, k=request.k, min_score=request.min_score)
+
+    return BatchSearchResponse(results=results)
+
+
@@ -2,14 +2,16 @@
 FILE: conversation.py
 STATUS: Active
 RESPONSIBILITY: Conversation API endpoints for managing chat conversations
-LAST MAJOR UPDATE: 2026-02-09
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException, Query, status
 
+from src.api.dependencies import flush_pending_interactions
 from src.models.conversation import (
     ConversationCreate,
     ConversationResponse,
@@ -100,6 +102,8 @@ async def get_conversation(conversation_id: str) -> ConversationResponse:
 )
 async def get_conversation_messages(conversation_id: str) -> ConversationWithMessages:
     """Get conversation with all messages."""
+    # Include turns still queued in the background interaction writer
+    await asyncio.to_thread(flush_pending_interactions)
     service = get_conversation_service()
     conversation = service.get_conversation_history(conversation_id)
     if not conversation:
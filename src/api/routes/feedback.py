@@ -6,11 +6,13 @@ LAST MAJOR UPDATE: 2026-02-06
 MAINTAINER: Shahu
 """
 
+import asyncio
 import logging
 
 from fastapi import APIRouter, HTTPException, Query, status
 from pydantic import BaseModel
 
+from src.api.dependencies import flush_pending_interactions
 from src.models.feedback import (
     ChatInteractionResponse,
     FeedbackCreate,
@@ -85,6 +87,8 @@ async def update_feedback(
 )
 async def get_stats() -> FeedbackStats:
     """Get feedback statistics."""
+    # Include interactions still queued in the background interaction writer
+    await asyncio.to_thread(flush_pending_interactions)
     service = get_feedback_service()
     return service.get_stats()
 
@@ -97,6 +101,8 @@ async def get_stats() -> FeedbackStats:
 )
 async def get_negative_feedback() -> list[ChatInteractionResponse]:
     """Get negative feedback with comments for review."""
+    # Include interactions still queued in the background interaction writer
+    await asyncio.to_thread(flush_pending_interactions)
     service = get_feedback_service()
     return service.get_negative_feedback_with_comments()
 
@@ -112,6 +118,8 @@ async def get_interactions(
     offset: int = Query(default=0, ge=0, description="Results to skip"),
 ) -> list[ChatInteractionResponse]:
     """Get recent chat interactions."""
+    # Include interactions still queued in the background interaction writer
+    await asyncio.to_thread(flush_pending_interactions)
     service = get_feedback_service()
     return service.get_recent_interactions(limit=limit, offset=offset)
 
@@ -124,6 +132,8 @@ async def get_interactions(
 )
 async def get_interaction(interaction_id: str) -> ChatInteractionResponse:
     """Get a specific chat interaction."""
+    # Include interactions still queued in the background interaction writer
+    await asyncio.to_thread(flush_pending_interactions)
     service = get_feedback_service()
     result = service.get_interaction(interaction_id)
     if not result:
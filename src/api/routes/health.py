@@ -31,6 +31,7 @@ async def health_check() -> HealthResponse:
         service = get_chat_service()
         is_loaded = service.is_ready
         index_size = service.vector_store.index_size if is_loaded else 0
+        index_version = service.index_version if is_loaded else None
 
         if is_loaded:
             status = "healthy"
@@ -41,11 +42,13 @@ async def health_check() -> HealthResponse:
         status = "unhealthy"
         is_loaded = False
         index_size = 0
+        index_version = None
 
     return HealthResponse(
         status=status,
         index_loaded=is_loaded,
         index_size=index_size,
+        index_version=index_version,
     )
 
 
@@ -2,7 +2,7 @@
 FILE: config.py
 STATUS: Active
 RESPONSIBILITY: Pydantic Settings configuration with validation for all app settings
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -75,6 +75,63 @@ class Settings(BaseSettings):
         le=100,
         description="Batch size for embedding API calls",
     )
+    embedding_batch_max_tokens: int = Field(
+        default=16000,
+        ge=1,
+        description="Estimated token budget per embedding request (batches are closed when either limit is reached)",
+    )
+    embedding_max_concurrency: int = Field(
+        default=4,
+        ge=1,
+        le=32,
+        description="Embedding requests kept in flight at once (1 = sequential)",
+    )
+    embedding_max_retries: int = Field(
+        default=5,
+        ge=0,
+        le=20,
+        description="Retries per embedding batch on rate limits (429) and server errors (5xx)",
+    )
+    embedding_retry_initial_delay: float = Field(
+        default=1.0,
+        ge=0.0,
+        description="Base backoff delay in seconds for embedding retries (doubled per attempt, full jitter)",
+    )
+    embedding_retry_max_delay: float = Field(
+        default=30.0,
+        ge=0.0,
+        description="Maximum backoff delay in seconds for embedding retries",
+    )
+    embedding_coalesce_enabled: bool = Field(
+        default=True,
+        description="Coalesce concurrent embed_query calls into batched API calls",
+    )
+    embedding_coalesce_max_wait_ms: float = Field(
+        default=5.0,
+        ge=0.0,
+        le=1000.0,
+        description="How long the first query of a batch waits for concurrent queries",
+    )
+    embedding_coalesce_max_batch: int = Field(
+        default=32,
+        ge=1,
+        le=100,
+        description="Maximum queries per coalesced embedding call (the window closes early when reached)",
+    )
+    embedding_cache_enabled: bool = Field(
+        default=True,
+        description="Cache embeddings on disk keyed by (model, sha256(text)); only misses call the API",
+    )
+    embedding_cache_max_mb: int = Field(
+        default=512,
+        ge=1,
+        description="On-disk embedding cache size limit; least recently used entries are evicted",
+    )
+    embedding_cache_memory_items: int = Field(
+        default=4096,
+        ge=0,
+        description="Embeddings kept in the in-memory LRU in front of the disk cache",
+    )
 
     # Search Configuration
     search_k: int = Field(
@@ -90,10 +147,215 @@ class Settings(BaseSettings):
         description="Minimum similarity score (0-1) for results",
     )
 
+    # Retrieval orchestration (chat pipeline)
+    retrieval_sql_timeout: float = Field(
+        default=45.0,
+        gt=0.0,
+        description="Seconds the SQL branch (SQL generation + execution) may take before it is treated as failed",
+    )
+    retrieval_vector_timeout: float = Field(
+        default=15.0,
+        gt=0.0,
+        description="Seconds the vector branch (query embedding + search) may take before it is dropped",
+    )
+    speculative_vector_search: bool = Field(
+        default=True,
+        description="Start vector search alongside SQL for statistical queries so the fallback is warm if SQL fails (async chat only)",
+    )
+    retrieval_max_workers: int = Field(
+        default=8,
+        ge=2,
+        le=64,
+        description="Threads shared by sync chat requests for running SQL and vector branches side by side",
+    )
+
+    # Semantic answer cache (paraphrased questions reuse a previous ChatResponse)
+    semantic_cache_enabled: bool = Field(
+        default=False,
+        description="Answer queries similar to a previous one (same entities) from the semantic answer cache",
+    )
+    semantic_cache_threshold: float = Field(
+        default=0.95,
+        ge=0.0,
+        le=1.0,
+        description="Minimum cosine similarity between query embeddings for a cache hit",
+    )
+    semantic_cache_ttl_seconds: float = Field(
+        default=3600.0,
+        ge=0.0,
+        description="Lifetime of cached answers in seconds (0 = until evicted or the data changes)",
+    )
+    semantic_cache_max_entries: int = Field(
+        default=1000,
+        ge=1,
+        description="Cached answers kept; least recently used are evicted",
+    )
+    semantic_cache_in_conversations: bool = Field(
+        default=False,
+        description="Also use the cache for requests with a conversation_id (answers may depend on history)",
+    )
+
+    # Exact-match response cache (identical requests reuse a previous ChatResponse)
+    response_cache_enabled: bool = Field(
+        default=True,
+        description="Answer repeated requests (same normalized query, route, k and history) from the response cache",
+    )
+    response_cache_max_entries: int = Field(
+        default=10000,
+        ge=1,
+        description="Responses kept on disk; least recently used are evicted",
+    )
+    response_cache_memory_items: int = Field(
+        default=256,
+        ge=0,
+        description="Responses kept in the in-memory LRU in front of the disk cache",
+    )
+
+    # Conversation history (prompt context for follow-up turns)
+    conversation_cache_max_conversations: int = Field(
+        default=1000,
+        ge=1,
+        description="Conversations whose recent turns are kept in memory; least recently used are evicted",
+    )
+
+    # Interaction persistence (write-behind queue for interactions.db)
+    interaction_write_behind: bool = Field(
+        default=True,
+        description="Save chat interactions from a background writer instead of on the request path",
+    )
+    interaction_queue_max: int = Field(
+        default=1000,
+        ge=1,
+        description="Interactions waiting to be written before requests block (backpressure)",
+    )
+    interaction_write_batch_size: int = Field(
+        default=100,
+        ge=1,
+        description="Maximum interactions written per transaction",
+    )
+    interaction_flush_timeout: float = Field(
+        default=10.0,
+        gt=0.0,
+        description="Seconds shutdown waits for queued interactions to be written",
+    )
+
+    # Latency histograms (per pipeline stage, GET /admin/latency)
+    latency_window_seconds: float = Field(
+        default=300.0,
+        gt=0.0,
+        description="Span of the rolling per-stage latency histograms in seconds",
+    )
+
+    # SQL template fast path (common question shapes compiled without the LLM)
+    sql_templates_enabled: bool = Field(
+        default=True,
+        description="Compile common statistical questions to SQL with rules before asking the LLM",
+    )
+
+    # Generated SQL cache (LLM SQL reused for the same question or question skeleton)
+    sql_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse LLM-generated SQL for repeated questions and questions differing only in player/team/number",
+    )
+    sql_cache_max_entries: int = Field(
+        default=10_000,
+        ge=1,
+        description="Generated SQL entries kept on disk; least recently used entries are evicted",
+    )
+    sql_cache_memory_items: int = Field(
+        default=1_000,
+        ge=0,
+        description="Generated SQL entries kept in the in-memory LRU in front of the disk cache",
+    )
+
+    # Generated SQL execution
+    sql_native_execution: bool = Field(
+        default=True,
+        description="Run SQL on pooled read-only sqlite3 connections with typed rows (false = LangChain SQLDatabase)",
+    )
+    sql_pool_size: int = Field(
+        default=4,
+        ge=1,
+        description="Idle read-only connections kept for SQL execution",
+    )
+    sql_max_rows: int = Field(
+        default=1000,
+        ge=1,
+        description="Rows a SQL query returns at most; the rest is dropped",
+    )
+    sql_timeout_seconds: float = Field(
+        default=15.0,
+        gt=0.0,
+        description="Wall-clock limit of one SQL query; SQLite is interrupted when it is reached",
+    )
+    sql_max_instructions: int = Field(
+        default=20_000_000,
+        ge=1000,
+        description="SQLite virtual machine instructions one query may run before it is interrupted",
+    )
+    sql_max_plan_cost: float = Field(
+        default=5_000_000,
+        ge=0.0,
+        description="Estimated rows visited by nested full-scan loops above which a query is rejected (0 = no plan check)",
+    )
+
+    # Vector Index Configuration (FAISS)
+    vector_index_type: Literal["flat", "ivf_flat", "hnsw", "ivf_pq", "sq8", "fp16", "pq"] = Field(
+        default="flat",
+        description="FAISS index type (flat = exact search, sq8/fp16/pq = quantized flat scan, others = approximate)",
+    )
+    ivf_nlist: int = Field(
+        default=256,
+        ge=1,
+        description="Number of IVF clusters (capped by corpus size at build time)",
+    )
+    ivf_nprobe: int = Field(
+        default=16,
+        ge=1,
+        description="Number of IVF clusters scanned per query (recall vs latency)",
+    )
+    hnsw_m: int = Field(default=32, ge=4, le=128, description="HNSW graph neighbors per node")
+    hnsw_ef_construction: int = Field(
+        default=200,
+        ge=8,
+        description="HNSW candidate list size during graph construction",
+    )
+    hnsw_ef_search: int = Field(
+        default=64,
+        ge=1,
+        description="HNSW candidate list size per query (recall vs latency)",
+    )
+    pq_m: int = Field(
+        default=64,
+        ge=1,
+        description="Number of PQ sub-quantizers (must divide the embedding dimension)",
+    )
+    pq_nbits: int = Field(default=8, ge=4, le=12, description="Bits per PQ sub-quantizer code")
+    rerank_k_factor: int = Field(
+        default=4,
+        ge=1,
+        description="pq index: candidates fetched per result and re-ranked with float32 vectors",
+    )
+    vector_index_mmap: bool = Field(
+        default=True,
+        description="Memory-map the FAISS index on load instead of reading it into RAM",
+    )
+    vector_snapshot_keep: int = Field(
+        default=3,
+        ge=1,
+        description="Index snapshots kept on disk when a new one is published (current always kept)",
+    )
+    vector_snapshot_watch_interval: float = Field(
+        default=0.0,
+        ge=0.0,
+        description="Seconds between checks of the current snapshot pointer for hot reload (0 = off)",
+    )
+
     # Paths (relative to project root, consolidated under data/)
     input_dir: str = Field(default="data/inputs")
     vector_db_dir: str = Field(default="data/vector")
     database_dir: str = Field(default="data/sql")
+    cache_dir: str = Field(default="data/cache")
 
     # Application
     app_title: str = Field(default="NBA Analyst AI")
@@ -135,16 +397,56 @@ class Settings(BaseSettings):
         """Path to FAISS index file."""
         return Path(self.vector_db_dir) / "faiss_index.idx"
 
+    @property
+    def bm25_index_path(self) -> Path:
+        """Path to corpus-wide BM25 inverted index (stored next to the FAISS index)."""
+        return Path(self.vector_db_dir) / "bm25_index.npz"
+
+    @property
+    def rerank_vectors_path(self) -> Path:
+        """Path to float32 re-rank vectors for the pq index type (stored next to the FAISS index)."""
+        return Path(self.vector_db_dir) / "rerank_vectors.npy"
+
+    @property
+    def vector_snapshots_path(self) -> Path:
+        """Directory of versioned index snapshots (one subdirectory per build plus a current pointer)."""
+        return Path(self.vector_db_dir) / "snapshots"
+
     @property
     def document_chunks_path(self) -> Path:
-        """Path to document chunks pickle file."""
+        """Path to legacy document chunks pickle file (migrated to chunk_store_path on load)."""
         return Path(self.vector_db_dir) / "document_chunks.pkl"
 
+    @property
+    def chunk_store_path(self) -> Path:
+        """Path to memory-mapped columnar chunk store."""
+        return Path(self.vector_db_dir) / "document_chunks.bin"
+
+    @property
+    def embedding_cache_path(self) -> Path:
+        """Path to persistent embedding cache (SQLite)."""
+        return Path(self.cache_dir) / "embeddings.sqlite"
+
+    @property
+    def response_cache_path(self) -> Path:
+        """Path to persistent chat response cache (SQLite, shared by API workers)."""
+        return Path(self.cache_dir) / "responses.sqlite"
+
+    @property
+    def sql_cache_path(self) -> Path:
+        """Path to persistent generated SQL cache (SQLite, shared by API workers)."""
+        return Path(self.cache_dir) / "generated_sql.sqlite"
+
     @property
     def database_path(self) -> Path:
         """Path to SQLite database."""
         return Path(self.database_dir) / "interactions.db"
 
+    @property
+    def stats_database_path(self) -> Path:
+        """Path to NBA statistics SQLite database (queried by the SQL tool)."""
+        return Path(self.database_dir) / "nba_stats.db"
+
 
 @lru_cache
 def get_settings() -> Settings:
@@ -2,7 +2,7 @@
 FILE: exceptions.py
 STATUS: Active
 RESPONSIBILITY: Custom exception hierarchy for structured error handling
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -82,6 +82,22 @@ class DocumentError(AppException):
         super().__init__(message, code="DOCUMENT_ERROR", details=details)
 
 
+class QueryCancelledError(AppException):
+    """Raised when a SQL query is interrupted (deadline, instruction budget or caller cancellation)."""
+
+    def __init__(self, message: str, details: dict[str, Any] | None = None):
+        """Create the error with its interruption reason and elapsed time in details."""
+        super().__init__(message, code="QUERY_CANCELLED", details=details)
+
+
+class QueryRejectedError(AppException):
+    """Raised when a SQL query plan is too expensive to run."""
+
+    def __init__(self, message: str, details: dict[str, Any] | None = None):
+        """Create the error with the estimated plan cost and the limit in details."""
+        super().__init__(message, code="QUERY_REJECTED", details=details)
+
+
 class RateLimitError(AppException):
     """Raised when rate limit is exceeded."""
 
@@ -0,0 +1,246 @@
+"""
+FILE: latency.py
+STATUS: Active
+RESPONSIBILITY: Per-stage latency measurement - request timings and rolling log-bucketed histograms
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import contextvars
+import math
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from src.core.config import settings
+
+# Pipeline stages (histogram names)
+CONVERSATION_HISTORY = "conversation_history"
+FOLLOWUP_REWRITE = "followup_rewrite"
+CLASSIFICATION = "classification"
+CACHE_LOOKUP = "cache_lookup"
+SQL_GENERATION = "sql_generation"
+SQL_EXECUTION = "sql_execution"
+EMBEDDING = "embedding"
+FAISS_SEARCH = "faiss_search"
+BM25_RESCORING = "bm25_rescoring"
+LLM_GENERATION = "llm_generation"
+VISUALIZATION = "visualization"
+TOTAL = "total"
+
+# Bucket boundaries grow by this factor: percentiles are within 2% of the true value
+_BUCKET_GROWTH = 1.02
+_MIN_MS = 0.001
+
+# Stage durations of the request being processed (None outside requests)
+_request_timings: contextvars.ContextVar[dict[str, float] | None] = contextvars.ContextVar(
+    "request_timings", default=None
+)
+
+
+@dataclass
+class LatencySummary:
+    """Percentiles of one stage over the histogram window (milliseconds).
+
+    Attributes:
+        count: Measurements in the window
+        mean_ms: Mean duration
+        p50_ms: Median
+        p95_ms: 95th percentile
+        p99_ms: 99th percentile
+        max_ms: Slowest measurement
+    """
+
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+
+class LatencyHistogram:
+    """Rolling latency histogram with logarithmic buckets (HDR-style).
+
+    Each bucket spans a constant ratio of values, so percentiles stay
+    within 2% of the true value from microseconds to hours with about a
+    thousand buckets at most. The window is split into slices; a slice
+    older than the window is dropped as a whole, so percentiles cover
+    roughly the last window_seconds. Thread-safe.
+    """
+
+    def __init__(self, window_seconds: float | None = None, slices: int = 6):
+        """Initialize an empty histogram.
+
+        Args:
+            window_seconds: Span of measurements reported (default from settings)
+            slices: Sub-windows the span is rotated in
+        """
+        window = settings.latency_window_seconds if window_seconds is None else window_seconds
+        self._slice_seconds = window / slices
+        self._slices: deque[tuple[float, Counter, list[float]]] = deque(maxlen=slices)
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms: float) -> None:
+        """Add a measurement.
+
+        Args:
+            duration_ms: Duration in milliseconds
+        """
+        bucket = self._bucket(duration_ms)
+        now = time.monotonic()
+        with self._lock:
+            if not self._slices or now - self._slices[-1][0] >= self._slice_seconds:
+                # [count, sum, max]
+                self._slices.append((now, Counter(), [0, 0.0, 0.0]))
+            _, buckets, totals = self._slices[-1]
+            buckets[bucket] += 1
+            totals[0] += 1
+            totals[1] += duration_ms
+            totals[2] = max(totals[2], duration_ms)
+
+    def summary(self) -> LatencySummary | None:
+        """Percentiles over the window.
+
+        Returns:
+            Summary, or None if nothing was measured in the window
+        """
+        cutoff = time.monotonic() - self._slice_seconds * (self._slices.maxlen or 1)
+        merged: Counter = Counter()
+        count, total, maximum = 0, 0.0, 0.0
+        with self._lock:
+            for started, buckets, totals in self._slices:
+                if started < cutoff:
+                    continue
+                merged.update(buckets)
+                count += totals[0]
+                total += totals[1]
+                maximum = max(maximum, totals[2])
+        if not count:
+            return None
+
+        ordered = sorted(merged.items())
+        return LatencySummary(
+            count=count,
+            mean_ms=total / count,
+            p50_ms=min(self._percentile(ordered, count, 0.50), maximum),
+            p95_ms=min(self._percentile(ordered, count, 0.95), maximum),
+            p99_ms=min(self._percentile(ordered, count, 0.99), maximum),
+            max_ms=maximum,
+        )
+
+    @staticmethod
+    def _bucket(duration_ms: float) -> int:
+        """Bucket index of a duration."""
+        if duration_ms <= _MIN_MS:
+            return 0
+        return int(math.log(duration_ms / _MIN_MS, _BUCKET_GROWTH)) + 1
+
+    @staticmethod
+    def _percentile(ordered: list[tuple[int, int]], count: int, quantile: float) -> float:
+        """Value at a quantile: upper bound of the bucket holding that rank."""
+        rank = max(1, math.ceil(quantile * count))
+        seen = 0
+        for bucket, bucket_count in ordered:
+            seen += bucket_count
+            if seen >= rank:
+                return _MIN_MS * _BUCKET_GROWTH**bucket
+        return _MIN_MS * _BUCKET_GROWTH ** ordered[-1][0]
+
+
+class LatencyRegistry:
+    """Rolling histograms per pipeline stage (created on first measurement)."""
+
+    def __init__(self, window_seconds: float | None = None):
+        """Initialize an empty registry.
+
+        Args:
+            window_seconds: Histogram window (default from settings)
+        """
+        self._window_seconds = window_seconds
+        self._histograms: dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def window_seconds(self) -> float:
+        """Span of measurements reported."""
+        return settings.latency_window_seconds if self._window_seconds is None else self._window_seconds
+
+    def record(self, stage: str, duration_ms: float) -> None:
+        """Add a measurement for a stage."""
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, LatencyHistogram(self._window_seconds))
+        histogram.record(duration_ms)
+
+    def summaries(self) -> dict[str, LatencySummary]:
+        """Percentiles per stage with measurements in the window."""
+        with self._lock:
+            histograms = dict(self._histograms)
+        summaries = {name: histogram.summary() for name, histogram in sorted(histograms.items())}
+        return {name: summary for name, summary in summaries.items() if summary is not None}
+
+    def reset(self) -> None:
+        """Drop all measurements."""
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide histograms (reported by GET /admin/latency)
+latency_registry = LatencyRegistry()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Time a pipeline stage.
+
+    The duration goes to the stage's histogram and, inside collect_timings(),
+    is added to the request's timings (a stage run twice is summed).
+
+    Args:
+        name: Stage name (one of the constants above)
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, (time.perf_counter() - start) * 1000)
+
+
+def record(name: str, duration_ms: float) -> None:
+    """Record a stage duration measured by the caller (see stage())."""
+    latency_registry.record(name, duration_ms)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + duration_ms
+
+
+@contextmanager
+def collect_timings() -> Iterator[dict[str, float]]:
+    """Collect the stage durations of one request.
+
+    Work started inside the block (threads via contextvars.copy_context,
+    asyncio tasks, asyncio.to_thread) records into the same dict.
+
+    Yields:
+        Stage name -> milliseconds, filled in as stages complete
+    """
+    timings: dict[str, float] = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        try:
+            _request_timings.reset(token)
+        except ValueError:
+            # An async generator finalized from another context
+            _request_timings.set(None)
+
+
+def current_timings() -> dict[str, float] | None:
+    """Stage durations of the request being processed (None outside collect_timings())."""
+    return _request_timings.get()
@@ -1,9 +1,13 @@
 """Pydantic models for request/response validation."""
 
 from src.models.chat import (
+    BatchSearchRequest,
+    BatchSearchResponse,
     ChatMessage,
     ChatRequest,
     ChatResponse,
+    IndexReloadRequest,
+    IndexReloadResponse,
     SearchResult,
 )
 from src.models.conversation import (
@@ -29,9 +33,13 @@ from src.models.feedback import (
 )
 
 __all__ = [
+    "BatchSearchRequest",
+    "BatchSearchResponse",
     "ChatMessage",
     "ChatRequest",
     "ChatResponse",
+    "IndexReloadRequest",
+    "IndexReloadResponse",
     "SearchResult",
     "ConversationCreate",
     "ConversationUpdate",
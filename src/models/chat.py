@@ -2,7 +2,7 @@
 FILE: chat.py
 STATUS: Active
 RESPONSIBILITY: Pydantic models for chat requests, responses, and search results
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -60,6 +60,51 @@ class SearchResult(BaseModel):
     )
 
 
+class BatchSearchRequest(BaseModel):
+    """Request to the batched search endpoint.
+
+    Attributes:
+        queries: Search queries (embedded and searched together)
+        k: Number of results per query
+        min_score: Minimum similarity score for results
+    """
+
+    queries: list[str] = Field(
+        min_length=1,
+        max_length=100,
+        description="Search queries",
+        examples=[["NBA championship 2023", "best three point shooters"]],
+    )
+    k: int = Field(default=5, ge=1, le=20, description="Number of results per query")
+    min_score: float | None = Field(
+        default=None,
+        ge=0,
+        le=1,
+        description="Minimum similarity score (0-1)",
+    )
+
+    @field_validator("queries")
+    @classmethod
+    def validate_queries(cls, v: list[str]) -> list[str]:
+        """Validate and clean each query."""
+        cleaned = [q.strip() for q in v]
+        if any(not q for q in cleaned):
+            raise ValueError("Queries cannot be empty")
+        if any(len(q) > 2000 for q in cleaned):
+            raise ValueError("Queries must be at most 2000 characters")
+        return cleaned
+
+
+class BatchSearchResponse(BaseModel):
+    """Response from the batched search endpoint.
+
+    Attributes:
+        results: Search results per query, in request order
+    """
+
+    results: list[list[SearchResult]] = Field(description="Search results per query")
+
+
 class ChatRequest(BaseModel):
     """Request to the chat endpoint.
 
@@ -70,6 +115,7 @@ class ChatRequest(BaseModel):
         include_sources: Whether to include source references
         conversation_id: Optional conversation ID for context
         turn_number: Turn number in conversation
+        include_timings: Whether to return per-stage durations
     """
 
     query: str = Field(
@@ -103,6 +149,10 @@ class ChatRequest(BaseModel):
         ge=1,
         description="Turn number in conversation",
     )
+    include_timings: bool = Field(
+        default=False,
+        description="Include per-stage durations (ms) in the response",
+    )
 
     @field_validator("query")
     @classmethod
@@ -142,6 +192,8 @@ class ChatResponse(BaseModel):
         turn_number: Turn number in conversation
         generated_sql: Generated SQL query (if applicable)
         visualization: Optional visualization for statistical queries
+        query_type: Query routing type
+        timings: Per-stage durations in ms (only if the request set include_timings)
     """
 
     answer: str = Field(description="AI-generated response")
@@ -179,6 +231,10 @@ class ChatResponse(BaseModel):
         default=None,
         description="Query routing type: statistical/contextual/hybrid/greeting",
     )
+    timings: dict[str, float] | None = Field(
+        default=None,
+        description="Per-stage durations in ms (requested with include_timings)",
+    )
 
     model_config = {"json_schema_extra": {"example": {
         "answer": "The Denver Nuggets won the 2023 NBA Championship.",
@@ -204,6 +260,7 @@ class HealthResponse(BaseModel):
         status: Service status
         index_loaded: Whether vector index is loaded
         index_size: Number of vectors in index
+        index_version: Active index snapshot version
         version: API version
     """
 
@@ -212,8 +269,168 @@ class HealthResponse(BaseModel):
     )
     index_loaded: bool = Field(description="Whether vector index is loaded")
     index_size: int = Field(ge=0, description="Number of vectors in index")
+    index_version: str | None = Field(
+        default=None,
+        description="Active index snapshot version (None for unversioned index files)",
+    )
     version: str = Field(default="1.0.0", description="API version")
     timestamp: datetime = Field(
         default_factory=datetime.utcnow,
         description="Health check timestamp (UTC)",
     )
+
+
+class IndexReloadRequest(BaseModel):
+    """Index hot reload request.
+
+    Attributes:
+        version: Snapshot version to load (default: current pointer)
+    """
+
+    version: str | None = Field(
+        default=None,
+        max_length=64,
+        pattern=r"^[0-9A-Za-z.]+$",
+        description="Snapshot version to load (default: the current snapshot)",
+    )
+
+
+class IndexReloadResponse(BaseModel):
+    """Index hot reload response.
+
+    Attributes:
+        previous_version: Snapshot version served before the reload
+        version: Snapshot version now serving
+        index_size: Number of vectors in the new index
+    """
+
+    previous_version: str | None = Field(description="Snapshot version served before the reload")
+    version: str = Field(description="Snapshot version now serving")
+    index_size: int = Field(ge=0, description="Number of vectors in the new index")
+
+
+class SemanticCacheStatsResponse(BaseModel):
+    """Semantic answer cache statistics.
+
+    Attributes:
+        enabled: Whether the cache is in use
+        entries: Cached answers
+        hits: Requests answered from the cache
+        misses: Lookups without a similar enough entry
+        bypasses: Requests that skipped the cache (inside conversations)
+        stores: Answers added
+        evictions: Answers evicted for capacity (LRU)
+        expirations: Answers dropped for age or changed data
+        hit_rate: hits / (hits + misses)
+    """
+
+    enabled: bool = Field(description="Whether the semantic cache is in use")
+    entries: int = Field(default=0, ge=0, description="Cached answers")
+    hits: int = Field(default=0, ge=0, description="Requests answered from the cache")
+    misses: int = Field(default=0, ge=0, description="Lookups without a similar enough entry")
+    bypasses: int = Field(default=0, ge=0, description="Requests that skipped the cache")
+    stores: int = Field(default=0, ge=0, description="Answers added")
+    evictions: int = Field(default=0, ge=0, description="Answers evicted for capacity (LRU)")
+    expirations: int = Field(default=0, ge=0, description="Answers dropped for age or changed data")
+    hit_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="hits / (hits + misses)")
+
+
+class ResponseCacheStatsResponse(BaseModel):
+    """Exact-match response cache statistics (this worker's counters).
+
+    Attributes:
+        enabled: Whether the cache is in use
+        entries: Cached responses on disk (shared by all workers)
+        memory_hits: Requests answered from the in-memory LRU
+        disk_hits: Requests answered from the SQLite tier
+        misses: Lookups without a current entry
+        stale: Entries dropped because the index or stats database changed
+        stores: Responses added
+        evictions: Responses evicted for capacity (LRU)
+        hit_rate: hits / (hits + misses)
+    """
+
+    enabled: bool = Field(description="Whether the response cache is in use")
+    entries: int = Field(default=0, ge=0, description="Cached responses on disk (all workers)")
+    memory_hits: int = Field(default=0, ge=0, description="Requests answered from the in-memory LRU")
+    disk_hits: int = Field(default=0, ge=0, description="Requests answered from the SQLite tier")
+    misses: int = Field(default=0, ge=0, description="Lookups without a current entry")
+    stale: int = Field(default=0, ge=0, description="Entries dropped for changed data")
+    stores: int = Field(default=0, ge=0, description="Responses added")
+    evictions: int = Field(default=0, ge=0, description="Responses evicted for capacity (LRU)")
+    hit_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="hits / (hits + misses)")
+
+
+class InteractionQueueStatsResponse(BaseModel):
+    """Background interaction writer statistics.
+
+    Attributes:
+        enabled: Whether interactions are written in the background
+        queue_depth: Interactions not yet committed
+        max_queue_depth: Most interactions waiting at once
+        enqueued: Interactions submitted
+        written: Interactions committed
+        failed: Interactions lost to failed writes
+        batches: Transactions written
+        mean_batch: Average interactions per transaction
+        backpressure_waits: Requests that blocked on a full queue
+        backpressure_wait_ms: Total time requests spent blocked
+    """
+
+    enabled: bool = Field(description="Whether interactions are written in the background")
+    queue_depth: int = Field(default=0, ge=0, description="Interactions not yet committed")
+    max_queue_depth: int = Field(default=0, ge=0, description="Most interactions waiting at once")
+    enqueued: int = Field(default=0, ge=0, description="Interactions submitted")
+    written: int = Field(default=0, ge=0, description="Interactions committed")
+    failed: int = Field(default=0, ge=0, description="Interactions lost to failed writes")
+    batches: int = Field(default=0, ge=0, description="Transactions written")
+    mean_batch: float = Field(default=0.0, ge=0.0, description="Average interactions per transaction")
+    backpressure_waits: int = Field(default=0, ge=0, description="Requests that blocked on a full queue")
+    backpressure_wait_ms: float = Field(default=0.0, ge=0.0, description="Total time requests spent blocked")
+
+
+class StageLatencyResponse(BaseModel):
+    """Latency percentiles of one pipeline stage.
+
+    Attributes:
+        count: Measurements in the window
+        mean_ms: Mean duration
+        p50_ms: Median duration
+        p95_ms: 95th percentile
+        p99_ms: 99th percentile
+        max_ms: Slowest measurement
+    """
+
+    count: int = Field(ge=0, description="Measurements in the window")
+    mean_ms: float = Field(ge=0.0, description="Mean duration (ms)")
+    p50_ms: float = Field(ge=0.0, description="Median duration (ms)")
+    p95_ms: float = Field(ge=0.0, description="95th percentile (ms)")
+    p99_ms: float = Field(ge=0.0, description="99th percentile (ms)")
+    max_ms: float = Field(ge=0.0, description="Slowest measurement (ms)")
+
+
+class LatencyStatsResponse(BaseModel):
+    """Rolling per-stage latency histograms of this worker.
+
+    Attributes:
+        window_seconds: Span of measurements covered
+        stages: Percentiles per pipeline stage (stages without measurements are omitted)
+    """
+
+    window_seconds: float = Field(gt=0.0, description="Span of measurements covered (seconds)")
+    stages: dict[str, StageLatencyResponse] = Field(
+        default_factory=dict,
+        description="Percentiles per pipeline stage",
+    )
+
+
+class CacheStatsResponse(BaseModel):
+    """Answer cache statistics.
+
+    Attributes:
+        response: Exact-match response cache statistics
+        semantic: Semantic answer cache statistics
+    """
+
+    response: ResponseCacheStatsResponse = Field(description="Exact-match response cache statistics")
+    semantic: SemanticCacheStatsResponse = Field(description="Semantic answer cache statistics")
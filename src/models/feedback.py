@@ -2,13 +2,13 @@
 FILE: feedback.py
 STATUS: Active
 RESPONSIBILITY: SQLAlchemy ORM and Pydantic models for feedback and chat interactions
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import NamedTuple, Optional
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
@@ -94,6 +94,14 @@ class ChatInteractionResponse(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ConversationTurn(NamedTuple):
+    """One previous turn of a conversation, as used for the prompt history."""
+
+    turn_number: int
+    query: str
+    response: str
+
+
 class FeedbackCreate(BaseModel):
     """Schema for creating feedback."""
 
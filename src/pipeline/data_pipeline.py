@@ -35,6 +35,7 @@ from src.pipeline.models import (
     QualityCheckResult,
     RawDocument,
 )
+from src.repositories.index_snapshots import IndexSnapshotStore
 from src.repositories.vector_store import VectorStoreRepository
 from src.services.embedding import EmbeddingService
 from src.utils.data_loader import download_and_extract_zip, load_and_parse_files
@@ -57,6 +58,7 @@ class DataPipeline:
         enable_quality_check: bool = False,
         quality_sample_size: int = 10,
         quality_threshold: float = 0.5,
+        snapshot_store: IndexSnapshotStore | None = None,
     ):
         """Initialize the pipeline.
 
@@ -66,12 +68,15 @@ class DataPipeline:
             enable_quality_check: Run LLM-powered chunk quality validation.
             quality_sample_size: Number of chunks to sample for quality check.
             quality_threshold: Minimum quality score for chunk retention (0.0-1.0).
+            snapshot_store: If given, the index stage also publishes a versioned
+                snapshot (picked up by a running API via hot reload).
         """
         self._embedding_service = embedding_service or EmbeddingService()
         self._vector_store = vector_store or VectorStoreRepository()
         self._enable_quality_check = enable_quality_check
         self._quality_sample_size = quality_sample_size
         self._quality_threshold = quality_threshold
+        self._snapshot_store = snapshot_store
 
     @logfire.instrument("Pipeline.load")
     def load(self, input_data: LoadStageInput) -> LoadStageOutput:
@@ -538,10 +543,15 @@ class DataPipeline:
         self._vector_store.build_index(doc_chunks, embeddings)
         self._vector_store.save()
 
+        snapshot_version = None
+        if self._snapshot_store is not None:
+            snapshot_version = self._snapshot_store.publish(self._vector_store).version
+
         return IndexStageOutput(
             index_size=self._vector_store.index_size,
             index_path=str(settings.faiss_index_path),
-            chunks_path=str(settings.document_chunks_path),
+            chunks_path=str(settings.chunk_store_path),
+            snapshot_version=snapshot_version,
         )
 
     @logfire.instrument("Pipeline.run")
@@ -636,6 +646,7 @@ Examples:
   poetry run python -m src.pipeline.data_pipeline
   poetry run python -m src.pipeline.data_pipeline --input-dir custom/inputs
   poetry run python -m src.pipeline.data_pipeline --rebuild
+  poetry run python -m src.pipeline.data_pipeline --rebuild --snapshot
   poetry run python -m src.pipeline.data_pipeline --data-url https://example.com/data.zip
         """,
     )
@@ -656,24 +667,33 @@ Examples:
         action="store_true",
         help="Rebuild index from scratch (delete existing)",
     )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        help="Publish the index as a versioned snapshot (running APIs can hot reload it)",
+    )
 
     args = parser.parse_args()
 
     try:
         repository = VectorStoreRepository()
+        snapshot_store = IndexSnapshotStore() if args.snapshot else None
 
         if not args.rebuild and repository.load():
             logger.info(
                 "Existing index loaded with %d vectors. Use --rebuild to rebuild.",
                 repository.index_size,
             )
+            if snapshot_store is not None:
+                manifest = snapshot_store.publish(repository)
+                logger.info("Published existing index as snapshot %s", manifest.version)
             return 0
 
         if args.rebuild:
             logger.info("Rebuild requested - deleting existing index")
             repository.delete_files()
 
-        pipeline = DataPipeline(vector_store=repository)
+        pipeline = DataPipeline(vector_store=repository, snapshot_store=snapshot_store)
         result = pipeline.run(input_dir=args.input_dir, data_url=args.data_url)
 
         if result.errors:
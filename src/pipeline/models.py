@@ -102,7 +102,10 @@ class IndexStageOutput(BaseModel):
 
     index_size: int = Field(ge=0, description="Number of vectors in the index")
     index_path: str = Field(description="Path to the FAISS index file")
-    chunks_path: str = Field(description="Path to the chunks pickle file")
+    chunks_path: str = Field(description="Path to the chunk store file")
+    snapshot_version: str | None = Field(
+        default=None, description="Published index snapshot version (if snapshots are enabled)"
+    )
 
 
 class PipelineResult(BaseModel):
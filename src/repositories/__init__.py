@@ -8,7 +8,14 @@ MAINTAINER: Shahu
 
 from src.repositories.conversation import ConversationRepository
 from src.repositories.feedback import FeedbackRepository
+from src.repositories.index_snapshots import IndexSnapshotStore
 from src.repositories.nba_database import NBADatabase
 from src.repositories.vector_store import VectorStoreRepository
 
-__all__ = ["ConversationRepository", "FeedbackRepository", "NBADatabase", "VectorStoreRepository"]
+__all__ = [
+    "ConversationRepository",
+    "FeedbackRepository",
+    "IndexSnapshotStore",
+    "NBADatabase",
+    "VectorStoreRepository",
+]
@@ -0,0 +1,271 @@
+"""
+FILE: bm25_index.py
+STATUS: Active
+RESPONSIBILITY: Corpus-wide BM25 inverted index persisted alongside the FAISS index
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> list[str]:
+    """Tokenize text for BM25 (lowercase + whitespace split).
+
+    Args:
+        text: Raw text
+
+    Returns:
+        List of tokens
+    """
+    return text.lower().split()
+
+
+class BM25Index:
+    """Precomputed BM25 (Okapi) inverted index over the full chunk corpus.
+
+    Built once at index build/load time so query-time scoring is a handful of
+    array lookups, and IDF reflects the whole corpus instead of the candidate set.
+
+    Postings are stored in CSR layout: for term id ``t``, the documents
+    containing it are ``doc_ids[indptr[t]:indptr[t + 1]]`` (sorted ascending)
+    with matching term frequencies in ``tfs``.
+
+    Attributes:
+        k1: Term frequency saturation parameter
+        b: Document length normalization parameter
+        epsilon: IDF floor factor for very common terms (same as rank_bm25)
+    """
+
+    epsilon: float = 0.25
+
+    def __init__(
+        self,
+        vocabulary: dict[str, int],
+        idf: np.ndarray,
+        doc_lengths: np.ndarray,
+        indptr: np.ndarray,
+        doc_ids: np.ndarray,
+        tfs: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        """Initialize from precomputed arrays (use build() or load()).
+
+        Args:
+            vocabulary: Term -> term id mapping
+            idf: IDF per term id (float32)
+            doc_lengths: Token count per document (int32)
+            indptr: CSR row pointers into doc_ids/tfs (int64, len = n_terms + 1)
+            doc_ids: Posting document ids (int32)
+            tfs: Posting term frequencies (float32)
+            k1: BM25 k1 parameter
+            b: BM25 b parameter
+        """
+        self.k1 = k1
+        self.b = b
+        self._vocabulary = vocabulary
+        self._idf = idf
+        self._doc_lengths = doc_lengths
+        self._indptr = indptr
+        self._doc_ids = doc_ids
+        self._tfs = tfs
+        self._avgdl = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+
+    @property
+    def num_docs(self) -> int:
+        """Number of documents in the index."""
+        return len(self._doc_lengths)
+
+    @property
+    def vocabulary_size(self) -> int:
+        """Number of distinct terms."""
+        return len(self._vocabulary)
+
+    @classmethod
+    def build(cls, texts: Sequence[str], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        """Build the inverted index from document texts.
+
+        Document ids are the positions in ``texts`` (aligned with FAISS ids).
+
+        Args:
+            texts: Document texts
+            k1: BM25 k1 parameter
+            b: BM25 b parameter
+
+        Returns:
+            Built BM25Index
+        """
+        empty = cls(
+            vocabulary={},
+            idf=np.zeros(0, dtype=np.float32),
+            doc_lengths=np.zeros(0, dtype=np.int32),
+            indptr=np.zeros(1, dtype=np.int64),
+            doc_ids=np.zeros(0, dtype=np.int32),
+            tfs=np.zeros(0, dtype=np.float32),
+            k1=k1,
+            b=b,
+        )
+        index = empty.extend(texts)
+
+        logger.info(
+            "Built BM25 index: %d docs, %d terms, %d postings",
+            index.num_docs,
+            index.vocabulary_size,
+            len(index._doc_ids),
+        )
+        return index
+
+    def extend(self, texts: Sequence[str]) -> "BM25Index":
+        """Return a new index with documents appended (ids continue from num_docs).
+
+        Existing postings are not re-tokenized: new postings are merged into
+        the CSR arrays and IDF / average length are recomputed for the corpus.
+
+        Args:
+            texts: Texts of the appended documents
+
+        Returns:
+            New BM25Index covering old and new documents
+        """
+        vocabulary = dict(self._vocabulary)
+        first_doc = self.num_docs
+        doc_lengths = np.zeros(len(texts), dtype=np.int32)
+        new_terms: list[int] = []
+        new_docs: list[int] = []
+        new_tfs: list[int] = []
+
+        for offset, text in enumerate(texts):
+            tokens = tokenize(text)
+            doc_lengths[offset] = len(tokens)
+            counts: dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                new_terms.append(vocabulary.setdefault(token, len(vocabulary)))
+                new_docs.append(first_doc + offset)
+                new_tfs.append(tf)
+
+        # New documents have the highest ids, so a stable sort by term keeps
+        # every posting list sorted by doc id
+        old_terms = np.repeat(np.arange(len(self._indptr) - 1), np.diff(self._indptr))
+        terms = np.concatenate([old_terms, np.asarray(new_terms, dtype=np.int64)])
+        order = np.argsort(terms, kind="stable")
+        doc_ids = np.concatenate([self._doc_ids, np.asarray(new_docs, dtype=np.int32)])[order]
+        tfs = np.concatenate([self._tfs, np.asarray(new_tfs, dtype=np.float32)])[order]
+
+        doc_freq = np.bincount(terms, minlength=len(vocabulary)).astype(np.int64)
+        indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+        np.cumsum(doc_freq, out=indptr[1:])
+
+        all_lengths = np.concatenate([self._doc_lengths, doc_lengths])
+        idf = self._compute_idf(doc_freq, len(all_lengths))
+        return type(self)(vocabulary, idf, all_lengths, indptr, doc_ids, tfs, k1=self.k1, b=self.b)
+
+    @classmethod
+    def _compute_idf(cls, doc_freq: np.ndarray, num_docs: int) -> np.ndarray:
+        """Compute Okapi IDF with rank_bm25's epsilon floor for negative values.
+
+        Args:
+            doc_freq: Number of documents containing each term
+            num_docs: Corpus size
+
+        Returns:
+            IDF per term (float32)
+        """
+        if len(doc_freq) == 0:
+            return np.zeros(0, dtype=np.float32)
+
+        idf = np.log((num_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+        floor = cls.epsilon * float(idf.mean())
+        idf = np.where(idf < 0, floor, idf)
+        return idf.astype(np.float32)
+
+    def get_scores(self, query_text: str, doc_ids: Sequence[int] | np.ndarray) -> np.ndarray:
+        """Score candidate documents against a query.
+
+        Args:
+            query_text: Raw query text (tokenized the same way as documents)
+            doc_ids: Candidate document ids
+
+        Returns:
+            BM25 scores aligned with doc_ids (float32)
+        """
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        scores = np.zeros(len(doc_ids), dtype=np.float32)
+        if len(doc_ids) == 0 or self.num_docs == 0:
+            return scores
+
+        avgdl = self._avgdl or 1.0
+        norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_ids] / avgdl)
+
+        for token in tokenize(query_text):
+            term_id = self._vocabulary.get(token)
+            if term_id is None:
+                continue
+
+            start, end = self._indptr[term_id], self._indptr[term_id + 1]
+            posting_docs = self._doc_ids[start:end]
+
+            # Binary search each candidate in the sorted posting list
+            pos = np.searchsorted(posting_docs, doc_ids)
+            pos = np.minimum(pos, len(posting_docs) - 1)
+            hit = posting_docs[pos] == doc_ids
+            tf = np.where(hit, self._tfs[start + pos], 0.0)
+
+            scores += self._idf[term_id] * (tf * (self.k1 + 1)) / (tf + norm)
+
+        return scores
+
+    def save(self, path: Path) -> None:
+        """Persist index arrays to a .npz file.
+
+        Args:
+            path: Destination file path
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        terms = np.array(sorted(self._vocabulary, key=self._vocabulary.__getitem__), dtype=str)
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                terms=terms,
+                idf=self._idf,
+                doc_lengths=self._doc_lengths,
+                indptr=self._indptr,
+                doc_ids=self._doc_ids,
+                tfs=self._tfs,
+                params=np.array([self.k1, self.b], dtype=np.float64),
+            )
+        logger.info("Saved BM25 index to %s", path)
+
+    @classmethod
+    def load(cls, path: Path) -> "BM25Index":
+        """Load index arrays from a .npz file.
+
+        Args:
+            path: Source file path
+
+        Returns:
+            Loaded BM25Index
+        """
+        with np.load(path, allow_pickle=False) as data:
+            terms = data["terms"]
+            k1, b = data["params"].tolist()
+            index = cls(
+                vocabulary={str(term): i for i, term in enumerate(terms)},
+                idf=data["idf"],
+                doc_lengths=data["doc_lengths"],
+                indptr=data["indptr"],
+                doc_ids=data["doc_ids"],
+                tfs=data["tfs"],
+                k1=k1,
+                b=b,
+            )
+        logger.info("Loaded BM25 index from %s (%d terms)", path, index.vocabulary_size)
+        return index
@@ -0,0 +1,514 @@
+"""
+FILE: chunk_store.py
+STATUS: Active
+RESPONSIBILITY: Memory-mapped columnar storage for document chunks (text, ids, typed metadata)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import json
+import logging
+import os
+import pickle
+import struct
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.models.document import DocumentChunk
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SSCHUNK1"
+FORMAT_VERSION = 1
+# Every array blob starts on a 64-byte boundary so views are aligned
+ALIGNMENT = 64
+
+
+@dataclass
+class MetadataColumn:
+    """One metadata field stored as a typed column.
+
+    Kinds:
+    - int / float / bool: native values in ``values``
+    - str: dictionary-encoded, ``codes`` index into ``categories``
+    - json: any other (mixed-type or nested) values, dictionary-encoded as JSON
+
+    Attributes:
+        name: Metadata field name
+        kind: Column kind (int, float, bool, str, json)
+        present: Whether each chunk has this field
+        values: Native values (int/float/bool kinds)
+        codes: Category codes (str/json kinds, -1 where absent)
+        categories: Decoded category values (str/json kinds)
+    """
+
+    name: str
+    kind: str
+    present: np.ndarray
+    values: np.ndarray | None = None
+    codes: np.ndarray | None = None
+    categories: list[Any] | None = None
+
+    def get(self, row: int) -> Any:
+        """Decode the value at a row (caller checks ``present`` first)."""
+        if self.codes is not None:
+            return self.categories[self.codes[row]]
+        return self.values[row].item()
+
+
+def _encode_strings(values: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Encode strings as a UTF-8 blob plus int64 offsets (len = n + 1)."""
+    encoded = [v.encode("utf-8") for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _decode_strings(offsets: np.ndarray, blob: np.ndarray) -> list[str]:
+    """Decode every string of an offsets/blob pair."""
+    data = blob.tobytes()
+    return [data[offsets[i] : offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+def _take_strings(offsets: np.ndarray, blob: np.ndarray, rows: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Gather a subset of an offsets/blob string array (vectorized)."""
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    positions = np.repeat(starts - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return new_offsets, blob[positions]
+
+
+def _column_kind(values: list[Any]) -> str:
+    """Pick the narrowest column kind that round-trips every value exactly."""
+    types = {type(v) for v in values}
+    if types == {bool}:
+        return "bool"
+    if types == {int}:
+        return "int"
+    if types == {float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "json"
+
+
+def _build_column(name: str, rows: dict[int, Any], num_rows: int) -> MetadataColumn:
+    """Encode one metadata field from its (row -> value) entries."""
+    present = np.zeros(num_rows, dtype=bool)
+    present[list(rows)] = True
+    kind = _column_kind(list(rows.values()))
+
+    if kind in ("str", "json"):
+        codes = np.full(num_rows, -1, dtype=np.int32)
+        keys: dict[str, int] = {}
+        for row, value in rows.items():
+            key = value if kind == "str" else json.dumps(value, sort_keys=True)
+            codes[row] = keys.setdefault(key, len(keys))
+        categories = list(keys) if kind == "str" else [json.loads(k) for k in keys]
+        return MetadataColumn(name, kind, present, codes=codes, categories=categories)
+
+    dtype = {"bool": np.bool_, "int": np.int64, "float": np.float64}[kind]
+    values = np.zeros(num_rows, dtype=dtype)
+    values[list(rows)] = list(rows.values())
+    return MetadataColumn(name, kind, present, values=values)
+
+
+def _concat_columns(
+    name: str,
+    first: MetadataColumn | None,
+    first_rows: int,
+    second: MetadataColumn | None,
+    second_rows: int,
+) -> MetadataColumn:
+    """Concatenate two stores' columns for one field (either may be missing)."""
+    if first is None or second is None or first.kind != second.kind:
+        # Missing on one side or kinds differ: re-encode just this field
+        rows: dict[int, Any] = {}
+        for column, offset in ((first, 0), (second, first_rows)):
+            if column is not None:
+                for row in np.flatnonzero(column.present).tolist():
+                    rows[offset + row] = column.get(row)
+        return _build_column(name, rows, first_rows + second_rows)
+
+    present = np.concatenate([first.present, second.present])
+    if first.codes is None:
+        return MetadataColumn(name, first.kind, present, values=np.concatenate([first.values, second.values]))
+
+    # Merge dictionaries: keep first's codes, remap second's into the union
+    def key(value: Any) -> Any:
+        return value if first.kind == "str" else json.dumps(value, sort_keys=True)
+
+    lookup = {key(c): i for i, c in enumerate(first.categories)}
+    categories = list(first.categories)
+    remap = np.empty(len(second.categories), dtype=np.int32)
+    for i, category in enumerate(second.categories):
+        code = lookup.setdefault(key(category), len(categories))
+        if code == len(categories):
+            categories.append(category)
+        remap[i] = code
+    second_codes = np.where(second.codes >= 0, remap[np.maximum(second.codes, 0)], -1).astype(np.int32)
+    return MetadataColumn(
+        name,
+        first.kind,
+        present,
+        codes=np.concatenate([first.codes, second_codes]),
+        categories=categories,
+    )
+
+
+class ChunkStore:
+    """Columnar document chunk store, memory-mapped when opened from disk.
+
+    File layout (single file): magic, header length, JSON header describing
+    every array (dtype, shape, offset), then the 64-byte aligned array blobs.
+    Chunk text and ids are offset-indexed UTF-8 blobs, metadata fields are
+    typed columns. Opening the file maps it instead of reading it, so startup
+    cost and resident memory don't grow with corpus size; text is decoded
+    only for the chunks actually returned by a search.
+    """
+
+    def __init__(
+        self,
+        text_offsets: np.ndarray,
+        text: np.ndarray,
+        id_offsets: np.ndarray,
+        ids: np.ndarray,
+        columns: list[MetadataColumn],
+    ):
+        """Initialize from encoded arrays (use from_chunks() or open()).
+
+        Args:
+            text_offsets: Text offsets into ``text`` (int64, len = n + 1)
+            text: UTF-8 text blob (uint8)
+            id_offsets: Id offsets into ``ids`` (int64, len = n + 1)
+            ids: UTF-8 chunk id blob (uint8)
+            columns: Metadata columns
+        """
+        self._text_offsets = text_offsets
+        self._text = text
+        self._id_offsets = id_offsets
+        self._ids = ids
+        self._columns = columns
+
+    def __len__(self) -> int:
+        """Number of chunks."""
+        return len(self._text_offsets) - 1
+
+    @property
+    def columns(self) -> list[MetadataColumn]:
+        """Metadata columns."""
+        return self._columns
+
+    @classmethod
+    def from_chunks(cls, chunks: Sequence[DocumentChunk]) -> "ChunkStore":
+        """Encode in-memory chunks into columnar form.
+
+        Args:
+            chunks: Document chunks in index order
+
+        Returns:
+            In-memory ChunkStore
+        """
+        text_offsets, text = _encode_strings([c.text for c in chunks])
+        id_offsets, ids = _encode_strings([c.id for c in chunks])
+
+        field_values: dict[str, dict[int, Any]] = {}
+        for row, chunk in enumerate(chunks):
+            for name, value in chunk.metadata.items():
+                field_values.setdefault(name, {})[row] = value
+
+        columns = [_build_column(name, rows, len(chunks)) for name, rows in field_values.items()]
+        return cls(text_offsets, text, id_offsets, ids, columns)
+
+    def append(self, chunks: Sequence[DocumentChunk]) -> "ChunkStore":
+        """Return a new in-memory store with chunks appended (rows continue from len()).
+
+        Existing rows are copied as arrays, not re-encoded; only metadata
+        fields whose type changes are re-encoded.
+
+        Args:
+            chunks: Chunks to append
+
+        Returns:
+            New ChunkStore
+        """
+        other = ChunkStore.from_chunks(chunks)
+        mine = {c.name: c for c in self._columns}
+        theirs = {c.name: c for c in other._columns}
+        names = list(mine) + [name for name in theirs if name not in mine]
+
+        return ChunkStore(
+            np.concatenate([self._text_offsets, other._text_offsets[1:] + self._text_offsets[-1]]),
+            np.concatenate([self._text, other._text]),
+            np.concatenate([self._id_offsets, other._id_offsets[1:] + self._id_offsets[-1]]),
+            np.concatenate([self._ids, other._ids]),
+            [
+                _concat_columns(name, mine.get(name), len(self), theirs.get(name), len(other))
+                for name in names
+            ],
+        )
+
+    def select(self, rows: np.ndarray) -> "ChunkStore":
+        """Return a new in-memory store with only the given rows (used for compaction).
+
+        Args:
+            rows: Row positions to keep, in the desired order
+
+        Returns:
+            New ChunkStore
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        text_offsets, text = _take_strings(self._text_offsets, self._text, rows)
+        id_offsets, ids = _take_strings(self._id_offsets, self._ids, rows)
+
+        columns = []
+        for column in self._columns:
+            present = column.present[rows]
+            if not present.any():
+                continue
+            columns.append(
+                MetadataColumn(
+                    column.name,
+                    column.kind,
+                    present,
+                    values=None if column.values is None else column.values[rows],
+                    codes=None if column.codes is None else column.codes[rows],
+                    categories=column.categories,
+                )
+            )
+        return ChunkStore(text_offsets, text, id_offsets, ids, columns)
+
+    @classmethod
+    def open(cls, path: Path) -> "ChunkStore":
+        """Memory-map a chunk store file.
+
+        Args:
+            path: Chunk store file
+
+        Returns:
+            ChunkStore backed by the mapped file
+
+        Raises:
+            ValueError: If the file is not a chunk store or has an unsupported version
+        """
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        if buffer[: len(MAGIC)].tobytes() != MAGIC:
+            raise ValueError(f"{path} is not a chunk store file")
+
+        (header_length,) = struct.unpack("<Q", buffer[len(MAGIC) : len(MAGIC) + 8].tobytes())
+        start = len(MAGIC) + 8
+        header = json.loads(buffer[start : start + header_length].tobytes())
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported chunk store version {header['version']}")
+
+        def array(name: str) -> np.ndarray:
+            spec = header["arrays"][name]
+            dtype = np.dtype(spec["dtype"])
+            nbytes = int(np.prod(spec["shape"])) * dtype.itemsize
+            return buffer[spec["offset"] : spec["offset"] + nbytes].view(dtype).reshape(spec["shape"])
+
+        columns = []
+        for i, spec in enumerate(header["columns"]):
+            prefix = f"col{i}"
+            present = array(f"{prefix}.present")
+            if spec["kind"] in ("str", "json"):
+                categories = _decode_strings(
+                    array(f"{prefix}.categories_offsets"), array(f"{prefix}.categories")
+                )
+                if spec["kind"] == "json":
+                    categories = [json.loads(c) for c in categories]
+                columns.append(
+                    MetadataColumn(
+                        spec["name"],
+                        spec["kind"],
+                        present,
+                        codes=array(f"{prefix}.codes"),
+                        categories=categories,
+                    )
+                )
+            else:
+                columns.append(
+                    MetadataColumn(spec["name"], spec["kind"], present, values=array(f"{prefix}.values"))
+                )
+
+        store = cls(
+            array("text_offsets"), array("text"), array("id_offsets"), array("ids"), columns
+        )
+        logger.info("Opened chunk store %s (%d chunks, %d columns)", path, len(store), len(columns))
+        return store
+
+    def save(self, path: Path) -> None:
+        """Write the store to a single file.
+
+        The file is written next to the destination and renamed into place, so
+        readers that still have the previous file mapped are not disturbed.
+
+        Args:
+            path: Destination file
+        """
+        arrays: dict[str, np.ndarray] = {
+            "text_offsets": self._text_offsets,
+            "text": self._text,
+            "id_offsets": self._id_offsets,
+            "ids": self._ids,
+        }
+        column_specs = []
+        for i, column in enumerate(self._columns):
+            prefix = f"col{i}"
+            column_specs.append({"name": column.name, "kind": column.kind})
+            arrays[f"{prefix}.present"] = column.present
+            if column.codes is not None:
+                encoded = column.categories
+                if column.kind == "json":
+                    encoded = [json.dumps(c, sort_keys=True) for c in encoded]
+                offsets, blob = _encode_strings(encoded)
+                arrays[f"{prefix}.codes"] = column.codes
+                arrays[f"{prefix}.categories_offsets"] = offsets
+                arrays[f"{prefix}.categories"] = blob
+            else:
+                arrays[f"{prefix}.values"] = column.values
+
+        # Header size depends on the offsets it contains: lay out the blobs
+        # after a generous upper bound on the header length
+        specs = {
+            name: {"dtype": a.dtype.str, "shape": list(a.shape), "offset": 0}
+            for name, a in arrays.items()
+        }
+        header_bound = len(json.dumps({"version": FORMAT_VERSION, "arrays": specs, "columns": column_specs}))
+        offset = _align(len(MAGIC) + 8 + header_bound + 32 * len(arrays))
+        for name, a in arrays.items():
+            specs[name]["offset"] = offset
+            offset = _align(offset + a.nbytes)
+
+        header = json.dumps(
+            {"version": FORMAT_VERSION, "arrays": specs, "columns": column_specs}
+        ).encode("utf-8")
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for name, a in arrays.items():
+                f.write(b"\0" * (specs[name]["offset"] - f.tell()))
+                f.write(np.ascontiguousarray(a).tobytes())
+        os.replace(tmp_path, path)
+        logger.info("Saved %d chunks to %s", len(self), path)
+
+    @classmethod
+    def migrate_pickle(cls, pickle_path: Path, path: Path) -> "ChunkStore":
+        """One-shot migration of a legacy document_chunks.pkl to a chunk store file.
+
+        Args:
+            pickle_path: Legacy pickle (list of {"id", "text", "metadata"} dicts)
+            path: Destination chunk store file
+
+        Returns:
+            ChunkStore opened from the new file
+        """
+        logger.info("Migrating legacy chunk pickle %s to %s", pickle_path, path)
+        with open(pickle_path, "rb") as f:
+            raw_chunks = pickle.load(f)
+
+        chunks = [
+            DocumentChunk(
+                id=chunk.get("id", f"chunk_{i}"),
+                text=chunk.get("text", ""),
+                metadata=chunk.get("metadata", {}),
+            )
+            for i, chunk in enumerate(raw_chunks)
+        ]
+        cls.from_chunks(chunks).save(path)
+        return cls.open(path)
+
+    def text(self, row: int) -> str:
+        """Decode the text of one chunk."""
+        return self._text[self._text_offsets[row] : self._text_offsets[row + 1]].tobytes().decode("utf-8")
+
+    def chunk_id(self, row: int) -> str:
+        """Decode the id of one chunk."""
+        return self._ids[self._id_offsets[row] : self._id_offsets[row + 1]].tobytes().decode("utf-8")
+
+    def metadata(self, row: int) -> dict[str, Any]:
+        """Rebuild the metadata dict of one chunk from the columns."""
+        return {c.name: c.get(row) for c in self._columns if c.present[row]}
+
+    def get(self, row: int) -> DocumentChunk:
+        """Materialize one chunk.
+
+        Args:
+            row: Chunk position (FAISS id)
+
+        Returns:
+            DocumentChunk
+        """
+        return DocumentChunk(id=self.chunk_id(row), text=self.text(row), metadata=self.metadata(row))
+
+    def iter_ids(self) -> Iterator[str]:
+        """Iterate over all chunk ids in order."""
+        for row in range(len(self)):
+            yield self.chunk_id(row)
+
+    def iter_texts(self) -> Iterator[str]:
+        """Iterate over all chunk texts in order."""
+        for row in range(len(self)):
+            yield self.text(row)
+
+    def iter_metadata(self) -> Iterator[dict[str, Any]]:
+        """Iterate over all chunk metadata dicts in order."""
+        # Decode whole columns once; per-element numpy indexing is far slower
+        decoded = []
+        for column in self._columns:
+            if column.codes is not None:
+                values = [column.categories[code] for code in column.codes.tolist()]
+            else:
+                values = column.values.tolist()
+            decoded.append((column.name, column.present.tolist(), values))
+
+        for row in range(len(self)):
+            yield {name: values[row] for name, present, values in decoded if present[row]}
+
+    def build_metadata_index(self) -> dict[str, dict[Any, np.ndarray]]:
+        """Build metadata inverted index: field -> value -> sorted row ids.
+
+        Grouping runs over the typed columns, so no per-chunk dicts are built.
+        Only scalar values (str, int, float, bool) are indexed; they are the
+        only ones metadata filters can match with equality.
+
+        Returns:
+            Nested dict of int64 id arrays
+        """
+        index: dict[str, dict[Any, np.ndarray]] = {}
+        for column in self._columns:
+            rows = np.flatnonzero(column.present)
+            if len(rows) == 0:
+                # np.split would still yield one (empty) group
+                continue
+            keys = column.codes[rows] if column.codes is not None else column.values[rows]
+            unique, inverse = np.unique(keys, return_inverse=True)
+            order = np.argsort(inverse, kind="stable")
+            groups = np.split(rows[order].astype(np.int64), np.cumsum(np.bincount(inverse))[:-1])
+
+            field_index: dict[Any, np.ndarray] = {}
+            for key, ids in zip(unique.tolist(), groups, strict=True):
+                value = column.categories[key] if column.codes is not None else key
+                if not isinstance(value, (str, int, float, bool)):
+                    continue
+                if value in field_index:
+                    # e.g. 1 and 1.0 in a json column compare equal
+                    ids = np.union1d(field_index[value], ids)
+                field_index[value] = ids
+            index[column.name] = field_index
+        return index
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next ALIGNMENT boundary."""
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,263 @@
+"""
+FILE: embedding_cache.py
+STATUS: Active
+RESPONSIBILITY: Persistent content-addressed embedding cache (SQLite + in-memory LRU)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of max_bytes, so eviction doesn't run on every put
+EVICTION_TARGET = 0.9
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Embedding cache counters (since the cache was opened).
+
+    Attributes:
+        memory_hits: Lookups served by the in-memory LRU
+        disk_hits: Lookups served by SQLite
+        misses: Lookups not in the cache
+        evictions: Entries evicted from disk for size
+    """
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits (memory + disk)."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class EmbeddingCache:
+    """Embeddings keyed by (model, sha256(text)), stored in SQLite with an LRU in front.
+
+    Vectors are stored as raw float32 bytes. The disk cache is bounded by
+    size: when it grows past max_bytes, least recently read entries are
+    evicted. The database runs in WAL mode, so several API workers and the
+    indexing pipeline can share one cache file.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_bytes: int | None = None,
+        memory_items: int | None = None,
+    ):
+        """Open (or create) the cache.
+
+        Args:
+            path: SQLite file (default from settings)
+            max_bytes: Disk size limit for stored vectors (default from settings)
+            memory_items: In-memory LRU capacity (default from settings)
+        """
+        self._path = path or settings.embedding_cache_path
+        self._max_bytes = max_bytes or settings.embedding_cache_max_mb * 2**20
+        self._memory_items = (
+            settings.embedding_cache_memory_items if memory_items is None else memory_items
+        )
+        self._memory: OrderedDict[tuple[str, bytes], np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = EmbeddingCacheStats()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash BLOB NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._size_bytes = self._disk_size()
+
+    @staticmethod
+    def text_hash(text: str) -> bytes:
+        """Content address of a text (sha256 of its UTF-8 bytes)."""
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    @property
+    def size_bytes(self) -> int:
+        """Bytes of vectors stored on disk (as of the last write by this process)."""
+        return self._size_bytes
+
+    def __len__(self) -> int:
+        """Number of entries on disk."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def get_many(self, model: str, texts: Sequence[str]) -> list[np.ndarray | None]:
+        """Look up embeddings for texts.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            Per text, its cached embedding or None on a miss
+        """
+        keys = [(model, self.text_hash(text)) for text in texts]
+        results: list[np.ndarray | None] = [None] * len(keys)
+
+        with self._lock:
+            disk_lookups: dict[bytes, list[int]] = {}
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                    self.stats.memory_hits += 1
+                else:
+                    disk_lookups.setdefault(key[1], []).append(i)
+
+            if disk_lookups:
+                found = self._read_disk(model, list(disk_lookups))
+                for text_hash, positions in disk_lookups.items():
+                    vector = found.get(text_hash)
+                    if vector is None:
+                        self.stats.misses += len(positions)
+                        continue
+                    self._remember((model, text_hash), vector)
+                    self.stats.disk_hits += len(positions)
+                    for i in positions:
+                        results[i] = vector
+
+        return results
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Store embeddings for texts (evicting old entries if over the size limit).
+
+        Args:
+            model: Embedding model name
+            texts: Embedded texts
+            vectors: Embeddings aligned with texts (n_texts x dim)
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors, strict=True):
+                key = (model, self.text_hash(text))
+                self._remember(key, vector.copy())
+                rows.append((model, key[1], vector.tobytes(), now))
+
+            # Replacing an existing entry over-counts; the next eviction re-measures
+            self._size_bytes += sum(len(row[2]) for row in rows)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+            if self._size_bytes > self._max_bytes:
+                self._evict()
+
+    def clear(self) -> None:
+        """Delete all cached embeddings (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._size_bytes = 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _read_disk(self, model: str, text_hashes: list[bytes]) -> dict[bytes, np.ndarray]:
+        """Fetch vectors from SQLite and refresh their last-used time (lock held)."""
+        found: dict[bytes, np.ndarray] = {}
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(text_hashes), 500):
+            chunk = text_hashes[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                [model, *chunk],
+            ).fetchall()
+            for text_hash, blob in rows:
+                found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+        if found:
+            now = time.time()
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                [(now, model, text_hash) for text_hash in found],
+            )
+            self._conn.commit()
+        return found
+
+    def _remember(self, key: tuple[str, bytes], vector: np.ndarray) -> None:
+        """Insert into the in-memory LRU (lock held)."""
+        if self._memory_items == 0:
+            return
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _disk_size(self) -> int:
+        """Bytes of vectors stored on disk."""
+        return self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to EVICTION_TARGET * max_bytes (lock held)."""
+        # Other processes share the file: re-measure before deciding what to drop
+        self._size_bytes = self._disk_size()
+        excess = self._size_bytes - int(self._max_bytes * EVICTION_TARGET)
+        if self._size_bytes <= self._max_bytes or excess <= 0:
+            return
+
+        victims = []
+        freed = 0
+        cursor = self._conn.execute(
+            "SELECT model, text_hash, LENGTH(vector) FROM embeddings ORDER BY last_used"
+        )
+        for model, text_hash, size in cursor:
+            victims.append((model, text_hash))
+            freed += size
+            if freed >= excess:
+                break
+        cursor.close()
+
+        self._conn.executemany("DELETE FROM embeddings WHERE model = ? AND text_hash = ?", victims)
+        self._conn.commit()
+        for key in victims:
+            self._memory.pop(key, None)
+        self._size_bytes -= freed
+        self.stats.evictions += len(victims)
+        logger.info("Embedding cache evicted %d entries (%.1f MB)", len(victims), freed / 2**20)
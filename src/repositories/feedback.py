@@ -2,13 +2,13 @@
 FILE: feedback.py
 STATUS: Active
 RESPONSIBILITY: SQLite feedback repository for chat interaction and feedback persistence
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
 import json
 import logging
-from collections.abc import Generator
+from collections.abc import Generator, Sequence
 from contextlib import contextmanager
 from pathlib import Path
 
@@ -21,6 +21,7 @@ from src.models.feedback import (
     ChatInteractionCreate,
     ChatInteractionDB,
     ChatInteractionResponse,
+    ConversationTurn,
     FeedbackCreate,
     FeedbackDB,
     FeedbackRating,
@@ -87,6 +88,18 @@ class FeedbackRepository:
             created_at=db_feedback.created_at,
         )
 
+    @staticmethod
+    def _to_interaction_db(interaction: ChatInteractionCreate) -> ChatInteractionDB:
+        """Convert a ChatInteractionCreate to a new ChatInteractionDB row."""
+        return ChatInteractionDB(
+            query=interaction.query,
+            response=interaction.response,
+            sources=json.dumps(interaction.sources),
+            processing_time_ms=interaction.processing_time_ms,
+            conversation_id=interaction.conversation_id,
+            turn_number=interaction.turn_number,
+        )
+
     @staticmethod
     def _to_interaction_response(
         db_interaction: ChatInteractionDB,
@@ -116,19 +129,26 @@ class FeedbackRepository:
             Saved interaction with generated ID
         """
         with self.get_session() as session:
-            db_interaction = ChatInteractionDB(
-                query=interaction.query,
-                response=interaction.response,
-                sources=json.dumps(interaction.sources),
-                processing_time_ms=interaction.processing_time_ms,
-                conversation_id=interaction.conversation_id,
-                turn_number=interaction.turn_number,
-            )
+            db_interaction = self._to_interaction_db(interaction)
             session.add(db_interaction)
             session.flush()
 
             return self._to_interaction_response(db_interaction)
 
+    def save_interactions(self, interactions: Sequence[ChatInteractionCreate]) -> int:
+        """Save several chat interactions in one transaction.
+
+        Args:
+            interactions: Chat interaction data
+
+        Returns:
+            Number of interactions saved
+        """
+        with self.get_session() as session:
+            session.add_all([self._to_interaction_db(interaction) for interaction in interactions])
+
+        return len(interactions)
+
     def get_interaction(self, interaction_id: str) -> ChatInteractionResponse | None:
         """Get a chat interaction by ID.
 
@@ -326,3 +346,38 @@ class FeedbackRepository:
                 results.append(self._to_interaction_response(db_int, feedback))
 
             return results
+
+    def get_recent_turns(
+        self, conversation_id: str, before_turn: int, limit: int
+    ) -> list[ConversationTurn]:
+        """Get the last turns of a conversation before a given turn.
+
+        Only turn number, query and response are read (no feedback, no
+        model conversion), and at most `limit` rows, so the cost does not
+        grow with the conversation length.
+
+        Args:
+            conversation_id: Conversation ID
+            before_turn: Only turns numbered below this are returned
+            limit: Maximum number of turns to return
+
+        Returns:
+            Turns ordered by turn_number (oldest first)
+        """
+        with self.get_session() as session:
+            rows = (
+                session.query(
+                    ChatInteractionDB.turn_number,
+                    ChatInteractionDB.query,
+                    ChatInteractionDB.response,
+                )
+                .filter(
+                    ChatInteractionDB.conversation_id == conversation_id,
+                    ChatInteractionDB.turn_number < before_turn,
+                )
+                .order_by(ChatInteractionDB.turn_number.desc(), ChatInteractionDB.created_at.desc())
+                .limit(limit)
+                .all()
+            )
+
+            return [ConversationTurn(*row) for row in reversed(rows)]
@@ -0,0 +1,210 @@
+"""
+FILE: index_snapshots.py
+STATUS: Active
+RESPONSIBILITY: Versioned, atomically published vector index snapshots with a current pointer
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import json
+import logging
+import os
+import shutil
+from dataclasses import asdict, dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.core.config import settings
+from src.core.exceptions import IndexNotFoundError
+from src.repositories.vector_store import VectorStoreRepository
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+CURRENT_NAME = "current"
+STAGING_PREFIX = ".staging-"
+
+
+@dataclass
+class SnapshotManifest:
+    """Description of one published index snapshot.
+
+    Attributes:
+        version: Snapshot version (directory name, sortable by build time)
+        created_at: ISO-8601 UTC publish time
+        index_size: Number of vectors in the index
+        files: File name -> size in bytes
+    """
+
+    version: str
+    created_at: str
+    index_size: int
+    files: dict[str, int] = field(default_factory=dict)
+
+    @classmethod
+    def read(cls, path: Path) -> "SnapshotManifest":
+        """Read a manifest.json file."""
+        return cls(**json.loads(path.read_text(encoding="utf-8")))
+
+
+class IndexSnapshotStore:
+    """Versioned snapshots of the vector index.
+
+    Layout::
+
+        snapshots/
+            20261016T101500Z/      one directory per build
+                manifest.json
+                faiss_index.idx, document_chunks.bin, bm25_index.npz, ...
+            current                text file naming the active version
+
+    A snapshot is written to a staging directory and renamed into place, and
+    the pointer is replaced atomically, so readers only ever see complete
+    snapshots. Snapshot directories are never modified after publishing.
+    """
+
+    def __init__(self, root: Path | None = None, keep: int | None = None):
+        """Initialize the snapshot store.
+
+        Args:
+            root: Snapshots directory (default from settings)
+            keep: Snapshots kept on disk after publishing (default from settings)
+        """
+        self._root = root or settings.vector_snapshots_path
+        self._keep = settings.vector_snapshot_keep if keep is None else keep
+
+    @property
+    def root(self) -> Path:
+        """Snapshots directory."""
+        return self._root
+
+    def path(self, version: str) -> Path:
+        """Directory of a snapshot version."""
+        return self._root / version
+
+    def versions(self) -> list[str]:
+        """List published versions, oldest first."""
+        if not self._root.exists():
+            return []
+        return sorted(
+            p.name for p in self._root.iterdir() if p.is_dir() and (p / MANIFEST_NAME).exists()
+        )
+
+    def current_version(self) -> str | None:
+        """Version named by the current pointer (None if nothing is published)."""
+        pointer = self._root / CURRENT_NAME
+        if not pointer.exists():
+            return None
+        version = pointer.read_text(encoding="utf-8").strip()
+        return version or None
+
+    def manifest(self, version: str) -> SnapshotManifest:
+        """Read a snapshot's manifest.
+
+        Raises:
+            IndexNotFoundError: If the version doesn't exist
+        """
+        path = self.path(version) / MANIFEST_NAME
+        if not path.exists():
+            raise IndexNotFoundError(f"Index snapshot '{version}' not found")
+        return SnapshotManifest.read(path)
+
+    def publish(self, repository: VectorStoreRepository, make_current: bool = True) -> SnapshotManifest:
+        """Save a repository as a new snapshot and (by default) point current at it.
+
+        Args:
+            repository: Built or loaded repository to snapshot
+            make_current: Switch the current pointer to the new snapshot
+
+        Returns:
+            Manifest of the new snapshot
+        """
+        self._root.mkdir(parents=True, exist_ok=True)
+        version = self._new_version()
+        staging = self._root / f"{STAGING_PREFIX}{version}"
+
+        try:
+            repository.save(staging)
+            manifest = SnapshotManifest(
+                version=version,
+                created_at=datetime.now(UTC).isoformat(),
+                index_size=repository.index_size,
+                files={p.name: p.stat().st_size for p in sorted(staging.iterdir())},
+            )
+            (staging / MANIFEST_NAME).write_text(
+                json.dumps(asdict(manifest), indent=2), encoding="utf-8"
+            )
+            os.replace(staging, self.path(version))
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info("Published index snapshot %s (%d vectors)", version, manifest.index_size)
+        if make_current:
+            self.set_current(version)
+        self.prune()
+        return manifest
+
+    def set_current(self, version: str) -> None:
+        """Atomically point current at a published version.
+
+        Raises:
+            IndexNotFoundError: If the version doesn't exist
+        """
+        self.manifest(version)
+        pointer = self._root / CURRENT_NAME
+        tmp_path = pointer.with_name(CURRENT_NAME + ".tmp")
+        tmp_path.write_text(version, encoding="utf-8")
+        os.replace(tmp_path, pointer)
+        logger.info("Current index snapshot is now %s", version)
+
+    def open(self, version: str | None = None, **kwargs: Any) -> VectorStoreRepository:
+        """Load a snapshot into a new repository.
+
+        Args:
+            version: Version to load (default: current)
+            **kwargs: Repository constructor arguments (mmap, nprobe, ...)
+
+        Returns:
+            Loaded repository
+
+        Raises:
+            IndexNotFoundError: If there is no such snapshot or it fails to load
+        """
+        version = version or self.current_version()
+        if version is None:
+            raise IndexNotFoundError("No index snapshot published. Run indexer with --snapshot first.")
+        self.manifest(version)
+
+        repository = VectorStoreRepository.from_directory(self.path(version), **kwargs)
+        if not repository.load():
+            raise IndexNotFoundError(f"Index snapshot '{version}' failed to load")
+        return repository
+
+    def prune(self) -> list[str]:
+        """Delete all but the newest `keep` snapshots (the current one is always kept).
+
+        Returns:
+            Deleted versions
+        """
+        current = self.current_version()
+        versions = self.versions()
+        stale = [v for v in versions[: max(len(versions) - self._keep, 0)] if v != current]
+        for version in stale:
+            try:
+                shutil.rmtree(self.path(version))
+                logger.info("Pruned index snapshot %s", version)
+            except OSError as e:
+                # Still memory-mapped by a process on a platform that forbids unlinking
+                logger.warning("Could not prune index snapshot %s: %s", version, e)
+        return stale
+
+    def _new_version(self) -> str:
+        """Timestamp version, suffixed if another snapshot was published this second."""
+        base = datetime.now(UTC).strftime("%Y%m%dT%H%M%SZ")
+        version, suffix = base, 1
+        while self.path(version).exists():
+            version = f"{base}.{suffix}"
+            suffix += 1
+        return version
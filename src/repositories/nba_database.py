@@ -1,8 +1,8 @@
 """
 FILE: nba_database.py
 STATUS: Active
-RESPONSIBILITY: SQLAlchemy models and repository for NBA statistics database
-LAST MAJOR UPDATE: 2026-02-10
+RESPONSIBILITY: SQLAlchemy models and repository for NBA statistics database (plus derived query tables)
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -17,6 +17,7 @@ from sqlalchemy import (
     Integer,
     String,
     create_engine,
+    text,
 )
 from sqlalchemy.orm import (
     DeclarativeBase,
@@ -29,6 +30,29 @@ from src.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Pre-joined players + teams + player_stats table rebuilt by NBADatabase.build_derived_tables()
+PLAYER_STATS_FULL = "player_stats_full"
+
+# Per-game columns materialized in player_stats_full (column -> season total it divides by gp)
+PER_GAME_STATS = {
+    "ppg": "pts",
+    "rpg": "reb",
+    "apg": "ast",
+    "spg": "stl",
+    "bpg": "blk",
+    "tpg": "tov",
+}
+
+# Columns players are ranked and filtered by: each gets an index (column, gp, name, team_abbr)
+# on player_stats_full, so "top N by column" (optionally with gp >= N) reads the index alone
+RANKED_COLUMNS = (
+    "pts", "reb", "ast", "stl", "blk", "ppg", "rpg", "apg", "spg", "bpg",
+    "fg_pct", "three_pct", "ft_pct", "efg_pct", "ts_pct", "usg_pct", "plus_minus", "net_rtg", "pie", "age",
+)
+
+# Season totals ranked through the players JOIN player_stats form: index (column, player_id)
+JOINED_RANKED_COLUMNS = ("pts", "reb", "ast", "stl", "blk", "fg_pct", "three_pct", "ts_pct")
+
 
 class Base(DeclarativeBase):
     """Base class for all database models."""
@@ -195,9 +219,69 @@ class NBADatabase:
 
     def drop_tables(self) -> None:
         """Drop all database tables."""
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {PLAYER_STATS_FULL}"))
         Base.metadata.drop_all(self.engine)
         logger.info("NBA database tables dropped")
 
+    def build_derived_tables(self) -> dict[str, int]:
+        """Rebuild player_stats_full and the ranking indexes from the base tables.
+
+        player_stats_full holds one row per player with the player, team and
+        all player_stats columns plus per-game averages (PER_GAME_STATS,
+        rounded to 1 decimal like the SQL prompt's per-game rule), so the
+        generated SQL needs no JOIN and no per-row division. Indexes cover
+        the usual ranking and team filters on it, and the season-total
+        rankings of the joined base tables. Run after loading statistics;
+        the table is a snapshot and is not updated by later inserts.
+
+        Returns:
+            Rows in player_stats_full and number of indexes created
+        """
+        stat_columns = [
+            column.name for column in PlayerStatsModel.__table__.columns if column.name not in ("id", "player_id")
+        ]
+        per_game = ",\n".join(
+            f"ROUND(CAST(ps.{total} AS FLOAT) / NULLIF(ps.gp, 0), 1) AS {column}"
+            for column, total in PER_GAME_STATS.items()
+        )
+        indexes = [
+            f"CREATE INDEX ix_{PLAYER_STATS_FULL}_{column} ON {PLAYER_STATS_FULL} ({column}, gp, name, team_abbr)"
+            for column in RANKED_COLUMNS
+        ]
+        indexes += [
+            f"CREATE INDEX ix_{PLAYER_STATS_FULL}_team ON {PLAYER_STATS_FULL} (team_abbr, team_name, pts, reb, ast)",
+            f"CREATE UNIQUE INDEX ix_{PLAYER_STATS_FULL}_player_id ON {PLAYER_STATS_FULL} (player_id)",
+        ]
+        base_indexes = [
+            f"CREATE INDEX IF NOT EXISTS ix_player_stats_{column}_player ON player_stats ({column}, player_id)"
+            for column in JOINED_RANKED_COLUMNS
+        ]
+        base_indexes.append("CREATE INDEX IF NOT EXISTS ix_players_team_abbr ON players (team_abbr)")
+
+        with self.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {PLAYER_STATS_FULL}"))
+            conn.execute(
+                text(
+                    f"""CREATE TABLE {PLAYER_STATS_FULL} AS
+SELECT p.id AS player_id, p.name, p.team_abbr, t.name AS team_name, p.age,
+{", ".join(f"ps.{column}" for column in stat_columns)},
+{per_game}
+FROM players p
+JOIN player_stats ps ON p.id = ps.player_id
+LEFT JOIN teams t ON t.abbreviation = p.team_abbr
+ORDER BY p.id"""
+                )
+            )
+            for statement in indexes + base_indexes:
+                conn.execute(text(statement))
+            rows = conn.execute(text(f"SELECT COUNT(*) FROM {PLAYER_STATS_FULL}")).scalar_one()
+            # Row counts per index let the query planner pick the covering indexes
+            conn.execute(text("ANALYZE"))
+
+        logger.info(f"Built {PLAYER_STATS_FULL} ({rows} rows) and {len(indexes) + len(base_indexes)} indexes")
+        return {PLAYER_STATS_FULL: rows, "indexes": len(indexes) + len(base_indexes)}
+
     def get_session(self) -> Session:
         """Get a new database session.
 
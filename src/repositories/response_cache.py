@@ -0,0 +1,254 @@
+"""
+FILE: response_cache.py
+STATUS: Active
+RESPONSIBILITY: Exact-match chat response cache (in-memory LRU + SQLite shared across workers)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.core.config import settings
+from src.models.chat import ChatResponse
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of max_entries, so eviction doesn't run on every put
+EVICTION_TARGET = 0.9
+
+# Trailing characters that don't change a question ("Who leads?" == "who leads")
+_TRAILING = " ?!.,;:"
+
+
+@dataclass
+class ResponseCacheStats:
+    """Response cache counters (since the cache was opened).
+
+    Attributes:
+        memory_hits: Lookups served by the in-memory LRU
+        disk_hits: Lookups served by SQLite
+        misses: Lookups not in the cache (including stale entries)
+        stale: Entries dropped because the data version changed
+        stores: Responses written
+        evictions: Entries evicted from disk for capacity
+    """
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits (memory + disk)."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class ResponseCache:
+    """ChatResponses keyed by a hash of the normalized query and its context.
+
+    Each entry records the data version (index snapshot + stats database
+    stamps) it was produced from; a lookup under another version deletes
+    the entry and misses, so answers never outlive the data behind them.
+    Responses are stored as JSON in SQLite (WAL mode, shared by all API
+    workers) with an in-memory LRU in front for popular questions. The
+    disk tier is bounded by entry count, evicting least recently read
+    entries first.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        max_entries: int | None = None,
+        memory_items: int | None = None,
+    ):
+        """Open (or create) the cache.
+
+        Args:
+            path: SQLite file (default from settings)
+            max_entries: Disk capacity in responses (default from settings)
+            memory_items: In-memory LRU capacity (default from settings)
+        """
+        self._path = path or settings.response_cache_path
+        self._max_entries = max_entries or settings.response_cache_max_entries
+        self._memory_items = (
+            settings.response_cache_memory_items if memory_items is None else memory_items
+        )
+        self._memory: OrderedDict[str, tuple[str, ChatResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = ResponseCacheStats()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                data_version TEXT NOT NULL,
+                response TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+        self._conn.commit()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Case-fold, collapse whitespace and drop trailing punctuation."""
+        return " ".join(query.casefold().split()).rstrip(_TRAILING)
+
+    @classmethod
+    def key(
+        cls,
+        query: str,
+        query_type: str,
+        k: int,
+        min_score: float | None = None,
+        conversation_history: str = "",
+    ) -> str:
+        """Cache key for a request (sha256 hex).
+
+        Args:
+            query: Effective query (after follow-up rewriting)
+            query_type: Classified route
+            k: Number of chunks retrieved
+            min_score: Minimum similarity score requested
+            conversation_history: Formatted previous turns ("" outside conversations)
+
+        Returns:
+            Key identifying requests that get the same answer
+        """
+        history_hash = hashlib.sha256(conversation_history.encode("utf-8")).hexdigest()
+        parts = (cls.normalize_query(query), query_type, str(k), repr(min_score), history_hash)
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        """Number of entries on disk."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str, data_version: str) -> ChatResponse | None:
+        """Look up a response.
+
+        Args:
+            key: Cache key (see key())
+            data_version: Current data version (entries for other versions are stale)
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        with self._lock:
+            cached = self._memory.get(key)
+            if cached is not None:
+                version, response = cached
+                if version == data_version:
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return response
+
+            row = self._conn.execute(
+                "SELECT data_version, response FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._memory.pop(key, None)
+                self.stats.misses += 1
+                return None
+
+            version, payload = row
+            if version != data_version:
+                self._drop(key)
+                self.stats.stale += 1
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            response = ChatResponse.model_validate_json(payload)
+            self._remember(key, version, response)
+            self.stats.disk_hits += 1
+            return response
+
+    def put(self, key: str, data_version: str, response: ChatResponse) -> None:
+        """Store a response (evicting old entries if over capacity).
+
+        Args:
+            key: Cache key (see key())
+            data_version: Data version the response was produced from
+            response: Response to return for identical requests
+        """
+        payload = response.model_dump_json()
+        with self._lock:
+            self._remember(key, data_version, response)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, data_version, response, last_used) VALUES (?, ?, ?, ?)",
+                (key, data_version, payload, time.time()),
+            )
+            self._conn.commit()
+            self.stats.stores += 1
+            self._evict()
+
+    def clear(self) -> None:
+        """Delete all cached responses (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _drop(self, key: str) -> None:
+        """Delete an entry from both tiers (lock held)."""
+        self._memory.pop(key, None)
+        self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self._conn.commit()
+
+    def _remember(self, key: str, data_version: str, response: ChatResponse) -> None:
+        """Insert into the in-memory LRU (lock held)."""
+        if self._memory_items == 0:
+            return
+        self._memory[key] = (data_version, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to EVICTION_TARGET * max_entries (lock held)."""
+        # Other processes share the file: count rows rather than tracking puts
+        count = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        if count <= self._max_entries:
+            return
+
+        excess = count - int(self._max_entries * EVICTION_TARGET)
+        victims = [
+            key
+            for (key,) in self._conn.execute(
+                "SELECT key FROM responses ORDER BY last_used LIMIT ?", (excess,)
+            ).fetchall()
+        ]
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", [(key,) for key in victims])
+        self._conn.commit()
+        for key in victims:
+            self._memory.pop(key, None)
+        self.stats.evictions += len(victims)
+        logger.info("Response cache evicted %d entries", len(victims))
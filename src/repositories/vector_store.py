@@ -2,25 +2,300 @@
 FILE: vector_store.py
 STATUS: Active
 RESPONSIBILITY: FAISS vector store data access layer for index CRUD operations
-LAST MAJOR UPDATE: 2026-02-10
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import hashlib
 import logging
-import pickle
+import os
+import struct
+from collections.abc import Iterable, Sequence
 from pathlib import Path
 from typing import Any, Protocol
 
 import faiss
 import numpy as np
 
+from src.core import latency
 from src.core.config import settings
 from src.core.exceptions import IndexNotFoundError, SearchError
+from src.core.latency import stage
 from src.core.observability import logfire
 from src.models.document import DocumentChunk
+from src.repositories.bm25_index import BM25Index
+from src.repositories.chunk_store import ChunkStore
 
 logger = logging.getLogger(__name__)
 
+# Supported FAISS index types (see create_faiss_index)
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq", "sq8", "fp16", "pq")
+# Index types whose approximate scores are re-ranked with stored float32 vectors
+RERANK_INDEX_TYPES = ("pq",)
+# Rows per index.add call: PQ encoding allocates n x 256 x pq_m float distance
+# tables per call, which exhausts memory for 100k+ vector batches
+ADD_BLOCK_SIZE = 4096
+
+
+def create_faiss_index(
+    embeddings: np.ndarray,
+    index_type: str = "flat",
+    nlist: int = 256,
+    hnsw_m: int = 32,
+    ef_construction: int = 200,
+    pq_m: int = 64,
+    pq_nbits: int = 8,
+    ids: np.ndarray | None = None,
+) -> faiss.Index:
+    """Create, train and populate an inner-product FAISS index.
+
+    - flat: exact search (IndexFlatIP), cost grows linearly with corpus size
+    - ivf_flat: inverted file over k-means clusters, full vectors per cluster
+    - hnsw: graph-based search, no training needed
+    - ivf_pq: inverted file with product-quantized vectors (smallest memory)
+    - sq8 / fp16: exhaustive scan over 8-bit / half-precision scalar-quantized
+      vectors (4x / 2x smaller than flat, near-exact recall)
+    - pq: exhaustive scan over product-quantized codes (dim * 4 / pq_m times
+      smaller than flat); the repository re-ranks its candidates with float32
+      vectors kept on disk (see rerank_candidates)
+
+    Args:
+        embeddings: L2-normalized float32 embeddings (n_vectors x dim)
+        index_type: One of INDEX_TYPES
+        nlist: Number of IVF clusters (capped to ~n_vectors / 39 for training)
+        hnsw_m: HNSW neighbors per node
+        ef_construction: HNSW candidate list size during construction
+        pq_m: Number of PQ sub-quantizers (must divide dim)
+        pq_nbits: Bits per PQ code
+        ids: Optional int64 labels; wraps the index in an IndexIDMap2 so
+            vectors can later be removed or replaced by label
+
+    Returns:
+        Trained index containing all embeddings
+
+    Raises:
+        ValueError: If index_type is unknown or PQ settings don't fit the data
+    """
+    n_vectors, dimension = embeddings.shape
+    metric = faiss.METRIC_INNER_PRODUCT
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dimension)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m, metric)
+        index.hnsw.efConstruction = ef_construction
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        # k-means wants ~39 training points per centroid
+        nlist = max(1, min(nlist, n_vectors // 39))
+        if index_type == "ivf_flat":
+            factory = f"IVF{nlist},Flat"
+        else:
+            _check_pq_params(n_vectors, dimension, pq_m, pq_nbits)
+            factory = f"IVF{nlist},PQ{pq_m}x{pq_nbits}"
+        index = faiss.index_factory(dimension, factory, metric)
+        if index_type == "ivf_pq":
+            # Polysemous codes are only used for Hamming-filtered search, which we
+            # don't enable, and their training dominates build time
+            faiss.downcast_index(index).do_polysemous_training = False
+        logger.info("Training FAISS %s on %d vectors", factory, n_vectors)
+        index.train(embeddings)
+    elif index_type in ("sq8", "fp16"):
+        qtype = faiss.ScalarQuantizer.QT_8bit if index_type == "sq8" else faiss.ScalarQuantizer.QT_fp16
+        index = faiss.IndexScalarQuantizer(dimension, qtype, metric)
+        # Learns per-dimension value ranges (no-op for fp16)
+        index.train(embeddings)
+    elif index_type == "pq":
+        _check_pq_params(n_vectors, dimension, pq_m, pq_nbits)
+        index = faiss.IndexPQ(dimension, pq_m, pq_nbits, metric)
+        index.do_polysemous_training = False
+        logger.info("Training FAISS PQ%dx%d on %d vectors", pq_m, pq_nbits, n_vectors)
+        index.train(embeddings)
+    else:
+        raise ValueError(f"Unknown index type '{index_type}' (expected one of {INDEX_TYPES})")
+
+    logger.info("Creating FAISS %s index with dimension %d", index_type, dimension)
+    if ids is not None:
+        index = faiss.IndexIDMap2(index)
+    add_vectors(index, embeddings, ids)
+    return index
+
+
+def add_vectors(index: faiss.Index, vectors: np.ndarray, ids: np.ndarray | None = None) -> None:
+    """Add vectors (with optional labels) in ADD_BLOCK_SIZE blocks.
+
+    Args:
+        index: FAISS index (an IndexIDMap2 when ids are given)
+        vectors: float32 vectors (n_vectors x dim)
+        ids: Optional int64 labels aligned with vectors
+    """
+    for start in range(0, len(vectors), ADD_BLOCK_SIZE):
+        block = np.ascontiguousarray(vectors[start : start + ADD_BLOCK_SIZE])
+        if ids is None:
+            index.add(block)
+        else:
+            index.add_with_ids(block, ids[start : start + ADD_BLOCK_SIZE])
+
+
+def _check_pq_params(n_vectors: int, dimension: int, pq_m: int, pq_nbits: int) -> None:
+    """Validate PQ settings against the training data.
+
+    Raises:
+        ValueError: If pq_m doesn't divide dimension or there are too few vectors
+    """
+    if dimension % pq_m != 0:
+        raise ValueError(f"pq_m={pq_m} must divide embedding dimension {dimension}")
+    if n_vectors < 2**pq_nbits:
+        raise ValueError(
+            f"PQ with {pq_nbits} bits needs at least {2**pq_nbits} vectors to train, got {n_vectors}"
+        )
+
+
+def rerank_candidates(
+    queries: np.ndarray,
+    candidate_rows: np.ndarray,
+    vectors: np.ndarray,
+    k: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Re-rank approximate candidates by exact inner product with float32 vectors.
+
+    Only the candidates' rows of vectors are read, so a memory-mapped matrix
+    pages in k_factor * k vectors per query rather than the whole corpus.
+
+    Args:
+        queries: L2-normalized queries (n_queries x dim)
+        candidate_rows: Candidate rows into vectors (n_queries x n_candidates, -1 = none)
+        vectors: L2-normalized float32 vectors (n_rows x dim)
+        k: Candidates to keep per query
+
+    Returns:
+        (scores, rows), each n_queries x k, sorted by descending score;
+        missing candidates have row -1 and score -inf
+    """
+    valid = candidate_rows >= 0
+    candidates = vectors[np.where(valid, candidate_rows, 0)]
+    scores = np.einsum("qcd,qd->qc", candidates, queries)
+    scores = np.where(valid, scores, -np.inf).astype(np.float32)
+
+    order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    rows = np.take_along_axis(np.where(valid, candidate_rows, -1), order, axis=1)
+    return np.take_along_axis(scores, order, axis=1), rows
+
+
+def chunk_key(chunk_id: str) -> int:
+    """Stable FAISS label for a chunk: 63-bit blake2b hash of its id.
+
+    Args:
+        chunk_id: Document chunk id
+
+    Returns:
+        Non-negative int64 label
+    """
+    digest = hashlib.blake2b(chunk_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def chunk_keys(chunk_ids: Iterable[str]) -> np.ndarray:
+    """Vector of chunk_key() labels (int64)."""
+    return np.fromiter((chunk_key(chunk_id) for chunk_id in chunk_ids), dtype=np.int64)
+
+
+def _directory_paths(directory: Path) -> dict[str, Path]:
+    """Repository file paths inside one directory, under their default names."""
+    return {
+        "index_path": directory / settings.faiss_index_path.name,
+        "chunks_path": directory / settings.document_chunks_path.name,
+        "chunk_store_path": directory / settings.chunk_store_path.name,
+        "bm25_path": directory / settings.bm25_index_path.name,
+        "rerank_path": directory / settings.rerank_vectors_path.name,
+    }
+
+
+def _base_index(index: faiss.Index) -> faiss.Index:
+    """Unwrap an IndexIDMap/IndexIDMap2 to the index doing the search."""
+    index = faiss.downcast_index(index)
+    if isinstance(index, faiss.IndexIDMap):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def set_search_params(index: faiss.Index, nprobe: int, ef_search: int) -> None:
+    """Apply query-time recall/latency knobs (no-op for flat indexes).
+
+    Args:
+        index: FAISS index
+        nprobe: IVF clusters scanned per query
+        ef_search: HNSW candidate list size per query
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(nprobe, ivf.nlist)
+
+    hnsw_index = _base_index(index)
+    if isinstance(hnsw_index, faiss.IndexHNSW):
+        hnsw_index.hnsw.efSearch = ef_search
+
+
+def _base_fourcc(path: Path) -> bytes:
+    """Fourcc of the index inside any IndexIDMap/IndexIDMap2 wrappers of an index file.
+
+    An IDMap is written as its fourcc, the common index header, then the
+    wrapped index. The header is d (int32), ntotal and two reserved fields
+    (int64), is_trained (1 byte), metric_type (int32) and, for metrics other
+    than L2/inner product, metric_arg (float32).
+    """
+    with open(path, "rb") as f:
+        fourcc = f.read(4)
+        while fourcc in (b"IxM2", b"IxMp"):
+            f.seek(4 + 8 * 3 + 1, os.SEEK_CUR)
+            metric_type = struct.unpack("<i", f.read(4))[0]
+            if metric_type > 1:
+                f.seek(4, os.SEEK_CUR)
+            fourcc = f.read(4)
+    return fourcc
+
+
+def read_faiss_index(path: Path, mmap: bool = True) -> faiss.Index:
+    """Read a FAISS index, memory-mapping its vectors when requested.
+
+    IVF indexes map their inverted lists (IO_FLAG_MMAP); flat and HNSW indexes
+    map their flat codes (IO_FLAG_MMAP_IFC). Mapped indexes are read-only.
+    FAISS releases without IO_FLAG_MMAP_IFC read flat and HNSW indexes into RAM.
+
+    Args:
+        path: Index file
+        mmap: Map the file instead of reading it into RAM
+
+    Returns:
+        Loaded index
+    """
+    if not mmap:
+        return faiss.read_index(str(path))
+
+    # IVF index fourccs all start with "Iw" (IwFl, IwPQ, ...)
+    if _base_fourcc(path).startswith(b"Iw"):
+        flag = faiss.IO_FLAG_MMAP
+    else:
+        flag = getattr(faiss, "IO_FLAG_MMAP_IFC", None)
+        if flag is None:
+            logger.warning("faiss %s cannot memory-map flat/HNSW indexes; reading into RAM", faiss.__version__)
+            return faiss.read_index(str(path))
+    return faiss.read_index(str(path), flag | faiss.IO_FLAG_READ_ONLY)
+
+
+def write_faiss_index(index: faiss.Index, path: Path) -> None:
+    """Write a FAISS index via a temporary file renamed into place.
+
+    Overwriting the file in place would truncate pages still mapped by a
+    loaded index (possibly the one being written).
+
+    Args:
+        index: FAISS index
+        path: Destination file
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    faiss.write_index(index, str(tmp_path))
+    os.replace(tmp_path, path)
+
 
 class EmbeddingProvider(Protocol):
     """Protocol for embedding providers (dependency injection)."""
@@ -36,26 +311,90 @@ class VectorStoreRepository:
     Handles FAISS index and document chunk storage with proper
     separation from business logic.
 
+    Chunks live in rows (chunk store, BM25, boosts, metadata index are all
+    row-aligned). FAISS labels are chunk_key() hashes of the chunk ids, held
+    in an IndexIDMap2, so chunks can be upserted or deleted without
+    re-embedding the corpus. Deleted and replaced rows are tombstoned until
+    compact() (or save()) rewrites the row-aligned data.
+
     Attributes:
         index: FAISS index for similarity search
-        chunks: List of document chunks with metadata
+        chunks: Columnar chunk store (text materialized per search hit)
     """
 
     def __init__(
         self,
         index_path: Path | None = None,
         chunks_path: Path | None = None,
+        bm25_path: Path | None = None,
+        index_type: str | None = None,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+        chunk_store_path: Path | None = None,
+        mmap: bool | None = None,
+        rerank_path: Path | None = None,
     ):
         """Initialize repository.
 
         Args:
             index_path: Path to FAISS index file (default from settings)
-            chunks_path: Path to chunks pickle file (default from settings)
+            chunks_path: Path to legacy chunks pickle, migrated on load (default from settings)
+            bm25_path: Path to BM25 inverted index (default: next to the FAISS index)
+            index_type: FAISS index type for build_index (default from settings)
+            nprobe: IVF clusters scanned per query (default from settings)
+            ef_search: HNSW candidate list size per query (default from settings)
+            chunk_store_path: Path to columnar chunk store (default: chunks_path with .bin suffix)
+            mmap: Memory-map the FAISS index on load (default from settings)
+            rerank_path: Path to pq re-rank vectors (default: next to the FAISS index)
         """
+        self._index_type = index_type or settings.vector_index_type
+        self._nprobe = nprobe or settings.ivf_nprobe
+        self._ef_search = ef_search or settings.hnsw_ef_search
+        self._mmap = settings.vector_index_mmap if mmap is None else mmap
         self._index_path = index_path or settings.faiss_index_path
         self._chunks_path = chunks_path or settings.document_chunks_path
+        self._chunk_store_path = chunk_store_path or self._chunks_path.with_suffix(
+            settings.chunk_store_path.suffix
+        )
+        self._bm25_path = bm25_path or self._index_path.with_name(settings.bm25_index_path.name)
+        self._rerank_path = rerank_path or self._index_path.with_name(
+            settings.rerank_vectors_path.name
+        )
+        self._rerank_k_factor = settings.rerank_k_factor
+        self._reset()
+
+    @classmethod
+    def from_directory(cls, directory: Path, **kwargs: Any) -> "VectorStoreRepository":
+        """Create a repository whose files live in one directory (e.g. an index snapshot).
+
+        Args:
+            directory: Directory holding the index files under their default names
+            **kwargs: Other constructor arguments (index_type, nprobe, mmap, ...)
+
+        Returns:
+            Repository (not loaded)
+        """
+        return cls(**_directory_paths(directory), **kwargs)
+
+    def _reset(self) -> None:
+        """Drop all in-memory index state."""
         self._index: faiss.Index | None = None
-        self._chunks: list[DocumentChunk] = []
+        self._index_mapped = False
+        self._store = ChunkStore.from_chunks([])
+        self._bm25: BM25Index | None = None
+        self._boosts: np.ndarray = np.zeros(0, dtype=np.float32)
+        self._metadata_index: dict[str, dict[Any, np.ndarray]] = {}
+        # Per row: chunk_key() of the chunk id, FAISS label (the key, or the
+        # row number for legacy indexes without ids), tombstone flag
+        self._row_keys = np.zeros(0, dtype=np.int64)
+        self._row_labels = np.zeros(0, dtype=np.int64)
+        self._tombstones = np.zeros(0, dtype=bool)
+        # Tombstoned vectors still in the index (HNSW can't remove vectors)
+        self._stale_vectors = 0
+        self._live_labels = np.zeros(0, dtype=np.int64)
+        self._live_label_rows = np.zeros(0, dtype=np.int64)
+        # Row-aligned float32 vectors for re-ranking a pq index (None otherwise)
+        self._rerank_vectors: np.ndarray | None = None
         self._is_loaded = False
 
     @property
@@ -65,65 +404,101 @@ class VectorStoreRepository:
 
     @property
     def index_size(self) -> int:
-        """Get number of vectors in index."""
+        """Get number of (live) vectors in index."""
         if self._index is None:
             return 0
-        return self._index.ntotal
+        return self._index.ntotal - self._stale_vectors
 
     @property
     def chunks(self) -> list[DocumentChunk]:
-        """Get document chunks (read-only copy)."""
-        return self._chunks.copy()
+        """Get all live document chunks (materialized copy; search() only decodes hits)."""
+        return [self._store.get(int(i)) for i in np.flatnonzero(~self._tombstones)]
 
     def load(self) -> bool:
         """Load index and chunks from disk.
 
+        The FAISS index and the chunk store are memory-mapped, so this does no
+        per-chunk work beyond the boost array. A legacy chunks pickle is
+        migrated to the chunk store once.
+
         Returns:
             True if loaded successfully, False otherwise
         """
-        if not self._index_path.exists() or not self._chunks_path.exists():
+        has_chunks = self._chunk_store_path.exists() or self._chunks_path.exists()
+        if not self._index_path.exists() or not has_chunks:
             logger.warning(
                 "Index files not found: %s, %s",
                 self._index_path,
-                self._chunks_path,
+                self._chunk_store_path,
             )
             return False
 
         try:
-            logger.info("Loading FAISS index from %s", self._index_path)
-            self._index = faiss.read_index(str(self._index_path))
-
-            logger.info("Loading chunks from %s", self._chunks_path)
-            with open(self._chunks_path, "rb") as f:
-                raw_chunks = pickle.load(f)
-
-            # Convert to DocumentChunk models
-            self._chunks = [
-                DocumentChunk(
-                    id=chunk.get("id", f"chunk_{i}"),
-                    text=chunk.get("text", ""),
-                    metadata=chunk.get("metadata", {}),
+            logger.info("Loading FAISS index from %s (mmap=%s)", self._index_path, self._mmap)
+            self._index = read_faiss_index(self._index_path, self._mmap)
+            set_search_params(self._index, self._nprobe, self._ef_search)
+
+            if self._chunk_store_path.exists():
+                self._store = ChunkStore.open(self._chunk_store_path)
+            else:
+                self._store = ChunkStore.migrate_pickle(self._chunks_path, self._chunk_store_path)
+
+            # BM25 index is derived data: rebuild from chunks if missing or stale
+            self._bm25 = None
+            if self._bm25_path.exists():
+                self._bm25 = BM25Index.load(self._bm25_path)
+                if self._bm25.num_docs != len(self._store):
+                    logger.warning("BM25 index size mismatch, rebuilding from chunks")
+                    self._bm25 = None
+            if self._bm25 is None:
+                self._bm25 = BM25Index.build(list(self._store.iter_texts()))
+
+            if self._index.ntotal != len(self._store):
+                raise ValueError(
+                    f"Index has {self._index.ntotal} vectors but chunk store has {len(self._store)} chunks"
                 )
-                for i, chunk in enumerate(raw_chunks)
-            ]
 
+            self._rerank_vectors = None
+            if isinstance(_base_index(self._index), faiss.IndexPQ):
+                if not self._rerank_path.exists():
+                    raise ValueError(f"pq index needs re-rank vectors at {self._rerank_path}")
+                self._rerank_vectors = np.load(self._rerank_path, mmap_mode="r" if self._mmap else None)
+                if len(self._rerank_vectors) != len(self._store):
+                    raise ValueError(
+                        f"Re-rank vectors have {len(self._rerank_vectors)} rows but chunk store has "
+                        f"{len(self._store)} chunks"
+                    )
+
+            self._boosts = self._compute_boost_array(self._store.iter_metadata(), len(self._store))
+            self._index_mapped = self._mmap
+            self._row_keys = chunk_keys(self._store.iter_ids())
+            if isinstance(self._index, faiss.IndexIDMap2):
+                self._row_labels = self._row_keys.copy()
+            else:
+                # Legacy index: labels are row numbers until the first update
+                self._row_labels = np.arange(len(self._store), dtype=np.int64)
+            self._tombstones = np.zeros(len(self._store), dtype=bool)
+            self._stale_vectors = 0
+            self._refresh_lookups()
             self._is_loaded = True
             logger.info(
                 "Loaded index with %d vectors and %d chunks",
                 self._index.ntotal,
-                len(self._chunks),
+                len(self._store),
             )
             return True
 
         except Exception as e:
             logger.error("Failed to load index: %s", e)
-            self._index = None
-            self._chunks = []
-            self._is_loaded = False
+            self._reset()
             return False
 
-    def save(self) -> None:
-        """Save index and chunks to disk.
+    def save(self, directory: Path | None = None) -> None:
+        """Save index and chunks to disk (compacting tombstoned rows first).
+
+        Args:
+            directory: Write the files under their default names into this
+                directory instead of the configured paths (see from_directory)
 
         Raises:
             ValueError: If no index to save
@@ -131,18 +506,34 @@ class VectorStoreRepository:
         if self._index is None:
             raise ValueError("No index to save")
 
+        self.compact()
+
+        if directory is None:
+            index_path, store_path = self._index_path, self._chunk_store_path
+            bm25_path, rerank_path = self._bm25_path, self._rerank_path
+        else:
+            paths = _directory_paths(directory)
+            index_path, store_path = paths["index_path"], paths["chunk_store_path"]
+            bm25_path, rerank_path = paths["bm25_path"], paths["rerank_path"]
+
         # Ensure directory exists
-        self._index_path.parent.mkdir(parents=True, exist_ok=True)
-        self._chunks_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+
+        logger.info("Saving FAISS index to %s", index_path)
+        write_faiss_index(self._index, index_path)
 
-        logger.info("Saving FAISS index to %s", self._index_path)
-        faiss.write_index(self._index, str(self._index_path))
+        self._store.save(store_path)
 
-        logger.info("Saving %d chunks to %s", len(self._chunks), self._chunks_path)
-        # Convert back to dict format for compatibility
-        raw_chunks = [{"id": c.id, "text": c.text, "metadata": c.metadata} for c in self._chunks]
-        with open(self._chunks_path, "wb") as f:
-            pickle.dump(raw_chunks, f)
+        if self._bm25 is not None:
+            self._bm25.save(bm25_path)
+
+        if self._rerank_vectors is not None:
+            tmp_path = rerank_path.with_name(rerank_path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                np.save(f, np.ascontiguousarray(self._rerank_vectors, dtype=np.float32))
+            os.replace(tmp_path, rerank_path)
+        elif rerank_path.exists():
+            rerank_path.unlink()
 
         logger.info("Index and chunks saved successfully")
 
@@ -150,34 +541,286 @@ class VectorStoreRepository:
         self,
         chunks: list[DocumentChunk],
         embeddings: np.ndarray,
+        index_type: str | None = None,
     ) -> None:
         """Build FAISS index from chunks and embeddings.
 
         Args:
             chunks: Document chunks to index
             embeddings: Embeddings array (n_chunks x embedding_dim)
+            index_type: One of INDEX_TYPES, e.g. a quantized "sq8", "fp16" or
+                "pq" to cut index memory (default: the repository's index type)
 
         Raises:
-            ValueError: If chunks and embeddings don't match
+            ValueError: If chunks and embeddings don't match, or the configured
+                index type can't be built from them
         """
         if len(chunks) != embeddings.shape[0]:
             raise ValueError(f"Mismatch: {len(chunks)} chunks but {embeddings.shape[0]} embeddings")
+        keys = self._unique_keys(chunks)
 
         # Normalize for cosine similarity
         embeddings = embeddings.astype("float32")
         faiss.normalize_L2(embeddings)
 
-        # Create index
-        dimension = embeddings.shape[1]
-        logger.info("Creating FAISS IndexFlatIP with dimension %d", dimension)
-        self._index = faiss.IndexFlatIP(dimension)
-        self._index.add(embeddings)
-
-        self._chunks = chunks
+        # Create index (build parameters from settings)
+        index_type = index_type or self._index_type
+        self._index = create_faiss_index(
+            embeddings,
+            index_type=index_type,
+            nlist=settings.ivf_nlist,
+            hnsw_m=settings.hnsw_m,
+            ef_construction=settings.hnsw_ef_construction,
+            pq_m=settings.pq_m,
+            pq_nbits=settings.pq_nbits,
+            ids=keys,
+        )
+        set_search_params(self._index, self._nprobe, self._ef_search)
+        self._index_mapped = False
+
+        self._store = ChunkStore.from_chunks(chunks)
+        self._bm25 = BM25Index.build([c.text for c in chunks])
+        self._boosts = self._compute_boost_array((c.metadata for c in chunks), len(chunks))
+        self._row_keys = keys
+        self._row_labels = keys.copy()
+        self._tombstones = np.zeros(len(chunks), dtype=bool)
+        self._stale_vectors = 0
+        self._rerank_vectors = embeddings if index_type in RERANK_INDEX_TYPES else None
+        self._refresh_lookups()
         self._is_loaded = True
 
         logger.info("Built index with %d vectors", self._index.ntotal)
 
+    def upsert(self, chunks: list[DocumentChunk], embeddings: np.ndarray) -> None:
+        """Add new chunks or replace existing ones (matched by chunk id).
+
+        Only the given chunks need embeddings; the rest of the corpus is left
+        as is. Replaced rows are tombstoned until compact(). On an empty
+        repository this is the same as build_index().
+
+        Args:
+            chunks: Chunks to add or replace
+            embeddings: Embeddings array (n_chunks x embedding_dim)
+
+        Raises:
+            ValueError: If chunks and embeddings don't match, or chunk ids repeat
+        """
+        if len(chunks) != embeddings.shape[0]:
+            raise ValueError(f"Mismatch: {len(chunks)} chunks but {embeddings.shape[0]} embeddings")
+        if not chunks:
+            return
+        if not self.is_loaded:
+            self.build_index(chunks, embeddings)
+            return
+
+        keys = self._unique_keys(chunks)
+        embeddings = embeddings.astype("float32")
+        faiss.normalize_L2(embeddings)
+        self._ensure_mutable_index()
+
+        replaced_rows = self._labels_to_rows(keys)
+        replaced = replaced_rows >= 0
+        needs_rebuild = False
+        if replaced.any():
+            self._tombstones[replaced_rows[replaced]] = True
+            needs_rebuild = not self._remove_vectors(keys[replaced])
+        if self._stale_vectors and np.isin(keys, self._row_labels[self._tombstones]).any():
+            # Deleted ids whose vectors couldn't be removed (HNSW) are coming back
+            needs_rebuild = True
+        if needs_rebuild:
+            # The same labels are re-added below, so old vectors can't linger
+            self._rebuild_index(np.flatnonzero(~self._tombstones))
+
+        add_vectors(self._index, embeddings, keys)
+        self._store = self._store.append(chunks)
+        self._bm25 = self._bm25.extend([c.text for c in chunks])
+        self._boosts = np.concatenate(
+            [self._boosts, self._compute_boost_array((c.metadata for c in chunks), len(chunks))]
+        )
+        self._row_keys = np.concatenate([self._row_keys, keys])
+        self._row_labels = np.concatenate([self._row_labels, keys])
+        self._tombstones = np.concatenate([self._tombstones, np.zeros(len(chunks), dtype=bool)])
+        if self._rerank_vectors is not None:
+            self._rerank_vectors = np.concatenate([self._rerank_vectors, embeddings])
+        self._refresh_lookups()
+
+        logger.info("Upserted %d chunks (%d replaced)", len(chunks), int(replaced.sum()))
+
+    def delete(self, chunk_ids: Sequence[str]) -> int:
+        """Delete chunks by id (tombstoned until compact()).
+
+        Args:
+            chunk_ids: Ids of chunks to delete (unknown ids are ignored)
+
+        Returns:
+            Number of chunks deleted
+
+        Raises:
+            IndexNotFoundError: If index not loaded
+        """
+        if not self.is_loaded:
+            raise IndexNotFoundError()
+
+        self._ensure_mutable_index()
+        keys = np.unique(chunk_keys(chunk_ids))
+        rows = self._labels_to_rows(keys)
+        found = rows >= 0
+        if not found.any():
+            return 0
+
+        self._tombstones[rows[found]] = True
+        if not self._remove_vectors(keys[found]):
+            self._stale_vectors += int(found.sum())
+        self._refresh_lookups()
+
+        logger.info("Deleted %d chunks", int(found.sum()))
+        return int(found.sum())
+
+    def compact(self) -> None:
+        """Physically drop tombstoned rows and stale vectors.
+
+        Rewrites the row-aligned data (chunk store, BM25, boosts). FAISS
+        labels are chunk id hashes, so the index itself only needs rebuilding
+        when it still holds stale vectors (HNSW).
+        """
+        if not self._tombstones.any() and not self._stale_vectors:
+            return
+
+        live_rows = np.flatnonzero(~self._tombstones)
+        if self._stale_vectors:
+            self._rebuild_index(live_rows)
+
+        self._store = self._store.select(live_rows)
+        self._bm25 = BM25Index.build(list(self._store.iter_texts()), k1=self._bm25.k1, b=self._bm25.b)
+        self._boosts = self._boosts[live_rows]
+        self._row_keys = self._row_keys[live_rows]
+        self._row_labels = self._row_labels[live_rows]
+        if self._rerank_vectors is not None:
+            self._rerank_vectors = self._rerank_vectors[live_rows]
+        self._tombstones = np.zeros(len(live_rows), dtype=bool)
+        self._refresh_lookups()
+
+        logger.info("Compacted index to %d chunks", len(live_rows))
+
+    @staticmethod
+    def _unique_keys(chunks: list[DocumentChunk]) -> np.ndarray:
+        """Compute chunk_key() labels, rejecting repeated chunk ids.
+
+        Args:
+            chunks: Document chunks
+
+        Returns:
+            int64 labels aligned with chunks
+
+        Raises:
+            ValueError: If a chunk id appears more than once
+        """
+        keys = chunk_keys(c.id for c in chunks)
+        if len(np.unique(keys)) != len(keys):
+            raise ValueError("Duplicate chunk ids: ids must be unique to be used as index labels")
+        return keys
+
+    def _refresh_lookups(self) -> None:
+        """Rebuild label -> row lookup and metadata index over live rows."""
+        live_rows = np.flatnonzero(~self._tombstones)
+        labels = self._row_labels[live_rows]
+        order = np.argsort(labels, kind="stable")
+        self._live_labels = labels[order]
+        self._live_label_rows = live_rows[order]
+
+        metadata_index = self._store.build_metadata_index()
+        if self._tombstones.any():
+            metadata_index = {
+                key: {
+                    value: ids[~self._tombstones[ids]]
+                    for value, ids in values.items()
+                    if not self._tombstones[ids].all()
+                }
+                for key, values in metadata_index.items()
+            }
+        self._metadata_index = metadata_index
+
+    def _labels_to_rows(self, labels: np.ndarray) -> np.ndarray:
+        """Map FAISS labels to live rows (-1 for padding, deleted or unknown labels).
+
+        Args:
+            labels: FAISS labels (any shape)
+
+        Returns:
+            int64 rows with the same shape
+        """
+        labels = np.asarray(labels, dtype=np.int64)
+        if len(self._live_labels) == 0:
+            return np.full(labels.shape, -1, dtype=np.int64)
+
+        pos = np.minimum(np.searchsorted(self._live_labels, labels), len(self._live_labels) - 1)
+        hit = self._live_labels[pos] == labels
+        return np.where(hit, self._live_label_rows[pos], -1)
+
+    def _ensure_mutable_index(self) -> None:
+        """Prepare the loaded index for in-place updates.
+
+        A memory-mapped index is copied into RAM (mapped buffers can't grow).
+        A legacy index without ids (labels = row numbers) is rebuilt as an
+        IndexIDMap2 keyed by chunk id hash from its own stored vectors.
+        """
+        if self._index_mapped:
+            self._index = faiss.deserialize_index(faiss.serialize_index(self._index))
+            set_search_params(self._index, self._nprobe, self._ef_search)
+            self._index_mapped = False
+
+        if not isinstance(self._index, faiss.IndexIDMap2):
+            logger.info("Converting legacy index to IndexIDMap2 keyed by chunk id")
+            if len(np.unique(self._row_keys)) != len(self._row_keys):
+                raise ValueError("Duplicate chunk ids: ids must be unique to be used as index labels")
+            self._rebuild_index(np.flatnonzero(~self._tombstones))
+
+    def _rebuild_index(self, rows: np.ndarray) -> None:
+        """Rebuild the FAISS index with only the given rows' vectors, keyed by chunk id hash.
+
+        Vectors come from the re-rank vectors when present, otherwise they are
+        reconstructed from the index itself (approximately for IVF-PQ), so
+        nothing is re-embedded. Training (IVF centroids, PQ codebooks) is kept.
+
+        Args:
+            rows: Rows whose vectors to keep
+        """
+        base = _base_index(self._index)
+        ivf = faiss.try_extract_index_ivf(base)
+        if ivf is not None:
+            ivf.make_direct_map()
+
+        if self._rerank_vectors is not None:
+            vectors = self._rerank_vectors[rows]
+        else:
+            vectors = self._index.reconstruct_batch(self._row_labels[rows])
+
+        empty = faiss.clone_index(base)
+        empty.reset()
+        index = faiss.IndexIDMap2(empty)
+        add_vectors(index, vectors, self._row_keys[rows])
+        set_search_params(index, self._nprobe, self._ef_search)
+
+        self._index = index
+        self._row_labels = self._row_keys.copy()
+        self._stale_vectors = 0
+        self._refresh_lookups()
+
+    def _remove_vectors(self, labels: np.ndarray) -> bool:
+        """Remove vectors from the index by label.
+
+        Args:
+            labels: FAISS labels to remove
+
+        Returns:
+            False if the index type can't remove vectors (HNSW)
+        """
+        try:
+            self._index.remove_ids(faiss.IDSelectorBatch(labels))
+            return True
+        except RuntimeError:
+            return False
+
     @staticmethod
     def _compute_metadata_boost(chunk: DocumentChunk) -> float:
         """Compute additive score boost from Reddit metadata.
@@ -255,6 +898,215 @@ class VectorStoreRepository:
             return 0.0
         return float(quality_score) * 5.0
 
+    @classmethod
+    def _compute_boost_array(cls, metadata: Iterable[dict[str, Any]], count: int) -> np.ndarray:
+        """Precompute combined metadata + quality boost per chunk, aligned with FAISS ids.
+
+        Both boosts always carry the same weight in the composite score, so a
+        single vector is enough for query-time rescoring. Only metadata is
+        needed, so chunk text is never decoded for this.
+
+        Args:
+            metadata: Chunk metadata dicts in index order
+            count: Number of chunks
+
+        Returns:
+            float32 array of boosts (0.0 to 10.0), one per chunk
+        """
+        boosts = np.zeros(count, dtype=np.float32)
+        for i, meta in enumerate(metadata):
+            # Boost helpers only read .metadata; skip validation of the placeholder text
+            chunk = DocumentChunk.model_construct(id="", text="", metadata=meta)
+            boosts[i] = cls._compute_metadata_boost(chunk) + cls._compute_quality_boost(chunk)
+        return boosts
+
+    def _resolve_metadata_filters(self, metadata_filters: dict[str, Any]) -> np.ndarray:
+        """Resolve equality filters to the ids matching all of them.
+
+        Args:
+            metadata_filters: Field -> required value
+
+        Returns:
+            Sorted int64 array of matching live rows (empty if none match)
+        """
+        matched: np.ndarray | None = None
+        for key, value in metadata_filters.items():
+            try:
+                ids = self._metadata_index.get(key, {}).get(value)
+            except TypeError:  # Unhashable filter value can never match a scalar
+                ids = None
+            if ids is None:
+                return np.zeros(0, dtype=np.int64)
+            matched = ids if matched is None else np.intersect1d(matched, ids, assume_unique=True)
+            if len(matched) == 0:
+                break
+        return matched if matched is not None else np.flatnonzero(~self._tombstones)
+
+    def _search_params(self, selector: faiss.IDSelector) -> faiss.SearchParameters:
+        """Build per-query search parameters carrying an id selector.
+
+        IVF and HNSW indexes require their own parameter types, which also
+        override the index-level nprobe/efSearch, so those are carried over.
+
+        Args:
+            selector: FAISS id selector
+
+        Returns:
+            Search parameters matching the index type
+        """
+        ivf = faiss.try_extract_index_ivf(self._index)
+        if ivf is not None:
+            return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+
+        index = _base_index(self._index)
+        if isinstance(index, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+
+        return faiss.SearchParameters(sel=selector)
+
+    def _rescore(
+        self,
+        candidate_ids: np.ndarray,
+        cosine_scores: np.ndarray,
+        query_text: str | None = None,
+    ) -> np.ndarray:
+        """Compute final scores for one query's FAISS candidates (see _rescore_batch).
+
+        Args:
+            candidate_ids: FAISS ids of the candidates
+            cosine_scores: Cosine similarity per candidate (0-100)
+            query_text: Optional query text for BM25
+
+        Returns:
+            Final scores per candidate, capped at 100
+        """
+        candidate_ids = np.asarray(candidate_ids, dtype=np.int64)
+        return self._rescore_batch(
+            candidate_ids[np.newaxis],
+            np.asarray(cosine_scores, dtype=np.float64)[np.newaxis],
+            np.ones((1, len(candidate_ids)), dtype=bool),
+            [query_text],
+        )[0]
+
+    def _rescore_batch(
+        self,
+        candidate_ids: np.ndarray,
+        cosine_scores: np.ndarray,
+        valid: np.ndarray,
+        query_texts: Sequence[str | None],
+    ) -> np.ndarray:
+        """Compute final scores for a (n_queries x n_candidates) candidate matrix.
+
+        With query_text: (cosine*0.70) + (bm25*0.15) + (metadata*0.075) + (quality*0.075)
+        Without (or if BM25 fails): cosine + metadata + quality
+
+        Boosts and the composite score are computed over the whole matrix at
+        once; BM25 is scored per query (each query has its own terms) and
+        normalized to 0-100 by that query's best candidate.
+
+        Args:
+            candidate_ids: FAISS ids (any in-range value where not valid)
+            cosine_scores: Cosine similarity per candidate (0-100)
+            valid: Mask of real candidates (FAISS pads with -1)
+            query_texts: Query text per row (None disables BM25 for that row)
+
+        Returns:
+            Final scores, capped at 100 (undefined where not valid)
+        """
+        boosts = self._boosts[candidate_ids]
+        bm25_scores = np.zeros(candidate_ids.shape, dtype=np.float64)
+        use_bm25 = np.zeros(len(candidate_ids), dtype=bool)
+
+        if self._bm25 is not None:
+            for row, query_text in enumerate(query_texts):
+                if not query_text or not valid[row].any():
+                    continue
+                try:
+                    row_ids = candidate_ids[row][valid[row]]
+                    scores = self._bm25.get_scores(query_text, row_ids)
+
+                    # Normalize BM25 to 0-100
+                    bm25_max = scores.max()
+                    if bm25_max > 0:
+                        scores = (scores / bm25_max) * 100
+                    bm25_scores[row][valid[row]] = scores
+                    use_bm25[row] = True
+                except Exception as e:
+                    # BM25 calculation failed, fall back to cosine + metadata + quality
+                    logger.warning(f"BM25 calculation failed ({e}), using cosine + metadata + quality only")
+
+        # Phase 18: Reweighted to prioritize semantic similarity (2026-02-13)
+        hybrid = cosine_scores * 0.70 + bm25_scores * 0.15 + boosts * 0.075
+        return np.minimum(np.where(use_bm25[:, np.newaxis], hybrid, cosine_scores + boosts), 100.0)
+
+    def _search_index(
+        self,
+        queries: np.ndarray,
+        search_k: int,
+        params: faiss.SearchParameters | None = None,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Run the FAISS search, re-ranking pq candidates with float32 vectors.
+
+        Args:
+            queries: L2-normalized queries (n_queries x dim)
+            search_k: Candidates per query
+            params: Optional FAISS search parameters (not used for pq)
+
+        Returns:
+            (scores, labels), each n_queries x search_k
+        """
+        if self._rerank_vectors is None:
+            return self._index.search(queries, search_k, params=params)
+
+        _, labels = self._index.search(queries, search_k * self._rerank_k_factor)
+        scores, rows = rerank_candidates(queries, self._labels_to_rows(labels), self._rerank_vectors, search_k)
+        return scores, np.where(rows >= 0, self._row_labels[rows], -1)
+
+    def _rank_candidates(
+        self,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        query_texts: Sequence[str | None],
+        k: int,
+        min_score: float | None,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """Rescore raw FAISS results and materialize the top-k chunks per query.
+
+        Args:
+            indices: FAISS labels (n_queries x search_k, -1 padded)
+            scores: Inner-product scores (n_queries x search_k)
+            query_texts: Query text per row for BM25
+            k: Results per query
+            min_score: Minimum cosine similarity (0-1)
+
+        Returns:
+            Per query, (chunk, score) tuples sorted by score descending
+        """
+        candidate_ids = self._labels_to_rows(indices)
+        cosine_scores = np.asarray(scores, dtype=np.float64) * 100  # percentage (0-100)
+
+        # Drop invalid ids (-1 padding, deleted chunks) and apply minimum score filter
+        valid = candidate_ids >= 0
+        if min_score is not None:
+            valid &= cosine_scores >= min_score * 100
+        candidate_ids = np.where(valid, candidate_ids, 0)
+
+        # Phase 13: 4-Signal Hybrid Scoring (Cosine + BM25 + Metadata + Quality)
+        final_scores = self._rescore_batch(candidate_ids, cosine_scores, valid, query_texts)
+        final_scores = np.where(valid, final_scores, -np.inf)
+
+        # Sort by final score descending (stable) and limit to k; only the
+        # returned hits are decoded from the chunk store
+        order = np.argsort(-final_scores, axis=1, kind="stable")[:, :k]
+        return [
+            [
+                (self._store.get(int(candidate_ids[row, col])), float(final_scores[row, col]))
+                for col in cols
+                if valid[row, col]
+            ]
+            for row, cols in enumerate(order)
+        ]
+
     @logfire.instrument("VectorStoreRepository.search {k=}")
     def search(
         self,
@@ -271,6 +1123,11 @@ class VectorStoreRepository:
         - BM25 (35%): Term-based relevance (requires query_text)
         - Metadata boost (15%): Authority signals (upvotes, NBA official)
 
+        Phase 18 reweighted this to 4 signals (cosine 70%, BM25 15%, metadata
+        7.5%, quality 7.5%). BM25 is scored against the precomputed corpus-wide
+        inverted index and boosts come from a precomputed per-chunk array, so
+        rescoring is a single vectorized pass over the candidate ids.
+
         Args:
             query_embedding: Query embedding vector (1 x dim)
             k: Number of results to return
@@ -295,156 +1152,97 @@ class VectorStoreRepository:
                 query_embedding = query_embedding.reshape(1, -1)
             faiss.normalize_L2(query_embedding)
 
-            # If metadata filters provided, pre-filter chunks
+            # ALWAYS retrieve more candidates to allow metadata boost to work
+            # (plus any deleted vectors still in the index, which are dropped)
+            search_k = max(k * 3, 15) + self._stale_vectors
+            search_params = None
+
+            # If metadata filters provided, restrict the FAISS scan to matching ids
             if metadata_filters:
-                filtered_indices = []
-                for i, chunk in enumerate(self._chunks):
-                    # Check if chunk metadata matches all filters
-                    matches = all(
-                        chunk.metadata.get(key) == value
-                        for key, value in metadata_filters.items()
-                    )
-                    if matches:
-                        filtered_indices.append(i)
+                filtered_ids = self._resolve_metadata_filters(metadata_filters)
 
-                if not filtered_indices:
+                if len(filtered_ids) == 0:
                     # No chunks match filters, fall back to unfiltered search
                     logger.warning(
                         f"No chunks matched metadata filters {metadata_filters}, using all chunks"
                     )
-                    filtered_indices = list(range(len(self._chunks)))
+                elif self._rerank_vectors is not None:
+                    # IndexPQ can't take a selector: score the filtered rows exactly
+                    search_k = min(search_k, len(filtered_ids))
+                    scores, rows = rerank_candidates(
+                        query_embedding, filtered_ids[np.newaxis, :], self._rerank_vectors, search_k
+                    )
+                    indices = self._row_labels[rows]
+                    return self._rank_candidates(indices, scores, [query_text], k, min_score)[0]
+                else:
+                    search_params = self._search_params(
+                        faiss.IDSelectorBatch(self._row_labels[filtered_ids])
+                    )
+                    search_k = min(search_k, len(filtered_ids))
 
-                # Search within filtered subset
-                # Create temporary index with filtered vectors
-                filtered_vectors = np.array(
-                    [self._index.reconstruct(i) for i in filtered_indices]
-                )
-                temp_index = faiss.IndexFlatIP(filtered_vectors.shape[1])
-                temp_index.add(filtered_vectors)
+            with stage(latency.FAISS_SEARCH):
+                scores, indices = self._search_index(query_embedding, search_k, search_params)
+            with stage(latency.BM25_RESCORING):
+                return self._rank_candidates(indices, scores, [query_text], k, min_score)[0]
 
-                # ALWAYS retrieve more candidates to allow metadata boost to work
-                search_k = max(k * 3, 15)  # At least 15 candidates for re-ranking
-                search_k = min(search_k, len(filtered_indices))
-                scores, indices = temp_index.search(query_embedding, search_k)
+        except Exception as e:
+            logger.error("Search failed: %s", e)
+            raise SearchError(f"Search failed: {e}") from e
 
-                # Map back to original indices
-                original_indices = [filtered_indices[idx] for idx in indices[0]]
-                scores = scores[0]
-            else:
-                # Normal search without metadata filtering
-                # ALWAYS retrieve more candidates to allow metadata boost to work
-                search_k = max(k * 3, 15)  # At least 15 candidates for re-ranking
-                scores, indices = self._index.search(query_embedding, search_k)
-                original_indices = indices[0]
-                scores = scores[0]
-
-            results: list[tuple[DocumentChunk, float]] = []
-            cosine_scores = []  # Track for BM25 normalization
-            for i, idx in enumerate(original_indices):
-                if idx < 0 or idx >= len(self._chunks):
-                    continue
+    @logfire.instrument("VectorStoreRepository.search_batch {k=}")
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        query_texts: Sequence[str | None] | None = None,
+        k: int = 5,
+        min_score: float | None = None,
+    ) -> list[list[tuple[DocumentChunk, float]]]:
+        """Search for several queries with one FAISS call and batched rescoring.
 
-                # Convert score to percentage (0-100)
-                score_percent = float(scores[i]) * 100
+        Scores are identical to calling search() once per query (without
+        metadata filters).
 
-                # Apply minimum score filter
-                if min_score is not None and score_percent < (min_score * 100):
-                    continue
+        Args:
+            query_embeddings: Query embedding matrix (n_queries x dim)
+            query_texts: Optional original query texts for BM25 reranking (one per query)
+            k: Number of results per query
+            min_score: Minimum similarity score (0-1)
 
-                results.append((self._chunks[idx], score_percent))
-                cosine_scores.append(score_percent)
+        Returns:
+            Per query, list of (chunk, score) tuples sorted by score descending
 
-            # Phase 13: 3-Signal Hybrid Scoring (Cosine + BM25 + Metadata)
-            if query_text and results:
-                # Calculate BM25 scores
-                try:
-                    from rank_bm25 import BM25Okapi
+        Raises:
+            IndexNotFoundError: If index not loaded
+            SearchError: If search fails
+        """
+        if not self.is_loaded:
+            raise IndexNotFoundError()
 
-                    # Extract text from candidates for BM25
-                    chunk_texts = [chunk.text for chunk, _ in results]
-                    query_tokens = query_text.lower().split()
+        query_embeddings = np.array(query_embeddings, dtype="float32", ndmin=2)
+        if query_texts is None:
+            query_texts = [None] * len(query_embeddings)
+        if len(query_texts) != len(query_embeddings):
+            raise SearchError(
+                f"Mismatch: {len(query_embeddings)} query embeddings but {len(query_texts)} query texts"
+            )
+        if len(query_embeddings) == 0:
+            return []
 
-                    # Build BM25 model
-                    tokenized_chunks = [text.lower().split() for text in chunk_texts]
-                    bm25 = BM25Okapi(tokenized_chunks)
-                    bm25_scores = bm25.get_scores(query_tokens)
+        try:
+            faiss.normalize_L2(query_embeddings)
 
-                    # Normalize BM25 to 0-100
-                    if bm25_scores.max() > 0:
-                        bm25_normalized = (bm25_scores / bm25_scores.max()) * 100
-                    else:
-                        bm25_normalized = bm25_scores
-
-                    # Apply 4-signal formula: (cosine*0.70) + (bm25*0.15) + (metadata*0.075) + (quality*0.075)
-                    # Phase 18: Reweighted to prioritize semantic similarity (2026-02-13)
-                    new_results = []
-                    for i, (chunk, cosine_score) in enumerate(results):
-                        bm25_score = bm25_normalized[i]
-                        metadata_boost = self._compute_metadata_boost(chunk)
-                        quality_boost = self._compute_quality_boost(chunk)
-
-                        # 4-signal composite score (boosted semantic weight)
-                        composite_score = (
-                            (cosine_score * 0.70)  # Increased from 0.45
-                            + (bm25_score * 0.15)  # Decreased from 0.30
-                            + (metadata_boost * 0.075)  # Adjusted from 0.15
-                            + (quality_boost * 0.075)  # Adjusted from 0.10
-                        )
-                        composite_score = min(composite_score, 100.0)
-
-                        new_results.append((chunk, composite_score))
-
-                    results = new_results
-
-                except ImportError:
-                    # BM25 not available, fall back to cosine + metadata + quality
-                    logger.warning("rank-bm25 not available, using cosine + metadata + quality only")
-                    results = [
-                        (chunk, min(
-                            score
-                            + self._compute_metadata_boost(chunk)
-                            + self._compute_quality_boost(chunk),
-                            100.0,
-                        ))
-                        for chunk, score in results
-                    ]
-                except Exception as e:
-                    # BM25 calculation failed, fall back to cosine + metadata + quality
-                    logger.warning(f"BM25 calculation failed ({e}), using cosine + metadata + quality only")
-                    results = [
-                        (chunk, min(
-                            score
-                            + self._compute_metadata_boost(chunk)
-                            + self._compute_quality_boost(chunk),
-                            100.0,
-                        ))
-                        for chunk, score in results
-                    ]
-            else:
-                # No query_text provided, fall back to cosine + metadata + quality boosting
-                results = [
-                    (chunk, min(
-                        score
-                        + self._compute_metadata_boost(chunk)
-                        + self._compute_quality_boost(chunk),
-                        100.0,
-                    ))
-                    for chunk, score in results
-                ]
-
-            # Sort by final score descending and limit to k
-            results.sort(key=lambda x: x[1], reverse=True)
-            return results[:k]
+            # Same candidate pool per query as search()
+            search_k = max(k * 3, 15) + self._stale_vectors
+            scores, indices = self._search_index(query_embeddings, search_k)
+            return self._rank_candidates(indices, scores, query_texts, k, min_score)
 
         except Exception as e:
-            logger.error("Search failed: %s", e)
-            raise SearchError(f"Search failed: {e}") from e
+            logger.error("Batch search failed: %s", e)
+            raise SearchError(f"Batch search failed: {e}") from e
 
     def clear(self) -> None:
         """Clear index and chunks from memory."""
-        self._index = None
-        self._chunks = []
-        self._is_loaded = False
+        self._reset()
         logger.info("Index cleared from memory")
 
     def delete_files(self) -> None:
@@ -453,8 +1251,14 @@ class VectorStoreRepository:
             self._index_path.unlink()
             logger.info("Deleted %s", self._index_path)
 
-        if self._chunks_path.exists():
-            self._chunks_path.unlink()
-            logger.info("Deleted %s", self._chunks_path)
+        for path in (self._chunk_store_path, self._chunks_path):
+            if path.exists():
+                path.unlink()
+                logger.info("Deleted %s", path)
+
+        for path in (self._bm25_path, self._rerank_path):
+            if path.exists():
+                path.unlink()
+                logger.info("Deleted %s", path)
 
         self.clear()
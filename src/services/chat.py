@@ -2,12 +2,21 @@
 FILE: chat.py
 STATUS: Active
 RESPONSIBILITY: Hybrid RAG pipeline (SQL + Vector Search) orchestration service
-LAST MAJOR UPDATE: 2026-02-12
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import asyncio
+import contextvars
 import logging
+import re
+import threading
 import time
+from collections.abc import AsyncIterator, Awaitable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 # LAZY IMPORTS: Heavy modules are imported on-demand, not at module load time
@@ -58,19 +67,93 @@ def _initialize_lazy_imports():
 
 
 # Import only lightweight modules at module level
+from src.core import latency
 from src.core.config import settings
 from src.core.exceptions import IndexNotFoundError, LLMError
+from src.core.latency import collect_timings, current_timings, stage
 from src.core.observability import logfire
 from src.core.security import sanitize_query, validate_search_params
 from src.models.chat import ChatRequest, ChatResponse, SearchResult, Visualization
-from src.models.feedback import ChatInteractionCreate
+from src.models.document import DocumentChunk
+from src.models.feedback import ChatInteractionCreate, ConversationTurn
 from src.repositories.feedback import FeedbackRepository
+from src.repositories.index_snapshots import IndexSnapshotStore
+from src.repositories.response_cache import ResponseCache
 from src.repositories.vector_store import VectorStoreRepository
+from src.services.conversation_history import ConversationHistoryCache
+from src.services.interaction_writer import InteractionWriter
+from src.services.semantic_cache import SemanticAnswerCache
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
 
+# Words of a query, for the semantic cache's entity fallback (no SQL templates)
+_ENTITY_WORD = re.compile(r"\d+(?:\.\d+)?|[^\W\d][\w'-]*")
+
+# Answer text when Gemini returns nothing (never cached)
+NO_RESPONSE_TEXT = "I could not generate a response."
+
+# Gemini config for follow-up query rewriting (deterministic, one sentence)
+REWRITE_CONFIG = {
+    "temperature": 0.0,
+    "max_output_tokens": 150,
+}
+
+
+def _rate_limit_wait(
+    error: Exception,
+    attempt: int,
+    max_retries: int,
+    delay: float,
+    max_delay: float,
+) -> float:
+    """Decide whether a failed Gemini call is retried.
+
+    Args:
+        error: Gemini ClientError from the failed call
+        attempt: 0-based attempt number that failed
+        max_retries: Maximum number of retry attempts
+        delay: Current backoff delay in seconds
+        max_delay: Maximum delay in seconds
+
+    Returns:
+        Seconds to wait before the next attempt
+
+    Raises:
+        LLMError: If the error is not a rate limit or retries are exhausted
+    """
+    # Check if this is a rate limit error (429)
+    error_str = str(error)
+    is_rate_limit = "429" in error_str or "RESOURCE_EXHAUSTED" in error_str
+
+    if not is_rate_limit:
+        # Not a rate limit error, raise immediately
+        logger.error("Non-rate-limit Gemini API error: %s", error)
+        raise LLMError(f"LLM API error: {error}") from error
+
+    if attempt >= max_retries:
+        # Exhausted all retries
+        logger.error(
+            "Rate limit error after %d retries: %s",
+            max_retries,
+            error
+        )
+        raise LLMError(
+            f"Rate limit exceeded after {max_retries} retries. "
+            "Please try again in a few moments."
+        ) from error
+
+    wait_time = min(delay, max_delay)
+    logger.warning(
+        "Rate limit hit (attempt %d/%d), retrying in %.1fs: %s",
+        attempt + 1,
+        max_retries + 1,
+        wait_time,
+        error_str[:100]
+    )
+    return wait_time
+
 
 def retry_with_exponential_backoff(
     func: Callable[[], T],
@@ -98,40 +181,74 @@ def retry_with_exponential_backoff(
         try:
             return func()
         except ClientError as e:
-            # Check if this is a rate limit error (429)
-            error_str = str(e)
-            is_rate_limit = "429" in error_str or "RESOURCE_EXHAUSTED" in error_str
+            time.sleep(_rate_limit_wait(e, attempt, max_retries, delay, max_delay))
+            delay *= 2
 
-            if not is_rate_limit:
-                # Not a rate limit error, raise immediately
-                logger.error("Non-rate-limit Gemini API error: %s", e)
-                raise LLMError(f"LLM API error: {e}") from e
 
-            if attempt >= max_retries:
-                # Exhausted all retries
-                logger.error(
-                    "Rate limit error after %d retries: %s",
-                    max_retries,
-                    e
-                )
-                raise LLMError(
-                    f"Rate limit exceeded after {max_retries} retries. "
-                    "Please try again in a few moments."
-                ) from e
+async def aretry_with_exponential_backoff(
+    func: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    initial_delay: float = 2.0,
+    max_delay: float = 30.0,
+) -> T:
+    """Async retry_with_exponential_backoff: backs off with asyncio.sleep.
 
-            # Wait with exponential backoff
-            wait_time = min(delay, max_delay)
-            logger.warning(
-                "Rate limit hit (attempt %d/%d), retrying in %.1fs: %s",
-                attempt + 1,
-                max_retries + 1,
-                wait_time,
-                error_str[:100]
-            )
-            time.sleep(wait_time)
+    Other requests keep running on the event loop while this one waits.
+
+    Args:
+        func: Coroutine function to retry (called again on each attempt)
+        max_retries: Maximum number of retry attempts
+        initial_delay: Initial delay in seconds (doubles each retry)
+        max_delay: Maximum delay in seconds
+
+    Returns:
+        Result from successful call
+
+    Raises:
+        LLMError: If all retries exhausted or non-rate-limit error occurs
+    """
+    delay = initial_delay
+
+    for attempt in range(max_retries + 1):
+        try:
+            return await func()
+        except ClientError as e:
+            await asyncio.sleep(_rate_limit_wait(e, attempt, max_retries, delay, max_delay))
             delay *= 2
 
 
+def _mtime_ns(path: Path) -> int:
+    """File modification time in nanoseconds (0 if missing)."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+# Shared by every chat() call: bounds the threads retrieval branches can occupy
+# under load instead of starting new ones per request.
+_RETRIEVAL_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.retrieval_max_workers, thread_name_prefix="chat-retrieval"
+)
+
+
+def _run_in_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+    """Run func on the retrieval thread pool and return a Future for its result.
+
+    Used for chat() retrieval branches. The caller's contextvars (e.g. the
+    active Logfire span) are propagated.
+
+    Args:
+        func: Function to call
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Future resolved with func's return value or exception
+    """
+    return _RETRIEVAL_EXECUTOR.submit(contextvars.copy_context().run, func, *args, **kwargs)
+
+
 # System prompt templates
 # Phase 12 improvements: Query-type-specific prompts with mandatory data usage
 # - SYSTEM_PROMPT_TEMPLATE: Default/fallback for general queries
@@ -417,6 +534,9 @@ class ChatService:
         enable_sql: bool = True,
         enable_vector_fallback: bool = True,
         conversation_history_limit: int = 5,
+        index_snapshots: Optional[IndexSnapshotStore] = None,
+        semantic_cache: Optional[SemanticAnswerCache] = None,
+        response_cache: Optional[ResponseCache] = None,
     ):
         """Initialize chat service.
 
@@ -429,6 +549,9 @@ class ChatService:
             enable_sql: Enable SQL tool for statistical queries (default: True)
             enable_vector_fallback: Enable fallback to vector search when SQL fails (default: True)
             conversation_history_limit: Number of previous turns to include in context (default: 5)
+            index_snapshots: Versioned index snapshots for hot reload (default from settings)
+            semantic_cache: Semantic answer cache (created if not provided and enabled in settings)
+            response_cache: Exact-match response cache (created if not provided and enabled in settings)
         """
         # Initialize lazy imports on first ChatService instantiation
         _initialize_lazy_imports()
@@ -439,9 +562,15 @@ class ChatService:
         self._enable_sql = enable_sql
         self._enable_vector_fallback = enable_vector_fallback
         self._conversation_history_limit = conversation_history_limit
+        self._conversation_history = ConversationHistoryCache(conversation_history_limit)
+        self._interaction_writer: Optional[InteractionWriter] = None
+        self._writer_lock = threading.Lock()
 
         # Dependencies (lazy initialization)
         self._vector_store = vector_store
+        self._index_snapshots = index_snapshots
+        self._index_version: Optional[str] = None
+        self._reload_lock = threading.Lock()
         self._embedding_service = embedding_service
         self._feedback_repository = feedback_repository
         self._client: Optional[Any] = None  # genai.Client
@@ -449,15 +578,86 @@ class ChatService:
         self._query_classifier: Optional[Any] = None  # QueryClassifier
         self._query_expander: Optional[Any] = None  # QueryExpander
         self._visualization_service: Optional[Any] = None  # VisualizationService
+        self._semantic_cache = semantic_cache
+        self._response_cache = response_cache
 
     @property
     def vector_store(self) -> VectorStoreRepository:
-        """Get vector store repository (lazy initialization)."""
+        """Get vector store repository (lazy initialization).
+
+        Uses the current index snapshot when one is published, otherwise the
+        unversioned index files. Callers should take this reference once per
+        request: reload_index() swaps it, and in-flight requests keep the
+        repository they started with.
+        """
         if self._vector_store is None:
-            self._vector_store = VectorStoreRepository()
+            version = self.index_snapshots.current_version()
+            if version is not None:
+                self._vector_store = VectorStoreRepository.from_directory(
+                    self.index_snapshots.path(version)
+                )
+                self._index_version = version
+            else:
+                self._vector_store = VectorStoreRepository()
             self._vector_store.load()
         return self._vector_store
 
+    @property
+    def index_snapshots(self) -> IndexSnapshotStore:
+        """Get index snapshot store (lazy initialization)."""
+        if self._index_snapshots is None:
+            self._index_snapshots = IndexSnapshotStore()
+        return self._index_snapshots
+
+    @property
+    def index_version(self) -> Optional[str]:
+        """Version of the loaded index snapshot (None for unversioned index files)."""
+        return self._index_version
+
+    def reload_index(self, version: Optional[str] = None) -> str:
+        """Load an index snapshot and swap it in without interrupting requests.
+
+        The new repository is fully loaded before the reference is replaced,
+        so requests never see a partially loaded index. Requests already
+        holding the previous repository finish on it; it is released when
+        the last one completes.
+
+        Args:
+            version: Snapshot version to load (default: current pointer)
+
+        Returns:
+            The version now serving
+
+        Raises:
+            IndexNotFoundError: If the snapshot doesn't exist or fails to load
+        """
+        with self._reload_lock:
+            version = version or self.index_snapshots.current_version()
+            repository = self.index_snapshots.open(version)
+            previous = self._index_version
+            self._vector_store = repository
+            self._index_version = version
+
+        logger.info(
+            "Hot-reloaded vector index: %s -> %s (%d vectors)",
+            previous,
+            version,
+            repository.index_size,
+        )
+        return version
+
+    def reload_index_if_changed(self) -> bool:
+        """Reload the index if the current snapshot pointer moved.
+
+        Returns:
+            True if a new snapshot was loaded
+        """
+        current = self.index_snapshots.current_version()
+        if current is None or current == self._index_version:
+            return False
+        self.reload_index(current)
+        return True
+
     @property
     def embedding_service(self) -> Any:  # EmbeddingService
         """Get embedding service (lazy initialization)."""
@@ -521,6 +721,62 @@ class ChatService:
             self._feedback_repository = FeedbackRepository()
         return self._feedback_repository
 
+    @property
+    def semantic_cache(self) -> Optional[SemanticAnswerCache]:
+        """Get semantic answer cache (lazy initialization, None when disabled)."""
+        if self._semantic_cache is None and settings.semantic_cache_enabled:
+            self._semantic_cache = SemanticAnswerCache()
+        return self._semantic_cache
+
+    @property
+    def interaction_writer(self) -> Optional[InteractionWriter]:
+        """Get background interaction writer (lazy initialization, None when disabled)."""
+        if self._interaction_writer is None and settings.interaction_write_behind:
+            with self._writer_lock:
+                if self._interaction_writer is None:
+                    self._interaction_writer = InteractionWriter(
+                        lambda batch: self.feedback_repository.save_interactions(batch)
+                    )
+        return self._interaction_writer
+
+    def flush_interactions(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued interactions are written to the database.
+
+        Args:
+            timeout: Maximum seconds to wait (default: interaction_flush_timeout)
+
+        Returns:
+            True if nothing is left to write
+        """
+        if self._interaction_writer is None:
+            return True
+        return self._interaction_writer.flush(timeout or settings.interaction_flush_timeout)
+
+    def close(self) -> None:
+        """Write queued interactions and stop background workers (application shutdown)."""
+        if self._interaction_writer is not None:
+            self._interaction_writer.close(settings.interaction_flush_timeout)
+
+    @property
+    def response_cache(self) -> Optional[ResponseCache]:
+        """Get exact-match response cache (lazy initialization, None when disabled)."""
+        if self._response_cache is None and settings.response_cache_enabled:
+            self._response_cache = ResponseCache()
+        return self._response_cache
+
+    @property
+    def data_version(self) -> str:
+        """Version of the data answers are built from: index + stats database stamps.
+
+        The index stamp is the snapshot version, or the FAISS file mtime for
+        unversioned index files. Cached answers are only reused while this
+        is unchanged.
+        """
+        index_version = self._index_version or f"mtime-{_mtime_ns(settings.faiss_index_path)}"
+        db_path = Path(self._sql_tool.db_path) if self._sql_tool else settings.stats_database_path
+        db_version = _mtime_ns(db_path) if self._enable_sql else 0
+        return f"{index_version}:{db_version}"
+
     @property
     def is_ready(self) -> bool:
         """Check if service is ready (index loaded)."""
@@ -663,25 +919,30 @@ class ChatService:
         Returns:
             Formatted conversation history string, or empty string if no history
         """
-        # Get previous messages (excluding current turn)
-        messages = self.feedback_repository.get_messages_by_conversation(conversation_id)
-
-        # Filter to only previous turns (not including current)
-        previous_messages = [msg for msg in messages if msg.turn_number and msg.turn_number < current_turn]
-
-        # Limit to last N turns
-        if len(previous_messages) > self._conversation_history_limit:
-            previous_messages = previous_messages[-self._conversation_history_limit :]
+        # Last N previous turns: from the in-memory ring buffer, else a LIMITed query
+        previous_turns = self._conversation_history.get(conversation_id, current_turn)
+        if previous_turns is None:
+            # Snapshot queued writes before reading: one committed in between shows up in the read
+            pending_turns = self._pending_turns(conversation_id, current_turn)
+            previous_turns = self.feedback_repository.get_recent_turns(
+                conversation_id,
+                before_turn=current_turn,
+                limit=self._conversation_history_limit,
+            )
+            if pending_turns:
+                merged = sorted(dict.fromkeys([*previous_turns, *pending_turns]), key=lambda t: t.turn_number)
+                previous_turns = merged[-self._conversation_history_limit :]
+            self._conversation_history.load(conversation_id, previous_turns)
 
         # No history to show
-        if not previous_messages:
+        if not previous_turns:
             return ""
 
         # Format history
         history_lines = ["CONVERSATION HISTORY:"]
-        for msg in previous_messages:
-            history_lines.append(f"User: {msg.query}")
-            history_lines.append(f"Assistant: {msg.response}")
+        for turn in previous_turns:
+            history_lines.append(f"User: {turn.query}")
+            history_lines.append(f"Assistant: {turn.response}")
 
         history_lines.append("---\n")
         return "\n".join(history_lines)
@@ -782,20 +1043,7 @@ class ChatService:
         Returns:
             Rewritten self-contained query, or original query if rewriting fails
         """
-        rewrite_prompt = (
-            "You are a query rewriter. Given a conversation history and a follow-up question, "
-            "rewrite the follow-up into a COMPLETE, SELF-CONTAINED question that can be understood "
-            "without any prior context.\n\n"
-            "Rules:\n"
-            "- Replace all pronouns (he, his, she, her, they, them, it) with the actual entity names\n"
-            "- Expand short fragments into full questions\n"
-            "- Preserve the user's intent exactly\n"
-            "- Keep the rewritten query concise (one sentence)\n"
-            "- Output ONLY the rewritten question, nothing else\n\n"
-            f"{conversation_history}\n"
-            f"Follow-up question: {query}\n\n"
-            "Rewritten question:"
-        )
+        rewrite_prompt = self._followup_rewrite_prompt(query, conversation_history)
 
         try:
             logger.info("Rewriting follow-up query using conversation context")
@@ -804,28 +1052,76 @@ class ChatService:
                 return self.client.models.generate_content(
                     model=self._model,
                     contents=rewrite_prompt,
-                    config={
-                        "temperature": 0.0,
-                        "max_output_tokens": 150,
-                    },
+                    config=REWRITE_CONFIG,
                 )
 
             response = retry_with_exponential_backoff(_call_llm)
+            return self._parse_rewritten_query(query, response)
 
-            if response.text:
-                rewritten = response.text.strip().strip('"').strip("'")
-                # Sanity check: rewritten query should not be empty or too long
-                if 3 < len(rewritten) < 500:
-                    logger.info(f"Query rewritten: '{query}' → '{rewritten}'")
-                    return rewritten
-
-            logger.warning("Query rewriting returned empty result, using original query")
+        except Exception as e:
+            logger.warning(f"Query rewriting failed ({e}), using original query")
             return query
 
+    async def _arewrite_followup_query(self, query: str, conversation_history: str) -> str:
+        """Async _rewrite_followup_query (Gemini async client, non-blocking backoff).
+
+        Args:
+            query: The follow-up query
+            conversation_history: Formatted conversation history string
+
+        Returns:
+            Rewritten self-contained query, or original query if rewriting fails
+        """
+        rewrite_prompt = self._followup_rewrite_prompt(query, conversation_history)
+
+        try:
+            logger.info("Rewriting follow-up query using conversation context")
+
+            def _call_llm():
+                return self.client.aio.models.generate_content(
+                    model=self._model,
+                    contents=rewrite_prompt,
+                    config=REWRITE_CONFIG,
+                )
+
+            response = await aretry_with_exponential_backoff(_call_llm)
+            return self._parse_rewritten_query(query, response)
+
         except Exception as e:
             logger.warning(f"Query rewriting failed ({e}), using original query")
             return query
 
+    @staticmethod
+    def _followup_rewrite_prompt(query: str, conversation_history: str) -> str:
+        """Build the Gemini prompt that rewrites a follow-up into a standalone question."""
+        return (
+            "You are a query rewriter. Given a conversation history and a follow-up question, "
+            "rewrite the follow-up into a COMPLETE, SELF-CONTAINED question that can be understood "
+            "without any prior context.\n\n"
+            "Rules:\n"
+            "- Replace all pronouns (he, his, she, her, they, them, it) with the actual entity names\n"
+            "- Expand short fragments into full questions\n"
+            "- Preserve the user's intent exactly\n"
+            "- Keep the rewritten query concise (one sentence)\n"
+            "- Output ONLY the rewritten question, nothing else\n\n"
+            f"{conversation_history}\n"
+            f"Follow-up question: {query}\n\n"
+            "Rewritten question:"
+        )
+
+    @staticmethod
+    def _parse_rewritten_query(query: str, response: Any) -> str:
+        """Take the rewritten query from a Gemini response, or keep the original."""
+        if response.text:
+            rewritten = response.text.strip().strip('"').strip("'")
+            # Sanity check: rewritten query should not be empty or too long
+            if 3 < len(rewritten) < 500:
+                logger.info(f"Query rewritten: '{query}' → '{rewritten}'")
+                return rewritten
+
+        logger.warning("Query rewriting returned empty result, using original query")
+        return query
+
     def _save_interaction(
         self,
         query: str,
@@ -835,7 +1131,10 @@ class ChatService:
         conversation_id: str | None,
         turn_number: int | None,
     ) -> None:
-        """Save a chat interaction to the database for conversation history.
+        """Save a chat interaction for conversation history.
+
+        With interaction_write_behind the interaction is queued for the
+        background writer and the request doesn't wait for the commit.
 
         Args:
             query: User query
@@ -855,12 +1154,30 @@ class ChatService:
                 conversation_id=conversation_id,
                 turn_number=turn_number,
             )
-            self.feedback_repository.save_interaction(interaction)
+            writer = self.interaction_writer
+            if writer is not None:
+                writer.submit(interaction)
+            else:
+                self.feedback_repository.save_interaction(interaction)
+            if conversation_id and turn_number:
+                self._conversation_history.append(
+                    conversation_id, ConversationTurn(turn_number, query, response)
+                )
             logger.debug("Interaction saved for conversation %s turn %s", conversation_id, turn_number)
         except Exception as e:
             # Don't fail the request if interaction saving fails
             logger.warning(f"Failed to save interaction: {e}")
 
+    def _pending_turns(self, conversation_id: str, before_turn: int) -> list[ConversationTurn]:
+        """Turns of a conversation queued in the interaction writer but not yet committed."""
+        if self._interaction_writer is None:
+            return []
+        return [
+            ConversationTurn(interaction.turn_number, interaction.query, interaction.response)
+            for interaction in self._interaction_writer.pending(conversation_id)
+            if interaction.turn_number and interaction.turn_number < before_turn
+        ]
+
     def _format_sql_results(self, sql_results: list[dict]) -> str:
         """Format SQL results with special handling for scalar values (COUNT, AVG, SUM).
 
@@ -944,7 +1261,80 @@ class ChatService:
         validate_search_params(k, min_score)
 
         self.ensure_ready()
+        expanded_query = self._expand_query(query, max_expansions)
+
+        # Generate query embedding using expanded query
+        with stage(latency.EMBEDDING):
+            query_embedding = self.embedding_service.embed_query(expanded_query)
+
+        # Search WITHOUT metadata filters (Phase 7 approach)
+        # Phase 13: Pass query_text for 3-signal hybrid scoring (cosine + BM25 + metadata)
+        results = self.vector_store.search(
+            query_embedding=query_embedding,
+            k=k,
+            min_score=min_score,
+            metadata_filters=None,
+            query_text=expanded_query,
+        )
+
+        # Convert to response models
+        return self._to_search_results(results)
+
+    @logfire.instrument("ChatService.asearch {query=}")
+    async def asearch(
+        self,
+        query: str,
+        k: int | None = None,
+        min_score: float | None = None,
+        max_expansions: int | None = None,
+    ) -> list[SearchResult]:
+        """Async search: the query embedding is awaited, the FAISS search runs in a worker thread.
+
+        Args:
+            query: Search query
+            k: Number of results (default from settings)
+            min_score: Minimum similarity score (0-1)
+            max_expansions: Pre-computed expansion limit from ClassificationResult
+
+        Returns:
+            List of search results
+
+        Raises:
+            ValidationError: If query is invalid
+            IndexNotFoundError: If index not loaded
+            SearchError: If search fails
+        """
+        query = sanitize_query(query)
+        k = k or settings.search_k
+        validate_search_params(k, min_score)
+
+        self.ensure_ready()
+        expanded_query = self._expand_query(query, max_expansions)
+
+        with stage(latency.EMBEDDING):
+            query_embedding = await self.embedding_service.aembed_query(expanded_query)
+
+        results = await asyncio.to_thread(
+            self.vector_store.search,
+            query_embedding=query_embedding,
+            k=k,
+            min_score=min_score,
+            metadata_filters=None,
+            query_text=expanded_query,
+        )
+
+        return self._to_search_results(results)
+
+    def _expand_query(self, query: str, max_expansions: int | None = None) -> str:
+        """Expand a search query with related keywords.
 
+        Args:
+            query: Sanitized search query
+            max_expansions: Pre-computed expansion limit from ClassificationResult
+
+        Returns:
+            Expanded query (used for both the embedding and BM25 scoring)
+        """
         # PHASE 7: Expand query for better keyword matching (replaces metadata filtering)
         # Use pre-computed max_expansions from QueryClassifier
         if max_expansions:
@@ -960,21 +1350,64 @@ class ChatService:
         # PHASE 6 metadata filtering DISABLED - caused false negatives
         # (Only 3 chunks tagged as player_stats, all were headers not actual data)
         # Query expansion provides better precision without excluding relevant chunks
+        return expanded_query
 
-        # Generate query embedding using expanded query
-        query_embedding = self.embedding_service.embed_query(expanded_query)
+    @logfire.instrument("ChatService.search_many")
+    def search_many(
+        self,
+        queries: Sequence[str],
+        k: int | None = None,
+        min_score: float | None = None,
+    ) -> list[list[SearchResult]]:
+        """Search for several queries at once.
 
-        # Search WITHOUT metadata filters (Phase 7 approach)
-        # Phase 13: Pass query_text for 3-signal hybrid scoring (cosine + BM25 + metadata)
-        results = self.vector_store.search(
-            query_embedding=query_embedding,
+        Same expansion and scoring as search(), but all (expanded) queries are
+        embedded in one embed_batch call and searched with one FAISS call.
+
+        Args:
+            queries: Search queries
+            k: Number of results per query (default from settings)
+            min_score: Minimum similarity score (0-1)
+
+        Returns:
+            Search results per query, in input order
+
+        Raises:
+            ValidationError: If a query is invalid
+            IndexNotFoundError: If index not loaded
+            SearchError: If search fails
+        """
+        queries = [sanitize_query(q) for q in queries]
+        k = k or settings.search_k
+        validate_search_params(k, min_score)
+        if not queries:
+            return []
+
+        self.ensure_ready()
+
+        expanded_queries = [self.query_expander.expand_smart(q) for q in queries]
+        query_embeddings = self.embedding_service.embed_batch(expanded_queries)
+
+        batch_results = self.vector_store.search_batch(
+            query_embeddings=query_embeddings,
+            query_texts=expanded_queries,
             k=k,
             min_score=min_score,
-            metadata_filters=None,
-            query_text=expanded_query,
         )
+        logger.info(f"Batch search: {len(queries)} queries, 1 embedding call, 1 FAISS call")
 
-        # Convert to response models
+        return [self._to_search_results(results) for results in batch_results]
+
+    @staticmethod
+    def _to_search_results(results: list[tuple[DocumentChunk, float]]) -> list[SearchResult]:
+        """Convert repository (chunk, score) tuples to API search results.
+
+        Args:
+            results: Ranked (chunk, score) tuples
+
+        Returns:
+            List of search results
+        """
         return [
             SearchResult(
                 text=chunk.text,
@@ -1011,42 +1444,35 @@ class ChatService:
         Raises:
             LLMError: If LLM call fails
         """
-        # Build prompt (use custom template if provided, otherwise default)
-        template = prompt_template if prompt_template is not None else SYSTEM_PROMPT_TEMPLATE
-        prompt = template.format(
-            app_name=settings.app_name,
-            conversation_history=conversation_history,
-            context=context,
-            question=query,
-        )
-
-        try:
-            logger.info("Calling Gemini LLM with model %s", self._model)
+        prompt = self._build_prompt(query, context, conversation_history, prompt_template)
+        logger.info("Calling Gemini LLM with model %s", self._model)
+        return self._generate(prompt)
 
-            # Wrap API call with retry logic for rate limit handling
-            def _call_llm():
-                return self.client.models.generate_content(
-                    model=self._model,
-                    contents=prompt,
-                    config={
-                        "temperature": self._temperature,
-                        "top_p": 0.95,
-                        "top_k": 40,
-                        "max_output_tokens": 2048,
-                    },
-                )
-
-            response = retry_with_exponential_backoff(_call_llm)
+    @logfire.instrument("ChatService.agenerate_response")
+    async def agenerate_response(
+        self,
+        query: str,
+        context: str,
+        conversation_history: str = "",
+        prompt_template: str | None = None,
+    ) -> str:
+        """Async generate_response (Gemini async client).
 
-            if response.text:
-                return response.text
+        Args:
+            query: User query
+            context: Retrieved context
+            conversation_history: Conversation history context (optional)
+            prompt_template: Optional custom prompt template
 
-            logger.warning("Gemini returned no text")
-            return "I could not generate a response."
+        Returns:
+            Generated response text
 
-        except Exception as e:
-            logger.error("LLM call failed: %s", e)
-            raise LLMError(f"LLM call failed: {e}") from e
+        Raises:
+            LLMError: If LLM call fails
+        """
+        prompt = self._build_prompt(query, context, conversation_history, prompt_template)
+        logger.info("Calling Gemini LLM with model %s", self._model)
+        return await self._agenerate(prompt)
 
     @logfire.instrument("ChatService.generate_response_hybrid")
     def generate_response_hybrid(
@@ -1070,8 +1496,61 @@ class ChatService:
         Raises:
             LLMError: If LLM call fails
         """
-        # Build prompt with separate SQL and vector contexts
-        prompt = HYBRID_PROMPT.format(
+        prompt = self._build_hybrid_prompt(query, sql_context, vector_context, conversation_history)
+        logger.info("Calling Gemini LLM with model %s (hybrid query)", self._model)
+        return self._generate(prompt)
+
+    @logfire.instrument("ChatService.agenerate_response_hybrid")
+    async def agenerate_response_hybrid(
+        self,
+        query: str,
+        sql_context: str,
+        vector_context: str,
+        conversation_history: str = "",
+    ) -> str:
+        """Async generate_response_hybrid (Gemini async client).
+
+        Args:
+            query: User query
+            sql_context: SQL query results context
+            vector_context: Vector search context
+            conversation_history: Conversation history context (optional)
+
+        Returns:
+            Generated response text
+
+        Raises:
+            LLMError: If LLM call fails
+        """
+        prompt = self._build_hybrid_prompt(query, sql_context, vector_context, conversation_history)
+        logger.info("Calling Gemini LLM with model %s (hybrid query)", self._model)
+        return await self._agenerate(prompt)
+
+    def _build_prompt(
+        self,
+        query: str,
+        context: str,
+        conversation_history: str,
+        prompt_template: str | None,
+    ) -> str:
+        """Fill a prompt template (default SYSTEM_PROMPT_TEMPLATE) with context and question."""
+        template = prompt_template if prompt_template is not None else SYSTEM_PROMPT_TEMPLATE
+        return template.format(
+            app_name=settings.app_name,
+            conversation_history=conversation_history,
+            context=context,
+            question=query,
+        )
+
+    @staticmethod
+    def _build_hybrid_prompt(
+        query: str,
+        sql_context: str,
+        vector_context: str,
+        conversation_history: str,
+    ) -> str:
+        """Fill HYBRID_PROMPT with separate SQL and vector contexts."""
+        return HYBRID_PROMPT.format(
             app_name=settings.app_name,
             conversation_history=conversation_history,
             sql_context=sql_context,
@@ -1079,34 +1558,69 @@ class ChatService:
             question=query,
         )
 
-        try:
-            logger.info("Calling Gemini LLM with model %s (hybrid query)", self._model)
+    def _generation_config(self) -> dict[str, Any]:
+        """Gemini sampling config for answers."""
+        return {
+            "temperature": self._temperature,
+            "top_p": 0.95,
+            "top_k": 40,
+            "max_output_tokens": 2048,
+        }
+
+    def _generate(self, prompt: str) -> str:
+        """Call Gemini with rate-limit retry and return the answer text.
 
+        Raises:
+            LLMError: If LLM call fails
+        """
+        try:
             # Wrap API call with retry logic for rate limit handling
             def _call_llm():
                 return self.client.models.generate_content(
                     model=self._model,
                     contents=prompt,
-                    config={
-                        "temperature": self._temperature,
-                        "top_p": 0.95,
-                        "top_k": 40,
-                        "max_output_tokens": 2048,
-                    },
+                    config=self._generation_config(),
                 )
 
-            response = retry_with_exponential_backoff(_call_llm)
+            with stage(latency.LLM_GENERATION):
+                response = retry_with_exponential_backoff(_call_llm)
+            return self._response_text(response)
 
-            if response.text:
-                return response.text
+        except Exception as e:
+            logger.error("LLM call failed: %s", e)
+            raise LLMError(f"LLM call failed: {e}") from e
 
-            logger.warning("Gemini returned no text")
-            return "I could not generate a response."
+    async def _agenerate(self, prompt: str) -> str:
+        """Async _generate: awaits the Gemini async client, backs off without blocking.
+
+        Raises:
+            LLMError: If LLM call fails
+        """
+        try:
+            def _call_llm():
+                return self.client.aio.models.generate_content(
+                    model=self._model,
+                    contents=prompt,
+                    config=self._generation_config(),
+                )
+
+            with stage(latency.LLM_GENERATION):
+                response = await aretry_with_exponential_backoff(_call_llm)
+            return self._response_text(response)
 
         except Exception as e:
             logger.error("LLM call failed: %s", e)
             raise LLMError(f"LLM call failed: {e}") from e
 
+    @staticmethod
+    def _response_text(response: Any) -> str:
+        """Answer text of a Gemini response (placeholder when empty)."""
+        if response.text:
+            return response.text
+
+        logger.warning("Gemini returned no text")
+        return NO_RESPONSE_TEXT
+
     @logfire.instrument("ChatService.chat")
     def chat(self, request: ChatRequest) -> ChatResponse:
         """Process a chat request through hybrid RAG pipeline (SQL + Vector Search).
@@ -1123,220 +1637,910 @@ class ChatService:
             SearchError: If search fails
             LLMError: If LLM call fails
         """
+        with collect_timings(), stage(latency.TOTAL):
+            return self._chat(request)
+
+    def _chat(self, request: ChatRequest) -> ChatResponse:
+        """chat() pipeline (stage timings are collected by the caller)."""
         start_time = time.time()
 
         # Sanitize query
         query = sanitize_query(request.query)
 
         # ──── PHASE 15: Detect simple greetings (don't need RAG search) ────
-        # Examples: "hi", "hello", "thanks", etc. should get simple responses
-        if self.query_classifier._is_greeting(query):
-            processing_time = (time.time() - start_time) * 1000
-            greeting_responses = {
-                "hi": "Hi there! Ask me anything about basketball stats, teams, or players.",
-                "hello": "Hello! What would you like to know about basketball?",
-                "hey": "Hey! Feel free to ask me basketball questions.",
-                "thanks": "You're welcome! Feel free to ask more questions.",
-                "thank you": "Happy to help! What else can I answer for you?",
-                "goodbye": "Goodbye! See you next time!",
-                "bye": "See you later!",
-            }
-            # Find best matching greeting response
-            query_lower = query.strip().lower()
-            response_text = next(
-                (v for k, v in greeting_responses.items() if k in query_lower),
-                "Hi! Ask me about basketball!"
+        greeting = self._greeting_response(query, start_time)
+        if greeting is not None:
+            return greeting
+
+        turn = _ChatTurn(request=request, query=query, effective_query=query, start_time=start_time)
+
+        # Build conversation context if conversation_id provided
+        if request.conversation_id:
+            with stage(latency.CONVERSATION_HISTORY):
+                turn.conversation_history = self._build_conversation_context(
+                    request.conversation_id,
+                    request.turn_number
+                )
+            self._log_conversation_history(turn)
+
+        # Rewrite follow-up queries to resolve pronouns/references BEFORE classification
+        # This ensures the classifier and SQL tool receive a self-contained query
+        if turn.conversation_history and self._is_followup_query(query):
+            with stage(latency.FOLLOWUP_REWRITE):
+                turn.effective_query = self._rewrite_followup_query(query, turn.conversation_history)
+
+        self._classify_turn(turn)
+
+        # Same question (or a paraphrase) on the same route and data: reuse its answer
+        cached = self._lookup_response_cache(turn)
+        if cached is None and self._semantic_cache_applies(turn):
+            cached = self._lookup_cached_response(turn, self._embed_for_cache(turn))
+        if cached is not None:
+            if request.conversation_id:
+                self._save_interaction(**self._interaction_fields(turn, cached.processing_time_ms))
+            return cached
+
+        # Statistical query → SQL tool (use effective_query for resolved pronouns),
+        # vector search for contextual/hybrid queries and as the SQL fallback
+        self._retrieve(turn)
+
+        # Generate response with appropriate prompt
+        prompt_template, context = self._select_prompt(turn)
+        if context is None:
+            # HYBRID case: pass sql_context and vector_context separately
+            turn.answer = self.generate_response_hybrid(
+                query=query,
+                sql_context=turn.sql_context,
+                vector_context=turn.vector_context,
+                conversation_history=turn.conversation_history,
             )
-            logger.info(f"Detected greeting: '{query}' - returning simple response")
-            return ChatResponse(
-                answer=response_text,
+        else:
+            # All other cases: use standard generate_response
+            turn.answer = self.generate_response(
                 query=query,
-                sources=[],
-                processing_time_ms=int(processing_time),
-                model=self.model,
-                conversation_id=None,
-                turn_number=1,
-                query_type="greeting",
+                context=context,
+                conversation_history=turn.conversation_history,
+                prompt_template=prompt_template,
             )
 
-        # Build conversation context if conversation_id provided
-        conversation_history = ""
+        # SMART FALLBACK: If SQL succeeded but LLM couldn't USE the data, retry with vector search
+        if self._llm_declined_sql(turn):
+            logger.warning("SQL succeeded but LLM couldn't parse results - retrying with vector search")
+
+            # Get vector search results (if not already retrieved)
+            if not turn.search_results:
+                turn.search_results = self.search(
+                    query=turn.effective_query,
+                    k=turn.adaptive_k,
+                    min_score=request.min_score,
+                    max_expansions=turn.classification.max_expansions,
+                )
+
+            if turn.search_results:
+                # Regenerate response with vector context using CONTEXTUAL_PROMPT
+                turn.answer = self.generate_response(
+                    query=query,
+                    context=self._fallback_vector_context(turn.search_results),
+                    conversation_history=turn.conversation_history,
+                    prompt_template=CONTEXTUAL_PROMPT,
+                )
+                logger.info("Vector search fallback succeeded")
+
+        self._postprocess_answer(turn)
+
+        # Calculate processing time
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        # Generate visualization for statistical queries with SQL results
+        visualization = self._build_visualization(turn)
+
+        # Auto-save interaction for conversation history (enables follow-up resolution)
         if request.conversation_id:
-            conversation_history = self._build_conversation_context(
-                request.conversation_id,
-                request.turn_number
+            self._save_interaction(**self._interaction_fields(turn, processing_time_ms))
+
+        response = self._build_chat_response(turn, processing_time_ms, visualization)
+        self._store_cached_response(turn, response)
+        return response
+
+    @logfire.instrument("ChatService.achat")
+    async def achat(self, request: ChatRequest) -> ChatResponse:
+        """Async chat: the same pipeline as chat() without blocking the event loop.
+
+        Embedding, Gemini and SQL generation calls are awaited on their async
+        clients; SQLite (conversation history, SQL execution, interaction
+        writes), FAISS search and chart rendering run in worker threads. One
+        worker process can then serve many concurrent chats instead of one
+        per threadpool thread.
+
+        Args:
+            request: Chat request with query and parameters
+
+        Returns:
+            Chat response with answer and sources
+
+        Raises:
+            ValidationError: If request is invalid
+            IndexNotFoundError: If index not loaded
+            SearchError: If search fails
+            LLMError: If LLM call fails
+        """
+        with collect_timings(), stage(latency.TOTAL):
+            return await self._achat(request)
+
+    async def _achat(self, request: ChatRequest) -> ChatResponse:
+        """achat() pipeline (stage timings are collected by the caller)."""
+        start_time = time.time()
+        query = sanitize_query(request.query)
+
+        greeting = self._greeting_response(query, start_time)
+        if greeting is not None:
+            return greeting
+
+        turn = await self._astart_turn(request, query, start_time)
+
+        cached = await self._alookup_response_cache(turn)
+        if cached is None and self._semantic_cache_applies(turn):
+            cached = self._lookup_cached_response(turn, await self._aembed_for_cache(turn))
+        if cached is not None:
+            if request.conversation_id:
+                await asyncio.to_thread(
+                    self._save_interaction, **self._interaction_fields(turn, cached.processing_time_ms)
+                )
+            return cached
+
+        await self._aretrieve(turn)
+
+        prompt_template, context = self._select_prompt(turn)
+        if context is None:
+            turn.answer = await self.agenerate_response_hybrid(
+                query=query,
+                sql_context=turn.sql_context,
+                vector_context=turn.vector_context,
+                conversation_history=turn.conversation_history,
+            )
+        else:
+            turn.answer = await self.agenerate_response(
+                query=query,
+                context=context,
+                conversation_history=turn.conversation_history,
+                prompt_template=prompt_template,
             )
-            if conversation_history:
-                logger.info(f"Including conversation history ({request.turn_number - 1} previous turns)")
 
-        # Rewrite follow-up queries to resolve pronouns/references BEFORE classification
-        # This ensures the classifier and SQL tool receive a self-contained query
-        effective_query = query
-        if conversation_history and self._is_followup_query(query):
-            effective_query = self._rewrite_followup_query(query, conversation_history)
+        if self._llm_declined_sql(turn):
+            logger.warning("SQL succeeded but LLM couldn't parse results - retrying with vector search")
 
-        # ── Single classify() call returns all query metadata ─────────────────
-        # ClassificationResult bundles: query_type, is_biographical, is_greeting, complexity_k
-        # This eliminates duplicate _is_biographical() and _estimate_question_complexity() calls.
-        if self._enable_sql:
-            classification = self.query_classifier.classify(effective_query)
+            if not turn.search_results:
+                turn.search_results = await self.asearch(
+                    query=turn.effective_query,
+                    k=turn.adaptive_k,
+                    min_score=request.min_score,
+                    max_expansions=turn.classification.max_expansions,
+                )
+
+            if turn.search_results:
+                turn.answer = await self.agenerate_response(
+                    query=query,
+                    context=self._fallback_vector_context(turn.search_results),
+                    conversation_history=turn.conversation_history,
+                    prompt_template=CONTEXTUAL_PROMPT,
+                )
+                logger.info("Vector search fallback succeeded")
+
+        self._postprocess_answer(turn)
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        visualization = None
+        if turn.query_type in (QueryType.STATISTICAL, QueryType.HYBRID):
+            # Plotly figure building is CPU-bound
+            visualization = await asyncio.to_thread(self._build_visualization, turn)
+
+        if request.conversation_id:
+            await asyncio.to_thread(
+                self._save_interaction, **self._interaction_fields(turn, processing_time_ms)
+            )
+
+        response = self._build_chat_response(turn, processing_time_ms, visualization)
+        await asyncio.to_thread(self._store_cached_response, turn, response)
+        return response
+
+    async def astream_chat(self, request: ChatRequest) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Streaming achat(): yields pipeline events as soon as each is known.
+
+        Events, in order:
+            routing: query classification ({query_type, effective_query, k, is_biographical})
+            sources: retrieved documents and generated SQL ({sources, generated_sql})
+            token: answer text as Gemini streams it ({text}); hedging removal and
+                citation formatting are applied incrementally
+            reset: the streamed answer is discarded (SQL fallback), followed by
+                a new sources event and new tokens
+            visualization: chart for statistical queries with SQL results (if any)
+            done: ChatResponse fields without sources/visualization
+
+        Args:
+            request: Chat request with query and parameters
+
+        Yields:
+            (event name, JSON-serializable payload) tuples
+
+        Raises:
+            ValidationError: If request is invalid
+            IndexNotFoundError: If index not loaded
+            SearchError: If search fails
+            LLMError: If LLM call fails
+        """
+        with collect_timings(), stage(latency.TOTAL):
+            async for event in self._astream_chat(request):
+                yield event
+
+    async def _astream_chat(self, request: ChatRequest) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """astream_chat() pipeline (stage timings are collected by the caller)."""
+        start_time = time.time()
+        query = sanitize_query(request.query)
+
+        greeting = self._greeting_response(query, start_time)
+        if greeting is not None:
+            yield "routing", {"query_type": greeting.query_type}
+            yield "token", {"text": greeting.answer}
+            yield "done", self._done_event(greeting)
+            return
+
+        turn = await self._astart_turn(request, query, start_time)
+        yield "routing", {
+            "query_type": turn.query_type.value,
+            "effective_query": turn.effective_query,
+            "k": turn.adaptive_k,
+            "is_biographical": turn.classification.is_biographical,
+        }
+
+        cached = await self._alookup_response_cache(turn)
+        if cached is None and self._semantic_cache_applies(turn):
+            cached = self._lookup_cached_response(turn, await self._aembed_for_cache(turn))
+        if cached is not None:
+            yield "sources", self._sources_event(turn)
+            yield "token", {"text": cached.answer}
+            if cached.visualization is not None:
+                yield "visualization", cached.visualization.model_dump(mode="json")
+            if request.conversation_id:
+                await asyncio.to_thread(
+                    self._save_interaction, **self._interaction_fields(turn, cached.processing_time_ms)
+                )
+            yield "done", self._done_event(cached)
+            return
+
+        await self._aretrieve(turn)
+        yield "sources", self._sources_event(turn)
+
+        prompt_template, context = self._select_prompt(turn)
+        if context is None:
+            prompt = self._build_hybrid_prompt(
+                query, turn.sql_context, turn.vector_context, turn.conversation_history
+            )
         else:
-            classification = ClassificationResult(QueryType.CONTEXTUAL)
+            prompt = self._build_prompt(query, context, turn.conversation_history, prompt_template)
 
-        query_type = classification.query_type
-        is_biographical = classification.is_biographical
-        logger.warning(f"[DEBUG-CLASSIFY] query_type={query_type} ({type(query_type)}), is_biographical={is_biographical}, enable_sql={self._enable_sql}")
+        answer_parts: list[str] = []
+        async for event in self._astream_answer(prompt, turn.query_type, answer_parts):
+            yield event
+        turn.answer = "".join(answer_parts)
 
-        # Adaptive k: use request.k if explicitly set, otherwise use classifier's complexity estimate
-        adaptive_k = request.k if request.k and request.k > 0 else classification.complexity_k
-        logger.info(f"Using k={adaptive_k} (complexity-based: simple=3, moderate=5, complex=7-9)")
-
-        # Route to appropriate data source(s)
-        search_results = []
-        sql_failed = False  # Track SQL failure for fallback
-        sql_success = False  # Track SQL success
-        sql_context = ""
-        vector_context = ""
-        generated_sql = None  # Track generated SQL for Phase 2 analysis
-        sql_result_data = None  # Track SQL results for visualization
-
-        # Statistical query → SQL tool (use effective_query for resolved pronouns)
-        if query_type in (QueryType.STATISTICAL, QueryType.HYBRID):
-            if self.sql_tool:
+        if self._llm_declined_sql(turn):
+            logger.warning("SQL succeeded but LLM couldn't parse results - retrying with vector search")
+
+            if not turn.search_results:
+                turn.search_results = await self.asearch(**self._search_kwargs(turn))
+
+            if turn.search_results:
+                yield "reset", {}
+                yield "sources", self._sources_event(turn)
+                prompt = self._build_prompt(
+                    query,
+                    self._fallback_vector_context(turn.search_results),
+                    turn.conversation_history,
+                    CONTEXTUAL_PROMPT,
+                )
+                answer_parts = []
+                async for event in self._astream_answer(prompt, turn.query_type, answer_parts):
+                    yield event
+                turn.answer = "".join(answer_parts)
+                logger.info("Vector search fallback succeeded")
+
+        # Same text as the streamed tokens: formatting is segment-wise (see _IncrementalFormatter)
+        self._postprocess_answer(turn)
+        processing_time_ms = (time.time() - start_time) * 1000
+
+        visualization = None
+        if turn.query_type in (QueryType.STATISTICAL, QueryType.HYBRID):
+            visualization = await asyncio.to_thread(self._build_visualization, turn)
+            if visualization is not None:
+                yield "visualization", visualization.model_dump(mode="json")
+
+        if request.conversation_id:
+            await asyncio.to_thread(
+                self._save_interaction, **self._interaction_fields(turn, processing_time_ms)
+            )
+
+        response = self._build_chat_response(turn, processing_time_ms, visualization)
+        await asyncio.to_thread(self._store_cached_response, turn, response)
+        yield "done", self._done_event(response)
+
+    async def _astart_turn(self, request: ChatRequest, query: str, start_time: float) -> "_ChatTurn":
+        """Load conversation history, rewrite follow-ups and classify (achat / astream_chat)."""
+        turn = _ChatTurn(request=request, query=query, effective_query=query, start_time=start_time)
+
+        if request.conversation_id:
+            with stage(latency.CONVERSATION_HISTORY):
+                turn.conversation_history = await asyncio.to_thread(
+                    self._build_conversation_context,
+                    request.conversation_id,
+                    request.turn_number,
+                )
+            self._log_conversation_history(turn)
+
+        if turn.conversation_history and self._is_followup_query(query):
+            with stage(latency.FOLLOWUP_REWRITE):
+                turn.effective_query = await self._arewrite_followup_query(query, turn.conversation_history)
+
+        self._classify_turn(turn)
+        return turn
+
+    async def _astream_answer(
+        self, prompt: str, query_type: Any, answer_parts: list[str]
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Stream a Gemini answer as formatted token events.
+
+        Args:
+            prompt: Filled prompt
+            query_type: QueryType of the turn (hedging removal is statistical/hybrid only)
+            answer_parts: Receives the raw (unformatted) text chunks
+
+        Yields:
+            ("token", {"text": ...}) events
+        """
+        formatter = _IncrementalFormatter(lambda text: self._format_answer(text, query_type))
+        async for text in self._astream_generate(prompt):
+            answer_parts.append(text)
+            formatted = formatter.feed(text)
+            if formatted:
+                yield "token", {"text": formatted}
+
+        if not answer_parts:
+            logger.warning("Gemini returned no text")
+            answer_parts.append(NO_RESPONSE_TEXT)
+            yield "token", {"text": self._format_answer(answer_parts[0], query_type)}
+            return
+
+        tail = formatter.flush()
+        if tail:
+            yield "token", {"text": tail}
+
+    async def _astream_generate(self, prompt: str) -> AsyncIterator[str]:
+        """Stream answer text from Gemini.
+
+        Rate-limit retries apply until the stream is open; once text has been
+        yielded a failure ends the stream. The llm_generation stage excludes
+        the time the consumer holds each chunk.
+
+        Raises:
+            LLMError: If LLM call fails
+        """
+        logger.info("Streaming Gemini LLM response with model %s", self._model)
+        elapsed = 0.0
+        resumed = time.perf_counter()
+        try:
+            def _open_stream():
+                return self.client.aio.models.generate_content_stream(
+                    model=self._model,
+                    contents=prompt,
+                    config=self._generation_config(),
+                )
+
+            stream = await aretry_with_exponential_backoff(_open_stream)
+            async for chunk in stream:
+                if chunk.text:
+                    elapsed += time.perf_counter() - resumed
+                    yield chunk.text
+                    resumed = time.perf_counter()
+
+        except Exception as e:
+            logger.error("LLM call failed: %s", e)
+            raise LLMError(f"LLM call failed: {e}") from e
+        finally:
+            latency.record(latency.LLM_GENERATION, (elapsed + time.perf_counter() - resumed) * 1000)
+
+    @staticmethod
+    def _sources_event(turn: "_ChatTurn") -> dict[str, Any]:
+        """Payload of the astream_chat sources event."""
+        sources = turn.search_results if turn.request.include_sources else []
+        return {
+            "sources": [source.model_dump(mode="json") for source in sources],
+            "generated_sql": turn.generated_sql,
+        }
+
+    @staticmethod
+    def _done_event(response: ChatResponse) -> dict[str, Any]:
+        """Payload of the astream_chat done event (sources/visualization were sent earlier)."""
+        return response.model_dump(mode="json", exclude={"sources", "visualization"})
+
+    # ── Answer caches: exact match, then semantic ────────────────────────────
+
+    def _lookup_response_cache(self, turn: "_ChatTurn") -> Optional[ChatResponse]:
+        """Cached response for an identical request, adapted to this request.
+
+        The key covers the normalized effective query, route, k, min_score and
+        conversation history, so the exact cache also applies inside
+        conversations. On a miss, the key and data version are kept on the
+        turn so the response can be stored once it is built.
+        """
+        cache = self.response_cache
+        if cache is None:
+            return None
+
+        turn.cache_data_version = self.data_version
+        key = ResponseCache.key(
+            turn.effective_query,
+            turn.query_type.value,
+            turn.adaptive_k,
+            turn.request.min_score,
+            turn.conversation_history,
+        )
+        with stage(latency.CACHE_LOOKUP):
+            cached = cache.get(key, turn.cache_data_version)
+        if cached is None:
+            turn.response_cache_key = key
+            return None
+
+        logger.info(f"Response cache hit for '{turn.effective_query[:50]}'")
+        return self._adapt_cached_response(turn, cached)
+
+    async def _alookup_response_cache(self, turn: "_ChatTurn") -> Optional[ChatResponse]:
+        """Async _lookup_response_cache() (SQLite and stat calls run in a worker thread)."""
+        if self.response_cache is None:
+            return None
+        return await asyncio.to_thread(self._lookup_response_cache, turn)
+
+    def _adapt_cached_response(self, turn: "_ChatTurn", cached: ChatResponse) -> ChatResponse:
+        """Copy of a cached response for this request (turn fields filled for saving)."""
+        request = turn.request
+        turn.answer = cached.answer
+        turn.search_results = list(cached.sources)
+        turn.generated_sql = cached.generated_sql
+        return cached.model_copy(update={
+            "query": turn.query,
+            "sources": turn.search_results if request.include_sources else [],
+            "processing_time_ms": (time.time() - turn.start_time) * 1000,
+            "conversation_id": request.conversation_id,
+            "turn_number": request.turn_number,
+            "timings": self._response_timings(request),
+        })
+
+    def _semantic_cache_applies(self, turn: "_ChatTurn") -> bool:
+        """Whether the turn may be answered from (and stored in) the semantic cache.
+
+        Requests inside a conversation bypass it unless
+        semantic_cache_in_conversations is set: their answers can depend on
+        the conversation history.
+        """
+        cache = self.semantic_cache
+        if cache is None:
+            return False
+        if turn.request.conversation_id and not settings.semantic_cache_in_conversations:
+            cache.record_bypass()
+            return False
+        return True
+
+    def _embed_for_cache(self, turn: "_ChatTurn") -> Optional[Any]:
+        """Embed the effective query for a cache lookup (None if embedding fails)."""
+        try:
+            with stage(latency.EMBEDDING):
+                return self.embedding_service.embed_query(turn.effective_query)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup skipped: {e}")
+            return None
+
+    async def _aembed_for_cache(self, turn: "_ChatTurn") -> Optional[Any]:
+        """Async _embed_for_cache()."""
+        try:
+            with stage(latency.EMBEDDING):
+                return await self.embedding_service.aembed_query(turn.effective_query)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup skipped: {e}")
+            return None
+
+    def _lookup_cached_response(self, turn: "_ChatTurn", embedding: Optional[Any]) -> Optional[ChatResponse]:
+        """Cached response for a paraphrase of the turn's query, adapted to this request.
+
+        On a miss, the embedding, scope and data version are kept on the turn
+        so the response can be stored once it is built.
+        """
+        if embedding is None:
+            return None
+
+        request = turn.request
+        turn.cache_embedding = embedding
+        # request.k rather than adaptive_k: paraphrases can get different complexity estimates.
+        # Entities too: "top 5" / "top 10 scorers" embed almost identically but need different answers
+        turn.cache_scope = (
+            turn.query_type.value,
+            request.k,
+            request.min_score,
+            self._entity_slots(turn.effective_query),
+        )
+        turn.cache_data_version = turn.cache_data_version or self.data_version
+
+        with stage(latency.CACHE_LOOKUP):
+            hit = self.semantic_cache.lookup(embedding, turn.cache_scope, turn.cache_data_version)
+        if hit is None:
+            return None
+
+        cached, similarity = hit
+        logger.info(f"Semantic cache hit (similarity {similarity:.3f}) for '{turn.effective_query[:50]}'")
+        turn.cache_embedding = None  # Already cached
+        # Not copied into the response cache: a wrong similarity hit would outlive this process
+        return self._adapt_cached_response(turn, cached)
+
+    def _entity_slots(self, query: str) -> tuple:
+        """Players, teams and numbers a query mentions, order-independent.
+
+        Uses the SQL templates' entity vocabulary when the SQL tool has one;
+        otherwise numbers and capitalized words (after the first) stand in
+        for entities.
+        """
+        tool = self.sql_tool
+        templates = getattr(tool, "templates", None) if tool is not None else None
+        if templates is not None:
+            slots = templates.skeleton(query).slots
+            return tuple(sorted({(slot.kind, str(slot.value)) for slot in slots}))
+
+        words = _ENTITY_WORD.findall(query)
+        entities = {w for w in words if w[0].isdigit()} | {w.lower() for w in words[1:] if w[0].isupper()}
+        return tuple(sorted(entities))
+
+    def _store_cached_response(self, turn: "_ChatTurn", response: ChatResponse) -> None:
+        """Cache a freshly built response in the caches the turn missed."""
+        if turn.answer == NO_RESPONSE_TEXT:
+            return
+        # Keep sources even if this request didn't ask for them; timings belong to this request only
+        response = response.model_copy(update={"sources": turn.search_results, "timings": None})
+        if turn.response_cache_key is not None:
+            self.response_cache.put(turn.response_cache_key, turn.cache_data_version, response)
+        if turn.cache_embedding is not None:
+            self.semantic_cache.store(
+                query=turn.effective_query,
+                embedding=turn.cache_embedding,
+                scope=turn.cache_scope,
+                data_version=turn.cache_data_version,
+                response=response,
+            )
+
+    # ── Retrieval: SQL and vector branches ───────────────────────────────────
+
+    def _retrieve(self, turn: "_ChatTurn") -> None:
+        """Run the SQL and vector branches for a turn.
+
+        HYBRID queries need both, so the branches run side by side on the
+        retrieval thread pool and retrieval takes about max(sql, vector)
+        instead of their sum. Each branch has its own timeout: a timed-out SQL
+        branch counts as failed and its query is interrupted, a timed-out
+        vector branch yields no results.
+
+        Speculative vector search for STATISTICAL queries is async-only
+        (_aretrieve() can cancel it): a search started in a thread runs to
+        completion, so here every statistical query would pay for it.
+        """
+        if not (self._routes_to_sql(turn) and turn.query_type == QueryType.HYBRID):
+            if self._routes_to_sql(turn):
                 try:
-                    # For biographical queries, rewrite to fetch comprehensive stats
-                    sql_query_text = effective_query
-                    if is_biographical:
-                        sql_query_text = self._rewrite_biographical_for_sql(effective_query)
-                        logger.info(f"Biographical SQL rewrite: '{effective_query}' → '{sql_query_text}'")
-
-                    logger.info(f"Routing to SQL tool (query_type: {query_type.value})")
-                    sql_result = self.sql_tool.query(sql_query_text)
-
-                    # Capture generated SQL for evaluation/analysis
-                    if sql_result["sql"]:
-                        generated_sql = sql_result["sql"]
-                        logger.debug(f"Generated SQL: {generated_sql}")
-
-                    if sql_result["error"]:
-                        logger.warning(f"SQL query failed: {sql_result['error']} - falling back to vector search")
-                        sql_failed = True
-                    elif not sql_result["results"]:
-                        logger.warning("SQL query returned no results - falling back to vector search")
-                        sql_failed = True
-                    else:
-                        # Use new _format_sql_results() method with scalar handling
-                        sql_context = self._format_sql_results(sql_result["results"])
-                        logger.info(f"SQL query returned {len(sql_result['results'])} rows")
-                        sql_success = True
-                        # Store SQL results for visualization
-                        sql_result_data = sql_result["results"]
+                    self._apply_sql_result(turn, self.sql_tool.query(self._sql_query_text(turn)))
+                except Exception as e:
+                    logger.error(f"SQL tool error: {e} - falling back to vector search")
+                    turn.sql_failed = True
+            if self._routes_to_vector(turn):
+                turn.search_results = self.search(**self._search_kwargs(turn))
+                turn.vector_context = self._build_vector_context(turn.search_results)
+            return
+
+        started = time.monotonic()
+        cancel = threading.Event()
+        vector_future = _run_in_thread(self.search, **self._search_kwargs(turn))
+        sql_future = _run_in_thread(self.sql_tool.query, self._sql_query_text(turn), cancel=cancel)
+        try:
+            self._apply_sql_result(turn, sql_future.result(timeout=settings.retrieval_sql_timeout))
+        except FutureTimeoutError:
+            cancel.set()
+            logger.error(
+                f"SQL branch timed out after {settings.retrieval_sql_timeout:.0f}s - falling back to vector search"
+            )
+            turn.sql_failed = True
+        except Exception as e:
+            logger.error(f"SQL tool error: {e} - falling back to vector search")
+            turn.sql_failed = True
+
+        if not self._routes_to_vector(turn):
+            vector_future.cancel()
+            return
+
+        remaining = settings.retrieval_vector_timeout - (time.monotonic() - started)
+        try:
+            turn.search_results = vector_future.result(timeout=max(remaining, 0.0))
+        except FutureTimeoutError:
+            logger.warning(
+                f"Vector branch timed out after {settings.retrieval_vector_timeout:.0f}s - continuing without documents"
+            )
+        turn.vector_context = self._build_vector_context(turn.search_results)
+
+    async def _aretrieve(self, turn: "_ChatTurn") -> None:
+        """Async counterpart of _retrieve(): the branches run as tasks.
 
+        Both tasks are scoped to this call: a branch that is no longer needed
+        (speculative search after SQL succeeded), has timed out, or is left
+        behind because the request itself was cancelled is cancelled too.
+        """
+        if not self._runs_branches_concurrently(turn):
+            if self._routes_to_sql(turn):
+                try:
+                    self._apply_sql_result(turn, await self.sql_tool.aquery(self._sql_query_text(turn)))
                 except Exception as e:
                     logger.error(f"SQL tool error: {e} - falling back to vector search")
-                    sql_failed = True
+                    turn.sql_failed = True
+            if self._routes_to_vector(turn):
+                turn.search_results = await self.asearch(**self._search_kwargs(turn))
+                turn.vector_context = self._build_vector_context(turn.search_results)
+            return
+
+        vector_task = asyncio.create_task(
+            asyncio.wait_for(self.asearch(**self._search_kwargs(turn)), settings.retrieval_vector_timeout)
+        )
+        sql_task = asyncio.create_task(
+            asyncio.wait_for(self.sql_tool.aquery(self._sql_query_text(turn)), settings.retrieval_sql_timeout)
+        )
+        try:
+            try:
+                self._apply_sql_result(turn, await sql_task)
+            except TimeoutError:
+                logger.error(
+                    f"SQL branch timed out after {settings.retrieval_sql_timeout:.0f}s - falling back to vector search"
+                )
+                turn.sql_failed = True
+            except Exception as e:
+                logger.error(f"SQL tool error: {e} - falling back to vector search")
+                turn.sql_failed = True
+
+            if not self._routes_to_vector(turn):
+                # Statistical query answered by SQL: the speculative search is not needed
+                return
+
+            try:
+                turn.search_results = await vector_task
+            except TimeoutError:
+                logger.warning(
+                    f"Vector branch timed out after {settings.retrieval_vector_timeout:.0f}s - continuing without documents"
+                )
+        finally:
+            for task in (sql_task, vector_task):
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # Mark a discarded branch's error as retrieved
+        turn.vector_context = self._build_vector_context(turn.search_results)
+
+    def _runs_branches_concurrently(self, turn: "_ChatTurn") -> bool:
+        """Whether _aretrieve() starts the SQL and vector branches together.
+
+        HYBRID queries need both. STATISTICAL queries start vector search
+        speculatively when it is their fallback, so it is already warm if
+        SQL fails.
+        """
+        if not self._routes_to_sql(turn):
+            return False
+        if turn.query_type == QueryType.HYBRID:
+            return True
+        return self._enable_vector_fallback and settings.speculative_vector_search
+
+    @staticmethod
+    def _search_kwargs(turn: "_ChatTurn") -> dict[str, Any]:
+        """search()/asearch() arguments for a turn."""
+        return {
+            "query": turn.effective_query,
+            "k": turn.adaptive_k,
+            "min_score": turn.request.min_score,
+            "max_expansions": turn.classification.max_expansions,  # Pre-computed expansion limit
+        }
+
+    # ── chat() / achat() pipeline steps (no I/O) ─────────────────────────────
+
+    def _greeting_response(self, query: str, start_time: float) -> Optional[ChatResponse]:
+        """Canned response for simple greetings, or None for real questions.
+
+        Examples: "hi", "hello", "thanks", etc. should get simple responses
+        without RAG search.
+        """
+        if not self.query_classifier._is_greeting(query):
+            return None
+
+        processing_time = (time.time() - start_time) * 1000
+        greeting_responses = {
+            "hi": "Hi there! Ask me anything about basketball stats, teams, or players.",
+            "hello": "Hello! What would you like to know about basketball?",
+            "hey": "Hey! Feel free to ask me basketball questions.",
+            "thanks": "You're welcome! Feel free to ask more questions.",
+            "thank you": "Happy to help! What else can I answer for you?",
+            "goodbye": "Goodbye! See you next time!",
+            "bye": "See you later!",
+        }
+        # Find best matching greeting response
+        query_lower = query.strip().lower()
+        response_text = next(
+            (v for k, v in greeting_responses.items() if k in query_lower),
+            "Hi! Ask me about basketball!"
+        )
+        logger.info(f"Detected greeting: '{query}' - returning simple response")
+        return ChatResponse(
+            answer=response_text,
+            query=query,
+            sources=[],
+            processing_time_ms=int(processing_time),
+            model=self.model,
+            conversation_id=None,
+            turn_number=1,
+            query_type="greeting",
+        )
+
+    @staticmethod
+    def _log_conversation_history(turn: "_ChatTurn") -> None:
+        """Log that conversation history is included in the prompt."""
+        if turn.conversation_history:
+            logger.info(f"Including conversation history ({turn.request.turn_number - 1} previous turns)")
+
+    def _classify_turn(self, turn: "_ChatTurn") -> None:
+        """Classify the (rewritten) query and pick k.
+
+        A single classify() call returns all query metadata (query_type,
+        is_biographical, is_greeting, complexity_k, max_expansions).
+        """
+        if self._enable_sql:
+            with stage(latency.CLASSIFICATION):
+                turn.classification = self.query_classifier.classify(turn.effective_query)
+        else:
+            turn.classification = ClassificationResult(QueryType.CONTEXTUAL)
+
+        classification = turn.classification
+        logger.warning(f"[DEBUG-CLASSIFY] query_type={classification.query_type} ({type(classification.query_type)}), is_biographical={classification.is_biographical}, enable_sql={self._enable_sql}")
 
-        # Contextual/Hybrid query → Vector search
-        # Also fallback to vector if SQL failed for STATISTICAL queries (when fallback enabled)
-        # OR always add vector search for HYBRID queries
+        # Adaptive k: use request.k if explicitly set, otherwise use classifier's complexity estimate
+        request = turn.request
+        turn.adaptive_k = request.k if request.k and request.k > 0 else classification.complexity_k
+        logger.info(f"Using k={turn.adaptive_k} (complexity-based: simple=3, moderate=5, complex=7-9)")
+
+    def _routes_to_sql(self, turn: "_ChatTurn") -> bool:
+        """Whether the query goes to the SQL tool (statistical / hybrid queries)."""
+        return turn.query_type in (QueryType.STATISTICAL, QueryType.HYBRID) and bool(self.sql_tool)
+
+    def _sql_query_text(self, turn: "_ChatTurn") -> str:
+        """Question sent to the SQL tool (biographical queries fetch comprehensive stats)."""
+        sql_query_text = turn.effective_query
+        if turn.classification.is_biographical:
+            sql_query_text = self._rewrite_biographical_for_sql(turn.effective_query)
+            logger.info(f"Biographical SQL rewrite: '{turn.effective_query}' → '{sql_query_text}'")
+
+        logger.info(f"Routing to SQL tool (query_type: {turn.query_type.value})")
+        return sql_query_text
+
+    def _apply_sql_result(self, turn: "_ChatTurn", sql_result: dict) -> None:
+        """Record an SQL tool result on the turn (context, generated SQL, success/failure)."""
+        # Capture generated SQL for evaluation/analysis
+        if sql_result["sql"]:
+            turn.generated_sql = sql_result["sql"]
+            logger.debug(f"Generated SQL: {turn.generated_sql}")
+
+        if sql_result["error"]:
+            logger.warning(f"SQL query failed: {sql_result['error']} - falling back to vector search")
+            turn.sql_failed = True
+        elif not sql_result["results"]:
+            logger.warning("SQL query returned no results - falling back to vector search")
+            turn.sql_failed = True
+        else:
+            # Use new _format_sql_results() method with scalar handling
+            turn.sql_context = self._format_sql_results(sql_result["results"])
+            logger.info(f"SQL query returned {len(sql_result['results'])} rows")
+            turn.sql_success = True
+            # Store SQL results for visualization
+            turn.sql_result_data = sql_result["results"]
+
+    def _routes_to_vector(self, turn: "_ChatTurn") -> bool:
+        """Whether the query needs vector search.
+
+        Contextual and hybrid queries always do; statistical queries fall back
+        to it when SQL failed (and fallback is enabled).
+        """
+        query_type = turn.query_type
         should_use_vector = (
             query_type == QueryType.CONTEXTUAL or
             query_type == QueryType.HYBRID or
-            (query_type == QueryType.STATISTICAL and sql_failed and self._enable_vector_fallback)
+            (query_type == QueryType.STATISTICAL and turn.sql_failed and self._enable_vector_fallback)
         )
 
         if should_use_vector:
-            if sql_failed and query_type == QueryType.STATISTICAL:
+            if turn.sql_failed and query_type == QueryType.STATISTICAL:
                 logger.info("SQL fallback activated - using vector search for statistical query")
             else:
                 logger.info(f"Routing to vector search (query_type: {query_type.value})")
+        return should_use_vector
 
-            search_results = self.search(
-                query=effective_query,
-                k=adaptive_k,
-                min_score=request.min_score,
-                max_expansions=classification.max_expansions,  # Pass pre-computed expansion limit
+    def _build_vector_context(self, search_results: list[SearchResult]) -> str:
+        """Format vector search context with a source quality assessment (Phase 18)."""
+        if not search_results:
+            return ""
+
+        # Assess source quality
+        quality_assessment = self._assess_source_quality(search_results, min_acceptable_score=50.0)
+
+        # Build quality warning prefix based on level
+        if quality_assessment["quality_level"] == "low":
+            quality_prefix = (
+                f"⚠️ SOURCE QUALITY WARNING: Retrieved sources have low similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
+                f"Instructions: If sources contain ANY relevant information, provide a PARTIAL answer starting with: "
+                f"'I have limited information about this topic. Based on the available sources:' "
+                f"Otherwise, respond: 'I do not have sufficient information to answer this question reliably.'\n\n"
+            )
+        elif quality_assessment["quality_level"] == "medium":
+            quality_prefix = (
+                f"ℹ️ SOURCE QUALITY: Retrieved sources have moderate similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
+                f"Instructions: Answer using available information. If aspects are missing, acknowledge: "
+                f"'The sources provide information about X but not about Y.'\n\n"
+            )
+        else:  # high quality
+            quality_prefix = (
+                f"✅ SOURCE QUALITY: Retrieved sources have high similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
+                f"Instructions: Answer confidently using the high-quality sources.\n\n"
             )
 
-            # Format vector search context with quality assessment (Phase 18)
-            if search_results:
-                # Assess source quality
-                quality_assessment = self._assess_source_quality(search_results, min_acceptable_score=50.0)
-
-                # Build quality warning prefix based on level
-                quality_prefix = ""
-                if quality_assessment["quality_level"] == "low":
-                    quality_prefix = (
-                        f"⚠️ SOURCE QUALITY WARNING: Retrieved sources have low similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
-                        f"Instructions: If sources contain ANY relevant information, provide a PARTIAL answer starting with: "
-                        f"'I have limited information about this topic. Based on the available sources:' "
-                        f"Otherwise, respond: 'I do not have sufficient information to answer this question reliably.'\n\n"
-                    )
-                elif quality_assessment["quality_level"] == "medium":
-                    quality_prefix = (
-                        f"ℹ️ SOURCE QUALITY: Retrieved sources have moderate similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
-                        f"Instructions: Answer using available information. If aspects are missing, acknowledge: "
-                        f"'The sources provide information about X but not about Y.'\n\n"
-                    )
-                else:  # high quality
-                    quality_prefix = (
-                        f"✅ SOURCE QUALITY: Retrieved sources have high similarity (avg: {quality_assessment['avg_score']:.1f}%).\n"
-                        f"Instructions: Answer confidently using the high-quality sources.\n\n"
-                    )
+        logger.info(f"Source quality: {quality_assessment['quality_level']} (avg: {quality_assessment['avg_score']:.1f}%)")
 
-                logger.info(f"Source quality: {quality_assessment['quality_level']} (avg: {quality_assessment['avg_score']:.1f}%)")
+        # Prepend quality context to vector_context
+        return quality_prefix + self._fallback_vector_context(search_results)
 
-                # Prepend quality context to vector_context
-                vector_context = quality_prefix + "\n\n---\n\n".join(
-                    [f"Source: {r.source} (Score: {r.score:.1f}%)\n{r.text}" for r in search_results]
-                )
+    @staticmethod
+    def _fallback_vector_context(search_results: list[SearchResult]) -> str:
+        """Plain vector context (sources and text, no quality prefix)."""
+        return "\n\n---\n\n".join(
+            [f"Source: {r.source} (Score: {r.score:.1f}%)\n{r.text}" for r in search_results]
+        )
 
-        # Select prompt template and format context based on query type
-        if query_type == QueryType.STATISTICAL and sql_success:
+    @staticmethod
+    def _select_prompt(turn: "_ChatTurn") -> tuple[str, Optional[str]]:
+        """Select prompt template and context for the query type.
+
+        Returns:
+            (template, context); context is None for HYBRID_PROMPT, which takes
+            sql_context and vector_context separately
+        """
+        query_type = turn.query_type
+        if query_type == QueryType.STATISTICAL and turn.sql_success:
             # SQL-only: Use SQL_ONLY_PROMPT
-            prompt_template = SQL_ONLY_PROMPT
-            context = sql_context
-        elif query_type == QueryType.HYBRID and sql_success and vector_context:
+            return SQL_ONLY_PROMPT, turn.sql_context
+        if query_type == QueryType.HYBRID and turn.sql_success and turn.vector_context:
             # Hybrid: Use HYBRID_PROMPT with separate SQL and vector sections
-            prompt_template = HYBRID_PROMPT
-            # HYBRID_PROMPT expects separate sql_context and vector_context parameters
-            # We'll handle this in generate_response call
-            context = None  # Signal to use sql_context + vector_context
-        elif query_type == QueryType.CONTEXTUAL and vector_context:
+            return HYBRID_PROMPT, None
+        if query_type == QueryType.CONTEXTUAL and turn.vector_context:
             # Contextual: Use CONTEXTUAL_PROMPT
-            prompt_template = CONTEXTUAL_PROMPT
-            context = vector_context
-        else:
-            # Fallback: Use default SYSTEM_PROMPT_TEMPLATE
-            prompt_template = SYSTEM_PROMPT_TEMPLATE
-            # Combine contexts for fallback
-            context_parts = []
-            if sql_context:
-                context_parts.append(f"STATISTICAL DATA (FROM SQL DATABASE):\n{sql_context}")
-            if vector_context:
-                context_parts.append(f"DOCUMENTS AND ANALYSIS:\n{vector_context}")
-            context = "\n\n=== === ===\n\n".join(context_parts) if context_parts else "No relevant information found."
+            return CONTEXTUAL_PROMPT, turn.vector_context
 
-        # Generate response with appropriate prompt
-        if context is None:
-            # HYBRID case: pass sql_context and vector_context separately
-            answer = self.generate_response_hybrid(
-                query=query,
-                sql_context=sql_context,
-                vector_context=vector_context,
-                conversation_history=conversation_history,
-            )
-        else:
-            # All other cases: use standard generate_response
-            answer = self.generate_response(
-                query=query,
-                context=context,
-                conversation_history=conversation_history,
-                prompt_template=prompt_template,
-            )
+        # Fallback: Use default SYSTEM_PROMPT_TEMPLATE and combine contexts
+        context_parts = []
+        if turn.sql_context:
+            context_parts.append(f"STATISTICAL DATA (FROM SQL DATABASE):\n{turn.sql_context}")
+        if turn.vector_context:
+            context_parts.append(f"DOCUMENTS AND ANALYSIS:\n{turn.vector_context}")
+        context = "\n\n=== === ===\n\n".join(context_parts) if context_parts else "No relevant information found."
+        return SYSTEM_PROMPT_TEMPLATE, context
 
-        # SMART FALLBACK: If SQL succeeded but LLM couldn't USE the data, retry with vector search
-        # Only trigger if LLM explicitly says it can't PARSE/USE provided data, NOT when data doesn't exist
+    @staticmethod
+    def _llm_declined_sql(turn: "_ChatTurn") -> bool:
+        """Whether SQL succeeded but the LLM said it couldn't use the data.
+
+        Only triggers if the LLM explicitly says it can't PARSE/USE provided
+        data, NOT when data doesn't exist.
+        """
         decline_phrases = [
             "cannot parse",
             "unable to interpret the data",
@@ -1344,101 +2548,193 @@ class ChatService:
             "no statistical data provided",  # LLM didn't see SQL context
             "the data format is unclear",
         ]
-        should_fallback = sql_success and not sql_failed and any(phrase in answer.lower() for phrase in decline_phrases)
-
-        if should_fallback:
-            logger.warning("SQL succeeded but LLM couldn't parse results - retrying with vector search")
-
-            # Get vector search results (if not already retrieved)
-            if not search_results:
-                search_results = self.search(
-                    query=effective_query,
-                    k=adaptive_k,
-                    min_score=request.min_score,
-                    max_expansions=classification.max_expansions,  # Pass pre-computed expansion limit
-                )
+        return (
+            turn.sql_success
+            and not turn.sql_failed
+            and any(phrase in turn.answer.lower() for phrase in decline_phrases)
+        )
 
-            if search_results:
-                # Retry with vector context using CONTEXTUAL_PROMPT
-                fallback_vector_context = "\n\n---\n\n".join(
-                    [f"Source: {r.source} (Score: {r.score:.1f}%)\n{r.text}" for r in search_results]
-                )
+    def _postprocess_answer(self, turn: "_ChatTurn") -> None:
+        """Strip hedging from statistical answers and format citations."""
+        turn.answer = self._format_answer(turn.answer, turn.query_type)
 
-                # Regenerate response with vector context
-                answer = self.generate_response(
-                    query=query,
-                    context=fallback_vector_context,
-                    conversation_history=conversation_history,
-                    prompt_template=CONTEXTUAL_PROMPT,
-                )
-                logger.info("Vector search fallback succeeded")
-
-        # Apply post-processing to answer
+    def _format_answer(self, answer: str, query_type: Any) -> str:
+        """Answer text as shown to the user (also applied piece by piece when streaming)."""
         # Issue #6: Remove excessive hedging language from statistical responses
         if query_type in (QueryType.STATISTICAL, QueryType.HYBRID):
             answer = self._remove_excessive_hedging(answer)
 
         # Apply superscript formatting to citations (Phase 18)
-        answer = self._format_superscript_citations(answer)
+        return self._format_superscript_citations(answer)
 
-        # Calculate processing time
-        processing_time_ms = (time.time() - start_time) * 1000
+    def _build_visualization(self, turn: "_ChatTurn") -> Optional[Visualization]:
+        """Chart for statistical queries with SQL results (None if not applicable or on failure)."""
+        if turn.query_type not in (QueryType.STATISTICAL, QueryType.HYBRID):
+            return None
 
-        # Generate visualization for statistical queries with SQL results
-        visualization = None
-        if query_type in (QueryType.STATISTICAL, QueryType.HYBRID):
-            if sql_success and sql_result_data:
-                try:
-                    logger.info("Generating visualization for SQL results")
-                    viz_data = self.visualization_service.generate_visualization(
-                        query=query,
-                        sql_result=sql_result_data
-                    )
-                    visualization = Visualization(
-                        pattern=viz_data["pattern"],
-                        viz_type=viz_data["viz_type"],
-                        plot_json=viz_data["plot_json"],
-                        plot_html=viz_data["plot_html"],
-                    )
-                    logger.info(f"Visualization generated: {viz_data['viz_type']} ({viz_data['pattern']})")
-                except Exception as e:
-                    # Don't fail the whole request if visualization fails
-                    logger.warning(f"Visualization generation failed: {e}")
+        if not (turn.sql_success and turn.sql_result_data):
+            # Log why visualization was skipped
+            if not turn.sql_success:
+                logger.info(
+                    "Visualization skipped: SQL query failed, used vector fallback. "
+                    "Visualizations require structured data from SQL results."
+                )
             else:
-                # Log why visualization was skipped
-                if not sql_success:
-                    logger.info(
-                        "Visualization skipped: SQL query failed, used vector fallback. "
-                        "Visualizations require structured data from SQL results."
-                    )
-                elif not sql_result_data:
-                    logger.info("Visualization skipped: SQL query returned no results")
+                logger.info("Visualization skipped: SQL query returned no results")
+            return None
 
-        # Auto-save interaction for conversation history (enables follow-up resolution)
-        if request.conversation_id:
-            response_sources = search_results if request.include_sources else []
-            self._save_interaction(
-                query=query,
-                response=answer,
-                sources=response_sources,
-                processing_time_ms=processing_time_ms,
-                conversation_id=request.conversation_id,
-                turn_number=request.turn_number,
+        try:
+            logger.info("Generating visualization for SQL results")
+            with stage(latency.VISUALIZATION):
+                viz_data = self.visualization_service.generate_visualization(
+                    query=turn.query,
+                    sql_result=turn.sql_result_data
+                )
+            logger.info(f"Visualization generated: {viz_data['viz_type']} ({viz_data['pattern']})")
+            return Visualization(
+                pattern=viz_data["pattern"],
+                viz_type=viz_data["viz_type"],
+                plot_json=viz_data["plot_json"],
+                plot_html=viz_data["plot_html"],
             )
+        except Exception as e:
+            # Don't fail the whole request if visualization fails
+            logger.warning(f"Visualization generation failed: {e}")
+            return None
+
+    @staticmethod
+    def _interaction_fields(turn: "_ChatTurn", processing_time_ms: float) -> dict[str, Any]:
+        """Keyword arguments for _save_interaction()."""
+        request = turn.request
+        return {
+            "query": turn.query,
+            "response": turn.answer,
+            "sources": turn.search_results if request.include_sources else [],
+            "processing_time_ms": processing_time_ms,
+            "conversation_id": request.conversation_id,
+            "turn_number": request.turn_number,
+        }
 
+    def _build_chat_response(
+        self,
+        turn: "_ChatTurn",
+        processing_time_ms: float,
+        visualization: Optional[Visualization],
+    ) -> ChatResponse:
+        """Assemble the API response for a processed turn."""
+        request = turn.request
         # Map query_type enum to string for API response (Phase 18)
-        query_type_str = query_type.value if query_type else None
-        logger.warning(f"[DEBUG-RETURN] BEFORE ChatResponse: query_type={query_type}, query_type_str={query_type_str}, type={type(query_type)}")
+        query_type_str = turn.query_type.value if turn.query_type else None
+        logger.warning(f"[DEBUG-RETURN] BEFORE ChatResponse: query_type={turn.query_type}, query_type_str={query_type_str}, type={type(turn.query_type)}")
 
         return ChatResponse(
-            answer=answer,
-            sources=search_results if request.include_sources else [],
-            query=query,
+            answer=turn.answer,
+            sources=turn.search_results if request.include_sources else [],
+            query=turn.query,
             processing_time_ms=processing_time_ms,
             model=self._model,
             conversation_id=request.conversation_id,
             turn_number=request.turn_number,
-            generated_sql=generated_sql,
+            generated_sql=turn.generated_sql,
             visualization=visualization,
             query_type=query_type_str,
+            timings=self._response_timings(request),
         )
+
+    @staticmethod
+    def _response_timings(request: ChatRequest) -> Optional[Dict[str, float]]:
+        """Stage durations so far (ms) if the request asked for them, else None."""
+        if not request.include_timings:
+            return None
+        timings = current_timings() or {}
+        return {name: round(ms, 2) for name, ms in timings.items()}
+
+
+@dataclass
+class _ChatTurn:
+    """Intermediate state of one chat()/achat() call, filled in step by step.
+
+    Attributes:
+        request: Incoming chat request
+        query: Sanitized user query
+        effective_query: Query after follow-up rewriting (used for routing and retrieval)
+        start_time: Request start (time.time())
+        conversation_history: Formatted previous turns ("" if none)
+        classification: ClassificationResult for effective_query
+        adaptive_k: Number of chunks to retrieve
+        sql_success: SQL returned rows
+        sql_failed: SQL errored or returned nothing
+        sql_context: Formatted SQL rows for the prompt
+        generated_sql: SQL produced by the SQL tool
+        sql_result_data: Raw SQL rows (for visualization)
+        search_results: Vector search results
+        vector_context: Formatted vector context for the prompt
+        answer: Generated answer
+        response_cache_key: Response cache key after an exact-match miss (None: don't store)
+        cache_embedding: Query embedding after a semantic cache miss (None: don't store)
+        cache_scope: Semantic cache scope (route and request parameters)
+        cache_data_version: data_version at lookup time
+    """
+
+    request: ChatRequest
+    query: str
+    effective_query: str
+    start_time: float
+    conversation_history: str = ""
+    classification: Any = None  # ClassificationResult
+    adaptive_k: int = 0
+    sql_success: bool = False
+    sql_failed: bool = False
+    sql_context: str = ""
+    generated_sql: Optional[str] = None
+    sql_result_data: Optional[list[dict]] = None
+    search_results: list[SearchResult] = field(default_factory=list)
+    vector_context: str = ""
+    answer: str = ""
+    response_cache_key: Optional[str] = None
+    cache_embedding: Any = None  # np.ndarray
+    cache_scope: Optional[tuple] = None
+    cache_data_version: Optional[str] = None
+
+    @property
+    def query_type(self) -> Any:  # QueryType
+        """Classified query type."""
+        return self.classification.query_type
+
+
+class _IncrementalFormatter:
+    """Applies answer formatting to streamed text as it arrives.
+
+    The answer rewrites (hedging phrases, [n] citations, whitespace runs)
+    only match letters, digits, whitespace and brackets, so no match spans
+    a punctuation character. Text is formatted up to the last punctuation
+    mark received and the rest is held back until more arrives; the
+    concatenated output equals formatting the whole answer at once.
+    """
+
+    _BOUNDARY = re.compile(r"[^\w\s\[\]]")
+
+    def __init__(self, format_text: Callable[[str], str]):
+        """Initialize the formatter.
+
+        Args:
+            format_text: Formatting applied to each complete segment
+        """
+        self._format_text = format_text
+        self._pending = ""
+
+    def feed(self, text: str) -> str:
+        """Add streamed text; return the formatted text that is safe to emit ("" if none)."""
+        self._pending += text
+        boundaries = list(self._BOUNDARY.finditer(text))
+        if not boundaries:
+            return ""
+
+        cut = len(self._pending) - len(text) + boundaries[-1].end()
+        ready, self._pending = self._pending[:cut], self._pending[cut:]
+        return self._format_text(ready)
+
+    def flush(self) -> str:
+        """Format and return the held-back remainder (end of stream)."""
+        ready, self._pending = self._pending, ""
+        return self._format_text(ready) if ready else ""
@@ -0,0 +1,161 @@
+"""
+FILE: conversation_history.py
+STATUS: Active
+RESPONSIBILITY: In-memory ring buffers of recent conversation turns (LRU across conversations)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from src.core.config import settings
+from src.models.feedback import ConversationTurn
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConversationHistoryStats:
+    """Conversation history cache counters (since creation).
+
+    Attributes:
+        hits: History lookups answered from memory
+        misses: Lookups that had to read the database
+        evictions: Conversations dropped for capacity (least recently used first)
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from memory."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _Buffer:
+    """Last turns of one conversation.
+
+    Attributes:
+        turns: Ring buffer of turns, oldest first
+        complete: The buffer holds every turn of the conversation so far
+            (nothing was dropped and the database had no older turns)
+    """
+
+    turns: deque = field(default_factory=deque)
+    complete: bool = False
+
+
+class ConversationHistoryCache:
+    """Per-conversation ring buffers of the last turns, LRU-evicted across conversations.
+
+    ChatService appends each turn it saves and reads the prompt history
+    from here; the database is only read (with a LIMIT) when a
+    conversation is not buffered or the buffer can't answer. A buffer that
+    hasn't seen the turn just before the requested one (e.g. it was saved
+    by another API worker) is treated as a miss, so history is never
+    silently missing a turn. Thread-safe.
+    """
+
+    def __init__(self, turns_per_conversation: int, max_conversations: int | None = None):
+        """Initialize an empty cache.
+
+        Args:
+            turns_per_conversation: Ring buffer size (the prompt history limit)
+            max_conversations: Conversations kept before LRU eviction (default from settings)
+        """
+        self._turns = turns_per_conversation
+        self._max_conversations = max_conversations or settings.conversation_cache_max_conversations
+        self._buffers: OrderedDict[str, _Buffer] = OrderedDict()  # LRU order: oldest first
+        self._lock = threading.Lock()
+        self.stats = ConversationHistoryStats()
+
+    def __len__(self) -> int:
+        """Number of buffered conversations."""
+        return len(self._buffers)
+
+    def get(self, conversation_id: str, before_turn: int) -> list[ConversationTurn] | None:
+        """Last turns of a conversation before a given turn.
+
+        Args:
+            conversation_id: Conversation ID
+            before_turn: Only turns numbered below this are returned
+
+        Returns:
+            Up to turns_per_conversation turns (oldest first), or None if
+            the database must be read
+        """
+        with self._lock:
+            buffer = self._buffers.get(conversation_id)
+            if buffer is not None:
+                turns = [turn for turn in buffer.turns if turn.turn_number < before_turn]
+                seen_previous = (turns[-1].turn_number if turns else 0) >= before_turn - 1
+                if seen_previous and (len(turns) >= self._turns or buffer.complete):
+                    self._buffers.move_to_end(conversation_id)
+                    self.stats.hits += 1
+                    return turns[-self._turns :] if self._turns else []
+
+            self.stats.misses += 1
+            return None
+
+    def load(self, conversation_id: str, turns: list[ConversationTurn]) -> None:
+        """Buffer turns read from the database (replacing the conversation's buffer).
+
+        Args:
+            conversation_id: Conversation ID
+            turns: Last turns (oldest first), as returned by a query limited
+                to turns_per_conversation rows
+        """
+        with self._lock:
+            buffer = _Buffer(
+                turns=deque(turns, maxlen=self._turns),
+                complete=len(turns) < self._turns,
+            )
+            self._insert(conversation_id, buffer)
+
+    def append(self, conversation_id: str, turn: ConversationTurn) -> None:
+        """Record a saved turn.
+
+        Only conversations already buffered, or starting with this turn,
+        are updated; others are loaded from the database when next read.
+
+        Args:
+            conversation_id: Conversation ID
+            turn: Turn just saved
+        """
+        with self._lock:
+            buffer = self._buffers.get(conversation_id)
+            if buffer is None:
+                if turn.turn_number != 1:
+                    return
+                buffer = _Buffer(turns=deque(maxlen=self._turns), complete=True)
+                self._insert(conversation_id, buffer)
+
+            if buffer.turns and turn.turn_number < buffer.turns[-1].turn_number:
+                # Out of order (turn regenerated): the database has the full picture
+                del self._buffers[conversation_id]
+                return
+
+            if buffer.turns.maxlen is not None and len(buffer.turns) == buffer.turns.maxlen:
+                buffer.complete = False  # Oldest turn falls out of the ring
+            buffer.turns.append(turn)
+            self._buffers.move_to_end(conversation_id)
+
+    def clear(self) -> None:
+        """Drop all buffers (statistics are kept)."""
+        with self._lock:
+            self._buffers.clear()
+
+    def _insert(self, conversation_id: str, buffer: _Buffer) -> None:
+        """Add a buffer as most recently used, evicting over capacity (lock held)."""
+        self._buffers[conversation_id] = buffer
+        self._buffers.move_to_end(conversation_id)
+        while len(self._buffers) > self._max_conversations:
+            self._buffers.popitem(last=False)
+            self.stats.evictions += 1
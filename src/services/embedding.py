@@ -2,12 +2,18 @@
 FILE: embedding.py
 STATUS: Active
 RESPONSIBILITY: Mistral AI embedding service for vector generation
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import asyncio
 import logging
+import random
+import threading
+import time
 from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any
 
 import numpy as np
 from mistralai import Mistral
@@ -16,15 +22,60 @@ from mistralai.models import SDKError
 from src.core.config import settings
 from src.core.exceptions import EmbeddingError
 from src.core.observability import logfire
+from src.repositories.embedding_cache import EmbeddingCache
+from src.services.embedding_batcher import EmbeddingBatcher
 
 logger = logging.getLogger(__name__)
 
+# Rough characters per token for mistral-embed on English text (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+
+# Rate limited or transient gateway errors; other API errors fail immediately
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text (errs high for short texts)."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def pack_batches(texts: Sequence[str], max_items: int, max_tokens: int) -> list[tuple[int, int]]:
+    """Split texts into contiguous batches bounded by count and estimated tokens.
+
+    A text whose estimate alone exceeds max_tokens gets a batch of its own
+    (the API decides whether it is too long).
+
+    Args:
+        texts: Texts to batch, in order
+        max_items: Maximum texts per batch
+        max_tokens: Estimated token budget per batch
+
+    Returns:
+        (start, end) slice bounds of each batch, in order
+    """
+    batches: list[tuple[int, int]] = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        text_tokens = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + text_tokens > max_tokens):
+            batches.append((start, i))
+            start, tokens = i, 0
+        tokens += text_tokens
+    if start < len(texts):
+        batches.append((start, len(texts)))
+    return batches
+
 
 class EmbeddingService:
     """Service for generating embeddings via Mistral API.
 
     Handles batching, error recovery, and provides a clean interface
-    for embedding generation.
+    for embedding generation. Embeddings are cached on disk by
+    (model, sha256(text)), so only texts never embedded before reach the API.
+    Batches are packed by count and estimated tokens and sent with up to
+    max_concurrency requests in flight; rate-limited batches are retried
+    with jittered exponential backoff. Concurrent embed_query calls are
+    coalesced into shared API calls by an EmbeddingBatcher.
 
     Attributes:
         model: Embedding model name
@@ -36,6 +87,11 @@ class EmbeddingService:
         api_key: str | None = None,
         model: str | None = None,
         batch_size: int | None = None,
+        cache: EmbeddingCache | None = None,
+        use_cache: bool | None = None,
+        max_concurrency: int | None = None,
+        max_batch_tokens: int | None = None,
+        coalesce_queries: bool | None = None,
     ):
         """Initialize embedding service.
 
@@ -43,11 +99,27 @@ class EmbeddingService:
             api_key: Mistral API key (default from settings)
             model: Embedding model name (default from settings)
             batch_size: Batch size for API calls (default from settings)
+            cache: Embedding cache (created on first use if not provided)
+            use_cache: Enable the embedding cache (default from settings)
+            max_concurrency: Requests kept in flight (default from settings)
+            max_batch_tokens: Estimated token budget per request (default from settings)
+            coalesce_queries: Batch concurrent embed_query calls (default from settings)
         """
         self._api_key = api_key or settings.mistral_api_key
         self._model = model or settings.embedding_model
         self._batch_size = batch_size or settings.embedding_batch_size
         self._client: Mistral | None = None
+        self._cache = cache
+        if use_cache is None:
+            use_cache = cache is not None or bool(settings.embedding_cache_enabled)
+        self._use_cache = use_cache
+        self._max_concurrency = max_concurrency or settings.embedding_max_concurrency
+        self._max_batch_tokens = max_batch_tokens or settings.embedding_batch_max_tokens
+        if coalesce_queries is None:
+            coalesce_queries = bool(settings.embedding_coalesce_enabled)
+        self._coalesce_queries = coalesce_queries
+        self._query_batcher: EmbeddingBatcher | None = None
+        self._batcher_lock = threading.Lock()
 
     @property
     def client(self) -> Mistral:
@@ -61,6 +133,26 @@ class EmbeddingService:
         """Get embedding model name."""
         return self._model
 
+    @property
+    def cache(self) -> EmbeddingCache | None:
+        """Get embedding cache (lazy initialization, None when disabled)."""
+        if not self._use_cache:
+            return None
+        if self._cache is None:
+            self._cache = EmbeddingCache()
+        return self._cache
+
+    @property
+    def query_batcher(self) -> EmbeddingBatcher | None:
+        """Get the embed_query coalescer (lazy initialization, None when disabled)."""
+        if not self._coalesce_queries:
+            return None
+        if self._query_batcher is None:
+            with self._batcher_lock:
+                if self._query_batcher is None:
+                    self._query_batcher = EmbeddingBatcher(self.embed_batch)
+        return self._query_batcher
+
     def embed_single(self, text: str) -> np.ndarray:
         """Generate embedding for a single text.
 
@@ -80,7 +172,8 @@ class EmbeddingService:
     def embed_batch(self, texts: Sequence[str]) -> np.ndarray:
         """Generate embeddings for multiple texts.
 
-        Handles batching automatically based on batch_size setting.
+        Cached texts are served from the embedding cache; the rest (each
+        distinct text once) are sent to the API and added to the cache.
 
         Args:
             texts: Sequence of texts to embed
@@ -95,65 +188,351 @@ class EmbeddingService:
             raise EmbeddingError("No texts provided for embedding")
 
         texts_list = list(texts)
-        all_embeddings: list[list[float]] = []
+        cache = self.cache
+        if cache is None:
+            return self._request_embeddings(texts_list)
+
+        cached, missing = self._lookup_cache(cache, texts_list)
+        if not missing:
+            return self._merge_cached(texts_list, cached, {})
+
+        fresh = self._request_embeddings(missing)
+        cache.put_many(self._model, missing, fresh)
+        return self._merge_cached(texts_list, cached, dict(zip(missing, fresh, strict=True)))
+
+    @logfire.instrument("EmbeddingService.aembed_batch")
+    async def aembed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        """Async embed_batch: same caching and batching, without blocking the event loop.
+
+        Batches are sent with the Mistral async client, at most
+        max_concurrency at a time, and rate-limit backoff uses asyncio.sleep.
+        Cache reads and writes go to SQLite (a write may wait on a locked
+        file), so they run in a worker thread.
+
+        Args:
+            texts: Sequence of texts to embed
+
+        Returns:
+            Embeddings array (n_texts x embedding_dim)
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        if not texts:
+            raise EmbeddingError("No texts provided for embedding")
 
-        total_batches = (len(texts_list) + self._batch_size - 1) // self._batch_size
+        texts_list = list(texts)
+        cache = self.cache
+        if cache is None:
+            return await self._arequest_embeddings(texts_list)
+
+        cached, missing = await asyncio.to_thread(self._lookup_cache, cache, texts_list)
+        if not missing:
+            return self._merge_cached(texts_list, cached, {})
+
+        fresh = await self._arequest_embeddings(missing)
+        await asyncio.to_thread(cache.put_many, self._model, missing, fresh)
+        return self._merge_cached(texts_list, cached, dict(zip(missing, fresh, strict=True)))
+
+    def _lookup_cache(
+        self, cache: EmbeddingCache, texts_list: list[str]
+    ) -> tuple[list[np.ndarray | None], list[str]]:
+        """Split texts into cached embeddings and distinct texts still to embed."""
+        cached = cache.get_many(self._model, texts_list)
+        missing = list(dict.fromkeys(t for t, v in zip(texts_list, cached, strict=True) if v is None))
         logger.info(
-            "Generating embeddings for %d texts in %d batches",
+            "Embedding cache: %d of %d texts cached, %d to embed",
+            len(texts_list) - sum(v is None for v in cached),
             len(texts_list),
-            total_batches,
+            len(missing),
         )
+        return cached, missing
 
-        for i in range(0, len(texts_list), self._batch_size):
-            batch = texts_list[i : i + self._batch_size]
-            batch_num = (i // self._batch_size) + 1
+    @staticmethod
+    def _merge_cached(
+        texts_list: list[str],
+        cached: list[np.ndarray | None],
+        fresh_by_text: dict[str, np.ndarray],
+    ) -> np.ndarray:
+        """Assemble cached and freshly computed embeddings in input order."""
+        return np.stack(
+            [v if v is not None else fresh_by_text[t] for t, v in zip(texts_list, cached, strict=True)]
+        ).astype(np.float32, copy=False)
 
-            try:
-                logger.debug(
-                    "Processing batch %d/%d (%d texts)",
-                    batch_num,
-                    total_batches,
-                    len(batch),
+    def _request_embeddings(self, texts_list: list[str]) -> np.ndarray:
+        """Call the embeddings API, keeping up to max_concurrency batches in flight.
+
+        Batches hold at most batch_size texts and max_batch_tokens estimated
+        tokens. Results are reassembled in input order.
+
+        Args:
+            texts_list: Texts to embed
+
+        Returns:
+            Embeddings array (n_texts x embedding_dim)
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        batches = pack_batches(texts_list, self._batch_size, self._max_batch_tokens)
+        total_batches = len(batches)
+        workers = min(self._max_concurrency, total_batches)
+        logger.info(
+            "Generating embeddings for %d texts in %d batches (%d in flight)",
+            len(texts_list),
+            total_batches,
+            workers,
+        )
+
+        results: list[list[list[float]]] = [[] for _ in batches]
+        if workers <= 1:
+            for batch_num, (start, end) in enumerate(batches, 1):
+                results[batch_num - 1] = self._embed_with_retry(
+                    texts_list[start:end], batch_num, total_batches
                 )
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embed") as executor:
+                futures = {
+                    executor.submit(
+                        self._embed_with_retry, texts_list[start:end], batch_num, total_batches
+                    ): batch_num - 1
+                    for batch_num, (start, end) in enumerate(batches, 1)
+                }
+                try:
+                    for future in as_completed(futures):
+                        results[futures[future]] = future.result()
+                except BaseException:
+                    # Don't start batches that are still queued
+                    for future in futures:
+                        future.cancel()
+                    raise
+
+        return self._to_array(results)
+
+    async def _arequest_embeddings(self, texts_list: list[str]) -> np.ndarray:
+        """Async _request_embeddings: up to max_concurrency batches awaited at once.
+
+        Args:
+            texts_list: Texts to embed
+
+        Returns:
+            Embeddings array (n_texts x embedding_dim)
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        batches = pack_batches(texts_list, self._batch_size, self._max_batch_tokens)
+        total_batches = len(batches)
+        logger.info(
+            "Generating embeddings for %d texts in %d batches (async, %d in flight)",
+            len(texts_list),
+            total_batches,
+            min(self._max_concurrency, total_batches),
+        )
+
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        # gather() returns results in argument order; the first failure cancels the rest
+        tasks = [
+            asyncio.ensure_future(
+                self._aembed_with_retry(texts_list[start:end], batch_num, total_batches, semaphore)
+            )
+            for batch_num, (start, end) in enumerate(batches, 1)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return self._to_array(results)
+
+    @staticmethod
+    def _to_array(results: Sequence[list[list[float]]]) -> np.ndarray:
+        """Flatten per-batch embeddings (in batch order) into one float32 array."""
+        embeddings_array = np.array(
+            [embedding for batch in results for embedding in batch], dtype=np.float32
+        )
+        logger.info(
+            "Generated embeddings with shape %s",
+            embeddings_array.shape,
+        )
+        return embeddings_array
+
+    def _embed_with_retry(self, batch: list[str], batch_num: int, total_batches: int) -> list[list[float]]:
+        """Embed one batch, retrying rate limits and transient gateway errors.
+
+        Args:
+            batch: Texts in the batch
+            batch_num: 1-based batch number (for logs and error details)
+            total_batches: Number of batches in the request
+
+        Returns:
+            One embedding per text
 
+        Raises:
+            EmbeddingError: If the batch fails or retries are exhausted
+        """
+        logger.debug(
+            "Processing batch %d/%d (%d texts)",
+            batch_num,
+            total_batches,
+            len(batch),
+        )
+
+        attempt = 0
+        while True:
+            try:
                 response = self.client.embeddings.create(
                     model=self._model,
                     inputs=batch,
                 )
+                return self._batch_embeddings(response, batch)
+            except Exception as e:
+                delay = self._retry_delay_or_raise(e, batch_num, attempt)
+                attempt += 1
+                time.sleep(delay)
 
-                batch_embeddings = [data.embedding for data in response.data]
-                all_embeddings.extend(batch_embeddings)
+    async def _aembed_with_retry(
+        self,
+        batch: list[str],
+        batch_num: int,
+        total_batches: int,
+        semaphore: asyncio.Semaphore,
+    ) -> list[list[float]]:
+        """Async _embed_with_retry; holds a semaphore slot while the batch is in flight or backing off."""
+        async with semaphore:
+            logger.debug(
+                "Processing batch %d/%d (%d texts)",
+                batch_num,
+                total_batches,
+                len(batch),
+            )
+
+            attempt = 0
+            while True:
+                try:
+                    response = await self.client.embeddings.create_async(
+                        model=self._model,
+                        inputs=batch,
+                    )
+                    return self._batch_embeddings(response, batch)
+                except Exception as e:
+                    delay = self._retry_delay_or_raise(e, batch_num, attempt)
+                    attempt += 1
+                    await asyncio.sleep(delay)
+
+    @staticmethod
+    def _batch_embeddings(response: Any, batch: list[str]) -> list[list[float]]:
+        """Extract one embedding per text from an API response."""
+        embeddings = [data.embedding for data in response.data]
+        if len(embeddings) != len(batch):
+            raise ValueError(f"API returned {len(embeddings)} embeddings for {len(batch)} texts")
+        return embeddings
+
+    def _retry_delay_or_raise(self, error: Exception, batch_num: int, attempt: int) -> float:
+        """Decide what to do after a failed batch request.
 
-            except SDKError as e:
-                logger.error(
-                    "Mistral API error in batch %d: %s",
+        Args:
+            error: Exception raised by the request
+            batch_num: 1-based batch number
+            attempt: Retries already made for this batch
+
+        Returns:
+            Seconds to wait before retrying
+
+        Raises:
+            EmbeddingError: If the error is not retryable or retries are exhausted
+        """
+        if isinstance(error, SDKError):
+            if error.status_code in RETRYABLE_STATUS_CODES and attempt < settings.embedding_max_retries:
+                delay = self._retry_delay(error, attempt)
+                logger.warning(
+                    "Embedding batch %d got HTTP %d, retry %d/%d in %.1fs",
                     batch_num,
-                    e,
+                    error.status_code,
+                    attempt + 1,
+                    settings.embedding_max_retries,
+                    delay,
                 )
-                raise EmbeddingError(
-                    f"Embedding API error: {e}",
-                    details={"batch": batch_num},
-                ) from e
+                return delay
+
+            logger.error(
+                "Mistral API error in batch %d: %s",
+                batch_num,
+                error,
+            )
+            raise EmbeddingError(
+                f"Embedding API error: {error}",
+                details={"batch": batch_num, "attempts": attempt + 1},
+            ) from error
+
+        logger.error("Unexpected error in batch %d: %s", batch_num, error)
+        raise EmbeddingError(
+            f"Embedding failed: {error}",
+            details={"batch": batch_num},
+        ) from error
+
+    @staticmethod
+    def _retry_delay(error: SDKError, attempt: int) -> float:
+        """Backoff before retry number attempt + 1.
+
+        Full jitter (uniform in [0, initial * 2^attempt], capped) keeps
+        concurrent batches that were throttled together from retrying in
+        lockstep. A Retry-After header, when present, is a lower bound.
+        """
+        ceiling = min(
+            settings.embedding_retry_max_delay,
+            settings.embedding_retry_initial_delay * 2**attempt,
+        )
+        delay = random.uniform(0, ceiling)
 
-            except Exception as e:
-                logger.error("Unexpected error in batch %d: %s", batch_num, e)
-                raise EmbeddingError(
-                    f"Embedding failed: {e}",
-                    details={"batch": batch_num},
-                ) from e
+        retry_after = (error.headers or {}).get("retry-after")
+        if retry_after is not None:
+            try:
+                delay = max(delay, min(float(retry_after), settings.embedding_retry_max_delay))
+            except ValueError:
+                pass  # HTTP-date form: fall back to the jittered delay
+        return delay
 
-        embeddings_array = np.array(all_embeddings, dtype=np.float32)
-        logger.info(
-            "Generated embeddings with shape %s",
-            embeddings_array.shape,
-        )
+    async def aembed_single(self, text: str) -> np.ndarray:
+        """Async embed_single.
 
-        return embeddings_array
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding vector as numpy array
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        embeddings = await self.aembed_batch([text])
+        return embeddings[0]
 
     def embed_query(self, query: str) -> np.ndarray:
         """Generate embedding for a search query.
 
-        This is an alias for embed_single, provided for semantic clarity.
+        Queries arriving from concurrent requests within
+        embedding_coalesce_max_wait_ms share one API call; with coalescing
+        disabled this is embed_single.
+
+        Args:
+            query: Search query text
+
+        Returns:
+            Query embedding vector
+
+        Raises:
+            EmbeddingError: If embedding generation fails
+        """
+        batcher = self.query_batcher
+        if batcher is None:
+            return self.embed_single(query)
+        return batcher.embed(query)
+
+    async def aembed_query(self, query: str) -> np.ndarray:
+        """Async embed_query (coalesced with concurrent queries like embed_query).
 
         Args:
             query: Search query text
@@ -164,4 +543,7 @@ class EmbeddingService:
         Raises:
             EmbeddingError: If embedding generation fails
         """
-        return self.embed_single(query)
+        batcher = self.query_batcher
+        if batcher is None:
+            return await self.aembed_single(query)
+        return await batcher.aembed(query)
@@ -0,0 +1,181 @@
+"""
+FILE: embedding_batcher.py
+STATUS: Active
+RESPONSIBILITY: Micro-batching coalescer for concurrent single-query embedding calls
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BatcherStats:
+    """Embedding batcher counters (since creation).
+
+    Attributes:
+        queries: Queries submitted
+        batches: embed_batch calls made
+        max_batch: Largest batch sent
+    """
+
+    queries: int = 0
+    batches: int = 0
+    max_batch: int = 0
+
+    @property
+    def mean_batch(self) -> float:
+        """Average queries per embed_batch call."""
+        return self.queries / self.batches if self.batches else 0.0
+
+
+class EmbeddingBatcher:
+    """Coalesces concurrent query embeddings into batched embed_batch calls.
+
+    The first query of a window waits up to max_wait_ms for others; the
+    window closes early once max_batch_size queries are queued. Each batch
+    is embedded in one call on a worker thread (up to max_in_flight batches
+    at once) and the vectors are fanned back out to the waiting callers.
+    Works for threads (embed) and event loops (aembed) alike.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[Sequence[str]], np.ndarray],
+        max_wait_ms: float | None = None,
+        max_batch_size: int | None = None,
+        max_in_flight: int | None = None,
+    ):
+        """Initialize the batcher (the dispatcher thread starts on first use).
+
+        Args:
+            embed_batch: Function embedding a list of texts (EmbeddingService.embed_batch)
+            max_wait_ms: How long the first query of a batch waits for more (default from settings)
+            max_batch_size: Maximum queries per batch (default from settings)
+            max_in_flight: Batches embedded concurrently (default from settings)
+        """
+        self._embed_batch = embed_batch
+        self._max_wait = (
+            settings.embedding_coalesce_max_wait_ms if max_wait_ms is None else max_wait_ms
+        ) / 1000
+        self._max_batch_size = max_batch_size or settings.embedding_coalesce_max_batch
+        self._max_in_flight = max_in_flight or settings.embedding_max_concurrency
+
+        self._pending: list[tuple[str, Future]] = []
+        self._window_start = 0.0
+        self._condition = threading.Condition()
+        self._closed = False
+        self._dispatcher: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.stats = BatcherStats()
+
+    def submit(self, text: str) -> Future:
+        """Queue a query for the next batch.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Future resolving to the query's embedding (or its batch's exception)
+        """
+        future: Future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+            self._ensure_started()
+            if not self._pending:
+                self._window_start = time.monotonic()
+            self._pending.append((text, future))
+            self.stats.queries += 1
+            self._condition.notify()
+        return future
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a query, batched with concurrent callers (blocking)."""
+        return self.submit(text).result()
+
+    async def aembed(self, text: str) -> np.ndarray:
+        """Embed a query, batched with concurrent callers (awaitable)."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def close(self) -> None:
+        """Flush queued queries and stop the dispatcher thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+            dispatcher = self._dispatcher
+        if dispatcher is not None:
+            dispatcher.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def _ensure_started(self) -> None:
+        """Start the dispatcher thread and batch executor (condition held)."""
+        if self._dispatcher is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._max_in_flight, thread_name_prefix="embed-batch"
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch_loop, name="embed-batcher", daemon=True
+            )
+            self._dispatcher.start()
+
+    def _dispatch_loop(self) -> None:
+        """Close batch windows and hand batches to the executor."""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                deadline = self._window_start + self._max_wait
+                while len(self._pending) < self._max_batch_size and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending[: self._max_batch_size]
+                del self._pending[: self._max_batch_size]
+                # Queries left over start the next window now
+                self._window_start = time.monotonic()
+
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list[tuple[str, Future]]) -> None:
+        """Embed one batch and resolve its callers' futures."""
+        # Drop callers that gave up (e.g. cancelled requests)
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        with self._condition:
+            self.stats.batches += 1
+            self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        logger.debug("Embedding %d coalesced queries (%d distinct)", len(batch), len(texts))
+
+        try:
+            vectors = self._embed_batch(texts)
+        except BaseException as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        by_text = dict(zip(texts, vectors, strict=True))
+        for text, future in batch:
+            # Own copy per caller: duplicates must not share a buffer
+            future.set_result(by_text[text].copy())
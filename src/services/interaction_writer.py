@@ -0,0 +1,214 @@
+"""
+FILE: interaction_writer.py
+STATUS: Active
+RESPONSIBILITY: Write-behind queue batching chat interaction inserts off the request path
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+
+from src.core.config import settings
+from src.models.feedback import ChatInteractionCreate
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InteractionWriterStats:
+    """Interaction writer counters (since creation).
+
+    Attributes:
+        enqueued: Interactions submitted
+        written: Interactions committed
+        failed: Interactions lost to failed batch writes
+        batches: Transactions committed (or attempted)
+        max_batch: Largest batch written
+        max_queue_depth: Most interactions waiting at once (queued + being written)
+        backpressure_waits: Submits that blocked because the queue was full
+        backpressure_wait_ms: Total time submitters spent blocked
+    """
+
+    enqueued: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    max_batch: int = 0
+    max_queue_depth: int = 0
+    backpressure_waits: int = 0
+    backpressure_wait_ms: float = 0.0
+
+    @property
+    def mean_batch(self) -> float:
+        """Average interactions per transaction."""
+        return (self.written + self.failed) / self.batches if self.batches else 0.0
+
+
+class InteractionWriter:
+    """Persists chat interactions from a background thread in multi-row transactions.
+
+    submit() only queues the interaction; a writer thread drains the queue
+    in batches of up to batch_size, one transaction each, so requests never
+    wait on an SQLite commit and concurrent requests share one. The queue
+    is bounded: when max_queue interactions are waiting, submit() blocks
+    until the writer catches up (counted in the backpressure stats).
+    Interactions stay visible through pending() until their batch is
+    committed. close() writes everything queued before returning.
+    """
+
+    def __init__(
+        self,
+        save_batch: Callable[[Sequence[ChatInteractionCreate]], object],
+        max_queue: int | None = None,
+        batch_size: int | None = None,
+    ):
+        """Initialize the writer (the writer thread starts on first submit).
+
+        Args:
+            save_batch: Function writing a list of interactions in one
+                transaction (FeedbackRepository.save_interactions)
+            max_queue: Interactions waiting before submit() blocks (default from settings)
+            batch_size: Maximum interactions per transaction (default from settings)
+        """
+        self._save_batch = save_batch
+        self._max_queue = max_queue or settings.interaction_queue_max
+        self._batch_size = batch_size or settings.interaction_write_batch_size
+
+        self._queue: list[ChatInteractionCreate] = []
+        self._in_flight: list[ChatInteractionCreate] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._writer: threading.Thread | None = None
+        self.stats = InteractionWriterStats()
+
+    @property
+    def queue_depth(self) -> int:
+        """Interactions not yet committed (queued + being written)."""
+        with self._condition:
+            return len(self._queue) + len(self._in_flight)
+
+    def submit(self, interaction: ChatInteractionCreate) -> None:
+        """Queue an interaction for writing, blocking while the queue is full.
+
+        Args:
+            interaction: Interaction to persist
+
+        Raises:
+            RuntimeError: If the writer is closed
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("InteractionWriter is closed")
+            self._ensure_started()
+
+            if len(self._queue) >= self._max_queue:
+                self.stats.backpressure_waits += 1
+                wait_start = time.monotonic()
+                while len(self._queue) >= self._max_queue and not self._closed:
+                    self._condition.wait()
+                self.stats.backpressure_wait_ms += (time.monotonic() - wait_start) * 1000
+                if self._closed:
+                    raise RuntimeError("InteractionWriter is closed")
+
+            self._queue.append(interaction)
+            self.stats.enqueued += 1
+            self.stats.max_queue_depth = max(
+                self.stats.max_queue_depth, len(self._queue) + len(self._in_flight)
+            )
+            self._condition.notify_all()
+
+    def pending(self, conversation_id: str) -> list[ChatInteractionCreate]:
+        """Interactions of a conversation that are not committed yet.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            Queued and in-flight interactions in submission order
+        """
+        with self._condition:
+            return [
+                interaction
+                for interaction in (*self._in_flight, *self._queue)
+                if interaction.conversation_id == conversation_id
+            ]
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every interaction submitted so far is written.
+
+        Args:
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._queue or self._in_flight:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write queued interactions and stop the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the queue to drain (None = no limit)
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            writer = self._writer
+        if writer is not None:
+            writer.join(timeout)
+            if writer.is_alive():
+                logger.error("Interaction writer did not drain within %.1fs (%d unwritten)", timeout, self.queue_depth)
+
+    def _ensure_started(self) -> None:
+        """Start the writer thread (condition held)."""
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="interaction-writer", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self) -> None:
+        """Drain the queue in batches until closed and empty."""
+        while True:
+            with self._condition:
+                while not self._queue and not self._closed:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                self._in_flight = self._queue[: self._batch_size]
+                del self._queue[: self._batch_size]
+                # Room in the queue: wake blocked submitters
+                self._condition.notify_all()
+                batch = self._in_flight
+
+            self._write_batch(batch)
+
+            with self._condition:
+                self._in_flight = []
+                self._condition.notify_all()
+
+    def _write_batch(self, batch: list[ChatInteractionCreate]) -> None:
+        """Write one batch in a single transaction (failures are logged, not raised)."""
+        try:
+            self._save_batch(batch)
+        except Exception as e:
+            logger.error("Failed to write %d chat interactions: %s", len(batch), e)
+            with self._condition:
+                self.stats.batches += 1
+                self.stats.failed += len(batch)
+            return
+
+        with self._condition:
+            self.stats.batches += 1
+            self.stats.written += len(batch)
+            self.stats.max_batch = max(self.stats.max_batch, len(batch))
+        logger.debug("Wrote %d chat interactions in one transaction", len(batch))
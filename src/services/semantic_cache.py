@@ -0,0 +1,222 @@
+"""
+FILE: semantic_cache.py
+STATUS: Active
+RESPONSIBILITY: Semantic answer cache - reuses ChatResponses for paraphrased questions (FAISS similarity)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+
+import faiss
+import numpy as np
+
+from src.core.config import settings
+from src.models.chat import ChatResponse
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SemanticCacheStats:
+    """Semantic answer cache counters (since creation).
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups with no entry above the similarity threshold
+        bypasses: Requests that skipped the cache (e.g. inside conversations)
+        stores: Responses added
+        evictions: Entries dropped for capacity (least recently used first)
+        expirations: Entries dropped for age (TTL) or a changed data version
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _CacheEntry:
+    """A cached response and what it is valid for."""
+
+    query: str
+    scope: Hashable
+    data_version: str
+    response: ChatResponse
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """ChatResponses keyed by query embedding, matched by cosine similarity.
+
+    Query embeddings are L2-normalized and kept in a small exact FAISS
+    inner-product index. A lookup returns the most similar entry above the
+    threshold whose scope (route and request parameters) and data version
+    match; entries for an older data version, or older than the TTL, are
+    dropped when encountered. Capacity is bounded with LRU eviction.
+    Thread-safe.
+    """
+
+    # Nearest entries examined per lookup (others may be for another scope)
+    CANDIDATES = 8
+
+    def __init__(
+        self,
+        threshold: float | None = None,
+        ttl_seconds: float | None = None,
+        max_entries: int | None = None,
+    ):
+        """Initialize an empty cache (the index is created on first store).
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (default from settings)
+            ttl_seconds: Entry lifetime in seconds, 0 = no expiry (default from settings)
+            max_entries: Capacity before LRU eviction (default from settings)
+        """
+        self._threshold = settings.semantic_cache_threshold if threshold is None else threshold
+        self._ttl = settings.semantic_cache_ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._max_entries = max_entries or settings.semantic_cache_max_entries
+
+        self._index: faiss.IndexIDMap2 | None = None
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()  # LRU order: oldest first
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = SemanticCacheStats()
+
+    def __len__(self) -> int:
+        """Number of cached responses."""
+        return len(self._entries)
+
+    def lookup(
+        self, embedding: np.ndarray, scope: Hashable, data_version: str
+    ) -> tuple[ChatResponse, float] | None:
+        """Find a cached response for a similar query.
+
+        Args:
+            embedding: Query embedding
+            scope: Route and request parameters the response must match
+            data_version: Current data version (entries for other versions are stale)
+
+        Returns:
+            (cached response, similarity) or None on a miss
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            match = self._best_match(vector, scope, data_version)
+            if match is None:
+                self.stats.misses += 1
+                return None
+
+            entry_id, similarity = match
+            self._entries.move_to_end(entry_id)
+            self.stats.hits += 1
+            return self._entries[entry_id].response, similarity
+
+    def store(
+        self,
+        query: str,
+        embedding: np.ndarray,
+        scope: Hashable,
+        data_version: str,
+        response: ChatResponse,
+    ) -> None:
+        """Cache a response (replacing an equivalent entry for the same scope).
+
+        Args:
+            query: Query the response answers (for logging)
+            embedding: Query embedding
+            scope: Route and request parameters the response was produced with
+            data_version: Data version the response was produced from
+            response: Response to return for similar queries
+        """
+        vector = self._normalize(embedding)
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(vector.shape[1]))
+
+            # Concurrent misses for one question would otherwise add duplicates
+            duplicate = self._best_match(vector, scope, data_version)
+            if duplicate is not None:
+                self._remove(duplicate[0])
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._index.add_with_ids(vector, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = _CacheEntry(
+                query=query,
+                scope=scope,
+                data_version=data_version,
+                response=response,
+                created_at=time.monotonic(),
+            )
+            self.stats.stores += 1
+
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+        logger.debug("Semantic cache stored '%s' (%d entries)", query[:50], len(self._entries))
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache."""
+        with self._lock:
+            self.stats.bypasses += 1
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)."""
+        with self._lock:
+            if self._index is not None:
+                self._index.reset()
+            self._entries.clear()
+
+    def _best_match(
+        self, vector: np.ndarray, scope: Hashable, data_version: str
+    ) -> tuple[int, float] | None:
+        """Most similar live entry above the threshold for scope (lock held).
+
+        Stale entries (expired or for another data version) found among the
+        candidates are removed.
+        """
+        if not self._entries:
+            return None
+
+        k = min(self.CANDIDATES, len(self._entries))
+        similarities, ids = self._index.search(vector, k)
+        now = time.monotonic()
+        for similarity, entry_id in zip(similarities[0], ids[0], strict=True):
+            if entry_id < 0 or similarity < self._threshold:
+                break  # Results are sorted by similarity
+            entry = self._entries[int(entry_id)]
+            if entry.data_version != data_version or (self._ttl and now - entry.created_at > self._ttl):
+                self._remove(int(entry_id))
+                self.stats.expirations += 1
+                continue
+            if entry.scope == scope:
+                return int(entry_id), float(similarity)
+        return None
+
+    def _remove(self, entry_id: int) -> None:
+        """Remove an entry from the index and the LRU (lock held)."""
+        self._index.remove_ids(np.array([entry_id], dtype=np.int64))
+        del self._entries[entry_id]
+
+    @staticmethod
+    def _normalize(embedding: np.ndarray) -> np.ndarray:
+        """(1, dim) float32 unit vector (inner product = cosine similarity)."""
+        vector = np.array(embedding, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(vector)
+        return vector
@@ -0,0 +1,393 @@
+"""
+FILE: sql_cache.py
+STATUS: Active
+RESPONSIBILITY: Generated SQL cache keyed by question and entity-slot skeleton (in-memory LRU + SQLite)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.core.config import settings
+from src.tools.sql_templates import CompiledSQL, QuestionSkeleton, Slot, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Evict down to this fraction of max_entries, so eviction doesn't run on every put
+EVICTION_TARGET = 0.9
+
+_EXACT = "exact"
+_SKELETON = "skeleton"
+
+# String literals ('' escapes a quote) and numeric literals outside identifiers
+_STRING_LITERAL = re.compile(r"('(?:[^']|'')*')")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?![\w.])")
+
+_NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv"})
+
+
+@dataclass
+class SQLCacheStats:
+    """SQL cache counters (since the cache was opened).
+
+    Attributes:
+        exact_hits: Lookups answered by the SQL of the same question
+        skeleton_hits: Lookups answered by filling another question's template
+        misses: Lookups left to the LLM
+        stale: Entries dropped because the schema or prompt version changed
+        stores: Generated queries written
+        templates: Stores that also produced a reusable skeleton template
+        evictions: Entries evicted from disk for capacity
+    """
+
+    exact_hits: int = 0
+    skeleton_hits: int = 0
+    misses: int = 0
+    stale: int = 0
+    stores: int = 0
+    templates: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total hits (exact + skeleton)."""
+        return self.exact_hits + self.skeleton_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def slot_forms(slot: Slot) -> dict[str, str]:
+    """Ways generated SQL refers to an entity (full name, last name, abbreviation, ...).
+
+    Args:
+        slot: Player or team slot
+
+    Returns:
+        Form name -> text, most specific first
+    """
+    if slot.kind == "player":
+        words = str(slot.value).split()
+        if len(words) > 2 and normalize_text(words[-1]) in _NAME_SUFFIXES:
+            words = words[:-1]
+        return {"full": str(slot.value), "last": words[-1], "first": words[0]}
+    if slot.kind == "team":
+        words = slot.name.split()
+        forms = {"abbreviation": str(slot.value)}
+        if words:
+            forms.update({"name": slot.name, "nickname": words[-1]})
+        if len(words) > 1:
+            forms["city"] = " ".join(words[:-1])
+        return forms
+    return {}
+
+
+def parameterize(sql: str, slots: tuple[Slot, ...]) -> tuple[str, dict[str, dict[str, Any]]] | None:
+    """Turn generated SQL into a template over the question's entity slots.
+
+    String literals naming a player or team ('LeBron James', '%Curry%',
+    'LAL') and the numeric literal equal to each number slot become named
+    parameters. The SQL is only templated when every slot is found
+    unambiguously; otherwise a different entity could not be substituted
+    safely.
+
+    Args:
+        sql: SQL generated for the question
+        slots: Entities of the question (QuestionSkeleton.slots)
+
+    Returns:
+        (template with :s0, :s1, ... parameters, parameter specs), or None
+    """
+    if not slots or ":" in sql:
+        return None  # Nothing to abstract, or text that would read as a bind parameter
+
+    segments = _STRING_LITERAL.split(sql)
+    code = [segment for segment in segments if not segment.startswith("'")]
+    number_slots = {i: float(slot.value) for i, slot in enumerate(slots) if slot.kind == "number"}
+    if len(set(number_slots.values())) != len(number_slots):
+        return None
+    for value in number_slots.values():
+        matches = sum(float(m) == value for segment in code for m in _NUMBER_LITERAL.findall(segment))
+        if matches != 1:
+            return None
+
+    specs: dict[str, dict[str, Any]] = {}
+    found: set[int] = set()
+
+    def add(spec: dict[str, Any]) -> str:
+        name = f"s{len(specs)}"
+        specs[name] = spec
+        found.add(spec["slot"])
+        return f":{name}"
+
+    def number(match: re.Match) -> str:
+        for i, value in number_slots.items():
+            if float(match.group(0)) == value:
+                return add({"slot": i, "form": "number"})
+        return match.group(0)
+
+    pieces = []
+    for segment in segments:
+        if not segment.startswith("'"):
+            pieces.append(_NUMBER_LITERAL.sub(number, segment))
+            continue
+        spec = _match_literal(segment[1:-1].replace("''", "'"), slots)
+        if spec is False:
+            return None
+        pieces.append(segment if spec is None else add(spec))
+
+    if len(found) != len(slots):
+        return None
+    return "".join(pieces), specs
+
+
+def _match_literal(text: str, slots: tuple[Slot, ...]) -> dict[str, Any] | None | bool:
+    """Parameter spec of a string literal naming a slot (None: no slot, False: ambiguous)."""
+    core = text.strip("%")
+    normalized = normalize_text(core)
+    if not normalized:
+        return None
+
+    matches = []
+    for i, slot in enumerate(slots):
+        for form, value in slot_forms(slot).items():
+            if normalize_text(value) == normalized:
+                matches.append((i, form))
+                break
+    if not matches:
+        return None
+    if len(matches) > 1:
+        return False
+    i, form = matches[0]
+    prefix = text[: len(text) - len(text.lstrip("%"))]
+    suffix = text[len(text.rstrip("%")):]
+    return {"slot": i, "form": form, "prefix": prefix, "suffix": suffix}
+
+
+def fill(specs: dict[str, dict[str, Any]], slots: tuple[Slot, ...]) -> dict[str, Any] | None:
+    """Parameter values of a template for another question's entities.
+
+    Args:
+        specs: Parameter specs from parameterize()
+        slots: Entities of the new question (same skeleton)
+
+    Returns:
+        Parameter values, or None if an entity lacks a form the template uses
+    """
+    params: dict[str, Any] = {}
+    for name, spec in specs.items():
+        if spec["slot"] >= len(slots):
+            return None
+        slot = slots[spec["slot"]]
+        if spec["form"] == "number":
+            if slot.kind != "number":
+                return None
+            value = float(slot.value)
+            params[name] = int(value) if value.is_integer() else value
+            continue
+        text = slot_forms(slot).get(spec["form"])
+        if text is None:
+            return None
+        params[name] = f"{spec['prefix']}{text}{spec['suffix']}"
+    return params
+
+
+class SQLCache:
+    """LLM-generated SQL keyed by question, with a second tier keyed by skeleton.
+
+    Exact tier: the normalized question maps to the SQL generated for it.
+    Skeleton tier: the question with players, teams and numbers replaced
+    by slots maps to that SQL with the entity literals turned into bound
+    parameters, so "How many assists did Trae Young record?" reuses the
+    query generated for Chris Paul. Entries record the cache version
+    (schema + prompt); entries of another version are stale and deleted.
+    Stored in SQLite (WAL mode, shared by all API workers) with an
+    in-memory LRU in front; the disk tier is bounded by entry count,
+    evicting least recently read entries first.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        path: Path | None = None,
+        max_entries: int | None = None,
+        memory_items: int | None = None,
+    ):
+        """Open (or create) the cache and drop entries of other versions.
+
+        Args:
+            version: Schema and prompt version of the SQL generator
+            path: SQLite file (default from settings)
+            max_entries: Disk capacity in entries (default from settings)
+            memory_items: In-memory LRU capacity (default from settings)
+        """
+        self._version = version
+        self._path = path or settings.sql_cache_path
+        self._max_entries = max_entries or settings.sql_cache_max_entries
+        self._memory_items = settings.sql_cache_memory_items if memory_items is None else memory_items
+        self._memory: OrderedDict[str, tuple[str, dict[str, dict[str, Any]]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = SQLCacheStats()
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS generated_sql (
+                key TEXT PRIMARY KEY,
+                version TEXT NOT NULL,
+                sql TEXT NOT NULL,
+                params TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_generated_sql_last_used ON generated_sql(last_used)")
+        stale = self._conn.execute("DELETE FROM generated_sql WHERE version != ?", (version,)).rowcount
+        self._conn.commit()
+        if stale:
+            self.stats.stale += stale
+            logger.info("SQL cache dropped %d entries from another schema/prompt version", stale)
+
+    @staticmethod
+    def _key(tier: str, text: str) -> str:
+        return f"{tier}:{text}"
+
+    def __len__(self) -> int:
+        """Number of entries on disk."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM generated_sql").fetchone()[0]
+
+    def get(self, question: str, skeleton: QuestionSkeleton | None = None) -> CompiledSQL | None:
+        """Look up SQL for a question (exact tier, then skeleton tier).
+
+        Args:
+            question: Natural language question
+            skeleton: Entity skeleton of the question (None: exact tier only)
+
+        Returns:
+            Cached SQL (shape cache_exact or cache_skeleton), or None on a miss
+        """
+        with self._lock:
+            entry = self._read(self._key(_EXACT, normalize_text(question)))
+            if entry is not None:
+                self.stats.exact_hits += 1
+                return CompiledSQL("cache_exact", entry[0])
+
+            if skeleton is not None and skeleton.slots:
+                entry = self._read(self._key(_SKELETON, skeleton.text))
+                params = fill(entry[1], skeleton.slots) if entry is not None else None
+                if params is not None:
+                    self.stats.skeleton_hits += 1
+                    return CompiledSQL("cache_skeleton", entry[0], params)
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, question: str, sql: str, skeleton: QuestionSkeleton | None = None) -> None:
+        """Store SQL generated for a question (and its template, if the entities can be slotted).
+
+        Args:
+            question: Natural language question
+            sql: SQL the LLM generated (and that executed successfully)
+            skeleton: Entity skeleton of the question
+        """
+        entries = [(self._key(_EXACT, normalize_text(question)), sql, {})]
+        template = parameterize(sql, skeleton.slots) if skeleton is not None else None
+        if template is not None:
+            entries.append((self._key(_SKELETON, skeleton.text), *template))
+
+        now = time.time()
+        with self._lock:
+            for key, entry_sql, specs in entries:
+                self._remember(key, entry_sql, specs)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO generated_sql (key, version, sql, params, last_used) VALUES (?, ?, ?, ?, ?)",
+                [(key, self._version, entry_sql, json.dumps(specs), now) for key, entry_sql, specs in entries],
+            )
+            self._conn.commit()
+            self.stats.stores += 1
+            self.stats.templates += template is not None
+            self._evict()
+
+    def clear(self) -> None:
+        """Delete all cached SQL (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM generated_sql")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _read(self, key: str) -> tuple[str, dict[str, dict[str, Any]]] | None:
+        """Entry from memory or disk (lock held); entries of another version are deleted."""
+        cached = self._memory.get(key)
+        if cached is not None:
+            self._memory.move_to_end(key)
+            return cached
+
+        row = self._conn.execute(
+            "SELECT version, sql, params FROM generated_sql WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        version, sql, params = row
+        if version != self._version:
+            # Written by a worker running another prompt version
+            self._conn.execute("DELETE FROM generated_sql WHERE key = ?", (key,))
+            self._conn.commit()
+            self.stats.stale += 1
+            return None
+
+        self._conn.execute("UPDATE generated_sql SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        entry = (sql, json.loads(params))
+        self._remember(key, *entry)
+        return entry
+
+    def _remember(self, key: str, sql: str, specs: dict[str, dict[str, Any]]) -> None:
+        """Insert into the in-memory LRU (lock held)."""
+        if self._memory_items == 0:
+            return
+        self._memory[key] = (sql, specs)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_items:
+            self._memory.popitem(last=False)
+
+    def _evict(self) -> None:
+        """Delete least recently used entries down to EVICTION_TARGET * max_entries (lock held)."""
+        # Other processes share the file: count rows rather than tracking puts
+        count = self._conn.execute("SELECT COUNT(*) FROM generated_sql").fetchone()[0]
+        if count <= self._max_entries:
+            return
+
+        excess = count - int(self._max_entries * EVICTION_TARGET)
+        victims = [
+            key
+            for (key,) in self._conn.execute(
+                "SELECT key FROM generated_sql ORDER BY last_used LIMIT ?", (excess,)
+            ).fetchall()
+        ]
+        self._conn.executemany("DELETE FROM generated_sql WHERE key = ?", [(key,) for key in victims])
+        self._conn.commit()
+        for key in victims:
+            self._memory.pop(key, None)
+        self.stats.evictions += len(victims)
+        logger.info("SQL cache evicted %d entries", len(victims))
@@ -0,0 +1,276 @@
+"""
+FILE: sql_executor.py
+STATUS: Active
+RESPONSIBILITY: Read-only SQLite execution on pooled connections (typed rows, row cap, deadlines, plan check)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+from src.core.config import settings
+from src.core.exceptions import QueryCancelledError, QueryRejectedError
+
+logger = logging.getLogger(__name__)
+
+# SQLite calls the progress handler every this many virtual machine instructions
+PROGRESS_INTERVAL = 1000
+
+# Table references with an optional alias ("FROM players p", "JOIN player_stats AS ps")
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", re.IGNORECASE)
+_NOT_ALIASES = frozenset({
+    "where", "join", "on", "using", "left", "right", "inner", "outer", "cross", "natural", "full",
+    "group", "order", "limit", "having", "union", "except", "intersect", "window",
+})
+
+
+@dataclass
+class QueryResult:
+    """Rows of a query as SQLite returned them (int, float, str, bytes or None).
+
+    Attributes:
+        columns: Column names in select order
+        rows: Row tuples
+        truncated: Whether rows were dropped by the row cap
+    """
+
+    columns: list[str]
+    rows: list[tuple] = field(default_factory=list)
+    truncated: bool = False
+
+    def as_dicts(self) -> list[dict[str, Any]]:
+        """Rows as column -> value dictionaries."""
+        columns = self.columns
+        return [dict(zip(columns, row, strict=True)) for row in self.rows]
+
+
+class ReadOnlySQLExecutor:
+    """Runs queries on a pool of read-only connections to a SQLite file.
+
+    Connections are opened with mode=ro and PRAGMA query_only, so even a
+    generated statement that slips past validation cannot modify the
+    database. Idle connections are kept for reuse (up to pool_size);
+    a burst beyond that opens extra connections that are closed after
+    use. Rows are fetched as tuples with the cursor's column names, so
+    values keep their SQLite types. Thread-safe.
+
+    Runaway queries are stopped inside SQLite rather than waited out:
+    before running, EXPLAIN QUERY PLAN estimates the rows visited by
+    nested full-scan loops and rejects plans above max_plan_cost; while
+    running, a progress handler interrupts the query at its deadline,
+    when it exceeds its instruction budget, or when the caller sets its
+    cancel event.
+    """
+
+    def __init__(self, db_path: str, pool_size: int | None = None):
+        """Initialize the executor (connections open on first use).
+
+        Args:
+            db_path: Path to the SQLite database
+            pool_size: Idle connections kept for reuse (default from settings)
+        """
+        self._db_path = db_path
+        self._uri = f"file:{db_path}?mode=ro"
+        self._pool_size = pool_size or settings.sql_pool_size
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._table_rows: dict[str, int] | None = None
+        self._table_rows_mtime: int | None = None
+        self._lock = threading.Lock()
+
+    def execute(
+        self,
+        sql: str,
+        parameters: dict[str, Any] | None = None,
+        max_rows: int | None = None,
+        timeout_seconds: float | None = None,
+        max_instructions: int | None = None,
+        max_plan_cost: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> QueryResult:
+        """Run a query and fetch its rows.
+
+        Args:
+            sql: SQL statement
+            parameters: Values for named :parameters
+            max_rows: Rows fetched at most (None = all); the rest is dropped
+            timeout_seconds: Wall-clock limit (default from settings)
+            max_instructions: SQLite instruction budget (default from settings)
+            max_plan_cost: Plan cost above which the query is rejected
+                (default from settings, 0 = no plan check)
+            cancel: Event interrupting the query when set (from another thread)
+
+        Returns:
+            Query result
+
+        Raises:
+            QueryRejectedError: If the query plan is too expensive
+            QueryCancelledError: If the query was interrupted
+            sqlite3.Error: If the statement fails (including writes)
+        """
+        timeout = settings.sql_timeout_seconds if timeout_seconds is None else timeout_seconds
+        budget = settings.sql_max_instructions if max_instructions is None else max_instructions
+        plan_limit = settings.sql_max_plan_cost if max_plan_cost is None else max_plan_cost
+
+        conn = self._acquire()
+        try:
+            if plan_limit:
+                cost = self.plan_cost(sql, parameters, conn)
+                if cost > plan_limit:
+                    raise QueryRejectedError(
+                        f"Query plan too expensive (~{cost:,.0f} rows visited by nested scans)",
+                        details={"plan_cost": cost, "max_plan_cost": plan_limit},
+                    )
+
+            start = time.monotonic()
+            deadline = start + timeout
+            state = {"steps": 0, "reason": None}
+
+            def progress() -> int:
+                state["steps"] += 1
+                if cancel is not None and cancel.is_set():
+                    state["reason"] = "cancelled"
+                elif state["steps"] * PROGRESS_INTERVAL > budget:
+                    state["reason"] = "instruction budget exceeded"
+                elif time.monotonic() > deadline:
+                    state["reason"] = "deadline exceeded"
+                return 1 if state["reason"] else 0
+
+            conn.set_progress_handler(progress, PROGRESS_INTERVAL)
+            try:
+                return self._fetch(conn, sql, parameters, max_rows)
+            except sqlite3.OperationalError as e:
+                if state["reason"] is None:
+                    raise
+                elapsed = time.monotonic() - start
+                raise QueryCancelledError(
+                    f"SQL query interrupted: {state['reason']} after {elapsed:.2f}s",
+                    details={"reason": state["reason"], "elapsed_seconds": elapsed},
+                ) from e
+            finally:
+                conn.set_progress_handler(None, 0)
+        finally:
+            self._release(conn)
+
+    def plan_cost(
+        self, sql: str, parameters: dict[str, Any] | None = None, conn: sqlite3.Connection | None = None
+    ) -> float:
+        """Estimate the rows a query visits from its EXPLAIN QUERY PLAN.
+
+        Full scans (SCAN) of one join are nested loops, so their row counts
+        multiply; a correlated subquery multiplies into the loop around it;
+        index lookups (SEARCH) count as one row; independent subqueries add.
+
+        Args:
+            sql: SQL statement
+            parameters: Values for named :parameters
+            conn: Connection to use (default: one from the pool)
+
+        Returns:
+            Estimated rows visited
+        """
+        if conn is None:
+            conn = self._acquire()
+            try:
+                return self.plan_cost(sql, parameters, conn)
+            finally:
+                self._release(conn)
+
+        plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters or {}).fetchall()
+        children: dict[int, list[tuple[int, str]]] = defaultdict(list)
+        for node_id, parent, _, detail in plan:
+            children[parent].append((node_id, detail))
+
+        table_rows = self._row_counts(conn)
+        default_rows = max(table_rows.values(), default=1)
+        aliases = {
+            (alias or table).lower(): table.lower()
+            for table, alias in _TABLE_REFERENCE.findall(sql)
+            if alias is None or alias.lower() not in _NOT_ALIASES
+        }
+
+        def scan_rows(detail: str) -> float:
+            name = detail.split()[1].lower()
+            if name == "constant":
+                return 1.0
+            table = aliases.get(name, name)
+            # CTEs and subquery results are sized like the largest table
+            return float(table_rows.get(table, default_rows))
+
+        def cost(node_id: int) -> float:
+            loops, independent = 1.0, 0.0
+            for child_id, detail in children.get(node_id, ()):
+                if detail.startswith("SCAN "):
+                    loops *= max(scan_rows(detail), 1.0)
+                elif detail.startswith("CORRELATED"):
+                    loops *= max(cost(child_id), 1.0)
+                elif children.get(child_id):
+                    independent += cost(child_id)
+            return loops + independent
+
+        return cost(0)
+
+    def _row_counts(self, conn: sqlite3.Connection) -> dict[str, int]:
+        """Rows per table, recounted when the database file changes (reload, derived tables rebuilt)."""
+        try:
+            mtime = os.stat(self._db_path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        with self._lock:
+            if self._table_rows is None or mtime != self._table_rows_mtime:
+                tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+                self._table_rows = {
+                    table.lower(): conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                    for table in tables
+                }
+                self._table_rows_mtime = mtime
+            return self._table_rows
+
+    @staticmethod
+    def _fetch(
+        conn: sqlite3.Connection, sql: str, parameters: dict[str, Any] | None, max_rows: int | None
+    ) -> QueryResult:
+        """Execute and fetch up to max_rows rows."""
+        cursor = conn.execute(sql, parameters or {})
+        try:
+            columns = [column[0] for column in cursor.description or ()]
+            if max_rows is None:
+                return QueryResult(columns, cursor.fetchall())
+            rows = cursor.fetchmany(max_rows + 1)
+            truncated = len(rows) > max_rows
+            return QueryResult(columns, rows[:max_rows], truncated)
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """Close idle connections."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Idle connection, or a new one if none is idle."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+            conn.execute("PRAGMA query_only = ON")
+            return conn
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool (closed if the pool is full)."""
+        if self._idle.qsize() < self._pool_size:
+            self._idle.put(conn)
+        else:
+            conn.close()
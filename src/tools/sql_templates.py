@@ -0,0 +1,755 @@
+"""
+FILE: sql_templates.py
+STATUS: Active
+RESPONSIBILITY: Deterministic NL→SQL compiler for common question shapes, entity slot extraction
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Counting stats: summed for teams, divided by gp for per-game questions
+COUNTING_COLUMNS = frozenset({
+    "gp", "w", "l", "pts", "fgm", "fga", "three_pm", "three_pa", "ftm", "fta",
+    "oreb", "dreb", "reb", "ast", "tov", "stl", "blk", "pf", "fp", "dd2", "td3", "poss",
+})
+
+# Shooting percentages: rankings and thresholds exclude players under MIN_GAMES games
+SHOOTING_PCT_COLUMNS = frozenset({"fg_pct", "three_pct", "ft_pct", "efg_pct", "ts_pct"})
+MIN_GAMES = 20
+
+# Stats where a lower value is better ("best"/"worst" flip the sort order)
+LOWER_IS_BETTER = frozenset({"tov", "pf", "l", "def_rtg", "to_ratio"})
+
+# Everyday phrasing of dictionary columns (only used for columns present in data_dictionary)
+STAT_SYNONYMS: dict[str, tuple[str, ...]] = {
+    "pts": ("points", "point", "pts", "scoring"),
+    "reb": ("rebounds", "rebound", "rebounding", "boards", "reb", "rebs", "total rebounds"),
+    "ast": ("assists", "assist", "ast", "dimes"),
+    "stl": ("steals", "steal", "stl"),
+    "blk": ("blocks", "block", "blk", "blocked shots"),
+    "tov": ("turnovers", "turnover", "tov"),
+    "pf": ("fouls", "personal fouls"),
+    "gp": ("games", "games played"),
+    "w": ("wins",),
+    "l": ("losses",),
+    "min": ("minutes", "minutes played"),
+    "fgm": ("field goals made", "field goals"),
+    "fga": ("field goal attempts", "field goals attempted"),
+    "ftm": ("free throws made", "free throws"),
+    "fta": ("free throw attempts", "free throws attempted"),
+    "three_pm": ("threes", "three pointers", "3 pointers", "threes made", "three pointers made", "3 pointers made"),
+    "three_pa": ("three point attempts", "3 point attempts", "three pointers attempted"),
+    "fg_pct": ("field goal percentage", "field goal %", "fg pct", "fg percentage"),
+    "ft_pct": ("free throw percentage", "free throw %", "ft pct", "ft percentage"),
+    "three_pct": (
+        "three point percentage", "3 point percentage", "three point %", "3 point %",
+        "three point pct", "3 point pct", "3 pt pct", "3pt pct", "3pt%", "3pt percentage",
+        "3pt %", "three point shooting percentage",
+    ),
+    "ts_pct": ("true shooting percentage", "true shooting", "ts pct", "ts percentage"),
+    "efg_pct": ("effective field goal percentage", "efg pct", "efg"),
+    "usg_pct": ("usage", "usage rate", "usage percentage"),
+    "plus_minus": ("plus minus",),
+    "dd2": ("double doubles",),
+    "td3": ("triple doubles",),
+    "off_rtg": ("offensive rating",),
+    "def_rtg": ("defensive rating",),
+    "net_rtg": ("net rating",),
+    "fp": ("fantasy points",),
+    "age": ("age",),
+}
+
+# Player nouns naming a stat ("top scorers")
+PLAYER_NOUNS: dict[str, tuple[str, ...]] = {
+    "pts": ("scorer", "scorers"),
+    "reb": ("rebounder", "rebounders"),
+    "ast": ("passer", "passers", "playmaker", "playmakers"),
+    "blk": ("shot blocker", "shot blockers", "blocker", "blockers"),
+}
+
+# Per-game abbreviations
+PER_GAME_STATS: dict[str, str] = {"ppg": "pts", "rpg": "reb", "apg": "ast", "spg": "stl", "bpg": "blk"}
+
+# Common team nicknames not derivable from the team name
+TEAM_NICKNAMES: dict[str, tuple[str, ...]] = {
+    "PHI": ("sixers",),
+    "CLE": ("cavs",),
+    "DAL": ("mavs",),
+    "MIN": ("wolves", "twolves"),
+    "GSW": ("dubs",),
+    "POR": ("blazers",),
+}
+
+_NUMBER_WORDS = {
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5,
+    "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+}
+
+_NAME_SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv"})
+
+# Grammar cues: phrase -> (cue, value)
+_CUES: dict[str, tuple[str, Any]] = {
+    # Ranking direction
+    "most": ("rank", "most"), "highest": ("rank", "most"), "greatest": ("rank", "most"),
+    "leading": ("rank", "most"), "leads": ("rank", "most"), "led": ("rank", "most"),
+    "leader": ("rank", "most"), "leaders": ("leaders", True), "top": ("top", True),
+    "fewest": ("rank", "least"), "lowest": ("rank", "least"), "least": ("rank", "least"),
+    "best": ("rank", "best"), "worst": ("rank", "worst"),
+    "maximum": ("aggregate", "max"), "max": ("aggregate", "max"),
+    "minimum": ("aggregate", "min"),
+    "average": ("aggregate", "avg"), "avg": ("aggregate", "avg"), "mean": ("aggregate", "avg"),
+    # Thresholds
+    "over": ("compare", ">"), "above": ("compare", ">"), "more than": ("compare", ">"),
+    "greater than": ("compare", ">"), "exceeding": ("compare", ">"),
+    "at least": ("compare", ">="), "or more": ("compare_after", ">="),
+    "under": ("compare", "<"), "below": ("compare", "<"), "less than": ("compare", "<"),
+    "fewer than": ("compare", "<"), "at most": ("compare", "<="),
+    # Question shapes
+    "how many": ("count", True), "number of players": ("count", True),
+    "per game": ("per_game", True),
+    "which team": ("team", True), "what team": ("team", True), "team": ("team", True),
+    "teams": ("team_plural", True), "which teams": ("team_plural", True),
+    "list": ("list", True), "roster": ("list", True),
+    "stats": ("summary", True), "statistics": ("summary", True), "numbers": ("summary", True),
+    "who": ("who", True), "whos": ("who", True), "what": ("what", True), "whats": ("what", True),
+    "players": ("plural", True), "playas": ("plural", True), "guys": ("plural", True), "are": ("plural", True),
+}
+
+# Words carrying no meaning for the query shape
+_FILLERS = frozenset("""
+    a an the this that these is was were be has have had did does do of in on for from at to by with
+    and any all me show give gimme tell please plz plzz pls season szn league nba overall total totals
+    number player guy current currently so far right now regular record recorded records get got getting
+    scored score scores shot shoots shooting made make makes played play plays which wide across among
+    there da lol about value i want know find see
+""".split())
+
+
+@dataclass(frozen=True)
+class CompiledSQL:
+    """SQL produced by the template compiler.
+
+    Attributes:
+        shape: Question shape matched (top_players, player_stat, ...)
+        sql: SQLite query with named parameters (:name)
+        params: Bound parameter values
+    """
+
+    shape: str
+    sql: str
+    params: dict[str, Any] = field(default_factory=dict)
+
+    def render(self) -> str:
+        """SQL with parameters inlined as literals (for display and logs, not execution)."""
+        def literal(match: re.Match) -> str:
+            value = self.params[match.group(1)]
+            if isinstance(value, str):
+                return "'" + value.replace("'", "''") + "'"
+            return repr(value)
+
+        return re.sub(r":(\w+)", literal, self.sql)
+
+
+@dataclass
+class SQLTemplateStats:
+    """Template compiler counters (since creation).
+
+    Attributes:
+        hits: Questions compiled without the LLM
+        misses: Questions left to the LLM
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of questions compiled without the LLM."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class Slot:
+    """An entity mention replaced by a placeholder in a question skeleton.
+
+    Attributes:
+        kind: player, team or number
+        value: Player name, team abbreviation or number
+        name: Team name (teams only)
+    """
+
+    kind: str
+    value: str | float
+    name: str = ""
+
+
+@dataclass(frozen=True)
+class QuestionSkeleton:
+    """A question with its entities replaced by placeholders.
+
+    Questions differing only in player, team or number share a skeleton
+    ("how many assists did {player} record").
+
+    Attributes:
+        text: Normalized question with {player}/{team}/{number} placeholders
+        slots: Entities replaced, in question order
+    """
+
+    text: str
+    slots: tuple[Slot, ...]
+
+
+@dataclass(frozen=True)
+class _Stat:
+    """A stat column mentioned in a question."""
+
+    column: str
+    table: str
+    per_game: bool = False
+
+    @property
+    def prefix(self) -> str:
+        return "p" if self.table == "players" else "ps"
+
+    def expr(self) -> str:
+        """Unrounded SQL expression of the stat."""
+        if self.per_game:
+            return f"CAST(ps.{self.column} AS FLOAT) / ps.gp"
+        return f"{self.prefix}.{self.column}"
+
+    def value_expr(self) -> str:
+        """SQL expression of the stat as shown in results."""
+        return f"ROUND({self.expr()}, 1)" if self.per_game else self.expr()
+
+    @property
+    def alias(self) -> str:
+        return f"{self.column}_per_game" if self.per_game else self.column
+
+    @property
+    def is_counting(self) -> bool:
+        return self.column in COUNTING_COLUMNS and not self.per_game
+
+
+@dataclass
+class _Question:
+    """Entities and cues recognized in a question."""
+
+    stats: list[_Stat] = field(default_factory=list)
+    teams: list[str] = field(default_factory=list)
+    players: list[str] = field(default_factory=list)
+    numbers: list[float] = field(default_factory=list)
+    cues: dict[str, Any] = field(default_factory=dict)
+    player_noun: bool = False
+
+
+_FROM_PLAYERS = "FROM players p JOIN player_stats ps ON p.id = ps.player_id"
+_FROM_TEAMS = (
+    "FROM teams t JOIN players p ON t.abbreviation = p.team_abbr "
+    "JOIN player_stats ps ON p.id = ps.player_id"
+)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase ASCII form of a question or name (accents, possessives and punctuation removed)."""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = text.replace("+/-", " plus minus ").replace("’", "'")
+    text = re.sub(r"(\d),(\d{3})", r"\1\2", text)  # 1,000 -> 1000
+    text = re.sub(r"'s\b|'", " ", text)
+    text = re.sub(r"[-/]", " ", text)
+    return " ".join(re.findall(r"[a-z0-9%]+(?:\.\d+)?", text))
+
+
+def tokenize(text: str) -> tuple[str, ...]:
+    """Tokens of normalize_text(text)."""
+    return tuple(normalize_text(text).split())
+
+
+def _parse_number(token: str) -> float | None:
+    """Numeric value of a token ("25", "1k", "60%", "0.5"), or None."""
+    match = re.fullmatch(r"(\d+(?:\.\d+)?)(k?)%?", token)
+    if match is None:
+        return _NUMBER_WORDS.get(token)
+    value = float(match.group(1))
+    return value * 1000 if match.group(2) else value
+
+
+class SQLTemplateCompiler:
+    """Maps common statistical question shapes straight to parameterized SQL.
+
+    Questions are tokenized and every token must be explained by the
+    grammar: a stat (data_dictionary abbreviations and full names plus
+    everyday synonyms), a team (name, nickname, abbreviation), a player
+    (full name, or a first/last name that is unique in the database), a
+    number, a shape cue ("top", "how many", "per game", "over", ...) or a
+    filler word. Any unexplained token, pronoun or ambiguous name leaves
+    the question to the LLM, so the compiler answers only what it fully
+    understands. Supported shapes: top-N players by a stat, one player's
+    stat, per-game values, league and team averages/maxima, player counts
+    above a threshold, team totals and rankings, roster counts and lists.
+    Entity values are bound as parameters; column names come from the
+    data dictionary only. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        dictionary_entries: Sequence[dict[str, str | None]],
+        teams: Sequence[tuple[str, str]],
+        player_names: Sequence[str],
+    ):
+        """Build the vocabulary.
+
+        Args:
+            dictionary_entries: data_dictionary rows (abbreviation, full_name,
+                column_name, table_name), as loaded by NBAGSQLTool
+            teams: (abbreviation, name) rows of the teams table
+            player_names: Names in the players table
+        """
+        self._vocab: dict[tuple[str, ...], tuple[str, Any]] = {}
+        self._team_names = dict(teams)
+        self._lock = threading.Lock()
+        self.stats = SQLTemplateStats()
+
+        for phrase, cue in _CUES.items():
+            self._vocab[tuple(phrase.split())] = ("cue", cue)
+        self._add_stats(dictionary_entries)
+        self._add_teams(teams)
+        self._add_players(player_names)
+        self._max_phrase = max((len(key) for key in self._vocab), default=1)
+
+    @classmethod
+    def from_database(
+        cls, db_path: str, dictionary_entries: Sequence[dict[str, str | None]]
+    ) -> "SQLTemplateCompiler":
+        """Build a compiler from the teams and players of a stats database.
+
+        Args:
+            db_path: Path to the SQLite stats database
+            dictionary_entries: data_dictionary rows (see __init__)
+
+        Returns:
+            Compiler (with no team/player vocabulary if the tables can't be read)
+        """
+        teams: list[tuple[str, str]] = []
+        players: list[str] = []
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                teams = conn.execute("SELECT abbreviation, name FROM teams").fetchall()
+                players = [row[0] for row in conn.execute("SELECT name FROM players")]
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"SQL templates: could not load teams/players ({e})")
+
+        compiler = cls(dictionary_entries, teams, players)
+        logger.info(
+            f"SQL template compiler ready: {len(teams)} teams, {len(players)} players, "
+            f"{len(compiler._vocab)} phrases"
+        )
+        return compiler
+
+    def compile(self, question: str) -> CompiledSQL | None:
+        """Compile a question to SQL without the LLM.
+
+        Args:
+            question: Natural language question
+
+        Returns:
+            Compiled SQL, or None if the question doesn't fit a known shape
+        """
+        parsed = self._parse(tokenize(question))
+        compiled = self._build(parsed) if parsed is not None else None
+        with self._lock:
+            if compiled is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+        return compiled
+
+    def skeleton(self, question: str) -> QuestionSkeleton:
+        """Replace the players, teams and numbers of a question by placeholders.
+
+        Unlike compile(), unknown words are kept as they are: the skeleton
+        only abstracts over entities.
+
+        Args:
+            question: Natural language question
+
+        Returns:
+            Skeleton and the entities it abstracts
+        """
+        tokens = tokenize(question)
+        words: list[str] = []
+        slots: list[Slot] = []
+        i = 0
+        while i < len(tokens):
+            for length in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                term = self._vocab.get(tokens[i:i + length])
+                if term is not None:
+                    break
+            else:
+                length, term = 1, self._single_token(tokens[i])
+
+            kind = term[0] if term is not None else None
+            if kind == "player":
+                slots.append(Slot("player", term[1]))
+            elif kind == "team":
+                slots.append(Slot("team", term[1], self._team_names.get(term[1], "")))
+            elif kind == "number" and tokens[i][0].isdigit():
+                # Number words stay words ("three point shooters")
+                slots.append(Slot("number", term[1]))
+            else:
+                words.extend(tokens[i:i + length])
+                i += length
+                continue
+            words.append("{" + kind + "}")
+            i += length
+        return QuestionSkeleton(" ".join(words), tuple(slots))
+
+    # ── Vocabulary ────────────────────────────────────────────────────────────
+
+    def _add_stats(self, entries: Sequence[dict[str, str | None]]) -> None:
+        """Stat phrases for every player/player_stats column in the data dictionary."""
+        columns: dict[str, str] = {}
+        for entry in entries:
+            column, table = entry.get("column_name"), entry.get("table_name")
+            if not column or table not in ("player_stats", "players") or column in ("name", "team_abbr"):
+                continue
+            columns[column] = table
+            for phrase in (entry.get("abbreviation") or "", entry.get("full_name") or ""):
+                tokens = tokenize(phrase)
+                # Single letters (W, L) are too ambiguous to be stat mentions
+                if tokens and len("".join(tokens)) > 1:
+                    self._vocab.setdefault(tokens, ("stat", _Stat(column, table)))
+
+        for column, phrases in STAT_SYNONYMS.items():
+            if column in columns:
+                for phrase in phrases:
+                    self._vocab.setdefault(tokenize(phrase), ("stat", _Stat(column, columns[column])))
+        for column, phrases in PLAYER_NOUNS.items():
+            if column in columns:
+                for phrase in phrases:
+                    noun = (_Stat(column, columns[column]), phrase.endswith("s"))
+                    self._vocab.setdefault(tokenize(phrase), ("player_noun", noun))
+        for phrase, column in PER_GAME_STATS.items():
+            if column in columns:
+                self._vocab.setdefault((phrase,), ("stat", _Stat(column, columns[column], per_game=True)))
+
+    def _add_teams(self, teams: Sequence[tuple[str, str]]) -> None:
+        """Team phrases: full name, nickname, city, abbreviation (unique ones only)."""
+        aliases: dict[tuple[str, ...], set[str]] = {}
+        for abbreviation, name in teams:
+            tokens = tokenize(name)
+            candidates = {tokens, tokens[-1:], tokens[-2:], tokens[:-1], tokenize(abbreviation)}
+            candidates.update(tokenize(nickname) for nickname in TEAM_NICKNAMES.get(abbreviation, ()))
+            for alias in candidates:
+                if alias:
+                    aliases.setdefault(alias, set()).add(abbreviation)
+
+        for alias, abbreviations in aliases.items():
+            if len(abbreviations) == 1 and alias not in self._vocab and not self._is_filler(alias):
+                self._vocab[alias] = ("team", next(iter(abbreviations)))
+
+    def _add_players(self, names: Sequence[str]) -> None:
+        """Player phrases: full name, plus first or last name when unique."""
+        aliases: dict[tuple[str, ...], set[str]] = {}
+        for name in names:
+            tokens = tokenize(name)
+            if not tokens:
+                continue
+            core = tokens[:-1] if len(tokens) > 2 and tokens[-1] in _NAME_SUFFIXES else tokens
+            candidates = {tokens, core}
+            if len(core) > 1:
+                candidates.update({core[:1], core[-1:]})
+            for alias in candidates:
+                aliases.setdefault(alias, set()).add(name)
+
+        for alias, players in aliases.items():
+            if len(players) != 1 or alias in self._vocab or self._is_filler(alias):
+                continue
+            if len(alias) == 1 and (len(alias[0]) < 4 or alias[0] in _NUMBER_WORDS):
+                continue
+            self._vocab[alias] = ("player", next(iter(players)))
+
+    @staticmethod
+    def _is_filler(alias: tuple[str, ...]) -> bool:
+        return len(alias) == 1 and alias[0] in _FILLERS
+
+    # ── Parsing ───────────────────────────────────────────────────────────────
+
+    def _parse(self, tokens: tuple[str, ...]) -> _Question | None:
+        """Recognize every token (None if any token is not understood)."""
+        question = _Question()
+        i = 0
+        while i < len(tokens):
+            for length in range(min(self._max_phrase, len(tokens) - i), 0, -1):
+                term = self._vocab.get(tokens[i:i + length])
+                if term is not None:
+                    break
+            else:
+                length, term = 1, self._single_token(tokens[i])
+                if term is None:
+                    return None
+
+            self._apply(question, *term)
+            i += length
+        return question
+
+    def _single_token(self, token: str) -> tuple[str, Any] | None:
+        """Term for a token outside the phrase vocabulary."""
+        if token in _FILLERS:
+            return ("filler", None)
+        number = _parse_number(token)
+        if number is not None:
+            return ("number", number)
+        # Possessive without apostrophe ("currys")
+        if token.endswith("s"):
+            term = self._vocab.get((token[:-1],))
+            if term is not None and term[0] in ("player", "team"):
+                return term
+        return None
+
+    @staticmethod
+    def _apply(question: _Question, kind: str, value: Any) -> None:
+        """Record a recognized term."""
+        if kind == "stat":
+            if value not in question.stats:
+                question.stats.append(value)
+        elif kind == "player_noun":
+            stat, plural = value
+            question.player_noun = True
+            if plural:
+                question.cues["plural"] = True
+            if stat not in question.stats:
+                question.stats.append(stat)
+        elif kind == "team":
+            if value not in question.teams:
+                question.teams.append(value)
+        elif kind == "player":
+            if value not in question.players:
+                question.players.append(value)
+        elif kind == "number":
+            question.numbers.append(value)
+        elif kind == "cue":
+            cue, cue_value = value
+            if cue == "compare_after":
+                cue = "compare"
+            elif cue == "leaders":
+                question.cues["plural"] = True
+                cue, cue_value = "rank", "most"
+            if cue in question.cues and question.cues[cue] != cue_value:
+                question.cues[cue] = None  # Contradictory cues ("most ... least")
+            else:
+                question.cues[cue] = cue_value
+
+    # ── SQL shapes ────────────────────────────────────────────────────────────
+
+    def _build(self, q: _Question) -> CompiledSQL | None:
+        """Pick the question shape and emit its SQL."""
+        cues = q.cues
+        if None in cues.values() or len(q.players) > 1 or len(q.teams) > 1:
+            return None
+        if "per_game" in cues:
+            if len(q.stats) != 1 or q.stats[0].column not in COUNTING_COLUMNS:
+                return None
+            q.stats[0] = _Stat(q.stats[0].column, q.stats[0].table, per_game=True)
+        if len(q.stats) > 1:
+            return None
+        stat = q.stats[0] if q.stats else None
+        team = q.teams[0] if q.teams else None
+        rank = cues.get("rank") or ("most" if "top" in cues else None)
+        team_question = "team" in cues or "team_plural" in cues
+
+        if q.players:
+            return self._build_player(q, stat, team)
+
+        if "count" in cues and "compare" not in cues:
+            if team and stat is None and not q.numbers and "summary" not in cues:
+                return self._roster_count(team)
+            return None
+        if "compare" in cues:
+            if "count" not in cues or stat is None or len(q.numbers) != 1 or rank or "aggregate" in cues:
+                return None
+            return self._count_threshold(stat, cues["compare"], q.numbers[0], team)
+
+        if stat is None:
+            if not team or q.numbers or rank or "aggregate" in cues:
+                return None
+            if "summary" in cues:
+                return None if {"who", "list", "plural"} & cues.keys() else self._team_summary(team)
+            if {"list", "who", "plural"} & cues.keys():
+                return self._roster_list(team)
+            return None
+
+        if team_question and team is None:
+            if rank is None or q.player_noun or "aggregate" in cues:
+                return None
+            limit = self._limit(q, plural="team_plural" in cues)
+            return self._team_ranking(stat, self._order(stat, rank), limit)
+        if rank:
+            if "aggregate" in cues:
+                return None
+            if "what" in cues and not ({"who", "plural", "top"} & cues.keys() or q.player_noun or q.numbers):
+                aggregate = "MIN" if self._order(stat, rank) == "ASC" else "MAX"
+                return self._league_aggregate(stat, aggregate, team)
+            return self._top_players(stat, self._order(stat, rank), self._limit(q, "plural" in cues), team)
+        if "aggregate" in cues:
+            if q.numbers:
+                return None
+            aggregate = {"avg": "AVG", "max": "MAX", "min": "MIN"}[cues["aggregate"]]
+            return self._league_aggregate(stat, aggregate, team)
+        if team and not q.numbers and not {"who", "plural", "list"} & cues.keys():
+            return self._team_total(stat, team)
+        return None
+
+    def _build_player(self, q: _Question, stat: _Stat | None, team: str | None) -> CompiledSQL | None:
+        """Shapes about one named player (a stat, a per-game average, or a summary)."""
+        cues = q.cues
+        if team or q.numbers or {"top", "rank", "compare", "team", "team_plural", "list"} & cues.keys():
+            return None
+        if stat is None:
+            if "summary" in cues and "aggregate" not in cues:
+                return self._player_summary(q.players[0])
+            return None
+        if "aggregate" in cues:
+            if cues["aggregate"] != "avg" or stat.column not in COUNTING_COLUMNS:
+                return None
+            stat = _Stat(stat.column, stat.table, per_game=True)  # A player's average is per game
+        return self._player_stat(q.players[0], stat)
+
+    @staticmethod
+    def _order(stat: _Stat, rank: str) -> str:
+        """Sort order for a ranking cue."""
+        if rank in ("best", "worst"):
+            better_desc = stat.column not in LOWER_IS_BETTER
+            return "DESC" if (rank == "best") == better_desc else "ASC"
+        return "DESC" if rank == "most" else "ASC"
+
+    @staticmethod
+    def _limit(q: _Question, plural: bool) -> int | None:
+        """Rows for a ranking: the number given, 5 for plural questions, else 1."""
+        if len(q.numbers) > 1:
+            return None
+        if q.numbers:
+            number = q.numbers[0]
+            return int(number) if number.is_integer() and 1 <= number <= 100 else None
+        return 5 if plural else 1
+
+    @staticmethod
+    def _quality_filters(stat: _Stat) -> list[str]:
+        """Filters keeping rankings meaningful (NULL percentages, low-sample players)."""
+        filters = []
+        if stat.column.endswith("_pct"):
+            filters.append(f"{stat.prefix}.{stat.column} IS NOT NULL")
+        if stat.column in SHOOTING_PCT_COLUMNS or stat.per_game:
+            filters.append("ps.gp >= :min_games")
+        return filters
+
+    def _top_players(self, stat: _Stat, order: str, limit: int | None, team: str | None) -> CompiledSQL | None:
+        if limit is None:
+            return None
+        filters = self._quality_filters(stat)
+        params: dict[str, Any] = {"limit": limit}
+        if team:
+            filters.append("p.team_abbr = :team")
+            params["team"] = team
+        if "ps.gp >= :min_games" in filters:
+            params["min_games"] = MIN_GAMES
+        where = f" WHERE {' AND '.join(filters)}" if filters else ""
+        sql = (
+            f"SELECT p.name, {stat.value_expr()} AS {stat.alias} {_FROM_PLAYERS}{where} "
+            f"ORDER BY {stat.alias} {order} LIMIT :limit"
+        )
+        return CompiledSQL("top_players", sql, params)
+
+    @staticmethod
+    def _player_stat(player: str, stat: _Stat) -> CompiledSQL:
+        sql = f"SELECT p.name, {stat.value_expr()} AS {stat.alias} {_FROM_PLAYERS} WHERE p.name = :player"
+        return CompiledSQL("player_stat", sql, {"player": player})
+
+    def _count_threshold(self, stat: _Stat, op: str, value: float, team: str | None) -> CompiledSQL:
+        if stat.column.endswith("_pct") and 0 < value <= 1:
+            value *= 100  # Percentages are stored on a 0-100 scale
+        filters = [f"{stat.value_expr()} {op} :threshold"]
+        params: dict[str, Any] = {"threshold": int(value) if value.is_integer() else value}
+        if stat.column in SHOOTING_PCT_COLUMNS:
+            filters.append("ps.gp >= :min_games")
+            params["min_games"] = MIN_GAMES
+        if team:
+            filters.append("p.team_abbr = :team")
+            params["team"] = team
+        sql = f"SELECT COUNT(*) AS player_count {_FROM_PLAYERS} WHERE {' AND '.join(filters)}"
+        return CompiledSQL("count_threshold", sql, params)
+
+    def _league_aggregate(self, stat: _Stat, aggregate: str, team: str | None) -> CompiledSQL:
+        filters = ["ps.gp > 0"] if stat.per_game else [f"{stat.expr()} IS NOT NULL"]
+        params: dict[str, Any] = {}
+        if aggregate != "AVG":
+            # A max/min is a one-row ranking: skip the same low-sample players
+            filters += [f for f in self._quality_filters(stat) if f not in filters]
+            if "ps.gp >= :min_games" in filters:
+                params["min_games"] = MIN_GAMES
+        if team:
+            filters.append("p.team_abbr = :team")
+            params["team"] = team
+        value = f"ROUND(AVG({stat.expr()}), 1)" if aggregate == "AVG" else f"{aggregate}({stat.value_expr()})"
+        sql = f"SELECT {value} AS {aggregate.lower()}_{stat.alias} {_FROM_PLAYERS} WHERE {' AND '.join(filters)}"
+        return CompiledSQL("team_aggregate" if team else "league_aggregate", sql, params)
+
+    @staticmethod
+    def _team_value(stat: _Stat) -> tuple[str, str]:
+        """Team-level expression and alias: totals for counting stats, averages otherwise."""
+        if stat.is_counting:
+            return f"SUM({stat.expr()})", f"total_{stat.alias}"
+        return f"ROUND(AVG({stat.expr()}), 1)", f"avg_{stat.alias}"
+
+    def _team_total(self, stat: _Stat, team: str) -> CompiledSQL:
+        value, alias = self._team_value(stat)
+        sql = f"SELECT t.name, {value} AS {alias} {_FROM_TEAMS} WHERE t.abbreviation = :team GROUP BY t.name"
+        return CompiledSQL("team_aggregate", sql, {"team": team})
+
+    def _team_ranking(self, stat: _Stat, order: str, limit: int | None) -> CompiledSQL | None:
+        if limit is None:
+            return None
+        value, alias = self._team_value(stat)
+        sql = f"SELECT t.name, {value} AS {alias} {_FROM_TEAMS} GROUP BY t.name ORDER BY {alias} {order} LIMIT :limit"
+        return CompiledSQL("team_ranking", sql, {"limit": limit})
+
+    @staticmethod
+    def _player_summary(player: str) -> CompiledSQL:
+        sql = (
+            "SELECT p.name, p.team_abbr, ps.gp, ps.pts, ps.reb, ps.ast, "
+            "ROUND(CAST(ps.pts AS FLOAT) / ps.gp, 1) AS pts_per_game, ps.fg_pct, ps.three_pct, ps.ts_pct "
+            f"{_FROM_PLAYERS} WHERE p.name = :player"
+        )
+        return CompiledSQL("player_summary", sql, {"player": player})
+
+    @staticmethod
+    def _team_summary(team: str) -> CompiledSQL:
+        sql = (
+            "SELECT t.name, SUM(ps.pts) AS total_pts, SUM(ps.reb) AS total_reb, SUM(ps.ast) AS total_ast "
+            f"{_FROM_TEAMS} WHERE t.abbreviation = :team GROUP BY t.name"
+        )
+        return CompiledSQL("team_aggregate", sql, {"team": team})
+
+    @staticmethod
+    def _roster_count(team: str) -> CompiledSQL:
+        sql = "SELECT COUNT(*) AS player_count FROM players p WHERE p.team_abbr = :team"
+        return CompiledSQL("roster_count", sql, {"team": team})
+
+    @staticmethod
+    def _roster_list(team: str) -> CompiledSQL:
+        sql = "SELECT p.name FROM players p WHERE p.team_abbr = :team ORDER BY p.name"
+        return CompiledSQL("roster_list", sql, {"team": team})
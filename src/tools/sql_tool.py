@@ -2,24 +2,45 @@
 FILE: sql_tool.py
 STATUS: Active
 RESPONSIBILITY: LangChain SQL agent for querying NBA statistics database
-LAST MAJOR UPDATE: 2026-02-13
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import ast
+import asyncio
+import hashlib
 import logging
 import sqlite3
+import threading
 import time
-from pathlib import Path
 
 from langchain_community.utilities import SQLDatabase
 from langchain_core.prompts import ChatPromptTemplate, FewShotPromptTemplate, PromptTemplate
 from langchain_core.runnables import RunnableSequence
 from langchain_google_genai import ChatGoogleGenerativeAI
 
+from src.core import latency
 from src.core.config import settings
+from src.core.latency import stage
+from src.repositories.nba_database import PER_GAME_STATS, PLAYER_STATS_FULL, RANKED_COLUMNS
+from src.tools.sql_cache import SQLCache
+from src.tools.sql_executor import ReadOnlySQLExecutor
+from src.tools.sql_templates import CompiledSQL, QuestionSkeleton, SQLTemplateCompiler
 
 logger = logging.getLogger(__name__)
 
+SQL_MODEL = "gemini-2.0-flash"
+
+# Bump when SQL post-processing (_extract_sql, _validate_sql_structure) changes,
+# so cached SQL from the previous rules is discarded (prompt changes are detected)
+SQL_CACHE_VERSION = 1
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """Whether an LLM error is a rate limit (429 / RESOURCE_EXHAUSTED)."""
+    error_str = str(error)
+    return "429" in error_str or "RESOURCE_EXHAUSTED" in error_str.upper()
+
 
 def _retry_on_rate_limit(func, max_retries: int = 3, initial_delay: float = 2.0):
     """Retry a function with exponential backoff on rate limit errors.
@@ -41,10 +62,7 @@ def _retry_on_rate_limit(func, max_retries: int = 3, initial_delay: float = 2.0)
         try:
             return func()
         except Exception as e:
-            error_str = str(e)
-            is_rate_limit = "429" in error_str or "RESOURCE_EXHAUSTED" in error_str.upper()
-
-            if not is_rate_limit:
+            if not _is_rate_limit(e):
                 # Not a rate limit error, raise immediately
                 raise
 
@@ -64,6 +82,44 @@ def _retry_on_rate_limit(func, max_retries: int = 3, initial_delay: float = 2.0)
             delay *= 2
 
 
+async def _aretry_on_rate_limit(func, max_retries: int = 3, initial_delay: float = 2.0):
+    """Async _retry_on_rate_limit: awaits func() and backs off with asyncio.sleep.
+
+    Args:
+        func: Callable returning an awaitable (called again on each attempt)
+        max_retries: Maximum retry attempts
+        initial_delay: Initial delay in seconds
+
+    Returns:
+        Result from successful call
+
+    Raises:
+        Exception: If all retries exhausted or non-rate-limit error
+    """
+    delay = initial_delay
+
+    for attempt in range(max_retries + 1):
+        try:
+            return await func()
+        except Exception as e:
+            if not _is_rate_limit(e):
+                raise
+
+            if attempt >= max_retries:
+                logger.error("SQL generation rate limit after %d retries", max_retries)
+                raise
+
+            wait_time = min(delay, 30.0)
+            logger.warning(
+                "SQL generation rate limit (attempt %d/%d), retrying in %.1fs",
+                attempt + 1,
+                max_retries + 1,
+                wait_time
+            )
+            await asyncio.sleep(wait_time)
+            delay *= 2
+
+
 def _load_dictionary_from_db(db_path: str) -> list[dict[str, str | None]]:
     """Load data dictionary entries from the database.
 
@@ -100,6 +156,66 @@ def _load_dictionary_from_db(db_path: str) -> list[dict[str, str | None]]:
         return []
 
 
+def _has_table(db_path: str, table: str) -> bool:
+    """Whether the database has a table (False if it can't be opened)."""
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    return row is not None
+
+
+def _build_derived_tables_block(available: bool) -> str:
+    """Prompt section advertising player_stats_full (empty if it wasn't built).
+
+    Args:
+        available: Whether NBADatabase.build_derived_tables() created the table
+
+    Returns:
+        Formatted schema/rules block for the SQL prompt
+    """
+    if not available:
+        return ""
+    per_game = ", ".join(f"{column} ({total}/gp)" for column, total in PER_GAME_STATS.items())
+    return f"""
+PRE-JOINED TABLE (PREFERRED - faster, no JOIN needed):
+- {PLAYER_STATS_FULL}(player_id, name, team_abbr, team_name, age, <every player_stats column except id>, {", ".join(PER_GAME_STATS)})
+  One row per player: players + teams + player_stats already joined.
+  Per-game averages are precomputed, rounded to 1 decimal: {per_game}
+  Indexed for ranking by: {", ".join(RANKED_COLUMNS)} (also filtered by gp), and by team_abbr.
+
+  "Top 5 scorers per game" → SELECT name, ppg FROM {PLAYER_STATS_FULL} ORDER BY ppg DESC LIMIT 5
+  "Best true shooting %" → SELECT name, ts_pct FROM {PLAYER_STATS_FULL} WHERE gp >= 20 ORDER BY ts_pct DESC LIMIT 1
+  "Lakers total points" → SELECT team_name, SUM(pts) as total_pts FROM {PLAYER_STATS_FULL} WHERE team_abbr = 'LAL' GROUP BY team_name
+The JOIN forms below remain valid, but prefer {PLAYER_STATS_FULL}.
+"""
+
+
+def _parse_run_output(result_str: str) -> list[dict]:
+    """Rows from the string SQLDatabase.run(include_columns=True) returns.
+
+    Args:
+        result_str: String like "[{'col1': 'val1', 'col2': 'val2'}]"
+
+    Returns:
+        List of result rows as dictionaries
+    """
+    if not result_str or result_str.strip() in ("", "[]"):
+        return []
+
+    # Use ast.literal_eval to safely parse the string
+    results = ast.literal_eval(result_str)
+
+    # Ensure it's a list
+    if not isinstance(results, list):
+        results = [results] if results else []
+    return results
+
+
 def _build_abbreviations_block(entries: list[dict[str, str | None]]) -> str:
     """Build the KEY ABBREVIATIONS block for the SQL prompt from dictionary entries.
 
@@ -264,7 +380,7 @@ class NBAGSQLTool:
             google_api_key: Google API key (default from settings)
         """
         if db_path is None:
-            db_path = str(Path(settings.database_dir) / "nba_stats.db")
+            db_path = str(settings.stats_database_path)
 
         self.db_path = db_path
         self._api_key = google_api_key or settings.google_api_key
@@ -272,14 +388,35 @@ class NBAGSQLTool:
         # Initialize SQLDatabase
         self.db = SQLDatabase.from_uri(f"sqlite:///{db_path}")
 
+        # Typed read-only execution of generated SQL (connections open on first query)
+        self.executor = ReadOnlySQLExecutor(db_path)
+
         # Load data dictionary for dynamic prompt
         dict_entries = _load_dictionary_from_db(db_path)
         abbreviations_block = _build_abbreviations_block(dict_entries)
         self._dict_entry_count = len(dict_entries)
 
+        # Pre-joined per-game table (advertised only if the database has it)
+        self.has_derived_tables = _has_table(db_path, PLAYER_STATS_FULL)
+        derived_tables_block = _build_derived_tables_block(self.has_derived_tables)
+        per_game_rule = (
+            f"use the precomputed {', '.join(PER_GAME_STATS)} columns of {PLAYER_STATS_FULL}; "
+            "with the base tables, divide by gp: ROUND(CAST(ps.column AS FLOAT) / ps.gp, 1)"
+            if self.has_derived_tables
+            else "ALWAYS divide by gp: ROUND(CAST(ps.column AS FLOAT) / ps.gp, 1)"
+        )
+
+        # Rule-based fast path for common question shapes (LLM is the fallback);
+        # its entity vocabulary also gives the SQL cache its question skeletons
+        self.templates = (
+            SQLTemplateCompiler.from_database(db_path, dict_entries)
+            if settings.sql_templates_enabled or settings.sql_cache_enabled
+            else None
+        )
+
         # Initialize LLM (Gemini for SQL generation)
         self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.0-flash",
+            model=SQL_MODEL,
             temperature=0.0,  # Deterministic for SQL generation
             google_api_key=self._api_key,
         )
@@ -301,7 +438,7 @@ DATABASE SCHEMA:
 - player_stats(id, player_id, gp, w, l, min, pts, fgm, fga, fg_pct, three_pm, three_pa, three_pct, ftm, fta, ft_pct, oreb, dreb, reb, ast, tov, stl, blk, pf, fp, dd2, td3, plus_minus, off_rtg, def_rtg, net_rtg, ast_pct, ast_to, ast_ratio, oreb_pct, dreb_pct, reb_pct, to_ratio, efg_pct, ts_pct, usg_pct, pace, pie, poss)
 
 NOTE: The teams table contains team names but NO statistics. Team stats must be aggregated from player_stats.
-
+{derived_tables_block}
 {abbreviations_block}
 
 CRITICAL TEAM QUERY RULES:
@@ -352,7 +489,7 @@ IMPORTANT RULES:
 5. For player names, use LIKE '%PlayerName%' for partial matching
 6. Keep queries SIMPLE - only use what's necessary
 7. Use the EXACT column names from the schema above (e.g., three_pct NOT 3P%)
-8. For "per game" stats (PPG, RPG, APG), ALWAYS divide by gp: ROUND(CAST(ps.column AS FLOAT) / ps.gp, 1)
+8. For "per game" stats (PPG, RPG, APG), {per_game_rule}
 9. For percentage-based rankings (fg_pct, ts_pct, efg_pct, ft_pct, three_pct), add WHERE ps.gp >= 20 to exclude low-sample players with inflated stats
 10. ALL percentage columns (fg_pct, three_pct, ft_pct, efg_pct, ts_pct, usg_pct, etc.) are stored as 0-100 scale (e.g., 45.2 means 45.2%, NOT 0.452). Use thresholds like ts_pct > 60 (not 0.6)
 11. For ranking queries asking about "top players" or superlatives, ALWAYS use appropriate LIMIT:
@@ -372,6 +509,9 @@ EXAMPLES:""",
 
         self.sql_chain = self.few_shot_prompt | self.llm
 
+        # Generated SQL reused for repeated questions and same-skeleton questions
+        self.sql_cache = SQLCache(self._sql_cache_version()) if settings.sql_cache_enabled else None
+
         logger.info(
             f"NBA SQL Tool initialized with database: {db_path} "
             f"({self._dict_entry_count} dictionary entries loaded)"
@@ -393,8 +533,36 @@ EXAMPLES:""",
             lambda: self.sql_chain.invoke({"input": question})
         )
 
-        # Extract SQL from response
-        sql = response.content.strip()
+        return self._extract_sql(response.content, question)
+
+    async def agenerate_sql(self, question: str) -> str:
+        """Async generate_sql: awaits the SQL chain without blocking the event loop.
+
+        Args:
+            question: Natural language question about NBA stats
+
+        Returns:
+            Generated SQL query string
+        """
+        logger.info(f"Generating SQL (async) for question: {question}")
+
+        response = await _aretry_on_rate_limit(
+            lambda: self.sql_chain.ainvoke({"input": question})
+        )
+
+        return self._extract_sql(response.content, question)
+
+    def _extract_sql(self, content: str, question: str) -> str:
+        """Extract and validate the SQL statement from an LLM response.
+
+        Args:
+            content: Raw LLM response text
+            question: Question the SQL was generated for
+
+        Returns:
+            Cleaned SQL query string
+        """
+        sql = content.strip()
 
         # Remove markdown code blocks if present
         if "```sql" in sql:
@@ -444,8 +612,9 @@ EXAMPLES:""",
         question_lower = question.lower()
 
         # Rule: If question mentions "players" and query only touches player_stats, add JOIN
+        # (player_stats_full already has the player columns)
         if 'player' in question_lower or any(kw in question_lower for kw in ['who', 'name']):
-            if 'player_stats' in sql_lower and 'join' not in sql_lower:
+            if re.search(r'\bplayer_stats\b', sql_lower) and 'join' not in sql_lower:
                 # Skip auto-correction for queries with subqueries (too complex to handle safely)
                 select_count = sql_lower.count('select')
                 if select_count > 1:
@@ -507,49 +676,129 @@ EXAMPLES:""",
             if unicodedata.category(c) != 'Mn'
         )
 
-    def execute_sql(self, sql: str, timeout_seconds: int = 15) -> list[dict]:
+    def _sql_cache_version(self) -> str:
+        """Version of the SQL generator: schema, prompt and model (cached SQL is only reused within one)."""
+        try:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            try:
+                schema = "\n".join(
+                    row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL ORDER BY name")
+                )
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            schema = ""
+        parts = (str(SQL_CACHE_VERSION), SQL_MODEL, self.few_shot_prompt.format(input=""), schema)
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    def _skeleton(self, question: str) -> QuestionSkeleton | None:
+        return self.templates.skeleton(question) if self.templates is not None else None
+
+    def lookup_cached_sql(self, question: str) -> CompiledSQL | None:
+        """SQL previously generated for this question or one with the same skeleton.
+
+        Args:
+            question: Natural language question
+
+        Returns:
+            Cached SQL (entity parameters bound for skeleton hits), or None
+        """
+        if self.sql_cache is None:
+            return None
+        try:
+            compiled = self.sql_cache.get(question, self._skeleton(question))
+        except sqlite3.Error as e:
+            logger.warning(f"SQL cache lookup failed: {e}")
+            return None
+        if compiled is not None:
+            logger.info(f"SQL cache hit ({compiled.shape}): {question[:80]}")
+        return compiled
+
+    def cache_generated_sql(self, question: str, sql: str) -> None:
+        """Remember SQL the LLM generated for a question (after it executed successfully).
+
+        Args:
+            question: Natural language question
+            sql: Generated SQL
+        """
+        if self.sql_cache is None:
+            return
+        try:
+            self.sql_cache.put(question, sql, self._skeleton(question))
+        except sqlite3.Error as e:
+            logger.warning(f"SQL cache store failed: {e}")
+
+    def compile_template(self, question: str) -> CompiledSQL | None:
+        """Compile a question with the rule-based templates (no LLM call).
+
+        Args:
+            question: Natural language question
+
+        Returns:
+            Parameterized SQL, or None if templates are disabled or the
+            question doesn't fit a known shape
+        """
+        if self.templates is None or not settings.sql_templates_enabled:
+            return None
+        compiled = self.templates.compile(question)
+        if compiled is not None:
+            logger.info(f"SQL template hit ({compiled.shape}): {question[:80]}")
+        return compiled
+
+    def execute_sql(
+        self,
+        sql: str,
+        timeout_seconds: float | None = None,
+        parameters: dict | None = None,
+        max_rows: int | None = None,
+        cancel: threading.Event | None = None,
+    ) -> list[dict]:
         """Execute SQL query with timeout protection.
 
+        Runs on the pooled read-only connections of self.executor, so rows
+        keep their SQLite types; sql_native_execution=false goes through
+        LangChain's SQLDatabase instead. The native path rejects plans with
+        expensive nested scans up front and interrupts SQLite at the
+        deadline, at the instruction budget or when cancel is set; the
+        SQLDatabase path can only check the timeout after the fact.
+
         Args:
             sql: SQL query string
-            timeout_seconds: Maximum execution time (default 15 seconds)
+            timeout_seconds: Maximum execution time (default from settings)
+            parameters: Values for named :parameters in the query
+            max_rows: Rows returned at most (default from settings); the rest is dropped
+            cancel: Event interrupting the query when set (native execution only)
 
         Returns:
             List of result rows as dictionaries
 
         Raises:
-            TimeoutError: If query execution exceeds timeout
+            QueryRejectedError: If the query plan is too expensive
+            QueryCancelledError: If the query was interrupted
+            TimeoutError: If query execution exceeds timeout (SQLDatabase path)
             Exception: If SQL execution fails
         """
+        timeout_seconds = settings.sql_timeout_seconds if timeout_seconds is None else timeout_seconds
         logger.info(f"Executing SQL (timeout: {timeout_seconds}s): {sql}")
+        max_rows = settings.sql_max_rows if max_rows is None else max_rows
 
         try:
-            # Set SQLite timeout to catch hanging queries
-            import sqlite3
-            sqlite3.PARSE_DECLTYPES = True
-
-            # Execute query - db.run() returns a STRING representation with include_columns=True
             start_time = time.time()
-            result_str = self.db.run(sql, include_columns=True)
+            if settings.sql_native_execution:
+                result = self.executor.execute(
+                    sql, parameters, max_rows, timeout_seconds=timeout_seconds, cancel=cancel
+                )
+                if result.truncated:
+                    logger.warning(f"SQL result truncated to {max_rows} rows")
+                results = result.as_dicts()
+            else:
+                results = self._run_with_sqldatabase(sql, parameters)[:max_rows]
             elapsed = time.time() - start_time
 
             # Check if execution exceeded timeout
             if elapsed > timeout_seconds:
                 raise TimeoutError(f"SQL query exceeded {timeout_seconds}s timeout (took {elapsed:.1f}s)")
 
-            # SQLDatabase returns a string like "[{'col1': 'val1', 'col2': 'val2'}]"
-            # Parse it back to a list of dicts
-            if not result_str or result_str.strip() in ("", "[]"):
-                return []
-
-            # Use ast.literal_eval to safely parse the string
-            import ast
-            results = ast.literal_eval(result_str)
-
-            # Ensure it's a list
-            if not isinstance(results, list):
-                results = [results] if results else []
-
             logger.info(f"Query returned {len(results)} rows")
 
             return results
@@ -558,16 +807,29 @@ EXAMPLES:""",
             logger.error(f"SQL execution error: {e}")
             raise
 
-    def query(self, question: str) -> dict:
+    def _run_with_sqldatabase(self, sql: str, parameters: dict | None) -> list[dict]:
+        """Execute through SQLDatabase.run() (rows come back as a repr string)."""
+        if parameters is None:
+            result_str = self.db.run(sql, include_columns=True)
+        else:
+            result_str = self.db.run(sql, include_columns=True, parameters=parameters)
+        return _parse_run_output(result_str)
+
+    def query(self, question: str, cancel: threading.Event | None = None) -> dict:
         """Query NBA database with natural language.
 
+        Common question shapes are compiled by the SQL templates and
+        previously generated SQL is reused from the SQL cache; the LLM only
+        generates SQL for the rest.
+
         Args:
             question: Natural language question about NBA statistics
+            cancel: Event interrupting SQL execution when set (e.g. by a caller's timeout)
 
         Returns:
             Dictionary with:
                 - question: Original question
-                - sql: Generated SQL query
+                - sql: Generated SQL query (template parameters inlined)
                 - results: Query results (list of dicts)
                 - error: Error message if query failed
 
@@ -578,11 +840,71 @@ EXAMPLES:""",
             [{'name': 'Player1', 'pts': 2500}, ...]
         """
         try:
-            # Generate SQL
-            sql = self.generate_sql(question)
+            # Generate SQL (templates, then the SQL cache, LLM for the rest)
+            with stage(latency.SQL_GENERATION):
+                compiled = self.compile_template(question) or self.lookup_cached_sql(question)
+                sql = compiled.render() if compiled else self.generate_sql(question)
 
             # Execute SQL
-            results = self.execute_sql(sql)
+            with stage(latency.SQL_EXECUTION):
+                if compiled:
+                    results = self.execute_sql(compiled.sql, parameters=compiled.params or None, cancel=cancel)
+                else:
+                    results = self.execute_sql(sql, cancel=cancel)
+
+            if compiled is None:
+                self.cache_generated_sql(question, sql)
+
+            return {
+                "question": question,
+                "sql": sql,
+                "results": results,
+                "error": None,
+            }
+
+        except Exception as e:
+            logger.error(f"Query failed: {e}")
+            return {
+                "question": question,
+                "sql": None,
+                "results": [],
+                "error": str(e),
+            }
+
+    async def aquery(self, question: str) -> dict:
+        """Async query: SQL generation is awaited, execution runs in a worker thread.
+
+        Args:
+            question: Natural language question about NBA statistics
+
+        Returns:
+            Same dictionary as query()
+        """
+        try:
+            with stage(latency.SQL_GENERATION):
+                compiled = self.compile_template(question)
+                if compiled is None and self.sql_cache is not None:
+                    compiled = await asyncio.to_thread(self.lookup_cached_sql, question)
+                sql = compiled.render() if compiled else await self.agenerate_sql(question)
+
+            # SQLite is synchronous; keep the event loop free while it runs. If this
+            # task is cancelled (e.g. by a retrieval timeout), interrupt the query
+            # instead of leaving it to run on in the worker thread.
+            cancel = threading.Event()
+            with stage(latency.SQL_EXECUTION):
+                try:
+                    if compiled:
+                        results = await asyncio.to_thread(
+                            self.execute_sql, compiled.sql, parameters=compiled.params or None, cancel=cancel
+                        )
+                    else:
+                        results = await asyncio.to_thread(self.execute_sql, sql, cancel=cancel)
+                except asyncio.CancelledError:
+                    cancel.set()
+                    raise
+
+            if compiled is None and self.sql_cache is not None:
+                await asyncio.to_thread(self.cache_generated_sql, question, sql)
 
             return {
                 "question": question,
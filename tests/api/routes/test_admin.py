@@ -0,0 +1,172 @@
+"""
+FILE: test_admin.py
+STATUS: Active
+RESPONSIBILITY: Tests for admin API routes (index reload, cache, interaction queue and latency statistics)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.routes.admin import router
+from src.core.exceptions import IndexNotFoundError
+from src.core.latency import LatencyRegistry
+from src.repositories.response_cache import ResponseCache
+from src.services.interaction_writer import InteractionWriter
+from src.services.semantic_cache import SemanticAnswerCache
+
+
+@pytest.fixture
+def client():
+    """Create test client for the admin router."""
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app, raise_server_exceptions=False)
+
+
+@pytest.fixture
+def mock_service():
+    service = MagicMock()
+    service.index_version = "20261016T100000Z"
+    service.reload_index.return_value = "20261016T110000Z"
+    service.vector_store.index_size = 42
+    return service
+
+
+class TestIndexReloadEndpoint:
+    """Tests for POST /admin/index/reload."""
+
+    def test_reload_current_snapshot(self, client, mock_service):
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.post("/admin/index/reload")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "previous_version": "20261016T100000Z",
+            "version": "20261016T110000Z",
+            "index_size": 42,
+        }
+        mock_service.reload_index.assert_called_once_with(None)
+
+    def test_reload_specific_version(self, client, mock_service):
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.post("/admin/index/reload", json={"version": "20261016T090000Z"})
+
+        assert response.status_code == 200
+        mock_service.reload_index.assert_called_once_with("20261016T090000Z")
+
+    def test_rejects_path_like_version(self, client, mock_service):
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.post("/admin/index/reload", json={"version": "../etc"})
+
+        assert response.status_code == 422
+        mock_service.reload_index.assert_not_called()
+
+    def test_missing_snapshot_propagates(self, client, mock_service):
+        mock_service.reload_index.side_effect = IndexNotFoundError("No index snapshot published.")
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.post("/admin/index/reload")
+
+        assert response.status_code == 500
+
+
+class TestCacheStatsEndpoint:
+    """Tests for GET /admin/cache/stats."""
+
+    def test_reports_semantic_cache_counters(self, client, mock_service):
+        mock_service.response_cache = None
+        cache = SemanticAnswerCache()
+        cache.stats.hits, cache.stats.misses, cache.stats.bypasses = 3, 1, 2
+        mock_service.semantic_cache = cache
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.get("/admin/cache/stats")
+
+        assert response.status_code == 200
+        semantic = response.json()["semantic"]
+        assert semantic["enabled"] is True
+        assert semantic["entries"] == 0
+        assert semantic["hits"] == 3
+        assert semantic["bypasses"] == 2
+        assert semantic["hit_rate"] == 0.75
+
+    def test_reports_response_cache_counters(self, client, mock_service, tmp_path):
+        cache = ResponseCache(path=tmp_path / "responses.sqlite")
+        cache.stats.memory_hits, cache.stats.disk_hits, cache.stats.misses = 2, 1, 1
+        mock_service.response_cache = cache
+        mock_service.semantic_cache = None
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.get("/admin/cache/stats")
+        cache.close()
+
+        assert response.status_code == 200
+        tier = response.json()["response"]
+        assert tier["enabled"] is True
+        assert tier["memory_hits"] == 2
+        assert tier["disk_hits"] == 1
+        assert tier["hit_rate"] == 0.75
+
+    def test_disabled_cache(self, client, mock_service):
+        mock_service.response_cache = None
+        mock_service.semantic_cache = None
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.get("/admin/cache/stats")
+
+        assert response.json()["response"]["enabled"] is False
+        assert response.json()["semantic"]["enabled"] is False
+
+
+class TestInteractionQueueStatsEndpoint:
+    """Tests for GET /admin/interactions/stats."""
+
+    def test_reports_writer_counters(self, client, mock_service):
+        writer = InteractionWriter(lambda batch: None)
+        writer.stats.enqueued, writer.stats.written, writer.stats.batches = 6, 6, 2
+        writer.stats.backpressure_waits = 1
+        mock_service.interaction_writer = writer
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.get("/admin/interactions/stats")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["enabled"] is True
+        assert body["queue_depth"] == 0
+        assert body["mean_batch"] == 3.0
+        assert body["backpressure_waits"] == 1
+
+    def test_disabled_writer(self, client, mock_service):
+        mock_service.interaction_writer = None
+        with patch("src.api.routes.admin.get_chat_service", return_value=mock_service):
+            response = client.get("/admin/interactions/stats")
+
+        assert response.json()["enabled"] is False
+
+
+
+class TestLatencyStatsEndpoint:
+    """Tests for GET /admin/latency."""
+
+    def test_reports_stage_percentiles(self, client):
+        registry = LatencyRegistry(window_seconds=60.0)
+        for ms in range(1, 101):
+            registry.record("llm_generation", float(ms))
+        with patch("src.api.routes.admin.latency_registry", registry):
+            response = client.get("/admin/latency")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["window_seconds"] == 60.0
+        stage = body["stages"]["llm_generation"]
+        assert stage["count"] == 100
+        assert stage["p50_ms"] == pytest.approx(50, rel=0.02)
+        assert stage["p99_ms"] == pytest.approx(99, rel=0.02)
+        assert stage["max_ms"] == 100.0
+
+    def test_no_measurements(self, client):
+        with patch("src.api.routes.admin.latency_registry", LatencyRegistry(window_seconds=60.0)):
+            response = client.get("/admin/latency")
+
+        assert response.json()["stages"] == {}
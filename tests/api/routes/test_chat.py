@@ -1,18 +1,20 @@
 """
 FILE: test_chat.py
 STATUS: Active
-RESPONSIBILITY: Tests for chat API routes (POST /chat, GET /search)
-LAST MAJOR UPDATE: 2026-02-13
+RESPONSIBILITY: Tests for chat API routes (POST /chat, POST /chat/stream, GET /search, POST /search/batch)
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
-from unittest.mock import MagicMock, patch
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from src.api.routes.chat import router
+from src.core.exceptions import LLMError
 from src.models.chat import ChatResponse, SearchResult
 
 
@@ -34,7 +36,8 @@ def client(app):
 def mock_service():
     """Create a mock ChatService with default return values."""
     service = MagicMock()
-    service.chat.return_value = ChatResponse(
+    service.achat = AsyncMock()
+    service.achat.return_value = ChatResponse(
         answer="The Denver Nuggets won.",
         sources=[
             SearchResult(text="Nuggets defeated Heat", score=92.5, source="nba.pdf")
@@ -62,7 +65,8 @@ class TestChatEndpoint:
         assert "answer" in data
         assert "sources" in data
         assert data["query"] == "Who won the NBA?"
-        mock_service.chat.assert_called_once()
+        mock_service.achat.assert_awaited_once()
+        mock_service.chat.assert_not_called()
 
     def test_chat_empty_query_rejected(self, client, mock_service):
         """POST /chat with empty query returns 422 validation error."""
@@ -79,6 +83,64 @@ class TestChatEndpoint:
         assert response.status_code == 422
 
 
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    """Split a text/event-stream body into (event, data) pairs."""
+    events = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestChatStreamEndpoint:
+    """Tests for POST /chat/stream (Server-Sent Events)."""
+
+    @staticmethod
+    def _events(*events, error=None):
+        async def stream(request):
+            for event in events:
+                yield event
+            if error is not None:
+                raise error
+
+        return stream
+
+    def test_stream_emits_service_events_as_sse(self, client, mock_service):
+        mock_service.astream_chat = self._events(
+            ("routing", {"query_type": "contextual"}),
+            ("sources", {"sources": [], "generated_sql": None}),
+            ("token", {"text": "The Nuggets "}),
+            ("token", {"text": "won."}),
+            ("done", {"answer": "The Nuggets won."}),
+        )
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post("/chat/stream", json={"query": "Who won the NBA?"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _parse_sse(response.text)
+        assert [name for name, _ in events] == ["routing", "sources", "token", "token", "done"]
+        assert "".join(data["text"] for name, data in events if name == "token") == "The Nuggets won."
+
+    def test_stream_error_becomes_error_event(self, client, mock_service):
+        mock_service.astream_chat = self._events(
+            ("routing", {"query_type": "contextual"}),
+            error=LLMError("LLM call failed: boom"),
+        )
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post("/chat/stream", json={"query": "Who won the NBA?"})
+
+        events = _parse_sse(response.text)
+        assert events[-1][0] == "error"
+        assert events[-1][1]["error"]["message"] == "LLM call failed: boom"
+
+    def test_stream_whitespace_only_query_rejected(self, client, mock_service):
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post("/chat/stream", json={"query": "   "})
+
+        assert response.status_code == 422
+
+
 class TestSearchEndpoint:
     """Tests for GET /search endpoint."""
 
@@ -103,3 +165,41 @@ class TestSearchEndpoint:
         mock_service.search.assert_called_once_with(query="test", k=10, min_score=None)
 
 
+
+
+class TestBatchSearchEndpoint:
+    """Tests for POST /search/batch endpoint."""
+
+    def test_batch_search_returns_results_per_query(self, client, mock_service):
+        """POST /search/batch returns one result list per query, in order."""
+        mock_service.search_many.return_value = [
+            [SearchResult(text="Relevant chunk", score=85.0, source="doc.pdf")],
+            [],
+        ]
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post(
+                "/search/batch", json={"queries": ["NBA championship", "obscure"], "k": 3}
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["results"]) == 2
+        assert data["results"][0][0]["source"] == "doc.pdf"
+        assert data["results"][1] == []
+        mock_service.search_many.assert_called_once_with(
+            ["NBA championship", "obscure"], k=3, min_score=None
+        )
+
+    def test_batch_search_rejects_empty_query(self, client, mock_service):
+        """POST /search/batch with an empty query returns 422."""
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post("/search/batch", json={"queries": ["ok", "  "]})
+
+        assert response.status_code == 422
+
+    def test_batch_search_rejects_empty_list(self, client, mock_service):
+        """POST /search/batch with no queries returns 422."""
+        with patch("src.api.routes.chat.get_chat_service", return_value=mock_service):
+            response = client.post("/search/batch", json={"queries": []})
+
+        assert response.status_code == 422
@@ -38,7 +38,8 @@ def test_client(mock_feedback_service):
     app.include_router(router)
 
     # Patch the get_feedback_service dependency
-    with patch("src.api.routes.feedback.get_feedback_service", return_value=mock_feedback_service):
+    with patch("src.api.routes.feedback.get_feedback_service", return_value=mock_feedback_service), \
+         patch("src.api.routes.feedback.flush_pending_interactions"):
         yield TestClient(app)
 
 
@@ -343,6 +344,34 @@ class TestGetInteractions:
         assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
+class TestPendingInteractions:
+    """Read endpoints include interactions still queued for the database."""
+
+    @pytest.mark.parametrize("path", ["/feedback/stats", "/feedback/negative", "/feedback/interactions"])
+    def test_reads_flush_interaction_queue(self, test_client, mock_feedback_service, path):
+        mock_feedback_service.get_stats.return_value = FeedbackStats(
+            total_interactions=0,
+            total_feedback=0,
+            positive_count=0,
+            negative_count=0,
+            feedback_rate=0.0,
+            positive_rate=0.0,
+        )
+        mock_feedback_service.get_negative_feedback_with_comments.return_value = []
+        calls = []
+        mock_feedback_service.get_recent_interactions.side_effect = lambda **_: calls.append("read") or []
+
+        with patch(
+            "src.api.routes.feedback.flush_pending_interactions", side_effect=lambda: calls.append("flush")
+        ) as flush:
+            response = test_client.get(path)
+
+        assert response.status_code == status.HTTP_200_OK
+        flush.assert_called_once()
+        if path == "/feedback/interactions":
+            assert calls == ["flush", "read"]
+
+
 class TestGetInteraction:
     """Tests for GET /feedback/interactions/{interaction_id} endpoint."""
 
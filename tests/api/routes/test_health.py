@@ -20,12 +20,14 @@ class TestHealthCheck:
         mock_service = MagicMock()
         mock_service.is_ready = True
         mock_service.vector_store.index_size = 100
+        mock_service.index_version = "20261016T100000Z"
         mock_get_service.return_value = mock_service
 
         result = await health_check()
         assert result.status == "healthy"
         assert result.index_loaded is True
         assert result.index_size == 100
+        assert result.index_version == "20261016T100000Z"
 
     @pytest.mark.asyncio
     @patch("src.api.routes.health.get_chat_service")
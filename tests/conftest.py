@@ -2,7 +2,7 @@
 FILE: conftest.py
 STATUS: Active
 RESPONSIBILITY: Shared pytest fixtures for all test modules
-LAST MAJOR UPDATE: 2026-02-10
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -10,9 +10,37 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from src.core.config import settings
 from src.models.chat import ChatResponse, SearchResult
 
 
+# ============================================================================
+# GLOBAL FIXTURES
+# ============================================================================
+
+
+# Features that ship enabled but share on-disk state across runs or answer
+# without calling the mocked dependencies. Tests opt back in one setting at a
+# time, or run with everything as shipped via @pytest.mark.shipped_defaults.
+TEST_SETTINGS = {
+    "embedding_cache_enabled": False,
+    "response_cache_enabled": False,
+    "interaction_write_behind": False,
+    "sql_templates_enabled": False,
+    "sql_cache_enabled": False,
+}
+
+
+@pytest.fixture(autouse=True)
+def test_settings(request, monkeypatch, tmp_path):
+    """Apply TEST_SETTINGS and keep on-disk caches in the test's tmp_path."""
+    monkeypatch.setattr(settings, "cache_dir", str(tmp_path / "cache"))
+    if request.node.get_closest_marker("shipped_defaults"):
+        return
+    for name, value in TEST_SETTINGS.items():
+        monkeypatch.setattr(settings, name, value)
+
+
 # ============================================================================
 # CHAT SERVICE FIXTURES
 # ============================================================================
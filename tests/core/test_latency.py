@@ -0,0 +1,123 @@
+"""
+FILE: test_latency.py
+STATUS: Active
+RESPONSIBILITY: Tests for per-stage latency measurement - histogram percentiles, window rotation, request timings
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import asyncio
+import contextvars
+import random
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.core import latency
+from src.core.latency import (
+    LatencyHistogram,
+    LatencyRegistry,
+    collect_timings,
+    current_timings,
+    record,
+    stage,
+)
+
+
+@pytest.fixture
+def registry():
+    """Fresh process-wide registry for the test."""
+    fresh = LatencyRegistry(window_seconds=60.0)
+    with patch.object(latency, "latency_registry", fresh):
+        yield fresh
+
+
+class TestLatencyHistogram:
+    """Tests for log-bucketed percentiles and the rolling window."""
+
+    def test_percentiles_within_two_percent(self):
+        histogram = LatencyHistogram(window_seconds=60.0)
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(3, 1.5) for _ in range(5000))
+        for value in values:
+            histogram.record(value)
+
+        summary = histogram.summary()
+
+        assert summary.count == 5000
+        assert summary.max_ms == values[-1]
+        assert summary.mean_ms == pytest.approx(sum(values) / len(values))
+        for quantile, measured in ((0.50, summary.p50_ms), (0.95, summary.p95_ms), (0.99, summary.p99_ms)):
+            exact = values[int(quantile * len(values)) - 1]
+            assert measured == pytest.approx(exact, rel=0.02)
+
+    def test_sub_microsecond_values(self):
+        histogram = LatencyHistogram(window_seconds=60.0)
+        histogram.record(0.0)
+
+        assert histogram.summary().p50_ms == 0.0
+
+    def test_empty_histogram(self):
+        assert LatencyHistogram(window_seconds=60.0).summary() is None
+
+    def test_old_measurements_leave_the_window(self):
+        histogram = LatencyHistogram(window_seconds=60.0, slices=6)
+        with patch("src.core.latency.time.monotonic", return_value=1000.0):
+            histogram.record(500.0)
+        with patch("src.core.latency.time.monotonic", return_value=1050.0):
+            histogram.record(5.0)
+            assert histogram.summary().count == 2
+        with patch("src.core.latency.time.monotonic", return_value=1065.0):
+            summary = histogram.summary()
+
+        assert summary.count == 1
+        assert summary.max_ms == 5.0
+
+
+class TestRequestTimings:
+    """Tests for stage() / collect_timings()."""
+
+    def test_stage_records_histogram_and_request(self, registry):
+        with collect_timings() as timings:
+            with stage("embedding"):
+                pass
+            record("embedding", 2.0)
+
+        assert timings["embedding"] >= 2.0  # Repeated stages are summed
+        assert registry.summaries()["embedding"].count == 2
+        assert current_timings() is None
+
+    def test_outside_request_only_histogram(self, registry):
+        record("faiss_search", 1.0)
+
+        assert current_timings() is None
+        assert registry.summaries()["faiss_search"].count == 1
+
+    def test_stage_records_on_error(self, registry):
+        with pytest.raises(RuntimeError), stage("sql_execution"):
+            raise RuntimeError("boom")
+
+        assert registry.summaries()["sql_execution"].count == 1
+
+    def test_worker_threads_record_into_request(self, registry):
+        with collect_timings() as timings:
+            context = contextvars.copy_context()
+            worker = threading.Thread(target=context.run, args=(record, "visualization", 3.0))
+            worker.start()
+            worker.join()
+
+        assert timings == {"visualization": 3.0}
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_are_isolated(self, registry):
+        async def request(ms):
+            with collect_timings() as timings:
+                await asyncio.to_thread(record, "sql_generation", ms)
+                await asyncio.sleep(0)
+                return timings
+
+        first, second = await asyncio.gather(request(1.0), request(2.0))
+
+        assert first == {"sql_generation": 1.0}
+        assert second == {"sql_generation": 2.0}
@@ -0,0 +1,92 @@
+"""
+FILE: test_bm25_index.py
+STATUS: Active
+RESPONSIBILITY: Tests for corpus-wide BM25 inverted index
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import numpy as np
+import pytest
+
+from src.repositories.bm25_index import BM25Index, tokenize
+
+CORPUS = [
+    "LeBron James scored 30 points for the Lakers",
+    "Stephen Curry hit seven threes against the Lakers",
+    "The Celtics defense held the Heat to 80 points",
+    "Nikola Jokic recorded another triple double",
+    "The Lakers and the Celtics have a historic rivalry",
+]
+
+
+class TestBM25Index:
+    """Tests for BM25Index."""
+
+    @pytest.fixture
+    def index(self):
+        """Build an index over the sample corpus."""
+        return BM25Index.build(CORPUS)
+
+    def test_tokenize_lowercases_and_splits(self):
+        assert tokenize("LeBron  James\tLakers") == ["lebron", "james", "lakers"]
+
+    def test_build_counts(self, index):
+        assert index.num_docs == 5
+        assert index.vocabulary_size == len({t for text in CORPUS for t in tokenize(text)})
+
+    def test_matches_rank_bm25_on_full_corpus(self, index):
+        """Scores over the full corpus equal rank_bm25's BM25Okapi."""
+        rank_bm25 = pytest.importorskip("rank_bm25")
+        reference = rank_bm25.BM25Okapi([tokenize(t) for t in CORPUS])
+
+        query = "lakers celtics rivalry"
+        expected = reference.get_scores(tokenize(query))
+        actual = index.get_scores(query, np.arange(len(CORPUS)))
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+    def test_scores_aligned_with_candidate_order(self, index):
+        full = index.get_scores("jokic triple double", [0, 1, 2, 3, 4])
+        subset = index.get_scores("jokic triple double", [3, 0])
+
+        assert subset[0] == pytest.approx(full[3])
+        assert subset[1] == pytest.approx(full[0])
+        assert subset[0] > 0
+        assert subset[1] == 0
+
+    def test_idf_is_corpus_wide(self, index):
+        """A rare term outscores a common one even when only one candidate is scored."""
+        rare = index.get_scores("jokic", [3])[0]
+        common = index.get_scores("lakers", [0])[0]
+        assert rare > common
+
+    def test_unknown_terms_score_zero(self, index):
+        scores = index.get_scores("zzz unknown", [0, 1, 2])
+        assert np.all(scores == 0)
+
+    def test_empty_candidates(self, index):
+        assert index.get_scores("lakers", []).shape == (0,)
+
+    def test_save_and_load_roundtrip(self, index, tmp_path):
+        path = tmp_path / "bm25_index.npz"
+        index.save(path)
+
+        loaded = BM25Index.load(path)
+
+        assert loaded.num_docs == index.num_docs
+        assert loaded.vocabulary_size == index.vocabulary_size
+        ids = np.arange(len(CORPUS))
+        np.testing.assert_allclose(
+            loaded.get_scores("lakers celtics", ids),
+            index.get_scores("lakers celtics", ids),
+        )
+
+    def test_extend_matches_full_build(self, index):
+        extended = BM25Index.build(CORPUS[:3]).extend(CORPUS[3:])
+
+        assert extended.num_docs == index.num_docs
+        assert extended.vocabulary_size == index.vocabulary_size
+        ids = np.arange(len(CORPUS))
+        for query in ("lakers celtics rivalry", "jokic triple double", "points"):
+            np.testing.assert_allclose(extended.get_scores(query, ids), index.get_scores(query, ids))
@@ -0,0 +1,114 @@
+"""
+FILE: test_chunk_store.py
+STATUS: Active
+RESPONSIBILITY: Tests for memory-mapped columnar chunk store
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from src.models.document import DocumentChunk
+from src.repositories.chunk_store import ChunkStore
+
+CHUNKS = [
+    DocumentChunk(
+        id="doc0_0",
+        text="LeBron James scored 30 points — a season high.",
+        metadata={"source": "nba.pdf", "page": 1, "quality_score": 0.8, "type": "pdf"},
+    ),
+    DocumentChunk(
+        id="doc0_1",
+        text="Stephen Curry hit seven threes.",
+        metadata={"source": "nba.pdf", "page": 2, "quality_score": 0.5},
+    ),
+    DocumentChunk(
+        id="reddit_0",
+        text="Who is the GOAT? Jordan, obviously.",
+        metadata={"source": "reddit.pdf", "page": "n/a", "comment_upvotes": 120, "type": "reddit_thread"},
+    ),
+]
+
+
+class TestChunkStore:
+    """Tests for ChunkStore."""
+
+    @pytest.fixture
+    def store_path(self, tmp_path):
+        """Save the sample chunks and return the file path."""
+        path = tmp_path / "document_chunks.bin"
+        ChunkStore.from_chunks(CHUNKS).save(path)
+        return path
+
+    def test_roundtrip(self, store_path):
+        store = ChunkStore.open(store_path)
+
+        assert len(store) == len(CHUNKS)
+        assert [store.get(i) for i in range(len(store))] == CHUNKS
+
+    def test_metadata_types_preserved(self, store_path):
+        store = ChunkStore.open(store_path)
+
+        kinds = {c.name: c.kind for c in store.columns}
+        assert kinds["source"] == "str"
+        assert kinds["quality_score"] == "float"
+        assert kinds["comment_upvotes"] == "int"
+        assert kinds["page"] == "json"  # mixed int / str
+        assert store.metadata(2) == CHUNKS[2].metadata
+        assert type(store.metadata(0)["page"]) is int
+
+    def test_open_is_memory_mapped(self, store_path):
+        store = ChunkStore.open(store_path)
+
+        assert isinstance(store._text, np.memmap)
+
+    def test_metadata_index(self, store_path):
+        index = ChunkStore.open(store_path).build_metadata_index()
+
+        np.testing.assert_array_equal(index["source"]["nba.pdf"], [0, 1])
+        np.testing.assert_array_equal(index["source"]["reddit.pdf"], [2])
+        np.testing.assert_array_equal(index["page"]["n/a"], [2])
+        np.testing.assert_array_equal(index["page"][1], [0])
+        np.testing.assert_array_equal(index["comment_upvotes"][120], [2])
+        np.testing.assert_array_equal(index["type"]["reddit_thread"], [2])
+
+    def test_empty_store(self, tmp_path):
+        path = tmp_path / "empty.bin"
+        ChunkStore.from_chunks([]).save(path)
+
+        store = ChunkStore.open(path)
+        assert len(store) == 0
+        assert store.build_metadata_index() == {}
+
+    def test_open_rejects_other_files(self, tmp_path):
+        path = tmp_path / "not_a_store.bin"
+        path.write_bytes(b"corrupted data")
+
+        with pytest.raises(ValueError, match="not a chunk store"):
+            ChunkStore.open(path)
+
+    def test_migrate_pickle(self, tmp_path):
+        pickle_path = tmp_path / "document_chunks.pkl"
+        with open(pickle_path, "wb") as f:
+            pickle.dump([{"id": c.id, "text": c.text, "metadata": c.metadata} for c in CHUNKS], f)
+
+        store = ChunkStore.migrate_pickle(pickle_path, tmp_path / "document_chunks.bin")
+
+        assert (tmp_path / "document_chunks.bin").exists()
+        assert store.get(1) == CHUNKS[1]
+
+    def test_append_and_select(self, store_path):
+        store = ChunkStore.open(store_path)
+        extra = DocumentChunk(id="new_0", text="Fresh chunk", metadata={"source": "new.pdf", "page": 9})
+
+        grown = store.append([extra])
+        assert len(grown) == 4
+        assert grown.get(3) == extra
+        assert grown.get(0) == CHUNKS[0]
+
+        kept = grown.select(np.array([1, 3]))
+        assert [kept.get(i) for i in range(len(kept))] == [CHUNKS[1], extra]
+        assert "comment_upvotes" not in {c.name for c in kept.columns}
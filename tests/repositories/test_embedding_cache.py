@@ -0,0 +1,85 @@
+"""
+FILE: test_embedding_cache.py
+STATUS: Active
+RESPONSIBILITY: Tests for persistent content-addressed embedding cache
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import numpy as np
+import pytest
+
+from src.repositories.embedding_cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Tests for EmbeddingCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = EmbeddingCache(path=tmp_path / "embeddings.sqlite", max_bytes=10**6, memory_items=2)
+        yield cache
+        cache.close()
+
+    def test_miss_then_hit(self, cache):
+        vectors = np.array([[0.1, 0.2], [0.3, 0.4]], dtype=np.float32)
+
+        assert cache.get_many("m", ["a", "b"]) == [None, None]
+        cache.put_many("m", ["a", "b"], vectors)
+        found = cache.get_many("m", ["b", "a", "b"])
+
+        np.testing.assert_array_equal(found[0], vectors[1])
+        np.testing.assert_array_equal(found[1], vectors[0])
+        assert cache.stats.misses == 2
+        assert cache.stats.hits == 3
+
+    def test_keyed_by_model(self, cache):
+        cache.put_many("model-a", ["text"], np.ones((1, 4), dtype=np.float32))
+
+        assert cache.get_many("model-b", ["text"]) == [None]
+
+    def test_persists_across_instances(self, tmp_path):
+        path = tmp_path / "embeddings.sqlite"
+        first = EmbeddingCache(path=path)
+        first.put_many("m", ["persisted"], np.full((1, 8), 0.5, dtype=np.float32))
+        first.close()
+
+        second = EmbeddingCache(path=path)
+        found = second.get_many("m", ["persisted"])
+        second.close()
+
+        np.testing.assert_array_equal(found[0], np.full(8, 0.5, dtype=np.float32))
+        assert second.stats.disk_hits == 1
+
+    def test_memory_lru_in_front_of_disk(self, cache):
+        cache.put_many("m", ["a", "b", "c"], np.eye(3, dtype=np.float32))
+
+        cache.get_many("m", ["c"])  # still in the 2-item LRU
+        cache.get_many("m", ["a"])  # evicted from LRU, read from disk
+
+        assert cache.stats.memory_hits == 1
+        assert cache.stats.disk_hits == 1
+
+    def test_size_based_eviction_drops_least_recently_used(self, tmp_path):
+        # 10 vectors of 100 float32 = 4000 bytes; limit fits ~6
+        cache = EmbeddingCache(path=tmp_path / "e.sqlite", max_bytes=2500, memory_items=0)
+        for i in range(10):
+            cache.put_many("m", [f"t{i}"], np.full((1, 100), i, dtype=np.float32))
+            if i == 4:
+                cache.get_many("m", ["t0"])  # t0 becomes recently used
+
+        assert cache.size_bytes <= 2500
+        assert cache.stats.evictions > 0
+        found = cache.get_many("m", ["t0", "t1", "t9"])
+        assert found[0] is not None
+        assert found[1] is None
+        assert found[2] is not None
+        cache.close()
+
+    def test_clear(self, cache):
+        cache.put_many("m", ["a"], np.ones((1, 2), dtype=np.float32))
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get_many("m", ["a"]) == [None]
@@ -2,7 +2,7 @@
 FILE: test_feedback.py
 STATUS: Active
 RESPONSIBILITY: Tests for feedback models, repository, and service
-LAST MAJOR UPDATE: 2026-02-06
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
@@ -206,6 +206,37 @@ class TestFeedbackRepository:
         recent = repository.get_recent_interactions(limit=3)
         assert len(recent) == 3
 
+    def test_save_interactions_batch(self, repository):
+        """Test saving several interactions in one transaction."""
+        interactions = [
+            ChatInteractionCreate(query=f"Query {i}", response=f"Response {i}") for i in range(4)
+        ]
+
+        assert repository.save_interactions(interactions) == 4
+        assert repository.get_stats().total_interactions == 4
+
+    def test_get_recent_turns(self, repository):
+        """Test reading the last turns of a conversation before a given turn."""
+        for turn in range(1, 8):
+            repository.save_interaction(
+                ChatInteractionCreate(
+                    query=f"Query {turn}",
+                    response=f"Response {turn}",
+                    conversation_id="conv-1",
+                    turn_number=turn,
+                )
+            )
+        repository.save_interaction(
+            ChatInteractionCreate(query="Other", response="Other", conversation_id="conv-2", turn_number=1)
+        )
+
+        turns = repository.get_recent_turns("conv-1", before_turn=6, limit=3)
+
+        assert [t.turn_number for t in turns] == [3, 4, 5]
+        assert turns[0].query == "Query 3"
+        assert turns[-1].response == "Response 5"
+        assert repository.get_recent_turns("conv-3", before_turn=2, limit=3) == []
+
     def test_get_stats(self, repository):
         """Test getting feedback statistics."""
         # Save interactions and feedback
@@ -0,0 +1,112 @@
+"""
+FILE: test_index_snapshots.py
+STATUS: Active
+RESPONSIBILITY: Tests for versioned vector index snapshots
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import IndexNotFoundError
+from src.models.document import DocumentChunk
+from src.repositories.index_snapshots import IndexSnapshotStore
+from src.repositories.vector_store import VectorStoreRepository
+
+
+def _repository(tmp_path, n_chunks=5, seed=0):
+    """Build an in-memory repository with n_chunks random chunks."""
+    rng = np.random.default_rng(seed)
+    repo = VectorStoreRepository(index_path=tmp_path / "idx.bin", chunks_path=tmp_path / "chunks.pkl")
+    chunks = [DocumentChunk(id=f"c{i}", text=f"chunk {i}", metadata={}) for i in range(n_chunks)]
+    repo.build_index(chunks, rng.random((n_chunks, 16), dtype=np.float32))
+    return repo
+
+
+class TestIndexSnapshotStore:
+    """Tests for IndexSnapshotStore."""
+
+    @pytest.fixture
+    def store(self, tmp_path):
+        return IndexSnapshotStore(root=tmp_path / "snapshots", keep=2)
+
+    def test_publish_writes_snapshot_and_pointer(self, store, tmp_path):
+        manifest = store.publish(_repository(tmp_path))
+
+        assert store.current_version() == manifest.version
+        assert store.versions() == [manifest.version]
+        assert manifest.index_size == 5
+        assert "faiss_index.idx" in manifest.files
+        assert "document_chunks.bin" in manifest.files
+        assert store.manifest(manifest.version) == manifest
+
+    def test_open_loads_current_snapshot(self, store, tmp_path):
+        store.publish(_repository(tmp_path, n_chunks=7))
+
+        repo = store.open()
+
+        assert repo.is_loaded
+        assert repo.index_size == 7
+
+    def test_versions_are_unique_and_ordered(self, store, tmp_path):
+        first = store.publish(_repository(tmp_path, n_chunks=3)).version
+        second = store.publish(_repository(tmp_path, n_chunks=4)).version
+
+        assert first != second
+        assert store.versions() == [first, second]
+        assert store.current_version() == second
+        assert store.open(first).index_size == 3
+
+    def test_publish_without_switching_current(self, store, tmp_path):
+        first = store.publish(_repository(tmp_path)).version
+        second = store.publish(_repository(tmp_path), make_current=False).version
+
+        assert store.current_version() == first
+        store.set_current(second)
+        assert store.current_version() == second
+
+    def test_prune_keeps_newest_and_current(self, store, tmp_path):
+        first = store.publish(_repository(tmp_path)).version
+        store.set_current(first)
+        store.publish(_repository(tmp_path), make_current=False)
+        store.publish(_repository(tmp_path), make_current=False)
+        latest = store.publish(_repository(tmp_path), make_current=False).version
+
+        versions = store.versions()
+        assert first in versions
+        assert latest in versions
+        assert len(versions) == 3  # keep=2 newest + current
+
+    def test_keep_zero_keeps_only_current(self, tmp_path):
+        store = IndexSnapshotStore(root=tmp_path / "snapshots", keep=0)
+        store.publish(_repository(tmp_path))
+        latest = store.publish(_repository(tmp_path)).version
+
+        assert store.versions() == [latest]
+
+    def test_failed_publish_leaves_current_untouched(self, store, tmp_path):
+        first = store.publish(_repository(tmp_path)).version
+
+        with patch.object(VectorStoreRepository, "save", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                store.publish(_repository(tmp_path))
+
+        assert store.current_version() == first
+        assert store.versions() == [first]
+        assert not any(p.name.startswith(".staging-") for p in store.root.iterdir())
+
+    def test_open_without_snapshots_raises(self, store):
+        assert store.current_version() is None
+        with pytest.raises(IndexNotFoundError):
+            store.open()
+
+    def test_unknown_version_raises(self, store, tmp_path):
+        store.publish(_repository(tmp_path))
+
+        with pytest.raises(IndexNotFoundError, match="not found"):
+            store.open("19990101T000000Z")
+        with pytest.raises(IndexNotFoundError):
+            store.set_current("19990101T000000Z")
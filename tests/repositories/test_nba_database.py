@@ -1,17 +1,20 @@
 """
 FILE: test_nba_database.py
 STATUS: Active
-RESPONSIBILITY: Unit tests for SQLAlchemy models and NBADatabase repository
-LAST MAJOR UPDATE: 2026-02-11
+RESPONSIBILITY: Unit tests for SQLAlchemy models and NBADatabase repository (including derived tables)
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import sqlite3
 import tempfile
 from pathlib import Path
 
 import pytest
 
 from src.repositories.nba_database import (
+    PLAYER_STATS_FULL,
+    RANKED_COLUMNS,
     Base,
     DataDictionaryModel,
     NBADatabase,
@@ -127,6 +130,86 @@ class TestCountRecords:
         session.close()
 
 
+def _stats(**values) -> dict:
+    """Stats record with every required column set (1 unless given)."""
+    stats = {
+        column.name: 1
+        for column in PlayerStatsModel.__table__.columns
+        if column.name not in ("id", "player_id")
+    }
+    stats.update(values)
+    return stats
+
+
+@pytest.fixture
+def loaded_db(temp_db):
+    session = temp_db.get_session()
+    temp_db.add_team(session, "LAL", "Los Angeles Lakers")
+    temp_db.add_team(session, "BOS", "Boston Celtics")
+    for name, team, gp, pts, reb in [
+        ("LeBron James", "LAL", 70, 1708, 546),
+        ("Jayson Tatum", "BOS", 72, 1930, 628),
+        ("Rookie", "BOS", 0, 0, 0),
+    ]:
+        player = temp_db.add_player(session, name, team, 25)
+        session.flush()
+        temp_db.add_player_stats(session, player.id, _stats(gp=gp, pts=pts, reb=reb))
+    session.commit()
+    session.close()
+    return temp_db
+
+
+class TestDerivedTables:
+    def test_pre_joined_rows_with_per_game_columns(self, loaded_db):
+        result = loaded_db.build_derived_tables()
+
+        assert result[PLAYER_STATS_FULL] == 3
+        conn = sqlite3.connect(loaded_db.db_path)
+        rows = conn.execute(
+            f"SELECT name, team_name, pts, ppg, rpg FROM {PLAYER_STATS_FULL} ORDER BY ppg DESC"
+        ).fetchall()
+        conn.close()
+        assert rows == [
+            ("Jayson Tatum", "Boston Celtics", 1930, 26.8, 8.7),
+            ("LeBron James", "Los Angeles Lakers", 1708, 24.4, 7.8),
+            ("Rookie", "Boston Celtics", 0, None, None),  # No games: no average
+        ]
+
+    def test_top_n_reads_covering_index(self, loaded_db):
+        loaded_db.build_derived_tables()
+
+        conn = sqlite3.connect(loaded_db.db_path)
+        plan = conn.execute(
+            f"EXPLAIN QUERY PLAN SELECT name, ppg FROM {PLAYER_STATS_FULL} WHERE gp >= 20 ORDER BY ppg DESC LIMIT 5"
+        ).fetchall()
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        assert "COVERING INDEX ix_player_stats_full_ppg" in plan[0][3]
+        assert {f"ix_{PLAYER_STATS_FULL}_{column}" for column in RANKED_COLUMNS} <= indexes
+        assert "ix_player_stats_pts_player" in indexes
+
+    def test_rebuild_reflects_new_stats(self, loaded_db):
+        loaded_db.build_derived_tables()
+        session = loaded_db.get_session()
+        player = loaded_db.add_player(session, "Jaylen Brown", "BOS", 28)
+        session.flush()
+        loaded_db.add_player_stats(session, player.id, _stats(gp=63, pts=1400))
+        session.commit()
+        session.close()
+
+        assert loaded_db.build_derived_tables()[PLAYER_STATS_FULL] == 4
+
+    def test_drop_tables_drops_derived_table(self, loaded_db):
+        loaded_db.build_derived_tables()
+
+        loaded_db.drop_tables()
+
+        conn = sqlite3.connect(loaded_db.db_path)
+        tables = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        conn.close()
+        assert (PLAYER_STATS_FULL,) not in tables
+
+
 class TestModelRepr:
     def test_team_repr(self):
         team = TeamModel(abbreviation="LAL", name="Los Angeles Lakers")
@@ -0,0 +1,122 @@
+"""
+FILE: test_response_cache.py
+STATUS: Active
+RESPONSIBILITY: Tests for exact-match chat response cache (keys, tiers, data-version invalidation)
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import pytest
+
+from src.models.chat import ChatResponse, SearchResult
+from src.repositories.response_cache import ResponseCache
+
+
+def _response(answer: str) -> ChatResponse:
+    return ChatResponse(
+        answer=answer,
+        sources=[SearchResult(text="chunk", source="doc.pdf", score=80.0)],
+        query="q",
+        processing_time_ms=100.0,
+        model="test-model",
+    )
+
+
+class TestResponseCacheKey:
+    """Tests for key normalization."""
+
+    def test_case_whitespace_and_trailing_punctuation_ignored(self):
+        assert ResponseCache.key("Who  leads the NBA in points?", "statistical", 5) == ResponseCache.key(
+            "who leads the nba in points", "statistical", 5
+        )
+
+    def test_key_covers_route_k_min_score_and_history(self):
+        base = ResponseCache.key("top scorers", "statistical", 5)
+
+        assert ResponseCache.key("top scorers", "contextual", 5) != base
+        assert ResponseCache.key("top scorers", "statistical", 8) != base
+        assert ResponseCache.key("top scorers", "statistical", 5, min_score=0.5) != base
+        assert ResponseCache.key("top scorers", "statistical", 5, conversation_history="User: hi") != base
+
+
+class TestResponseCache:
+    """Tests for ResponseCache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = ResponseCache(path=tmp_path / "responses.sqlite", max_entries=100, memory_items=2)
+        yield cache
+        cache.close()
+
+    def test_miss_then_hit(self, cache):
+        key = ResponseCache.key("top scorers", "statistical", 5)
+
+        assert cache.get(key, "v1") is None
+        cache.put(key, "v1", _response("SGA leads."))
+        found = cache.get(key, "v1")
+
+        assert found.answer == "SGA leads."
+        assert found.sources[0].source == "doc.pdf"
+        assert cache.stats.misses == 1
+        assert cache.stats.memory_hits == 1
+
+    def test_data_version_change_drops_entry(self, cache):
+        key = ResponseCache.key("top scorers", "statistical", 5)
+        cache.put(key, "v1", _response("old data"))
+
+        assert cache.get(key, "v2") is None
+        assert len(cache) == 0
+        assert cache.stats.stale == 1
+        assert cache.get(key, "v1") is None
+
+    def test_shared_across_instances(self, tmp_path):
+        path = tmp_path / "responses.sqlite"
+        key = ResponseCache.key("top scorers", "statistical", 5)
+        first = ResponseCache(path=path)
+        second = ResponseCache(path=path)
+
+        first.put(key, "v1", _response("SGA leads."))
+        found = second.get(key, "v1")
+        again = second.get(key, "v1")
+        first.close()
+        second.close()
+
+        assert found.answer == "SGA leads."
+        assert again.answer == "SGA leads."
+        assert second.stats.disk_hits == 1
+        assert second.stats.memory_hits == 1
+
+    def test_memory_lru_in_front_of_disk(self, cache):
+        keys = [ResponseCache.key(q, "statistical", 5) for q in ("a", "b", "c")]
+        for key in keys:
+            cache.put(key, "v1", _response(key))
+
+        cache.get(keys[2], "v1")  # still in the 2-item LRU
+        cache.get(keys[0], "v1")  # evicted from LRU, read from disk
+
+        assert cache.stats.memory_hits == 1
+        assert cache.stats.disk_hits == 1
+
+    def test_disk_eviction_keeps_recently_used(self, tmp_path):
+        cache = ResponseCache(path=tmp_path / "responses.sqlite", max_entries=10, memory_items=0)
+        keys = [ResponseCache.key(f"question {i}", "statistical", 5) for i in range(11)]
+        for key in keys[:10]:
+            cache.put(key, "v1", _response(key))
+        cache.get(keys[0], "v1")  # oldest write, but recently read
+
+        cache.put(keys[10], "v1", _response("newest"))
+
+        assert len(cache) == 9
+        assert cache.stats.evictions == 2
+        assert cache.get(keys[0], "v1") is not None
+        assert cache.get(keys[1], "v1") is None
+        cache.close()
+
+    def test_clear(self, cache):
+        key = ResponseCache.key("top scorers", "statistical", 5)
+        cache.put(key, "v1", _response("SGA leads."))
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.get(key, "v1") is None
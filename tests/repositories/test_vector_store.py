@@ -6,6 +6,7 @@ LAST MAJOR UPDATE: 2026-02-06
 MAINTAINER: Shahu
 """
 
+import pickle
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,7 +15,8 @@ import pytest
 
 from src.core.exceptions import IndexNotFoundError, SearchError
 from src.models.document import DocumentChunk
-from src.repositories.vector_store import VectorStoreRepository
+from src.repositories.chunk_store import ChunkStore
+from src.repositories.vector_store import VectorStoreRepository, chunk_key, create_faiss_index
 
 
 class TestVectorStoreRepository:
@@ -91,9 +93,10 @@ class TestVectorStoreRepository:
         repository.build_index(sample_chunks, sample_embeddings)
         repository.save()
 
-        # Verify files exist
+        # Verify files exist (chunks go to the columnar store, not the pickle)
         assert index_path.exists()
-        assert chunks_path.exists()
+        assert chunks_path.with_suffix(".bin").exists()
+        assert not chunks_path.exists()
 
         # Create new repository and load
         new_repo = VectorStoreRepository(
@@ -156,12 +159,12 @@ class TestVectorStoreRepository:
         repository.save()
 
         assert index_path.exists()
-        assert chunks_path.exists()
+        assert chunks_path.with_suffix(".bin").exists()
 
         repository.delete_files()
 
         assert not index_path.exists()
-        assert not chunks_path.exists()
+        assert not chunks_path.with_suffix(".bin").exists()
         assert not repository.is_loaded
 
     def test_chunks_returns_copy(self, repository, sample_chunks, sample_embeddings):
@@ -187,8 +190,8 @@ class TestVectorStoreRepository:
         repository.build_index(sample_chunks, sample_embeddings)
         repository.save()
 
-        # Corrupt chunks file
-        with open(chunks_path, "w") as f:
+        # Corrupt chunk store file
+        with open(chunks_path.with_suffix(".bin"), "w") as f:
             f.write("corrupted data")
 
         # Create new repository and try to load
@@ -233,6 +236,44 @@ class TestVectorStoreRepository:
         # Should fall back to unfiltered search
         assert len(results) <= 2
 
+    def test_search_with_multiple_metadata_filters(self, repository, sample_chunks, sample_embeddings):
+        """Test that multiple metadata filters are intersected."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        query_embedding = np.random.rand(64).astype(np.float32)
+        results = repository.search(
+            query_embedding,
+            k=5,
+            metadata_filters={"source": "nba.pdf", "page": 2},
+        )
+
+        assert [chunk.id for chunk, _ in results] == ["doc0_1"]
+
+    def test_search_with_metadata_filters_does_not_rebuild_index(self, repository, sample_chunks, sample_embeddings):
+        """Test that filtered search uses an id selector instead of reconstructing vectors."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        with patch.object(repository._index, "reconstruct", side_effect=AssertionError("reconstruct called")):
+            results = repository.search(
+                np.random.rand(64).astype(np.float32),
+                k=5,
+                metadata_filters={"source": "players.pdf"},
+            )
+
+        assert [chunk.id for chunk, _ in results] == ["doc1_0"]
+
+    def test_search_with_unhashable_metadata_filter_falls_back(self, repository, sample_chunks, sample_embeddings):
+        """Test that an unhashable filter value matches nothing and falls back to unfiltered search."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        results = repository.search(
+            np.random.rand(64).astype(np.float32),
+            k=3,
+            metadata_filters={"source": ["nba.pdf"]},
+        )
+
+        assert len(results) == 3
+
     def test_search_with_1d_query_embedding(self, repository, sample_chunks, sample_embeddings):
         """Test search handles 1D query embedding correctly."""
         repository.build_index(sample_chunks, sample_embeddings)
@@ -343,6 +384,136 @@ class TestVectorStoreRepository:
             assert hasattr(chunk, 'text')
             assert hasattr(chunk, 'metadata')
 
+    def test_save_writes_bm25_index(self, repository, sample_chunks, sample_embeddings, temp_paths):
+        """Test that save persists the BM25 inverted index next to the FAISS index."""
+        index_path, _ = temp_paths
+
+        repository.build_index(sample_chunks, sample_embeddings)
+        repository.save()
+
+        assert (index_path.parent / "bm25_index.npz").exists()
+
+    def test_load_rebuilds_missing_bm25_index(self, repository, sample_chunks, sample_embeddings, temp_paths):
+        """Test that load rebuilds the BM25 index when the file is missing (legacy indexes)."""
+        index_path, chunks_path = temp_paths
+
+        repository.build_index(sample_chunks, sample_embeddings)
+        repository.save()
+        (index_path.parent / "bm25_index.npz").unlink()
+
+        new_repo = VectorStoreRepository(index_path=index_path, chunks_path=chunks_path)
+        assert new_repo.load()
+
+        query_embedding = np.random.rand(64).astype(np.float32)
+        results = new_repo.search(query_embedding, k=3, query_text="Michael Jordan Bulls")
+        assert len(results) == 3
+
+    def test_search_with_query_text_uses_bm25(self, repository, sample_chunks):
+        """Test that BM25 lifts the lexically matching chunk when cosine scores tie."""
+        embeddings = np.ones((3, 64), dtype=np.float32)
+        repository.build_index(sample_chunks, embeddings)
+
+        results = repository.search(np.ones(64, dtype=np.float32), k=3, query_text="Jordan Bulls")
+
+        assert results[0][0].id == "doc0_1"
+        assert all(isinstance(score, float) for _, score in results)
+
+    def test_load_migrates_legacy_pickle(self, sample_chunks, sample_embeddings, temp_paths):
+        """Test that a legacy chunks pickle is migrated to the chunk store on first load."""
+        index_path, chunks_path = temp_paths
+        repo = VectorStoreRepository(index_path=index_path, chunks_path=chunks_path)
+        repo.build_index(sample_chunks, sample_embeddings)
+        repo.save()
+        chunks_path.with_suffix(".bin").unlink()
+        with open(chunks_path, "wb") as f:
+            pickle.dump([{"id": c.id, "text": c.text, "metadata": c.metadata} for c in sample_chunks], f)
+
+        new_repo = VectorStoreRepository(index_path=index_path, chunks_path=chunks_path)
+        assert new_repo.load()
+
+        assert chunks_path.with_suffix(".bin").exists()
+        assert new_repo.chunks == sample_chunks
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_load_and_search_roundtrip(self, repository, sample_chunks, sample_embeddings, temp_paths, mmap):
+        """Test that a memory-mapped (or fully read) index returns the same hits."""
+        index_path, chunks_path = temp_paths
+        repository.build_index(sample_chunks, sample_embeddings)
+        repository.save()
+        expected = repository.search(sample_embeddings[1], k=3, query_text="Jordan")
+
+        new_repo = VectorStoreRepository(index_path=index_path, chunks_path=chunks_path, mmap=mmap)
+        assert new_repo.load()
+
+        assert new_repo.search(sample_embeddings[1], k=3, query_text="Jordan") == expected
+
+    def test_save_after_mmap_load(self, repository, sample_chunks, sample_embeddings, temp_paths):
+        """Test that re-saving over the mapped files leaves the loaded index usable."""
+        index_path, chunks_path = temp_paths
+        repository.build_index(sample_chunks, sample_embeddings)
+        repository.save()
+
+        new_repo = VectorStoreRepository(index_path=index_path, chunks_path=chunks_path, mmap=True)
+        assert new_repo.load()
+        new_repo.save()
+
+        assert len(new_repo.search(sample_embeddings[0], k=3)) == 3
+        assert VectorStoreRepository(index_path=index_path, chunks_path=chunks_path).load()
+
+    def test_search_materializes_only_returned_chunks(self, repository, sample_chunks, sample_embeddings):
+        """Test that search decodes chunk text only for the top-k hits."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        with patch.object(ChunkStore, "get", autospec=True, side_effect=ChunkStore.get) as get:
+            results = repository.search(sample_embeddings[0], k=2)
+
+        assert len(results) == 2
+        assert get.call_count == 2
+
+    def test_search_batch_matches_single_searches(self, repository, sample_chunks, sample_embeddings):
+        """Test that batched search returns exactly what per-query search returns."""
+        repository.build_index(sample_chunks, sample_embeddings)
+        queries = np.random.rand(4, 64).astype(np.float32)
+        texts = ["Jordan Bulls", None, "LeBron greatest", "zzz"]
+
+        batch = repository.search_batch(queries, texts, k=2)
+
+        expected = [repository.search(q, k=2, query_text=t) for q, t in zip(queries, texts)]
+        assert batch == expected
+
+    def test_search_batch_single_faiss_call(self, repository, sample_chunks, sample_embeddings):
+        """Test that all queries go through one FAISS search over the query matrix."""
+        repository.build_index(sample_chunks, sample_embeddings)
+        index_search = MagicMock(wraps=repository._index.search)
+        repository._index.search = index_search
+
+        results = repository.search_batch(np.random.rand(5, 64).astype(np.float32), k=2)
+
+        assert len(results) == 5
+        index_search.assert_called_once()
+        assert index_search.call_args.args[0].shape == (5, 64)
+
+    def test_search_batch_min_score(self, repository, sample_chunks, sample_embeddings):
+        """Test that min_score filters candidates per query."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        results = repository.search_batch(sample_embeddings, k=3, min_score=0.999)
+
+        # Each chunk's own embedding is its only (near) exact match
+        assert [[chunk.id for chunk, _ in r] for r in results] == [["doc0_0"], ["doc0_1"], ["doc1_0"]]
+
+    def test_search_batch_text_count_mismatch_raises(self, repository, sample_chunks, sample_embeddings):
+        """Test that query_texts must align with query embeddings."""
+        repository.build_index(sample_chunks, sample_embeddings)
+
+        with pytest.raises(SearchError, match="Mismatch"):
+            repository.search_batch(sample_embeddings, ["only one"])
+
+    def test_search_batch_not_loaded_raises(self, repository):
+        """Test that batched search on unloaded index raises error."""
+        with pytest.raises(IndexNotFoundError):
+            repository.search_batch(np.random.rand(2, 64).astype(np.float32))
+
     def test_delete_files_when_files_dont_exist(self, repository):
         """Test delete_files handles non-existent files gracefully."""
         # Should not raise error even if files don't exist
@@ -350,6 +521,401 @@ class TestVectorStoreRepository:
         assert not repository.is_loaded
 
 
+class TestIndexTypes:
+    """Tests for pluggable FAISS index types (flat, IVF, HNSW, IVF-PQ)."""
+
+    N_VECTORS = 300
+    DIM = 64
+
+    @pytest.fixture
+    def corpus(self):
+        rng = np.random.default_rng(7)
+        chunks = [
+            DocumentChunk(id=f"c{i}", text=f"chunk {i}", metadata={"source": f"doc{i % 3}.pdf"})
+            for i in range(self.N_VECTORS)
+        ]
+        return chunks, rng.random((self.N_VECTORS, self.DIM), dtype=np.float32)
+
+    @pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw", "ivf_pq", "sq8", "fp16", "pq"])
+    def test_build_and_search(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            index_type=index_type,
+            nprobe=64,
+        )
+        repo.build_index(chunks, embeddings)
+
+        assert repo.index_size == self.N_VECTORS
+        results = repo.search(embeddings[42], k=5)
+        assert len(results) == 5
+        assert "c42" in [chunk.id for chunk, _ in results]
+
+    @pytest.mark.parametrize("index_type", ["ivf_flat", "hnsw"])
+    def test_filtered_search_on_ann_index(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            index_type=index_type,
+        )
+        repo.build_index(chunks, embeddings)
+
+        results = repo.search(embeddings[0], k=5, metadata_filters={"source": "doc1.pdf"})
+
+        assert results
+        assert all(chunk.metadata["source"] == "doc1.pdf" for chunk, _ in results)
+
+    def test_load_applies_search_params(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        paths = {"index_path": tmp_path / "idx.bin", "chunks_path": tmp_path / "chunks.pkl"}
+        repo = VectorStoreRepository(**paths, index_type="ivf_flat")
+        repo.build_index(chunks, embeddings)
+        repo.save()
+
+        loaded = VectorStoreRepository(**paths, nprobe=3)
+        assert loaded.load()
+
+        import faiss
+
+        assert faiss.extract_index_ivf(loaded._index).nprobe == 3
+
+    @pytest.mark.parametrize("index_type", ["ivf_flat", "ivf_pq"])
+    def test_mmap_load_maps_ivf_lists(self, tmp_path, corpus, index_type):
+        import faiss
+
+        chunks, embeddings = corpus
+        paths = {"index_path": tmp_path / "idx.bin", "chunks_path": tmp_path / "chunks.pkl"}
+        repo = VectorStoreRepository(**paths, index_type=index_type)
+        repo.build_index(chunks, embeddings)
+        repo.save()
+
+        loaded = VectorStoreRepository(**paths, mmap=True)
+        assert loaded.load()
+
+        invlists = faiss.downcast_InvertedLists(faiss.extract_index_ivf(loaded._index).invlists)
+        assert isinstance(invlists, faiss.OnDiskInvertedLists)
+        assert "c42" in [chunk.id for chunk, _ in loaded.search(embeddings[42], k=5)]
+
+    def test_unknown_index_type_raises(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            index_type="annoy",
+        )
+        with pytest.raises(ValueError, match="Unknown index type"):
+            repo.build_index(chunks, embeddings)
+
+    def test_ivf_pq_requires_enough_training_vectors(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            index_type="ivf_pq",
+        )
+        with pytest.raises(ValueError, match="needs at least"):
+            repo.build_index(chunks[:100], embeddings[:100])
+
+
+class TestQuantizedIndexes:
+    """Tests for quantized storage modes (sq8, fp16, pq with float re-rank)."""
+
+    N_VECTORS = 400
+    DIM = 64
+
+    @pytest.fixture
+    def corpus(self):
+        rng = np.random.default_rng(3)
+        chunks = [
+            DocumentChunk(id=f"c{i}", text=f"chunk {i}", metadata={"source": f"doc{i % 4}.pdf"})
+            for i in range(self.N_VECTORS)
+        ]
+        return chunks, rng.random((self.N_VECTORS, self.DIM), dtype=np.float32)
+
+    def _repo(self, tmp_path, **kwargs):
+        return VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            **kwargs,
+        )
+
+    @pytest.mark.parametrize("index_type", ["sq8", "fp16", "pq"])
+    def test_quantized_codes_are_smaller_than_flat(self, corpus, index_type):
+        _, embeddings = corpus
+        flat = create_faiss_index(embeddings, "flat")
+        quantized = create_faiss_index(embeddings, index_type, pq_m=16)
+
+        # Bytes stored per vector: 4*dim for flat
+        assert quantized.sa_code_size() <= flat.sa_code_size() / 2
+
+    def test_build_index_selects_index_type(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type="flat")
+
+        repo.build_index(chunks, embeddings, index_type="sq8")
+
+        import faiss
+
+        assert isinstance(faiss.downcast_index(repo._index.index), faiss.IndexScalarQuantizer)
+        assert repo.search(embeddings[17], k=1)[0][0].id == "c17"
+
+    def test_pq_rerank_restores_exact_scores(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        flat = self._repo(tmp_path / "flat")
+        flat.build_index(chunks, embeddings)
+        pq = self._repo(tmp_path / "pq")
+        pq.build_index(chunks, embeddings, index_type="pq")
+
+        for i in (0, 123, 399):
+            expected = flat.search(embeddings[i], k=5)
+            actual = pq.search(embeddings[i], k=5)
+            assert actual[0][0].id == f"c{i}"
+            assert actual[0][1] == pytest.approx(expected[0][1], abs=1e-3)
+
+    def test_pq_filtered_search(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings, index_type="pq")
+
+        results = repo.search(embeddings[5], k=5, metadata_filters={"source": "doc1.pdf"})
+
+        assert results[0][0].id == "c5"
+        assert all(chunk.metadata["source"] == "doc1.pdf" for chunk, _ in results)
+
+    @pytest.mark.parametrize("mmap", [True, False])
+    def test_pq_save_and_load(self, tmp_path, corpus, mmap):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings, index_type="pq")
+        repo.save()
+        assert (tmp_path / "rerank_vectors.npy").exists()
+
+        loaded = self._repo(tmp_path, mmap=mmap)
+        assert loaded.load()
+        assert isinstance(loaded._rerank_vectors, np.memmap) == mmap
+        assert loaded.search(embeddings[42], k=1)[0][0].id == "c42"
+
+    def test_pq_load_without_rerank_vectors_fails(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings, index_type="pq")
+        repo.save()
+        (tmp_path / "rerank_vectors.npy").unlink()
+
+        assert not self._repo(tmp_path).load()
+
+    def test_rebuild_as_flat_removes_rerank_vectors(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings, index_type="pq")
+        repo.save()
+
+        repo.build_index(chunks, embeddings, index_type="flat")
+        repo.save()
+
+        assert not (tmp_path / "rerank_vectors.npy").exists()
+
+    def test_pq_upsert_delete_compact(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings, index_type="pq")
+        repo.save()
+
+        loaded = self._repo(tmp_path)
+        assert loaded.load()
+        replacement = DocumentChunk(id="c8", text="rewritten", metadata={"source": "edited.pdf"})
+        loaded.upsert([replacement], embeddings[300:301])
+        loaded.delete(["c300"])
+        loaded.compact()
+
+        assert len(loaded._rerank_vectors) == self.N_VECTORS - 1
+        top = loaded.search(embeddings[300], k=1)[0][0]
+        assert top.id == "c8"
+        assert top.text == "rewritten"
+
+
+class TestIncrementalUpdates:
+    """Tests for upsert/delete/compact with chunk-id keyed labels."""
+
+    N_VECTORS = 300
+    DIM = 64
+
+    @pytest.fixture
+    def corpus(self):
+        rng = np.random.default_rng(11)
+        chunks = [
+            DocumentChunk(id=f"c{i}", text=f"chunk number {i}", metadata={"source": f"doc{i % 3}.pdf"})
+            for i in range(self.N_VECTORS)
+        ]
+        return chunks, rng.random((self.N_VECTORS, self.DIM), dtype=np.float32)
+
+    def _repo(self, tmp_path, index_type="flat", **kwargs):
+        return VectorStoreRepository(
+            index_path=tmp_path / "idx.bin",
+            chunks_path=tmp_path / "chunks.pkl",
+            index_type=index_type,
+            nprobe=64,
+            **kwargs,
+        )
+
+    def _new_chunk(self, chunk_id, source="new.pdf"):
+        return DocumentChunk(id=chunk_id, text=f"fresh text {chunk_id}", metadata={"source": source})
+
+    def test_chunk_key_is_stable(self):
+        assert chunk_key("c1") == chunk_key("c1")
+        assert chunk_key("c1") != chunk_key("c2")
+        assert 0 <= chunk_key("c1") < 2**63
+
+    @pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw", "ivf_pq"])
+    def test_upsert_adds_new_chunks(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+
+        new_vectors = np.random.default_rng(1).random((2, self.DIM), dtype=np.float32)
+        repo.upsert([self._new_chunk("n0"), self._new_chunk("n1")], new_vectors)
+
+        assert repo.index_size == self.N_VECTORS + 2
+        results = repo.search(new_vectors[1], k=5)
+        assert "n1" in [chunk.id for chunk, _ in results]
+
+    @pytest.mark.parametrize("index_type", ["flat", "ivf_flat", "hnsw", "ivf_pq"])
+    def test_upsert_replaces_existing_chunk(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+
+        replacement = DocumentChunk(id="c5", text="rewritten", metadata={"source": "edited.pdf"})
+        new_vector = embeddings[200:201].copy()
+        repo.upsert([replacement], new_vector)
+
+        assert repo.index_size == self.N_VECTORS
+        results = repo.search(new_vector[0], k=5)
+        hits = [chunk for chunk, _ in results if chunk.id == "c5"]
+        assert len(hits) == 1
+        assert hits[0].text == "rewritten"
+        assert repo.search(embeddings[0], k=3, metadata_filters={"source": "edited.pdf"})[0][0].id == "c5"
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_delete_hides_chunks(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+
+        assert repo.delete(["c42", "missing"]) == 1
+
+        assert repo.index_size == self.N_VECTORS - 1
+        assert "c42" not in [chunk.id for chunk, _ in repo.search(embeddings[42], k=10)]
+        filtered = repo.search(embeddings[42], k=200, metadata_filters={"source": "doc0.pdf"})
+        assert "c42" not in [chunk.id for chunk, _ in filtered]
+        assert "c42" not in [chunk.id for chunk in repo.chunks]
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_compact_drops_tombstones(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+        repo.delete(["c1", "c2"])
+        repo.upsert([self._new_chunk("c3")], embeddings[3:4])
+
+        repo.compact()
+
+        assert len(repo._store) == self.N_VECTORS - 2
+        assert repo._index.ntotal == self.N_VECTORS - 2
+        assert not repo._tombstones.any()
+        assert repo._bm25.num_docs == self.N_VECTORS - 2
+        results = repo.search(embeddings[3], k=1, query_text="fresh text")
+        assert results[0][0].id == "c3"
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_upsert_after_delete_drops_old_vector(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+        repo.delete(["c7"])
+
+        repo.upsert([self._new_chunk("c7")], embeddings[200:201])
+
+        assert repo._index.ntotal == self.N_VECTORS
+        assert repo._stale_vectors == 0
+        # The deleted vector must not resurface under the re-used label
+        scores = {chunk.id: score for chunk, score in repo.search(embeddings[7], k=10)}
+        assert scores.get("c7", 0.0) < 99.0
+        assert repo.search(embeddings[200], k=1)[0][0].id in {"c7", "c200"}
+
+    def test_save_and_load_after_updates(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, "ivf_flat")
+        repo.build_index(chunks, embeddings)
+        repo.delete(["c7"])
+        repo.upsert([self._new_chunk("n0")], embeddings[7:8])
+        repo.save()
+
+        loaded = self._repo(tmp_path, "ivf_flat")
+        assert loaded.load()
+        assert loaded.index_size == self.N_VECTORS
+        assert loaded.search(embeddings[7], k=1)[0][0].id == "n0"
+
+    @pytest.mark.parametrize("index_type", ["flat", "hnsw"])
+    def test_upsert_on_memory_mapped_index(self, tmp_path, corpus, index_type):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path, index_type)
+        repo.build_index(chunks, embeddings)
+        repo.save()
+
+        loaded = self._repo(tmp_path, index_type, mmap=True)
+        assert loaded.load()
+        loaded.upsert([self._new_chunk("n0")], embeddings[9:10])
+        loaded.delete(["c9"])
+
+        assert loaded.search(embeddings[9], k=1)[0][0].id == "n0"
+
+    def test_legacy_index_without_ids_is_converted(self, tmp_path, corpus):
+        import faiss
+
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+        repo.build_index(chunks, embeddings)
+        repo.save()
+        # Rewrite the index the way older builds did: labels = row numbers
+        vectors = embeddings.copy()
+        faiss.normalize_L2(vectors)
+        legacy = faiss.IndexFlatIP(self.DIM)
+        legacy.add(vectors)
+        faiss.write_index(legacy, str(tmp_path / "idx.bin"))
+
+        loaded = self._repo(tmp_path)
+        assert loaded.load()
+        assert loaded.search(embeddings[4], k=1)[0][0].id == "c4"
+
+        loaded.delete(["c4"])
+        assert isinstance(loaded._index, faiss.IndexIDMap2)
+        assert loaded.search(embeddings[4], k=1)[0][0].id != "c4"
+        assert loaded.search(embeddings[5], k=1)[0][0].id == "c5"
+
+    def test_upsert_on_empty_repository_builds(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+
+        repo.upsert(chunks[:10], embeddings[:10])
+
+        assert repo.is_loaded
+        assert repo.index_size == 10
+
+    def test_duplicate_ids_rejected(self, tmp_path, corpus):
+        chunks, embeddings = corpus
+        repo = self._repo(tmp_path)
+
+        with pytest.raises(ValueError, match="Duplicate chunk ids"):
+            repo.build_index([chunks[0], chunks[0]], embeddings[:2])
+
+    def test_delete_requires_loaded_index(self, tmp_path):
+        with pytest.raises(IndexNotFoundError):
+            self._repo(tmp_path).delete(["c1"])
+
+
 class TestMetadataBoost:
     """Tests for _compute_metadata_boost() re-ranking."""
 
@@ -542,3 +1108,75 @@ class TestQualityBoost:
         )
         boost = VectorStoreRepository._compute_quality_boost(chunk)
         assert boost == 0.0
+
+
+class TestVectorizedRescoring:
+    """Precomputed boost array rescoring matches the per-chunk Python loop.
+
+    Timing comparison: scripts/benchmark_rescoring.py.
+    """
+
+    N_CHUNKS = 2_000
+    N_CANDIDATES = 15  # search() always rescores max(k * 3, 15) candidates
+    QUERY_TEXT = "lebron lakers playoffs"
+
+    @staticmethod
+    def _build_repo(tmp_path, n_chunks: int) -> VectorStoreRepository:
+        rng = np.random.default_rng(42)
+        words = np.array(["lebron", "curry", "lakers", "celtics", "defense", "playoffs", "mvp", "rookie"]
+                         + [f"w{i}" for i in range(2000)])
+        chunks = []
+        for i in range(n_chunks):
+            metadata = {"source": f"doc_{i % 50}.pdf", "quality_score": float(rng.random())}
+            if i % 2:
+                metadata.update({
+                    "type": "reddit_thread",
+                    "comment_upvotes": int(rng.integers(0, 500)),
+                    "min_comment_upvotes_in_post": 0,
+                    "max_comment_upvotes_in_post": 500,
+                    "post_upvotes": int(rng.integers(0, 5000)),
+                    "min_post_upvotes_global": 0,
+                    "max_post_upvotes_global": 5000,
+                    "is_nba_official": int(i % 7 == 0),
+                })
+            text = " ".join(rng.choice(words, size=12))
+            chunks.append(DocumentChunk(id=f"c{i}", text=text, metadata=metadata))
+
+        repo = VectorStoreRepository(index_path=tmp_path / "idx.bin", chunks_path=tmp_path / "c.pkl")
+        repo.build_index(chunks, rng.random((n_chunks, 8), dtype=np.float32))
+        return repo
+
+    @staticmethod
+    def _legacy_rescore(repo, candidate_ids, chunks, cosine_scores, query_text):
+        """Pre-vectorization rescoring loop (per-candidate dict lookups and branches).
+
+        Takes already-materialized chunks, as the old in-memory chunk list did,
+        and scores BM25 through the same index so only rescoring differs.
+        """
+        bm25_scores = repo._bm25.get_scores(query_text, candidate_ids)
+        if bm25_scores.max() > 0:
+            bm25_scores = bm25_scores / bm25_scores.max() * 100
+        results = []
+        for i, chunk in enumerate(chunks):
+            score = (
+                cosine_scores[i] * 0.70
+                + float(bm25_scores[i]) * 0.15
+                + VectorStoreRepository._compute_metadata_boost(chunk) * 0.075
+                + VectorStoreRepository._compute_quality_boost(chunk) * 0.075
+            )
+            results.append(min(score, 100.0))
+        return results
+
+    def test_matches_legacy_rescoring(self, tmp_path):
+        repo = self._build_repo(tmp_path, self.N_CHUNKS)
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            ids = rng.choice(self.N_CHUNKS, size=self.N_CANDIDATES, replace=False)
+            cos = rng.random(self.N_CANDIDATES) * 100
+            chunks = [repo._store.get(int(i)) for i in ids]
+
+            np.testing.assert_allclose(
+                repo._rescore(ids, cos, self.QUERY_TEXT),
+                self._legacy_rescore(repo, ids, chunks, cos.tolist(), self.QUERY_TEXT),
+                rtol=1e-5,
+            )
@@ -2,11 +2,13 @@
 FILE: test_chat.py
 STATUS: Active
 RESPONSIBILITY: Unit tests for ChatService RAG pipeline orchestration
-LAST MAJOR UPDATE: 2026-02-13
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
-from unittest.mock import MagicMock
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import numpy as np
 import pytest
@@ -14,7 +16,9 @@ import pytest
 from src.core.exceptions import IndexNotFoundError, LLMError
 from src.models.chat import ChatRequest, ChatResponse, SearchResult
 from src.models.document import DocumentChunk
-from src.services.chat import ChatService
+from src.repositories.response_cache import ResponseCache
+from src.services.chat import ChatService, _IncrementalFormatter
+from src.services.semantic_cache import SemanticAnswerCache
 
 
 @pytest.fixture
@@ -42,6 +46,16 @@ def mock_client():
     return client
 
 
+def _classify_as(service, query_type_name):
+    """Make the service classify every query as the given QueryType."""
+    from src.services.query_classifier import ClassificationResult, QueryType
+
+    classifier = MagicMock()
+    classifier._is_greeting.return_value = False
+    classifier.classify.return_value = ClassificationResult(QueryType[query_type_name])
+    service._query_classifier = classifier
+
+
 @pytest.fixture
 def chat_service(mock_vector_store, mock_embedding_service, mock_client):
     service = ChatService(
@@ -158,6 +172,32 @@ class TestChatServiceSearch:
         assert results[0].metadata == {"page": 5, "category": "stats"}
 
 
+class TestChatServiceSearchMany:
+    def test_search_many_uses_one_embedding_and_one_search_call(
+        self, chat_service, mock_vector_store, mock_embedding_service
+    ):
+        chunk = DocumentChunk(id="0_0", text="Jokic was named MVP.", metadata={"source": "players.txt"})
+        mock_embedding_service.embed_batch.return_value = np.random.rand(2, 64).astype(np.float32)
+        mock_vector_store.search_batch.return_value = [[(chunk, 88.0)], []]
+
+        results = chat_service.search_many(["Who was MVP?", "Something obscure"], k=3)
+
+        mock_embedding_service.embed_batch.assert_called_once()
+        assert len(mock_embedding_service.embed_batch.call_args.args[0]) == 2
+        mock_embedding_service.embed_query.assert_not_called()
+        mock_vector_store.search_batch.assert_called_once()
+        assert mock_vector_store.search_batch.call_args.kwargs["k"] == 3
+        assert len(results) == 2
+        assert results[0][0].text == "Jokic was named MVP."
+        assert results[0][0].source == "players.txt"
+        assert results[1] == []
+
+    def test_search_many_empty(self, chat_service, mock_vector_store, mock_embedding_service):
+        assert chat_service.search_many([]) == []
+        mock_embedding_service.embed_batch.assert_not_called()
+        mock_vector_store.search_batch.assert_not_called()
+
+
 class TestChatServiceGenerateResponse:
     def test_generate_response_success(self, chat_service):
         answer = chat_service.generate_response(query="Who won?", context="The Nuggets won.")
@@ -314,6 +354,779 @@ class TestGreetingHandling:
         mock_vector_store.search.assert_called_once()
 
 
+class TestChatServiceAsync:
+    """Tests for achat(): same pipeline as chat() on async clients."""
+
+    ANSWER = "The Denver Nuggets won the 2023 NBA Championship."
+
+    @pytest.fixture
+    def async_service(self, chat_service, mock_client, mock_embedding_service, mock_vector_store):
+        response = MagicMock()
+        response.text = self.ANSWER
+        mock_client.aio.models.generate_content = AsyncMock(return_value=response)
+        mock_embedding_service.aembed_query = AsyncMock(
+            return_value=np.random.rand(64).astype(np.float32)
+        )
+        chunk = DocumentChunk(id="0_0", text="The Nuggets won.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 95.0)]
+        return chat_service
+
+    @pytest.mark.asyncio
+    async def test_achat_matches_chat(self, async_service, mock_client, mock_embedding_service):
+        _classify_as(async_service, "CONTEXTUAL")
+        request = ChatRequest(query="Who won the championship?")
+
+        async_response = await async_service.achat(request)
+        sync_response = async_service.chat(request)
+
+        assert async_response.answer == sync_response.answer == self.ANSWER
+        assert async_response.sources == sync_response.sources
+        assert async_response.query_type == sync_response.query_type == "contextual"
+        mock_client.aio.models.generate_content.assert_awaited_once()
+        mock_embedding_service.aembed_query.assert_awaited_once()
+        async_prompt = mock_client.aio.models.generate_content.call_args.kwargs["contents"]
+        assert async_prompt == mock_client.models.generate_content.call_args.kwargs["contents"]
+
+    @pytest.mark.asyncio
+    async def test_achat_greeting_skips_pipeline(self, async_service, mock_client):
+        response = await async_service.achat(ChatRequest(query="hi"))
+
+        assert response.query_type == "greeting"
+        mock_client.aio.models.generate_content.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_achat_statistical_uses_async_sql(self, async_service, mock_vector_store, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "speculative_vector_search", False)
+        _classify_as(async_service, "STATISTICAL")
+        sql_tool = MagicMock()
+        sql_tool.aquery = AsyncMock(
+            return_value={"sql": "SELECT pts FROM players", "results": [{"pts": 30}], "error": None}
+        )
+        async_service._sql_tool = sql_tool
+        async_service._visualization_service = MagicMock()
+        async_service._visualization_service.generate_visualization.side_effect = ValueError("no chart")
+
+        response = await async_service.achat(ChatRequest(query="How many points did Jokic score?"))
+
+        sql_tool.aquery.assert_awaited_once()
+        sql_tool.query.assert_not_called()
+        mock_vector_store.search.assert_not_called()
+        assert response.generated_sql == "SELECT pts FROM players"
+        assert response.visualization is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_achats_overlap(self, async_service, mock_client):
+        _classify_as(async_service, "CONTEXTUAL")
+
+        async def slow_llm(**kwargs):
+            await asyncio.sleep(0.1)
+            response = MagicMock()
+            response.text = self.ANSWER
+            return response
+
+        mock_client.aio.models.generate_content = AsyncMock(side_effect=slow_llm)
+
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *(async_service.achat(ChatRequest(query=f"Question {i}?")) for i in range(20))
+        )
+        elapsed = time.perf_counter() - start
+
+        assert all(r.answer == self.ANSWER for r in responses)
+        # 20 sequential LLM calls would take 2s
+        assert elapsed < 1.0
+
+    @pytest.mark.asyncio
+    async def test_async_retry_backs_off_without_blocking(self, async_service, mock_client):
+        from google.genai.errors import ClientError
+
+        response = MagicMock()
+        response.text = self.ANSWER
+        mock_client.aio.models.generate_content = AsyncMock(
+            side_effect=[ClientError(429, {"error": {"message": "RESOURCE_EXHAUSTED"}}), response]
+        )
+
+        with patch("src.services.chat.asyncio.sleep", new=AsyncMock()) as mock_sleep, \
+             patch("src.services.chat.time.sleep") as mock_time_sleep:
+            answer = await async_service.agenerate_response(query="q", context="c")
+
+        assert answer == self.ANSWER
+        mock_sleep.assert_awaited_once_with(2.0)
+        mock_time_sleep.assert_not_called()
+
+
+class TestConcurrentRetrieval:
+    """Tests for SQL and vector branches running side by side (hybrid / speculative)."""
+
+    SQL_OK = {"sql": "SELECT pts FROM players", "results": [{"pts": 30}], "error": None}
+    SQL_EMPTY = {"sql": "SELECT pts FROM players", "results": [], "error": None}
+    DELAY = 0.2
+
+    @pytest.fixture
+    def service(self, chat_service, mock_client, mock_embedding_service, mock_vector_store):
+        chunk = DocumentChunk(id="0_0", text="Jokic is a great passer.", metadata={"source": "nba.pdf"})
+
+        def slow_search(**kwargs):
+            time.sleep(self.DELAY)
+            return [(chunk, 95.0)]
+
+        mock_vector_store.search.side_effect = slow_search
+        response = MagicMock()
+        response.text = "Jokic scored 30 points."
+        mock_client.aio.models.generate_content = AsyncMock(return_value=response)
+        mock_embedding_service.aembed_query = AsyncMock(return_value=np.random.rand(64).astype(np.float32))
+        chat_service._visualization_service = MagicMock()
+        chat_service._visualization_service.generate_visualization.side_effect = ValueError("no chart")
+        return chat_service
+
+    def _sql_tool(self, result, delay=None):
+        """Mock SQL tool whose query()/aquery() take `delay` seconds."""
+        delay = self.DELAY if delay is None else delay
+
+        def query(question, cancel=None):
+            if cancel is None:
+                time.sleep(delay)
+            elif cancel.wait(delay):
+                raise RuntimeError("interrupted")
+            return result
+
+        async def aquery(question):
+            await asyncio.sleep(delay)
+            return result
+
+        sql_tool = MagicMock()
+        sql_tool.query.side_effect = query
+        sql_tool.aquery = AsyncMock(side_effect=aquery)
+        return sql_tool
+
+    def test_hybrid_branches_overlap(self, service, mock_vector_store, mock_client):
+        _classify_as(service, "HYBRID")
+        service._sql_tool = self._sql_tool(self.SQL_OK)
+
+        start = time.perf_counter()
+        response = service.chat(ChatRequest(query="How good is Jokic and why?"))
+        elapsed = time.perf_counter() - start
+
+        # Sequential branches would take 2 * DELAY
+        assert elapsed < 1.5 * self.DELAY
+        assert response.generated_sql == "SELECT pts FROM players"
+        assert len(response.sources) == 1
+        prompt = mock_client.models.generate_content.call_args.kwargs["contents"]
+        assert "Jokic is a great passer." in prompt
+
+    def test_statistical_fallback_searches_after_sql(self, service, mock_vector_store):
+        _classify_as(service, "STATISTICAL")
+        service._sql_tool = self._sql_tool(self.SQL_EMPTY, delay=0.0)
+
+        response = service.chat(ChatRequest(query="How many points did Jokic score?"))
+
+        mock_vector_store.search.assert_called_once()
+        assert len(response.sources) == 1
+
+    def test_sync_statistical_success_does_not_speculate(self, service, mock_vector_store):
+        _classify_as(service, "STATISTICAL")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=0.0)
+
+        response = service.chat(ChatRequest(query="How many points did Jokic score?"))
+
+        # A search started in a thread can't be cancelled, so chat() doesn't start one
+        mock_vector_store.search.assert_not_called()
+        assert response.sources == []
+        assert response.generated_sql == "SELECT pts FROM players"
+
+    def test_speculation_disabled_keeps_sequential_routing(self, service, mock_vector_store, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "speculative_vector_search", False)
+        _classify_as(service, "STATISTICAL")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=0.0)
+
+        service.chat(ChatRequest(query="How many points did Jokic score?"))
+
+        mock_vector_store.search.assert_not_called()
+
+    def test_sql_timeout_interrupts_query(self, service, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "retrieval_sql_timeout", 0.05)
+        _classify_as(service, "HYBRID")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=1.0)
+
+        start = time.perf_counter()
+        response = service.chat(ChatRequest(query="How good is Jokic and why?"))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert response.generated_sql is None
+        assert len(response.sources) == 1
+        cancel = service.sql_tool.query.call_args.kwargs["cancel"]
+        assert cancel.is_set()
+
+    def test_vector_timeout_answers_from_sql(self, service, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "retrieval_vector_timeout", 0.05)
+        _classify_as(service, "HYBRID")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=0.0)
+
+        response = service.chat(ChatRequest(query="How good is Jokic and why?"))
+
+        assert response.sources == []
+        assert response.generated_sql == "SELECT pts FROM players"
+
+    def test_vector_error_propagates_for_hybrid(self, service, mock_vector_store):
+        _classify_as(service, "HYBRID")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=0.0)
+        mock_vector_store.search.side_effect = IndexNotFoundError("Index not loaded")
+
+        with pytest.raises(IndexNotFoundError):
+            service.chat(ChatRequest(query="How good is Jokic and why?"))
+
+    @pytest.mark.asyncio
+    async def test_achat_hybrid_branches_overlap(self, service):
+        _classify_as(service, "HYBRID")
+        service._sql_tool = self._sql_tool(self.SQL_OK)
+
+        start = time.perf_counter()
+        response = await service.achat(ChatRequest(query="How good is Jokic and why?"))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.5 * self.DELAY
+        assert response.generated_sql == "SELECT pts FROM players"
+        assert len(response.sources) == 1
+        service.sql_tool.aquery.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_achat_cancels_speculative_search_after_sql_success(
+        self, service, mock_embedding_service, mock_vector_store
+    ):
+        embedding_cancelled = asyncio.Event()
+
+        async def slow_embedding(query):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                embedding_cancelled.set()
+                raise
+
+        mock_embedding_service.aembed_query = AsyncMock(side_effect=slow_embedding)
+        _classify_as(service, "STATISTICAL")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=0.0)
+
+        response = await service.achat(ChatRequest(query="How many points did Jokic score?"))
+
+        assert response.generated_sql == "SELECT pts FROM players"
+        await asyncio.wait_for(embedding_cancelled.wait(), timeout=1)
+        mock_vector_store.search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_achat_sql_timeout_uses_warm_fallback(self, service, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "retrieval_sql_timeout", 0.05)
+        _classify_as(service, "STATISTICAL")
+        service._sql_tool = self._sql_tool(self.SQL_OK, delay=10.0)
+
+        start = time.perf_counter()
+        response = await service.achat(ChatRequest(query="How many points did Jokic score?"))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 1.0
+        assert response.generated_sql is None
+        assert len(response.sources) == 1
+
+
+class TestChatServiceStreaming:
+    """Tests for astream_chat(): routing, sources, tokens, visualization, done."""
+
+    @pytest.fixture
+    def stream_service(self, chat_service, mock_client, mock_embedding_service, mock_vector_store):
+        mock_embedding_service.aembed_query = AsyncMock(return_value=np.random.rand(64).astype(np.float32))
+        chunk = DocumentChunk(id="0_0", text="The Nuggets won.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 95.0)]
+        chat_service._visualization_service = MagicMock()
+        chat_service._visualization_service.generate_visualization.side_effect = ValueError("no chart")
+        return chat_service
+
+    @staticmethod
+    def _stream_llm(mock_client, *answers):
+        """Each generate_content_stream call streams the next answer's chunks."""
+
+        def open_stream(**kwargs):
+            chunks = list(next(remaining))
+
+            async def stream():
+                for text in chunks:
+                    yield MagicMock(text=text)
+
+            return stream()
+
+        remaining = iter(answers)
+        mock_client.aio.models.generate_content_stream = AsyncMock(side_effect=open_stream)
+
+    @staticmethod
+    async def _collect(service, query, **request_fields):
+        return [event async for event in service.astream_chat(ChatRequest(query=query, **request_fields))]
+
+    @pytest.mark.asyncio
+    async def test_events_in_order(self, stream_service, mock_client):
+        _classify_as(stream_service, "CONTEXTUAL")
+        self._stream_llm(mock_client, ["The Denver ", "Nuggets won", " the title[1]."])
+
+        events = await self._collect(stream_service, "Who won the championship?")
+
+        names = [name for name, _ in events]
+        assert names[:2] == ["routing", "sources"]
+        assert names[-1] == "done"
+        assert set(names[2:-1]) == {"token"}
+        assert events[0][1]["query_type"] == "contextual"
+        assert events[1][1]["sources"][0]["source"] == "nba.pdf"
+        streamed = "".join(data["text"] for name, data in events if name == "token")
+        assert streamed == "The Denver Nuggets won the title<sup>1</sup>."
+        assert events[-1][1]["answer"] == streamed
+        assert "sources" not in events[-1][1]
+
+    @pytest.mark.asyncio
+    async def test_tokens_match_non_streaming_formatting(self, stream_service, mock_client):
+        _classify_as(stream_service, "STATISTICAL")
+        stream_service._sql_tool = MagicMock()
+        stream_service._sql_tool.aquery = AsyncMock(
+            return_value={"sql": "SELECT pts FROM players", "results": [{"pts": 30}], "error": None}
+        )
+        answer = "Jokic appears to have scored approximately 30 points[1], possibly more [2]."
+        # Split inside the hedging phrase, the number and the citation
+        self._stream_llm(mock_client, ["Jokic appears to", " have scored approx", "imately 3", "0 points[", "1], possibly more [2", "]."])
+
+        events = await self._collect(stream_service, "How many points did Jokic score?")
+
+        streamed = "".join(data["text"] for name, data in events if name == "token")
+        expected = stream_service._format_superscript_citations(stream_service._remove_excessive_hedging(answer))
+        assert streamed == expected == "Jokic scored 30 points<sup>1</sup>, more <sup>2</sup>."
+        assert events[1][1]["generated_sql"] == "SELECT pts FROM players"
+
+    @pytest.mark.asyncio
+    async def test_visualization_is_trailing_event(self, stream_service, mock_client):
+        _classify_as(stream_service, "STATISTICAL")
+        stream_service._sql_tool = MagicMock()
+        stream_service._sql_tool.aquery = AsyncMock(
+            return_value={"sql": "SELECT pts FROM players", "results": [{"pts": 30}], "error": None}
+        )
+        stream_service._visualization_service.generate_visualization.side_effect = None
+        stream_service._visualization_service.generate_visualization.return_value = {
+            "pattern": "single_value", "viz_type": "metric", "plot_json": "{}", "plot_html": "<div></div>",
+        }
+        self._stream_llm(mock_client, ["Jokic scored 30 points."])
+
+        events = await self._collect(stream_service, "How many points did Jokic score?")
+
+        assert [name for name, _ in events][-2:] == ["visualization", "done"]
+        assert events[-2][1]["viz_type"] == "metric"
+
+    @pytest.mark.asyncio
+    async def test_greeting_streams_canned_answer(self, stream_service, mock_client):
+        events = await self._collect(stream_service, "hi")
+
+        assert [name for name, _ in events] == ["routing", "token", "done"]
+        assert events[0][1]["query_type"] == "greeting"
+        mock_client.aio.models.generate_content_stream.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_declined_sql_resets_to_vector_answer(self, stream_service, mock_client):
+        _classify_as(stream_service, "STATISTICAL")
+        stream_service._sql_tool = MagicMock()
+        stream_service._sql_tool.aquery = AsyncMock(
+            return_value={"sql": "SELECT pts FROM players", "results": [{"pts": 30}], "error": None}
+        )
+        self._stream_llm(mock_client, ["I cannot parse the data."], ["The Nuggets won."])
+
+        events = await self._collect(stream_service, "How many points did Jokic score?")
+
+        names = [name for name, _ in events]
+        reset = names.index("reset")
+        assert names[reset + 1] == "sources"
+        after_reset = "".join(data["text"] for name, data in events[reset:] if name == "token")
+        assert after_reset == "The Nuggets won."
+        assert events[-1][1]["answer"] == "The Nuggets won."
+
+    @pytest.mark.asyncio
+    async def test_empty_stream_yields_placeholder(self, stream_service, mock_client):
+        _classify_as(stream_service, "CONTEXTUAL")
+        self._stream_llm(mock_client, [])
+
+        events = await self._collect(stream_service, "Who won the championship?")
+
+        tokens = [data["text"] for name, data in events if name == "token"]
+        assert tokens == ["I could not generate a response."]
+
+
+class TestIncrementalFormatter:
+    """Streamed formatting must equal formatting the whole answer."""
+
+    ANSWER = (
+        "He appears to have scored approximately 30 points[1], possibly more.  It seems that "
+        "the team [12] may be   better; I think they won about 3.5 games [3]\nand kind of dominated[4]"
+    )
+
+    @staticmethod
+    def _format(text):
+        return ChatService._format_superscript_citations(None, ChatService._remove_excessive_hedging(text))
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 8, 13, 1000])
+    def test_chunked_output_equals_whole(self, chunk_size):
+        formatter = _IncrementalFormatter(self._format)
+        chunks = [self.ANSWER[i:i + chunk_size] for i in range(0, len(self.ANSWER), chunk_size)]
+
+        streamed = "".join(formatter.feed(chunk) for chunk in chunks) + formatter.flush()
+
+        assert streamed == self._format(self.ANSWER)
+
+    def test_holds_back_text_after_last_punctuation(self):
+        formatter = _IncrementalFormatter(self._format)
+
+        assert formatter.feed("Source [") == ""
+        assert formatter.feed("1], then more") == "Source <sup>1</sup>,"
+        assert formatter.flush() == " then more"
+
+
+class TestChatServiceSemanticCache:
+    """Tests for answering paraphrased questions from the semantic answer cache."""
+
+    QUERY_VECTORS = {
+        "Who are the top 5 scorers?": [1.0, 0.0, 0.0, 0.1],
+        "Who are the 5 best scorers?": [1.0, 0.0, 0.0, 0.12],
+        "Why is Jokic so effective?": [0.0, 1.0, 0.0, 0.0],
+        "Who are the top 10 scorers?": [1.0, 0.0, 0.0, 0.11],
+        "How many assists does Chris Paul have?": [0.0, 0.0, 1.0, 0.5],
+        "How many assists does Trae Young have?": [0.0, 0.0, 1.0, 0.51],
+    }
+
+    @pytest.fixture
+    def cached_service(self, mock_vector_store, mock_embedding_service, mock_client):
+        def embed(query):
+            # Expanded search queries get a vector of their own
+            return np.array(self.QUERY_VECTORS.get(query, [0.0, 0.0, 1.0, 0.0]), dtype=np.float32)
+
+        mock_embedding_service.embed_query.side_effect = embed
+        mock_embedding_service.aembed_query = AsyncMock(side_effect=embed)
+        chunk = DocumentChunk(id="0_0", text="SGA led the league.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 90.0)]
+        response = MagicMock()
+        response.text = "SGA, Giannis, Jokic, Luka and Tatum."
+        mock_client.aio.models.generate_content = AsyncMock(return_value=response)
+
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            model="test-model",
+            semantic_cache=SemanticAnswerCache(threshold=0.95, ttl_seconds=0, max_entries=10),
+        )
+        service._client = mock_client
+        service._sql_tool = MagicMock(templates=None)  # Entity fallback: numbers and names
+        _classify_as(service, "CONTEXTUAL")
+        return service
+
+    def test_paraphrase_answered_from_cache(self, cached_service, mock_client, mock_vector_store):
+        first = cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+        second = cached_service.chat(ChatRequest(query="Who are the 5 best scorers?"))
+
+        assert second.answer == first.answer
+        assert second.query == "Who are the 5 best scorers?"
+        assert second.sources == first.sources
+        assert mock_client.models.generate_content.call_count == 1
+        assert mock_vector_store.search.call_count == 1
+        assert cached_service.semantic_cache.stats.hits == 1
+
+    def test_different_question_misses(self, cached_service, mock_client):
+        cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+        cached_service.chat(ChatRequest(query="Why is Jokic so effective?"))
+
+        assert mock_client.models.generate_content.call_count == 2
+        assert cached_service.semantic_cache.stats.misses == 2
+
+    @pytest.mark.parametrize(
+        "first, second",
+        [
+            ("Who are the top 5 scorers?", "Who are the top 10 scorers?"),
+            ("How many assists does Chris Paul have?", "How many assists does Trae Young have?"),
+        ],
+    )
+    def test_different_entities_miss(self, cached_service, mock_client, first, second):
+        cached_service.chat(ChatRequest(query=first))
+        cached_service.chat(ChatRequest(query=second))
+
+        assert mock_client.models.generate_content.call_count == 2
+        assert cached_service.semantic_cache.stats.hits == 0
+
+    def test_template_entity_slots_scope_cache(self, cached_service, mock_client):
+        from src.tools.sql_templates import QuestionSkeleton, Slot
+
+        players = {"Chris Paul": "Chris Paul", "Trae Young": "Trae Young"}
+        cached_service._sql_tool.templates = MagicMock()
+        cached_service._sql_tool.templates.skeleton.side_effect = lambda q: QuestionSkeleton(
+            "", tuple(Slot("player", name) for name in players if name in q)
+        )
+
+        cached_service.chat(ChatRequest(query="How many assists does Chris Paul have?"))
+        cached_service.chat(ChatRequest(query="How many assists does Trae Young have?"))
+
+        assert mock_client.models.generate_content.call_count == 2
+
+    def test_sources_cached_even_when_not_requested(self, cached_service):
+        cached_service.chat(ChatRequest(query="Who are the top 5 scorers?", include_sources=False))
+        second = cached_service.chat(ChatRequest(query="Who are the 5 best scorers?"))
+
+        assert len(second.sources) == 1
+
+    def test_data_version_change_invalidates(self, cached_service, mock_client):
+        cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+        cached_service._index_version = "20261016T120000Z"  # Index hot reload
+        cached_service.chat(ChatRequest(query="Who are the 5 best scorers?"))
+
+        assert mock_client.models.generate_content.call_count == 2
+
+    def test_conversations_bypass_cache(self, cached_service, mock_client):
+        cached_service._feedback_repository = MagicMock()
+        cached_service._feedback_repository.get_messages_by_conversation.return_value = []
+        cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+
+        cached_service.chat(
+            ChatRequest(query="Who are the 5 best scorers?", conversation_id="conv-1", turn_number=1)
+        )
+
+        assert mock_client.models.generate_content.call_count == 2
+        assert cached_service.semantic_cache.stats.bypasses == 1
+
+    def test_conversations_use_cache_when_enabled(self, cached_service, mock_client, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "semantic_cache_in_conversations", True)
+        cached_service._feedback_repository = MagicMock()
+        cached_service._feedback_repository.get_messages_by_conversation.return_value = []
+        cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+
+        response = cached_service.chat(
+            ChatRequest(query="Who are the 5 best scorers?", conversation_id="conv-1", turn_number=1)
+        )
+
+        assert mock_client.models.generate_content.call_count == 1
+        assert response.conversation_id == "conv-1"
+        cached_service._feedback_repository.save_interaction.assert_called()
+
+    def test_embedding_failure_skips_cache(self, cached_service, mock_embedding_service, mock_client):
+        mock_embedding_service.embed_query.side_effect = [RuntimeError("API down"), np.ones(4, dtype=np.float32)]
+
+        response = cached_service.chat(ChatRequest(query="Who are the top 5 scorers?"))
+
+        assert response.answer
+        assert len(cached_service.semantic_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_achat_and_stream_share_cache(self, cached_service, mock_client):
+        first = await cached_service.achat(ChatRequest(query="Who are the top 5 scorers?"))
+        events = [
+            event async for event in cached_service.astream_chat(ChatRequest(query="Who are the 5 best scorers?"))
+        ]
+
+        assert [name for name, _ in events] == ["routing", "sources", "token", "done"]
+        assert events[2][1]["text"] == first.answer
+        mock_client.aio.models.generate_content.assert_awaited_once()
+
+
+class TestChatServiceResponseCache:
+    """Tests for answering repeated questions from the exact-match response cache."""
+
+    QUERY = "Who are the top 5 scorers?"
+
+    @pytest.fixture
+    def cached_service(self, mock_vector_store, mock_embedding_service, mock_client, tmp_path, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "vector_db_dir", str(tmp_path))
+        settings.faiss_index_path.write_bytes(b"index")
+        mock_embedding_service.embed_query.return_value = np.ones(4, dtype=np.float32)
+        mock_embedding_service.aembed_query = AsyncMock(return_value=np.ones(4, dtype=np.float32))
+        chunk = DocumentChunk(id="0_0", text="SGA led the league.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 90.0)]
+        response = MagicMock()
+        response.text = "SGA, Giannis, Jokic, Luka and Tatum."
+        mock_client.aio.models.generate_content = AsyncMock(return_value=response)
+
+        cache = ResponseCache(path=tmp_path / "responses.sqlite")
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            model="test-model",
+            enable_sql=False,
+            response_cache=cache,
+        )
+        service._client = mock_client
+        _classify_as(service, "CONTEXTUAL")
+        yield service
+        cache.close()
+
+    def test_repeated_question_answered_from_cache(self, cached_service, mock_client, mock_vector_store):
+        first = cached_service.chat(ChatRequest(query=self.QUERY))
+        second = cached_service.chat(ChatRequest(query="  who are the TOP 5 scorers "))
+
+        assert second.answer == first.answer
+        assert second.query == "who are the TOP 5 scorers"
+        assert second.sources == first.sources
+        assert mock_client.models.generate_content.call_count == 1
+        assert mock_vector_store.search.call_count == 1
+        assert cached_service.response_cache.stats.memory_hits == 1
+
+    def test_index_file_change_invalidates(self, cached_service, mock_client):
+        import os
+
+        from src.core.config import settings
+
+        cached_service.chat(ChatRequest(query=self.QUERY))
+        stat = settings.faiss_index_path.stat()
+        os.utime(settings.faiss_index_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Index rebuilt
+        cached_service.chat(ChatRequest(query=self.QUERY))
+
+        assert mock_client.models.generate_content.call_count == 2
+        assert cached_service.response_cache.stats.stale == 1
+
+    def test_conversation_history_is_part_of_key(self, cached_service, mock_client):
+        cached_service._feedback_repository = MagicMock()
+        histories = iter(["User: Hi\nAssistant: Hello", "User: Hi\nAssistant: Hello", "User: Who won?"])
+
+        with patch.object(cached_service, "_build_conversation_context", side_effect=lambda *_: next(histories)):
+            for turn in range(3):
+                cached_service.chat(ChatRequest(query=self.QUERY, conversation_id="conv-1", turn_number=turn + 1))
+
+        assert mock_client.models.generate_content.call_count == 2
+        assert cached_service.response_cache.stats.hits == 1
+        assert cached_service._feedback_repository.save_interaction.call_count == 3
+
+    def test_semantic_hit_not_copied_to_exact_tier(self, cached_service, mock_client, mock_embedding_service):
+        cached_service._semantic_cache = SemanticAnswerCache(threshold=0.95, ttl_seconds=0, max_entries=10)
+        cached_service.chat(ChatRequest(query=self.QUERY))
+        cached_service.chat(ChatRequest(query="Who are the 5 best scorers?"))  # Semantic hit
+        cached_service.chat(ChatRequest(query="Who are the 5 best scorers?"))  # Semantic hit again
+
+        assert mock_client.models.generate_content.call_count == 1
+        assert cached_service.semantic_cache.stats.hits == 2
+        assert cached_service.response_cache.stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_achat_and_stream_share_cache(self, cached_service, mock_client):
+        first = await cached_service.achat(ChatRequest(query=self.QUERY))
+        events = [event async for event in cached_service.astream_chat(ChatRequest(query=self.QUERY))]
+
+        assert [name for name, _ in events] == ["routing", "sources", "token", "done"]
+        assert events[2][1]["text"] == first.answer
+        mock_client.aio.models.generate_content.assert_awaited_once()
+
+
+@pytest.mark.shipped_defaults
+class TestChatServiceShippedDefaults:
+    """Chat pipeline with every setting as shipped (caches and write-behind enabled)."""
+
+    QUERY = "Who are the top 5 scorers?"
+
+    @pytest.fixture
+    def default_service(self, mock_vector_store, mock_embedding_service, mock_client, tmp_path, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "vector_db_dir", str(tmp_path))
+        mock_embedding_service.embed_query.return_value = np.ones(4, dtype=np.float32)
+        chunk = DocumentChunk(id="0_0", text="SGA led the league.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 90.0)]
+
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            model="test-model",
+            enable_sql=False,
+        )
+        service._client = mock_client
+        service._feedback_repository = MagicMock()
+        _classify_as(service, "CONTEXTUAL")
+        yield service
+        service.close()
+        if service._response_cache is not None:
+            service._response_cache.close()
+
+    def test_repeated_question_with_defaults(self, default_service, mock_client):
+        # Opening turns of two conversations: same (empty) history, so the second is a cache hit
+        first = default_service.chat(ChatRequest(query=self.QUERY, conversation_id="conv-1", turn_number=1))
+        second = default_service.chat(ChatRequest(query=self.QUERY, conversation_id="conv-2", turn_number=1))
+
+        assert second.answer == first.answer
+        assert mock_client.models.generate_content.call_count == 1
+        assert default_service.flush_interactions(timeout=5)
+        saved = [
+            interaction
+            for call in default_service.feedback_repository.save_interactions.call_args_list
+            for interaction in call.args[0]
+        ]
+        assert len(saved) == 2
+
+
+class TestChatServiceTimings:
+    """Tests for per-stage timings in chat responses (include_timings)."""
+
+    QUERY = "Who won the championship?"
+
+    @pytest.fixture
+    def timed_service(self, chat_service, mock_client, mock_embedding_service, mock_vector_store):
+        response = MagicMock()
+        response.text = "The Denver Nuggets."
+        mock_client.aio.models.generate_content = AsyncMock(return_value=response)
+        mock_embedding_service.aembed_query = AsyncMock(return_value=np.ones(4, dtype=np.float32))
+        chunk = DocumentChunk(id="0_0", text="The Nuggets won.", metadata={"source": "nba.pdf"})
+        mock_vector_store.search.return_value = [(chunk, 95.0)]
+        _classify_as(chat_service, "CONTEXTUAL")
+        return chat_service
+
+    def test_timings_only_when_requested(self, timed_service):
+        assert timed_service.chat(ChatRequest(query=self.QUERY)).timings is None
+
+        timings = timed_service.chat(ChatRequest(query=self.QUERY, include_timings=True)).timings
+
+        assert {"embedding", "llm_generation"} <= set(timings)
+        assert all(ms >= 0 for ms in timings.values())
+
+    def test_stages_recorded_in_histograms(self, timed_service):
+        from src.core import latency
+
+        registry = latency.LatencyRegistry(window_seconds=60.0)
+        with patch.object(latency, "latency_registry", registry):
+            timed_service.chat(ChatRequest(query=self.QUERY))
+
+        assert {"embedding", "llm_generation", "total"} <= set(registry.summaries())
+
+    @pytest.mark.asyncio
+    async def test_stream_done_event_carries_timings(self, timed_service, mock_client):
+        TestChatServiceStreaming._stream_llm(mock_client, ["The ", "Nuggets."])
+        request = ChatRequest(query=self.QUERY, include_timings=True)
+        events = [event async for event in timed_service.astream_chat(request)]
+
+        done = events[-1][1]
+        assert "llm_generation" in done["timings"]
+        assert "embedding" in (await timed_service.achat(request)).timings
+
+    def test_cached_response_reports_its_own_timings(self, timed_service, tmp_path, mock_client):
+        timed_service._response_cache = ResponseCache(path=tmp_path / "responses.sqlite")
+        timed_service.chat(ChatRequest(query=self.QUERY, include_timings=True))
+
+        cached = timed_service.chat(ChatRequest(query=self.QUERY, include_timings=True))
+        untimed = timed_service.chat(ChatRequest(query=self.QUERY))
+        timed_service.response_cache.close()
+
+        assert mock_client.models.generate_content.call_count == 1
+        assert "llm_generation" not in cached.timings
+        assert "cache_lookup" in cached.timings
+        assert untimed.timings is None
+
+
 class TestBiographicalRewrite:
     """Tests for ChatService._rewrite_biographical_for_sql() static method (Phase 17)."""
 
@@ -350,3 +1163,73 @@ class TestQuestionComplexity:
         from src.services.query_classifier import QueryClassifier
         assert hasattr(QueryClassifier, "_estimate_question_complexity")
         assert QueryClassifier._estimate_question_complexity("How many teams?") == 3
+
+
+class TestChatServiceIndexReload:
+    @pytest.fixture
+    def snapshots(self):
+        snapshots = MagicMock()
+        snapshots.current_version.return_value = "v2"
+        return snapshots
+
+    def test_reload_swaps_repository(self, mock_vector_store, mock_embedding_service, snapshots):
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            index_snapshots=snapshots,
+        )
+        in_flight = service.vector_store
+        new_store = MagicMock()
+        snapshots.open.return_value = new_store
+
+        version = service.reload_index()
+
+        assert version == "v2"
+        snapshots.open.assert_called_once_with("v2")
+        assert service.vector_store is new_store
+        assert service.index_version == "v2"
+        # A request that already took the old reference keeps using it
+        assert in_flight is mock_vector_store
+
+    def test_failed_reload_keeps_serving_old_index(
+        self, mock_vector_store, mock_embedding_service, snapshots
+    ):
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            index_snapshots=snapshots,
+        )
+        snapshots.open.side_effect = IndexNotFoundError("Index snapshot 'v2' failed to load")
+
+        with pytest.raises(IndexNotFoundError):
+            service.reload_index()
+
+        assert service.vector_store is mock_vector_store
+        assert service.index_version is None
+
+    def test_reload_if_changed(self, mock_vector_store, mock_embedding_service, snapshots):
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            index_snapshots=snapshots,
+        )
+
+        assert service.reload_index_if_changed() is True
+        assert service.reload_index_if_changed() is False
+        snapshots.open.assert_called_once_with("v2")
+
+    def test_lazy_vector_store_uses_current_snapshot(self, mock_embedding_service, snapshots, tmp_path):
+        snapshots.path.return_value = tmp_path / "v2"
+        service = ChatService(
+            embedding_service=mock_embedding_service,
+            api_key="test-key",
+            index_snapshots=snapshots,
+        )
+
+        store = service.vector_store
+
+        assert store._index_path == tmp_path / "v2" / "faiss_index.idx"
+        assert service.index_version == "v2"
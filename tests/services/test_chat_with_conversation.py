@@ -2,11 +2,11 @@
 FILE: test_chat_with_conversation.py
 STATUS: Active
 RESPONSIBILITY: Tests for ChatService with conversation context (pronoun resolution)
-LAST MAJOR UPDATE: 2026-02-09
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
-from datetime import datetime
+import threading
 from unittest.mock import MagicMock
 
 import numpy as np
@@ -14,7 +14,8 @@ import pytest
 
 from src.models.chat import ChatRequest, ChatResponse, SearchResult
 from src.models.document import DocumentChunk
-from src.models.feedback import ChatInteractionResponse
+from src.models.feedback import ChatInteractionCreate, ConversationTurn
+from src.repositories.feedback import FeedbackRepository
 from src.services.chat import ChatService
 
 
@@ -49,11 +50,25 @@ def mock_feedback_repository():
     repo = MagicMock()
 
     # Default: no conversation history
-    repo.get_messages_by_conversation.return_value = []
+    repo.get_recent_turns.return_value = []
 
     return repo
 
 
+@pytest.fixture
+def feedback_repository(tmp_path):
+    """Real feedback repository on a temporary database."""
+    repo = FeedbackRepository(db_path=tmp_path / "interactions.db")
+    yield repo
+    repo.close()
+
+
+def _save_turn(repo: FeedbackRepository, turn_number: int, query: str, response: str) -> None:
+    repo.save_interaction(
+        ChatInteractionCreate(query=query, response=response, conversation_id="conv-123", turn_number=turn_number)
+    )
+
+
 @pytest.fixture
 def mock_client():
     """Mock Gemini client."""
@@ -97,12 +112,12 @@ class TestChatWithConversation:
         assert response.conversation_id is None
         assert response.turn_number == 1
 
-        # Should not call get_messages_by_conversation
-        mock_feedback_repository.get_messages_by_conversation.assert_not_called()
+        # Should not read conversation history
+        mock_feedback_repository.get_recent_turns.assert_not_called()
 
     def test_chat_with_conversation_id_no_history(self, chat_service_with_conversation, mock_feedback_repository):
         """Test chat with conversation_id but no previous messages."""
-        mock_feedback_repository.get_messages_by_conversation.return_value = []
+        mock_feedback_repository.get_recent_turns.return_value = []
 
         request = ChatRequest(
             query="Who scored the most points?",
@@ -115,25 +130,14 @@ class TestChatWithConversation:
         assert response.conversation_id == "conv-123"
         assert response.turn_number == 1
 
-        # Should call get_messages but get empty list
-        mock_feedback_repository.get_messages_by_conversation.assert_called_once_with("conv-123")
+        # Should read history (LIMITed to the history size) but get empty list
+        mock_feedback_repository.get_recent_turns.assert_called_once_with("conv-123", before_turn=1, limit=5)
 
     def test_chat_with_conversation_history(self, chat_service_with_conversation, mock_feedback_repository, mock_client):
         """Test chat with conversation history."""
         # Setup conversation history
-        previous_messages = [
-            ChatInteractionResponse(
-                id="msg-1",
-                query="Who scored the most points?",
-                response="LeBron James scored 30 points.",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=1,
-            )
-        ]
-        mock_feedback_repository.get_messages_by_conversation.return_value = previous_messages
+        previous_turns = [ConversationTurn(1, "Who scored the most points?", "LeBron James scored 30 points.")]
+        mock_feedback_repository.get_recent_turns.return_value = previous_turns
 
         # Mock LLM response
         mock_response = MagicMock()
@@ -152,7 +156,7 @@ class TestChatWithConversation:
         assert response.turn_number == 2
 
         # Verify conversation history was retrieved
-        mock_feedback_repository.get_messages_by_conversation.assert_called_once_with("conv-123")
+        mock_feedback_repository.get_recent_turns.assert_called_once_with("conv-123", before_turn=2, limit=5)
 
         # Verify LLM was called with prompt containing conversation history
         call_args = mock_client.models.generate_content.call_args
@@ -162,23 +166,12 @@ class TestChatWithConversation:
         assert "User: Who scored the most points?" in prompt
         assert "Assistant: LeBron James scored 30 points." in prompt
 
-    def test_conversation_history_limit(self, chat_service_with_conversation, mock_feedback_repository, mock_client):
+    def test_conversation_history_limit(self, chat_service_with_conversation, feedback_repository, mock_client):
         """Test that conversation history is limited to last N turns."""
-        # Create 10 messages (should only include last 5)
-        messages = []
+        # Save 10 turns (should only include last 5)
         for i in range(1, 11):
-            messages.append(ChatInteractionResponse(
-                id=f"msg-{i}",
-                query=f"Question {i}",
-                response=f"Answer {i}",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=i,
-            ))
-
-        mock_feedback_repository.get_messages_by_conversation.return_value = messages
+            _save_turn(feedback_repository, i, f"Question {i}", f"Answer {i}")
+        chat_service_with_conversation._feedback_repository = feedback_repository
 
         request = ChatRequest(
             query="Follow-up question",
@@ -205,43 +198,12 @@ class TestChatWithConversation:
         assert "User: Question 1\n" not in history_section
         assert "User: Question 5\n" not in history_section
 
-    def test_conversation_history_excludes_current_turn(self, chat_service_with_conversation, mock_feedback_repository, mock_client):
+    def test_conversation_history_excludes_current_turn(self, chat_service_with_conversation, feedback_repository, mock_client):
         """Test that conversation history excludes the current turn."""
-        # Messages with turn numbers 1, 2, 3
-        messages = [
-            ChatInteractionResponse(
-                id="msg-1",
-                query="Question 1",
-                response="Answer 1",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=1,
-            ),
-            ChatInteractionResponse(
-                id="msg-2",
-                query="Question 2",
-                response="Answer 2",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=2,
-            ),
-            ChatInteractionResponse(
-                id="msg-3",
-                query="Question 3",  # Current turn - should be excluded
-                response="Answer 3",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=3,
-            ),
-        ]
-
-        mock_feedback_repository.get_messages_by_conversation.return_value = messages
+        # Turns 1, 2, 3 (turn 3 is the current turn - should be excluded)
+        for i in range(1, 4):
+            _save_turn(feedback_repository, i, f"Question {i}", f"Answer {i}")
+        chat_service_with_conversation._feedback_repository = feedback_repository
 
         request = ChatRequest(
             query="Question 3",  # Turn 3
@@ -265,19 +227,9 @@ class TestChatWithConversation:
 
     def test_build_conversation_context_format(self, chat_service_with_conversation, mock_feedback_repository):
         """Test the format of conversation context."""
-        messages = [
-            ChatInteractionResponse(
-                id="msg-1",
-                query="Who is LeBron James?",
-                response="LeBron James is a basketball player.",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=1,
-            ),
+        mock_feedback_repository.get_recent_turns.return_value = [
+            ConversationTurn(1, "Who is LeBron James?", "LeBron James is a basketball player."),
         ]
-        mock_feedback_repository.get_messages_by_conversation.return_value = messages
 
         # Call _build_conversation_context directly
         context = chat_service_with_conversation._build_conversation_context("conv-123", 2)
@@ -290,7 +242,7 @@ class TestChatWithConversation:
 
     def test_build_conversation_context_empty(self, chat_service_with_conversation, mock_feedback_repository):
         """Test conversation context when no history exists."""
-        mock_feedback_repository.get_messages_by_conversation.return_value = []
+        mock_feedback_repository.get_recent_turns.return_value = []
 
         context = chat_service_with_conversation._build_conversation_context("conv-123", 1)
 
@@ -313,19 +265,13 @@ class TestChatWithConversation:
     def test_pronoun_resolution_scenario(self, chat_service_with_conversation, mock_feedback_repository, mock_client):
         """Test realistic pronoun resolution scenario."""
         # Conversation: "Who has the most points?" -> "LeBron" -> "What about his assists?"
-        previous_messages = [
-            ChatInteractionResponse(
-                id="msg-1",
-                query="Who has the most points in NBA history?",
-                response="LeBron James has the most points in NBA history with 40,474 points.",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-789",
-                turn_number=1,
+        mock_feedback_repository.get_recent_turns.return_value = [
+            ConversationTurn(
+                1,
+                "Who has the most points in NBA history?",
+                "LeBron James has the most points in NBA history with 40,474 points.",
             ),
         ]
-        mock_feedback_repository.get_messages_by_conversation.return_value = previous_messages
 
         # Mock LLM to demonstrate it has context to resolve "his"
         mock_response = MagicMock()
@@ -364,19 +310,9 @@ class TestChatWithConversation:
         # Mock SQL tool to return None (not available)
         service._sql_tool = None
 
-        previous_messages = [
-            ChatInteractionResponse(
-                id="msg-1",
-                query="Previous question",
-                response="Previous answer",
-                sources=[],
-                processing_time_ms=100,
-                created_at=datetime.utcnow(),
-                conversation_id="conv-123",
-                turn_number=1,
-            ),
+        mock_feedback_repository.get_recent_turns.return_value = [
+            ConversationTurn(1, "Previous question", "Previous answer"),
         ]
-        mock_feedback_repository.get_messages_by_conversation.return_value = previous_messages
 
         request = ChatRequest(
             query="Follow-up question",
@@ -391,3 +327,66 @@ class TestChatWithConversation:
         call_args = mock_client.models.generate_content.call_args
         prompt = call_args[1]["contents"]
         assert "CONVERSATION HISTORY:" in prompt
+
+
+class TestConversationHistoryBuffer:
+    """Tests for serving conversation history from the in-memory ring buffer."""
+
+    def test_follow_up_turns_do_not_reread_database(self, chat_service_with_conversation, mock_feedback_repository, mock_client):
+        for turn in range(1, 5):
+            chat_service_with_conversation.chat(
+                ChatRequest(query=f"Question {turn}", conversation_id="conv-123", turn_number=turn)
+            )
+
+        # Only the first turn reads the database; later turns see the saved turns in memory
+        mock_feedback_repository.get_recent_turns.assert_called_once()
+        prompt = mock_client.models.generate_content.call_args[1]["contents"]
+        assert "User: Question 3\n" in prompt
+        assert "Assistant: Test response" in prompt
+
+    def test_history_limit_applies_to_buffer(self, mock_vector_store, mock_embedding_service, mock_feedback_repository, mock_client):
+        service = ChatService(
+            vector_store=mock_vector_store,
+            embedding_service=mock_embedding_service,
+            feedback_repository=mock_feedback_repository,
+            api_key="test-key",
+            enable_sql=False,
+            conversation_history_limit=2,
+        )
+        service._client = mock_client
+        for turn in range(1, 5):
+            service.chat(ChatRequest(query=f"Question {turn}", conversation_id="conv-123", turn_number=turn))
+
+        prompt = mock_client.models.generate_content.call_args[1]["contents"]
+        assert "User: Question 1\n" not in prompt
+        assert "User: Question 2\n" in prompt
+        assert "User: Question 3\n" in prompt
+
+    def test_turn_saved_elsewhere_triggers_reload(self, chat_service_with_conversation, feedback_repository):
+        chat_service_with_conversation._feedback_repository = feedback_repository
+        chat_service_with_conversation.chat(ChatRequest(query="Question 1", conversation_id="conv-123", turn_number=1))
+        _save_turn(feedback_repository, 2, "Question 2", "Answer from another worker")
+
+        context = chat_service_with_conversation._build_conversation_context("conv-123", 3)
+
+        assert "Assistant: Answer from another worker" in context
+
+    def test_history_includes_queued_interactions(self, chat_service_with_conversation, feedback_repository, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "interaction_write_behind", True)
+        service = chat_service_with_conversation
+        service._feedback_repository = feedback_repository
+        gate = threading.Event()
+        save_interactions = feedback_repository.save_interactions
+        feedback_repository.save_interactions = lambda batch: gate.wait(5) and save_interactions(batch)
+
+        service.chat(ChatRequest(query="Question 1", conversation_id="conv-123", turn_number=1))
+        service._conversation_history.clear()  # Force the database path
+        context = service._build_conversation_context("conv-123", 2)
+        gate.set()
+        service.close()
+
+        assert "User: Question 1" in context
+        assert len(feedback_repository.get_recent_turns("conv-123", before_turn=2, limit=5)) == 1
+
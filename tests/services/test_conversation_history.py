@@ -0,0 +1,100 @@
+"""
+FILE: test_conversation_history.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for ConversationHistoryCache - ring buffers, completeness, LRU eviction
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import pytest
+
+from src.models.feedback import ConversationTurn
+from src.services.conversation_history import ConversationHistoryCache
+
+
+def _turn(number: int) -> ConversationTurn:
+    return ConversationTurn(number, f"Question {number}", f"Answer {number}")
+
+
+@pytest.fixture
+def cache():
+    return ConversationHistoryCache(turns_per_conversation=3, max_conversations=2)
+
+
+class TestRingBuffer:
+    """Test serving history from buffered turns."""
+
+    def test_unknown_conversation_misses(self, cache):
+        assert cache.get("conv-1", before_turn=2) is None
+        assert cache.stats.misses == 1
+
+    def test_new_conversation_is_buffered_from_first_turn(self, cache):
+        cache.append("conv-1", _turn(1))
+        cache.append("conv-1", _turn(2))
+
+        assert cache.get("conv-1", before_turn=3) == [_turn(1), _turn(2)]
+        assert cache.stats.hits == 1
+
+    def test_ring_keeps_last_turns(self, cache):
+        for number in range(1, 6):
+            cache.append("conv-1", _turn(number))
+
+        assert cache.get("conv-1", before_turn=6) == [_turn(3), _turn(4), _turn(5)]
+
+    def test_excludes_current_and_later_turns(self, cache):
+        cache.append("conv-1", _turn(1))
+        cache.append("conv-1", _turn(2))
+
+        assert cache.get("conv-1", before_turn=2) == [_turn(1)]
+
+    def test_append_to_unbuffered_conversation_is_ignored(self, cache):
+        cache.append("conv-1", _turn(4))
+
+        assert len(cache) == 0
+
+    def test_loaded_short_history_is_complete(self, cache):
+        cache.load("conv-1", [_turn(1)])
+
+        assert cache.get("conv-1", before_turn=2) == [_turn(1)]
+
+    def test_truncated_buffer_cannot_answer_older_turns(self, cache):
+        cache.load("conv-1", [_turn(3), _turn(4), _turn(5)])  # LIMITed read of a longer conversation
+
+        assert cache.get("conv-1", before_turn=6) == [_turn(3), _turn(4), _turn(5)]
+        assert cache.get("conv-1", before_turn=5) is None  # Turn 2 would be needed
+
+    def test_missing_previous_turn_misses(self, cache):
+        cache.append("conv-1", _turn(1))
+
+        # Turn 2 was saved by another worker
+        assert cache.get("conv-1", before_turn=3) is None
+
+    def test_out_of_order_turn_drops_buffer(self, cache):
+        cache.append("conv-1", _turn(1))
+        cache.append("conv-1", _turn(2))
+        cache.append("conv-1", _turn(1))  # Turn regenerated
+
+        assert cache.get("conv-1", before_turn=3) is None
+
+
+class TestEviction:
+    """Test LRU eviction across conversations."""
+
+    def test_least_recently_used_conversation_evicted(self, cache):
+        cache.append("conv-1", _turn(1))
+        cache.append("conv-2", _turn(1))
+        cache.get("conv-1", before_turn=2)  # conv-1 is now most recently used
+
+        cache.append("conv-3", _turn(1))
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.get("conv-2", before_turn=2) is None
+        assert cache.get("conv-1", before_turn=2) is not None
+
+    def test_clear(self, cache):
+        cache.append("conv-1", _turn(1))
+
+        cache.clear()
+
+        assert len(cache) == 0
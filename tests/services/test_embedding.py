@@ -2,18 +2,20 @@
 FILE: test_embedding.py
 STATUS: Active
 RESPONSIBILITY: Unit tests for EmbeddingService - Mistral embedding generation
-LAST MAJOR UPDATE: 2026-02-08
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
-from unittest.mock import MagicMock, Mock, patch
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import numpy as np
 import pytest
 from mistralai.models import SDKError
 
 from src.core.exceptions import EmbeddingError
-from src.services.embedding import EmbeddingService
+from src.services.embedding import EmbeddingService, estimate_tokens, pack_batches
 
 
 class TestEmbeddingServiceInit:
@@ -206,7 +208,7 @@ class TestEmbedBatch:
 
         mock_client.embeddings.create.side_effect = [mock_response1, mock_response2]
 
-        service = EmbeddingService(api_key="test_key", batch_size=3)
+        service = EmbeddingService(api_key="test_key", batch_size=3, max_concurrency=1)
 
         # Test with 5 texts (requires 2 batches: 3 + 2)
         texts = ["Text 1", "Text 2", "Text 3", "Text 4", "Text 5"]
@@ -256,9 +258,10 @@ class TestEmbedBatch:
         with pytest.raises(EmbeddingError, match="No texts provided"):
             service.embed_batch([])
 
+    @patch("src.services.embedding.time.sleep")
     @patch("src.services.embedding.Mistral")
-    def test_embed_batch_sdk_error(self, mock_mistral_class):
-        """Test batch embedding handles SDKError."""
+    def test_embed_batch_sdk_error(self, mock_mistral_class, mock_sleep):
+        """Test batch embedding handles SDKError (after exhausting 429 retries)."""
         # Setup mock
         mock_client = MagicMock()
         mock_mistral_class.return_value = mock_client
@@ -317,7 +320,7 @@ class TestEmbedBatch:
             SDKError("Network error", raw_response=mock_raw_response),
         ]
 
-        service = EmbeddingService(api_key="test_key", batch_size=1)
+        service = EmbeddingService(api_key="test_key", batch_size=1, max_concurrency=1)
 
         # Test with 2 texts (2 batches)
         with pytest.raises(EmbeddingError, match="Embedding API error"):
@@ -366,7 +369,7 @@ class TestEmbedBatch:
             create_response(9, 1),  # Batch 4: 1 text
         ]
 
-        service = EmbeddingService(api_key="test_key", batch_size=3)
+        service = EmbeddingService(api_key="test_key", batch_size=3, max_concurrency=1)
 
         # Test with 10 texts
         texts = [f"Text {i}" for i in range(10)]
@@ -377,6 +380,294 @@ class TestEmbedBatch:
         assert mock_client.embeddings.create.call_count == 4
 
 
+def _sdk_error(status_code: int, headers: dict | None = None) -> SDKError:
+    """SDKError with a mocked HTTP response."""
+    raw_response = Mock()
+    raw_response.status_code = status_code
+    raw_response.text = "error"
+    raw_response.headers = {"content-type": "application/json", **(headers or {})}
+    return SDKError("API error", raw_response=raw_response)
+
+
+def _echo_response(model, inputs):
+    """Mock embeddings response: [len(text), 1.0] per input."""
+    return Mock(data=[Mock(embedding=[float(len(t)), 1.0]) for t in inputs])
+
+
+class TestPackBatches:
+    """Test token-aware batch packing."""
+
+    def test_count_limit(self):
+        assert pack_batches(["a"] * 7, max_items=3, max_tokens=10_000) == [(0, 3), (3, 6), (6, 7)]
+
+    def test_token_limit_closes_batch(self):
+        texts = ["x" * 399] * 5  # 100 estimated tokens each
+
+        assert pack_batches(texts, max_items=100, max_tokens=250) == [(0, 2), (2, 4), (4, 5)]
+
+    def test_oversized_text_gets_own_batch(self):
+        texts = ["short", "x" * 4000, "short"]
+
+        assert pack_batches(texts, max_items=100, max_tokens=100) == [(0, 1), (1, 2), (2, 3)]
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("") == 1
+        assert estimate_tokens("x" * 400) == 101
+
+
+class TestConcurrentEmbedding:
+    """Test concurrent batch requests, ordering and retries."""
+
+    @patch("src.services.embedding.Mistral")
+    def test_results_in_input_order(self, mock_mistral_class):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        release = threading.Event()
+        in_flight = []
+
+        def create(model, inputs):
+            # First batch finishes last, after every other batch has started
+            in_flight.append(inputs[0])
+            if inputs[0] == "t0":
+                release.wait(timeout=5)
+            elif len(in_flight) == 4:
+                release.set()
+            return Mock(data=[Mock(embedding=[float(t[1:]), 1.0]) for t in inputs])
+
+        mock_client.embeddings.create.side_effect = create
+        service = EmbeddingService(api_key="test_key", batch_size=2, max_concurrency=4)
+
+        result = service.embed_batch([f"t{i}" for i in range(8)])
+
+        assert mock_client.embeddings.create.call_count == 4
+        assert release.is_set()
+        np.testing.assert_array_equal(result[:, 0], np.arange(8))
+
+    @patch("src.services.embedding.Mistral")
+    def test_batches_packed_by_tokens(self, mock_mistral_class):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = _echo_response
+        service = EmbeddingService(api_key="test_key", batch_size=32, max_batch_tokens=250)
+
+        result = service.embed_batch(["x" * 399] * 5)
+
+        assert mock_client.embeddings.create.call_count == 3
+        assert result.shape == (5, 2)
+
+    @patch("src.services.embedding.time.sleep")
+    @patch("src.services.embedding.Mistral")
+    def test_rate_limited_batch_is_retried(self, mock_mistral_class, mock_sleep):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = [
+            _sdk_error(429),
+            _sdk_error(503),
+            _echo_response("mistral-embed", ["ab"]),
+        ]
+        service = EmbeddingService(api_key="test_key")
+
+        result = service.embed_batch(["ab"])
+
+        assert mock_client.embeddings.create.call_count == 3
+        assert mock_sleep.call_count == 2
+        np.testing.assert_array_equal(result, [[2.0, 1.0]])
+
+    @patch("src.services.embedding.time.sleep")
+    @patch("src.services.embedding.Mistral")
+    def test_retry_after_header_is_lower_bound(self, mock_mistral_class, mock_sleep):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = [
+            _sdk_error(429, {"retry-after": "7"}),
+            _echo_response("mistral-embed", ["a"]),
+        ]
+        service = EmbeddingService(api_key="test_key")
+
+        service.embed_batch(["a"])
+
+        assert mock_sleep.call_args.args[0] >= 7.0
+
+    @patch("src.services.embedding.time.sleep")
+    @patch("src.services.embedding.Mistral")
+    def test_retries_exhausted_raises(self, mock_mistral_class, mock_sleep, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "embedding_max_retries", 2)
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = _sdk_error(429)
+        service = EmbeddingService(api_key="test_key")
+
+        with pytest.raises(EmbeddingError, match="Embedding API error") as exc_info:
+            service.embed_batch(["a"])
+
+        assert mock_client.embeddings.create.call_count == 3
+        assert exc_info.value.details["attempts"] == 3
+
+    @patch("src.services.embedding.time.sleep")
+    @patch("src.services.embedding.Mistral")
+    def test_client_error_not_retried(self, mock_mistral_class, mock_sleep):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = _sdk_error(400)
+        service = EmbeddingService(api_key="test_key")
+
+        with pytest.raises(EmbeddingError, match="Embedding API error"):
+            service.embed_batch(["a"])
+
+        assert mock_client.embeddings.create.call_count == 1
+        mock_sleep.assert_not_called()
+
+
+class TestAsyncEmbedding:
+    """Test aembed_batch / aembed_query (Mistral async client)."""
+
+    @staticmethod
+    def _async_client(mock_mistral_class, side_effect):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create_async = AsyncMock(side_effect=side_effect)
+        return mock_client
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_results_in_input_order(self, mock_mistral_class):
+        async def create(model, inputs):
+            # Later batches finish first
+            await asyncio.sleep(0.01 * (10 - int(inputs[0][1:])))
+            return Mock(data=[Mock(embedding=[float(t[1:]), 1.0]) for t in inputs])
+
+        mock_client = self._async_client(mock_mistral_class, create)
+        service = EmbeddingService(api_key="test_key", batch_size=2, max_concurrency=4)
+
+        result = await service.aembed_batch([f"t{i}" for i in range(8)])
+
+        np.testing.assert_array_equal(result[:, 0], np.arange(8))
+        assert mock_client.embeddings.create_async.await_count == 4
+        mock_client.embeddings.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_concurrency_is_bounded(self, mock_mistral_class):
+        in_flight = peak = 0
+
+        async def create(model, inputs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return _echo_response(model, inputs)
+
+        self._async_client(mock_mistral_class, create)
+        service = EmbeddingService(api_key="test_key", batch_size=1, max_concurrency=3)
+
+        await service.aembed_batch([f"text {i}" for i in range(10)])
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_rate_limit_backs_off_with_asyncio_sleep(self, mock_mistral_class):
+        mock_client = self._async_client(
+            mock_mistral_class, [_sdk_error(429), _echo_response("mistral-embed", ["ab"])]
+        )
+        service = EmbeddingService(api_key="test_key")
+
+        with patch("src.services.embedding.asyncio.sleep", new=AsyncMock()) as mock_sleep, \
+             patch("src.services.embedding.time.sleep") as mock_time_sleep:
+            result = await service.aembed_batch(["ab"])
+
+        np.testing.assert_array_equal(result, [[2.0, 1.0]])
+        assert mock_client.embeddings.create_async.await_count == 2
+        mock_sleep.assert_awaited_once()
+        mock_time_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_error_raises_embedding_error(self, mock_mistral_class):
+        self._async_client(mock_mistral_class, _sdk_error(400))
+        service = EmbeddingService(api_key="test_key")
+
+        with pytest.raises(EmbeddingError, match="Embedding API error"):
+            await service.aembed_batch(["a"])
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_uses_cache(self, mock_mistral_class, tmp_path):
+        from src.repositories.embedding_cache import EmbeddingCache
+
+        mock_client = self._async_client(mock_mistral_class, _echo_response)
+        cache = EmbeddingCache(path=tmp_path / "embeddings.sqlite")
+        service = EmbeddingService(api_key="test_key", cache=cache)
+
+        first = await service.aembed_batch(["a", "bb"])
+        second = await service.aembed_batch(["bb", "a"])
+
+        assert mock_client.embeddings.create_async.await_count == 1
+        np.testing.assert_array_equal(second, first[::-1])
+        cache.close()
+
+
+class TestEmbeddingCacheIntegration:
+    """Test EmbeddingService with the embedding cache enabled."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        from src.repositories.embedding_cache import EmbeddingCache
+
+        cache = EmbeddingCache(path=tmp_path / "embeddings.sqlite")
+        yield cache
+        cache.close()
+
+    @staticmethod
+    def _echo_client(mock_mistral_class):
+        """Mock client returning [len(text), 1.0] for each input."""
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = lambda model, inputs: Mock(
+            data=[Mock(embedding=[float(len(t)), 1.0]) for t in inputs]
+        )
+        return mock_client
+
+    @patch("src.services.embedding.Mistral")
+    def test_only_misses_are_sent_to_api(self, mock_mistral_class, cache):
+        mock_client = self._echo_client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", cache=cache)
+
+        service.embed_batch(["a", "bb"])
+        result = service.embed_batch(["bb", "ccc", "a", "ccc"])
+
+        assert mock_client.embeddings.create.call_count == 2
+        assert mock_client.embeddings.create.call_args.kwargs["inputs"] == ["ccc"]
+        np.testing.assert_array_equal(result[:, 0], [2.0, 3.0, 1.0, 3.0])
+        assert cache.stats.hits == 2
+
+    @patch("src.services.embedding.Mistral")
+    def test_fully_cached_batch_makes_no_api_call(self, mock_mistral_class, cache):
+        mock_client = self._echo_client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", cache=cache)
+        first = service.embed_batch(["x", "yy"])
+
+        second = service.embed_batch(["x", "yy"])
+
+        assert mock_client.embeddings.create.call_count == 1
+        np.testing.assert_array_equal(first, second)
+        assert second.dtype == np.float32
+
+    @patch("src.services.embedding.Mistral")
+    def test_use_cache_false_bypasses_cache(self, mock_mistral_class, cache):
+        mock_client = self._echo_client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", cache=cache, use_cache=False)
+
+        service.embed_batch(["a"])
+        service.embed_batch(["a"])
+
+        assert mock_client.embeddings.create.call_count == 2
+        assert service.cache is None
+
+
 class TestEmbedQuery:
     """Test query embedding (alias for embed_single)."""
 
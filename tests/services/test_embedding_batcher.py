@@ -0,0 +1,183 @@
+"""
+FILE: test_embedding_batcher.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for EmbeddingBatcher - coalescing concurrent query embeddings
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock, patch
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import EmbeddingError
+from src.services.embedding import EmbeddingService
+from src.services.embedding_batcher import EmbeddingBatcher
+
+
+class RecordingEmbedder:
+    """embed_batch stand-in returning [len(text), 1.0] and recording batches."""
+
+    def __init__(self, error: Exception | None = None):
+        self.batches: list[list[str]] = []
+        self._error = error
+        self._lock = threading.Lock()
+
+    def __call__(self, texts):
+        with self._lock:
+            self.batches.append(list(texts))
+        if self._error is not None:
+            raise self._error
+        return np.array([[float(len(t)), 1.0] for t in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def embedder():
+    return RecordingEmbedder()
+
+
+class TestEmbeddingBatcher:
+    """Test coalescing, fan-out and limits."""
+
+    def test_concurrent_queries_share_one_call(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=8)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "ggggggg", "hhhhhhhh"]
+
+        with ThreadPoolExecutor(max_workers=len(texts)) as pool:
+            results = list(pool.map(batcher.embed, texts))
+        batcher.close()
+
+        assert len(embedder.batches) == 1
+        assert sorted(embedder.batches[0]) == sorted(texts)
+        assert [r[0] for r in results] == [float(len(t)) for t in texts]
+        assert batcher.stats.queries == 8
+        assert batcher.stats.batches == 1
+
+    def test_max_batch_size_splits_batches(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=3)
+
+        futures = [batcher.submit(f"text {i}") for i in range(7)]
+        results = [f.result(timeout=5) for f in futures]
+        batcher.close()
+
+        assert [len(b) for b in embedder.batches] == [3, 3, 1]
+        assert all(r[0] == 6.0 for r in results)
+        assert batcher.stats.max_batch == 3
+
+    def test_lone_query_waits_at_most_max_wait(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=0)
+
+        result = batcher.embed("solo")
+        batcher.close()
+
+        np.testing.assert_array_equal(result, [4.0, 1.0])
+        assert embedder.batches == [["solo"]]
+
+    def test_duplicates_embedded_once_with_separate_buffers(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=2)
+
+        first, second = batcher.submit("same"), batcher.submit("same")
+        a, b = first.result(timeout=5), second.result(timeout=5)
+        batcher.close()
+
+        assert embedder.batches == [["same"]]
+        a[0] = -1.0
+        assert b[0] == 4.0
+
+    def test_error_fans_out_to_every_caller(self):
+        embedder = RecordingEmbedder(error=EmbeddingError("Embedding API error: boom"))
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=2)
+
+        futures = [batcher.submit("x"), batcher.submit("y")]
+        for future in futures:
+            with pytest.raises(EmbeddingError, match="boom"):
+                future.result(timeout=5)
+        batcher.close()
+
+    def test_cancelled_query_is_dropped(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=2)
+
+        cancelled = batcher.submit("gone")
+        cancelled.cancel()
+        kept = batcher.submit("kept")
+        kept.result(timeout=5)
+        batcher.close()
+
+        assert embedder.batches == [["kept"]]
+
+    def test_submit_after_close_raises(self, embedder):
+        batcher = EmbeddingBatcher(embedder)
+        batcher.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            batcher.submit("late")
+
+    @pytest.mark.asyncio
+    async def test_aembed_coalesces_concurrent_coroutines(self, embedder):
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=200, max_batch_size=5)
+
+        results = await asyncio.gather(*(batcher.aembed("q" * (i + 1)) for i in range(5)))
+        batcher.close()
+
+        assert len(embedder.batches) == 1
+        assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+class TestEmbeddingServiceCoalescing:
+    """Test embed_query / aembed_query going through the batcher."""
+
+    @staticmethod
+    def _client(mock_mistral_class):
+        mock_client = MagicMock()
+        mock_mistral_class.return_value = mock_client
+        mock_client.embeddings.create.side_effect = lambda model, inputs: Mock(
+            data=[Mock(embedding=[float(len(t)), 1.0]) for t in inputs]
+        )
+        return mock_client
+
+    @patch("src.services.embedding.Mistral")
+    def test_concurrent_embed_query_makes_one_api_call(self, mock_mistral_class, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "embedding_coalesce_max_wait_ms", 200.0)
+        monkeypatch.setattr(settings, "embedding_coalesce_max_batch", 4)
+        mock_client = self._client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", coalesce_queries=True)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(service.embed_query, ["a", "bb", "ccc", "dddd"]))
+
+        assert mock_client.embeddings.create.call_count == 1
+        assert [r[0] for r in results] == [1.0, 2.0, 3.0, 4.0]
+        service.query_batcher.close()
+
+    @pytest.mark.asyncio
+    @patch("src.services.embedding.Mistral")
+    async def test_aembed_query_is_coalesced(self, mock_mistral_class, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "embedding_coalesce_max_wait_ms", 200.0)
+        monkeypatch.setattr(settings, "embedding_coalesce_max_batch", 3)
+        mock_client = self._client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", coalesce_queries=True)
+
+        results = await asyncio.gather(*(service.aembed_query(q) for q in ["a", "bb", "ccc"]))
+
+        assert mock_client.embeddings.create.call_count == 1
+        assert [r[0] for r in results] == [1.0, 2.0, 3.0]
+        service.query_batcher.close()
+
+    @patch("src.services.embedding.Mistral")
+    def test_coalescing_disabled(self, mock_mistral_class):
+        mock_client = self._client(mock_mistral_class)
+        service = EmbeddingService(api_key="test_key", coalesce_queries=False)
+
+        service.embed_query("a")
+        service.embed_query("b")
+
+        assert service.query_batcher is None
+        assert mock_client.embeddings.create.call_count == 2
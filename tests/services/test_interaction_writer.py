@@ -0,0 +1,138 @@
+"""
+FILE: test_interaction_writer.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for InteractionWriter - batching, pending visibility, backpressure, shutdown flush
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import threading
+
+import pytest
+
+from src.models.feedback import ChatInteractionCreate
+from src.services.interaction_writer import InteractionWriter
+
+
+def _interaction(i: int, conversation_id: str | None = "conv-1") -> ChatInteractionCreate:
+    return ChatInteractionCreate(
+        query=f"Question {i}", response=f"Answer {i}", conversation_id=conversation_id, turn_number=i
+    )
+
+
+class GatedSaver:
+    """save_batch stand-in recording batches; blocks while the gate is closed."""
+
+    def __init__(self, error: Exception | None = None):
+        self.batches: list[list[ChatInteractionCreate]] = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.started = threading.Event()
+        self._error = error
+
+    def __call__(self, batch):
+        self.started.set()
+        self.gate.wait(5)
+        self.batches.append(list(batch))
+        if self._error is not None:
+            raise self._error
+        return len(batch)
+
+
+@pytest.fixture
+def saver():
+    return GatedSaver()
+
+
+class TestInteractionWriter:
+    """Test write-behind batching and shutdown."""
+
+    def test_queued_interactions_share_transactions(self, saver):
+        writer = InteractionWriter(saver, max_queue=100, batch_size=10)
+        saver.gate.clear()
+        writer.submit(_interaction(0))
+        saver.started.wait(5)  # First batch is being written; the rest queue up
+        for i in range(1, 13):
+            writer.submit(_interaction(i))
+
+        saver.gate.set()
+        assert writer.flush(timeout=5)
+        writer.close()
+
+        assert [len(b) for b in saver.batches] == [1, 10, 2]
+        assert writer.stats.written == 13
+        assert writer.stats.max_batch == 10
+
+    def test_close_writes_everything_queued(self, saver):
+        writer = InteractionWriter(saver, max_queue=100, batch_size=100)
+        for i in range(5):
+            writer.submit(_interaction(i))
+
+        writer.close()
+
+        assert sum(len(b) for b in saver.batches) == 5
+        assert writer.queue_depth == 0
+
+    def test_pending_includes_queued_and_in_flight(self, saver):
+        writer = InteractionWriter(saver, max_queue=100, batch_size=1)
+        saver.gate.clear()
+        writer.submit(_interaction(1))
+        saver.started.wait(5)
+        writer.submit(_interaction(2))
+        writer.submit(_interaction(3, conversation_id="conv-2"))
+
+        pending = writer.pending("conv-1")
+
+        assert [i.turn_number for i in pending] == [1, 2]
+        saver.gate.set()
+        writer.close()
+        assert writer.pending("conv-1") == []
+
+    def test_full_queue_blocks_submit(self, saver):
+        writer = InteractionWriter(saver, max_queue=1, batch_size=1)
+        saver.gate.clear()
+        writer.submit(_interaction(1))
+        saver.started.wait(5)
+        writer.submit(_interaction(2))  # Queue now full
+
+        blocked = threading.Thread(target=writer.submit, args=(_interaction(3),))
+        blocked.start()
+        blocked.join(0.2)
+        assert blocked.is_alive()
+
+        saver.gate.set()
+        blocked.join(5)
+        writer.close()
+
+        assert not blocked.is_alive()
+        assert writer.stats.backpressure_waits == 1
+        assert writer.stats.backpressure_wait_ms > 0
+        assert writer.stats.written == 3
+
+    def test_failed_batch_is_counted_and_writer_continues(self):
+        saver = GatedSaver(error=RuntimeError("database is locked"))
+        writer = InteractionWriter(saver, max_queue=10, batch_size=10)
+
+        writer.submit(_interaction(1))
+        writer.flush(timeout=5)
+        writer.submit(_interaction(2))
+        writer.close()
+
+        assert writer.stats.failed == 2
+        assert writer.stats.batches == 2
+
+    def test_flush_times_out_while_writer_is_stuck(self, saver):
+        writer = InteractionWriter(saver, max_queue=10, batch_size=10)
+        saver.gate.clear()
+        writer.submit(_interaction(1))
+
+        assert writer.flush(timeout=0.05) is False
+        saver.gate.set()
+        writer.close()
+
+    def test_submit_after_close_raises(self, saver):
+        writer = InteractionWriter(saver)
+        writer.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            writer.submit(_interaction(1))
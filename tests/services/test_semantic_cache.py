@@ -0,0 +1,156 @@
+"""
+FILE: test_semantic_cache.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for SemanticAnswerCache - similarity lookup, scope, TTL, LRU, stats
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from src.models.chat import ChatResponse
+from src.services.semantic_cache import SemanticAnswerCache
+
+SCOPE = ("statistical", None, None)
+
+
+def _response(answer: str) -> ChatResponse:
+    return ChatResponse(answer=answer, sources=[], query="q", processing_time_ms=100.0, model="test-model")
+
+
+def _vector(seed: int, dim: int = 32) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+
+def _paraphrase(vector: np.ndarray, noise: float = 0.05, seed: int = 99) -> np.ndarray:
+    """Vector with cosine similarity close to 1 to `vector`."""
+    jitter = np.random.default_rng(seed).standard_normal(vector.shape).astype(np.float32)
+    return vector + noise * np.linalg.norm(vector) / np.sqrt(vector.size) * jitter
+
+
+@pytest.fixture
+def cache():
+    return SemanticAnswerCache(threshold=0.95, ttl_seconds=0, max_entries=10)
+
+
+class TestLookup:
+    """Test similarity matching."""
+
+    def test_paraphrase_hits(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("SGA leads."))
+
+        hit = cache.lookup(_paraphrase(query), SCOPE, "v1")
+
+        assert hit is not None
+        response, similarity = hit
+        assert response.answer == "SGA leads."
+        assert similarity > 0.95
+
+    def test_unrelated_query_misses(self, cache):
+        cache.store("top 5 scorers", _vector(1), SCOPE, "v1", _response("SGA leads."))
+
+        assert cache.lookup(_vector(2), SCOPE, "v1") is None
+
+    def test_embedding_scale_is_ignored(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("SGA leads."))
+
+        assert cache.lookup(query * 7.5, SCOPE, "v1") is not None
+
+    def test_scope_must_match(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("SGA leads."))
+
+        assert cache.lookup(query, ("contextual", None, None), "v1") is None
+        assert cache.lookup(query, ("statistical", 10, None), "v1") is None
+
+    def test_best_match_wins(self, cache):
+        query = _vector(1)
+        cache.store("far", _paraphrase(query, noise=0.25), SCOPE, "v1", _response("far"))
+        cache.store("near", _paraphrase(query, noise=0.01), SCOPE, "v1", _response("near"))
+
+        response, _ = cache.lookup(query, SCOPE, "v1")
+
+        assert response.answer == "near"
+
+
+class TestInvalidation:
+    """Test data versions, TTL and LRU eviction."""
+
+    def test_data_version_change_drops_entry(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("old data"))
+
+        assert cache.lookup(query, SCOPE, "v2") is None
+        assert len(cache) == 0
+        assert cache.stats.expirations == 1
+
+    def test_ttl_expires_entries(self):
+        cache = SemanticAnswerCache(threshold=0.95, ttl_seconds=60, max_entries=10)
+        query = _vector(1)
+        with patch("src.services.semantic_cache.time.monotonic", return_value=1000.0):
+            cache.store("top 5 scorers", query, SCOPE, "v1", _response("SGA leads."))
+        with patch("src.services.semantic_cache.time.monotonic", return_value=1030.0):
+            assert cache.lookup(query, SCOPE, "v1") is not None
+        with patch("src.services.semantic_cache.time.monotonic", return_value=1061.0):
+            assert cache.lookup(query, SCOPE, "v1") is None
+
+        assert cache.stats.expirations == 1
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = SemanticAnswerCache(threshold=0.95, ttl_seconds=0, max_entries=2)
+        first, second, third = _vector(1), _vector(2), _vector(3)
+        cache.store("first", first, SCOPE, "v1", _response("1"))
+        cache.store("second", second, SCOPE, "v1", _response("2"))
+        cache.lookup(first, SCOPE, "v1")  # first is now most recently used
+
+        cache.store("third", third, SCOPE, "v1", _response("3"))
+
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
+        assert cache.lookup(second, SCOPE, "v1") is None
+        assert cache.lookup(first, SCOPE, "v1") is not None
+        assert cache.lookup(third, SCOPE, "v1") is not None
+
+    def test_storing_equivalent_query_replaces_entry(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("old"))
+        cache.store("who are the 5 best scorers", _paraphrase(query), SCOPE, "v1", _response("new"))
+
+        assert len(cache) == 1
+        assert cache.lookup(query, SCOPE, "v1")[0].answer == "new"
+
+    def test_clear(self, cache):
+        cache.store("top 5 scorers", _vector(1), SCOPE, "v1", _response("SGA leads."))
+
+        cache.clear()
+
+        assert len(cache) == 0
+        assert cache.lookup(_vector(1), SCOPE, "v1") is None
+
+
+class TestStats:
+    """Test hit-rate counters."""
+
+    def test_hit_rate(self, cache):
+        query = _vector(1)
+        cache.store("top 5 scorers", query, SCOPE, "v1", _response("SGA leads."))
+
+        cache.lookup(query, SCOPE, "v1")
+        cache.lookup(_paraphrase(query), SCOPE, "v1")
+        cache.lookup(_vector(2), SCOPE, "v1")
+        cache.record_bypass()
+
+        assert cache.stats.hits == 2
+        assert cache.stats.misses == 1
+        assert cache.stats.bypasses == 1
+        assert cache.stats.stores == 1
+        assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+    def test_empty_cache_misses(self, cache):
+        assert cache.lookup(_vector(1), SCOPE, "v1") is None
+        assert cache.stats.hit_rate == 0.0
@@ -0,0 +1,149 @@
+"""
+FILE: test_sql_cache.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for SQLCache - SQL parameterization, exact/skeleton tiers, persistence, invalidation
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import pytest
+
+from src.tools.sql_cache import SQLCache, fill, parameterize
+from src.tools.sql_templates import QuestionSkeleton, Slot
+
+PAUL = Slot("player", "Chris Paul")
+YOUNG = Slot("player", "Trae Young")
+LAKERS = Slot("team", "LAL", "Los Angeles Lakers")
+CELTICS = Slot("team", "BOS", "Boston Celtics")
+
+ASSISTS_SQL = "SELECT p.name, ps.ast FROM players p JOIN player_stats ps ON p.id = ps.player_id WHERE p.name LIKE '%Paul%'"
+
+
+def _skeleton(*slots: Slot) -> QuestionSkeleton:
+    text = " ".join(["how many assists did"] + ["{" + slot.kind + "}" for slot in slots] + ["record"])
+    return QuestionSkeleton(text, slots)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SQLCache("v1", path=tmp_path / "sql.sqlite", max_entries=100, memory_items=10)
+    yield cache
+    cache.close()
+
+
+class TestParameterize:
+    """Test turning generated SQL into entity templates."""
+
+    def test_name_literal_keeps_wildcards_and_form(self):
+        template, specs = parameterize(ASSISTS_SQL, (PAUL,))
+
+        assert template.endswith("LIKE :s0")
+        assert fill(specs, (YOUNG,)) == {"s0": "%Young%"}
+
+    def test_team_and_number_slots(self):
+        sql = "SELECT p.name FROM players p WHERE p.team_abbr = 'LAL' AND ps.pts > 1000 LIMIT 5"
+
+        template, specs = parameterize(sql, (Slot("number", 5), LAKERS, Slot("number", 1000.0)))
+
+        assert template == "SELECT p.name FROM players p WHERE p.team_abbr = :s0 AND ps.pts > :s1 LIMIT :s2"
+        assert fill(specs, (Slot("number", 3), CELTICS, Slot("number", 1500.0))) == {
+            "s0": "BOS", "s1": 1500, "s2": 3,
+        }
+
+    def test_unused_slot_is_not_templated(self):
+        # The LLM ignored the number: another number could not be substituted
+        assert parameterize(ASSISTS_SQL, (PAUL, Slot("number", 2024))) is None
+
+    def test_ambiguous_number_is_not_templated(self):
+        sql = "SELECT ROUND(CAST(ps.pts AS FLOAT) / ps.gp, 1) FROM player_stats ps LIMIT 1"
+
+        assert parameterize(sql, (Slot("number", 1),)) is None
+
+    def test_sql_with_colon_is_not_templated(self):
+        assert parameterize("SELECT 'a:b' FROM players WHERE name = 'Chris Paul'", (PAUL,)) is None
+
+    def test_other_literals_are_left_alone(self):
+        sql = "SELECT name FROM players WHERE name = 'Chris Paul' AND team_abbr = 'PHX'"
+
+        template, _ = parameterize(sql, (PAUL,))
+
+        assert template == "SELECT name FROM players WHERE name = :s0 AND team_abbr = 'PHX'"
+
+
+class TestTiers:
+    """Test exact and skeleton lookups."""
+
+    def test_exact_hit_ignores_case_and_punctuation(self, cache):
+        cache.put("How many assists did Chris Paul record?", ASSISTS_SQL, _skeleton(PAUL))
+
+        compiled = cache.get("how many assists did chris paul record", _skeleton(PAUL))
+
+        assert compiled.shape == "cache_exact"
+        assert compiled.sql == ASSISTS_SQL
+        assert cache.stats.exact_hits == 1
+
+    def test_skeleton_hit_binds_new_entity(self, cache):
+        cache.put("How many assists did Chris Paul record?", ASSISTS_SQL, _skeleton(PAUL))
+
+        compiled = cache.get("How many assists did Trae Young record?", _skeleton(YOUNG))
+
+        assert compiled.shape == "cache_skeleton"
+        assert compiled.params == {"s0": "%Young%"}
+        assert compiled.render().endswith("LIKE '%Young%'")
+        assert cache.stats.skeleton_hits == 1
+        assert cache.stats.templates == 1
+
+    def test_different_skeleton_misses(self, cache):
+        cache.put("How many assists did Chris Paul record?", ASSISTS_SQL, _skeleton(PAUL))
+
+        assert cache.get("How many steals did Trae Young record?", QuestionSkeleton(
+            "how many steals did {player} record", (YOUNG,)
+        )) is None
+        assert cache.stats.misses == 1
+
+    def test_untemplatable_sql_only_hits_exact(self, cache):
+        sql = "SELECT name FROM players WHERE name LIKE '%Point God%'"
+        cache.put("How many assists did Chris Paul record?", sql, _skeleton(PAUL))
+
+        assert cache.get("How many assists did Trae Young record?", _skeleton(YOUNG)) is None
+        assert cache.stats.templates == 0
+
+
+class TestPersistence:
+    """Test the SQLite tier and version invalidation."""
+
+    def test_entries_survive_reopen(self, cache, tmp_path):
+        cache.put("How many assists did Chris Paul record?", ASSISTS_SQL, _skeleton(PAUL))
+        cache.close()
+
+        reopened = SQLCache("v1", path=tmp_path / "sql.sqlite", memory_items=0)
+        try:
+            assert reopened.get("How many assists did Trae Young record?", _skeleton(YOUNG)) is not None
+        finally:
+            reopened.close()
+
+    def test_new_version_drops_entries(self, cache, tmp_path):
+        cache.put("How many assists did Chris Paul record?", ASSISTS_SQL, _skeleton(PAUL))
+        cache.close()
+
+        reopened = SQLCache("v2", path=tmp_path / "sql.sqlite")
+        try:
+            assert len(reopened) == 0
+            assert reopened.stats.stale == 2  # Exact and skeleton entries
+            assert reopened.get("How many assists did Chris Paul record?") is None
+        finally:
+            reopened.close()
+
+    def test_least_recently_used_entries_evicted(self, tmp_path):
+        cache = SQLCache("v1", path=tmp_path / "sql.sqlite", max_entries=10, memory_items=0)
+        try:
+            for i in range(12):
+                cache.put(f"question {i}", f"SELECT {i}")
+
+            # The 11th put evicts down to 9 entries, the 12th brings it back to 10
+            assert len(cache) == 10
+            assert cache.stats.evictions == 2
+            assert cache.get("question 0") is None
+            assert cache.get("question 11") is not None
+        finally:
+            cache.close()
@@ -0,0 +1,183 @@
+"""
+FILE: test_sql_executor.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for ReadOnlySQLExecutor - typed rows, row cap, read-only connections, pooling, limits
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.core.exceptions import QueryCancelledError, QueryRejectedError
+from src.tools.sql_executor import QueryResult, ReadOnlySQLExecutor
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "stats.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE players (id INTEGER PRIMARY KEY, name TEXT, pts INTEGER, fg_pct REAL)")
+    conn.executemany(
+        "INSERT INTO players (name, pts, fg_pct) VALUES (?, ?, ?)",
+        [(f"Player {i}", 100 * i, 40.0 + i / 10) for i in range(50)] + [("O'Neal, Jr. [\\n]", None, None)],
+    )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+# Counts forever; only an interrupt stops it
+ENDLESS = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+
+
+@pytest.fixture
+def executor(db_path):
+    executor = ReadOnlySQLExecutor(db_path, pool_size=2)
+    yield executor
+    executor.close()
+
+
+class TestExecute:
+    """Test query results."""
+
+    def test_typed_rows_and_columns(self, executor):
+        result = executor.execute("SELECT name, pts, fg_pct FROM players WHERE id = 2")
+
+        assert result.columns == ["name", "pts", "fg_pct"]
+        assert result.rows == [("Player 1", 100, 40.1)]
+        assert result.as_dicts() == [{"name": "Player 1", "pts": 100, "fg_pct": 40.1}]
+
+    def test_unusual_values_round_trip(self, executor):
+        result = executor.execute("SELECT name, pts FROM players WHERE pts IS NULL")
+
+        assert result.as_dicts() == [{"name": "O'Neal, Jr. [\\n]", "pts": None}]
+
+    def test_named_parameters(self, executor):
+        result = executor.execute("SELECT COUNT(*) AS n FROM players WHERE pts > :threshold", {"threshold": 4000})
+
+        assert result.as_dicts() == [{"n": 9}]
+
+    def test_row_cap_marks_truncation(self, executor):
+        capped = executor.execute("SELECT id FROM players", max_rows=10)
+        exact = executor.execute("SELECT id FROM players LIMIT 10", max_rows=10)
+
+        assert len(capped.rows) == 10 and capped.truncated
+        assert not exact.truncated
+
+    def test_statement_without_rows(self, executor):
+        assert executor.execute("PRAGMA query_only") == QueryResult(["query_only"], [(1,)])
+
+    def test_writes_are_rejected(self, executor):
+        with pytest.raises(sqlite3.OperationalError):
+            executor.execute("UPDATE players SET pts = 0")
+
+    def test_missing_database_raises(self, tmp_path):
+        with pytest.raises(sqlite3.OperationalError):
+            ReadOnlySQLExecutor(str(tmp_path / "missing.db")).execute("SELECT 1")
+        assert not (tmp_path / "missing.db").exists()
+
+
+class TestPool:
+    """Test connection reuse."""
+
+    def test_connection_is_reused(self, executor):
+        executor.execute("SELECT 1")
+        conn = executor._idle.queue[-1]
+
+        executor.execute("SELECT 1")
+
+        assert executor._idle.queue == [conn]
+
+    def test_error_returns_connection_to_pool(self, executor):
+        with pytest.raises(sqlite3.OperationalError):
+            executor.execute("SELECT * FROM missing_table")
+
+        assert executor._idle.qsize() == 1
+
+    def test_concurrent_queries(self, executor):
+        results = []
+
+        def run():
+            results.append(len(executor.execute("SELECT id FROM players").rows))
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        assert results == [51] * 8
+        assert executor._idle.qsize() <= 2
+
+
+class TestLimits:
+    """Test interrupting and rejecting expensive queries."""
+
+    def test_deadline_interrupts_query(self, executor):
+        with pytest.raises(QueryCancelledError) as exc_info:
+            executor.execute(ENDLESS, timeout_seconds=0.2, max_instructions=10**12)
+
+        assert exc_info.value.details["reason"] == "deadline exceeded"
+        assert exc_info.value.details["elapsed_seconds"] < 2
+
+    def test_instruction_budget_interrupts_query(self, executor):
+        with pytest.raises(QueryCancelledError) as exc_info:
+            executor.execute(ENDLESS, timeout_seconds=60, max_instructions=100_000)
+
+        assert exc_info.value.details["reason"] == "instruction budget exceeded"
+
+    def test_cancel_event_interrupts_query(self, executor):
+        cancel = threading.Event()
+        threading.Timer(0.1, cancel.set).start()
+
+        with pytest.raises(QueryCancelledError) as exc_info:
+            executor.execute(ENDLESS, timeout_seconds=60, max_instructions=10**12, cancel=cancel)
+
+        assert exc_info.value.details["reason"] == "cancelled"
+
+    def test_connection_reusable_after_interrupt(self, executor):
+        with pytest.raises(QueryCancelledError):
+            executor.execute(ENDLESS, timeout_seconds=0.1)
+
+        assert executor.execute("SELECT COUNT(*) FROM players").rows == [(51,)]
+        assert executor._idle.qsize() == 1
+
+    def test_nested_full_scans_rejected(self, executor):
+        sql = "SELECT COUNT(*) FROM players a CROSS JOIN players b CROSS JOIN players c"
+
+        with pytest.raises(QueryRejectedError) as exc_info:
+            executor.execute(sql, max_plan_cost=100_000)
+
+        assert exc_info.value.details["plan_cost"] == 51 ** 3
+
+    def test_correlated_subquery_cost_multiplies(self, executor):
+        sql = "SELECT name FROM players p WHERE pts > (SELECT AVG(pts) FROM players q WHERE q.fg_pct < p.fg_pct)"
+
+        assert executor.plan_cost(sql) == 51 * 51
+
+    def test_index_lookups_are_cheap(self, executor):
+        assert executor.plan_cost("SELECT name FROM players WHERE id = 3") == 1
+        assert executor.plan_cost("SELECT a.name FROM players a JOIN players b ON a.id = b.id") == 51
+
+    def test_row_counts_follow_database_changes(self, executor, db_path):
+        import os
+
+        assert executor.plan_cost("SELECT COUNT(*) FROM players") == 51
+
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE player_stats_full AS SELECT * FROM players WHERE id <= 10")
+        conn.execute("DELETE FROM players WHERE id > 20")
+        conn.commit()
+        conn.close()
+        stat = os.stat(db_path)
+        os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # Coarse filesystem clocks
+
+        assert executor.plan_cost("SELECT COUNT(*) FROM players") == 20
+        assert executor.plan_cost("SELECT COUNT(*) FROM player_stats_full") == 10
+
+    def test_plan_check_can_be_disabled(self, executor):
+        sql = "SELECT COUNT(*) FROM players a CROSS JOIN players b CROSS JOIN players c"
+
+        assert executor.execute(sql, max_plan_cost=0).rows == [(51 ** 3,)]
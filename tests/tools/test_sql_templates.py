@@ -0,0 +1,230 @@
+"""
+FILE: test_sql_templates.py
+STATUS: Active
+RESPONSIBILITY: Unit tests for SQLTemplateCompiler - question shapes, LLM fallbacks, parameterized execution
+LAST MAJOR UPDATE: 2026-10-16
+MAINTAINER: Shahu
+"""
+
+import sqlite3
+
+import pytest
+
+from src.tools.sql_templates import CompiledSQL, SQLTemplateCompiler, normalize_text
+
+DICTIONARY = [
+    {"abbreviation": "PTS", "full_name": "Points", "column_name": "pts", "table_name": "player_stats"},
+    {"abbreviation": "REB", "full_name": "Rebounds", "column_name": "reb", "table_name": "player_stats"},
+    {"abbreviation": "AST", "full_name": "Assists", "column_name": "ast", "table_name": "player_stats"},
+    {"abbreviation": "TOV", "full_name": "Turnovers", "column_name": "tov", "table_name": "player_stats"},
+    {"abbreviation": "GP", "full_name": "Games Played", "column_name": "gp", "table_name": "player_stats"},
+    {"abbreviation": "FG%", "full_name": "Field Goal Percentage", "column_name": "fg_pct", "table_name": "player_stats"},
+    {"abbreviation": "AGE", "full_name": "Age", "column_name": "age", "table_name": "players"},
+    {"abbreviation": "OREB", "full_name": "Offensive Rebounds", "column_name": None, "table_name": None},
+]
+TEAMS = [("LAL", "Los Angeles Lakers"), ("LAC", "Los Angeles Clippers"), ("BOS", "Boston Celtics")]
+# name, team, age, gp, pts, reb, ast, tov, fg_pct
+PLAYERS = [
+    ("LeBron James", "LAL", 40, 70, 1708, 546, 574, 240, 51.3),
+    ("Anthony Davis", "LAL", 32, 60, 1500, 700, 200, 130, 53.0),
+    ("Jayson Tatum", "BOS", 27, 72, 1930, 628, 430, 200, 45.2),
+    ("Jaylen Brown", "BOS", 28, 63, 1400, 370, 280, 180, 46.3),
+    ("Bronny James", "LAL", 20, 10, 40, 10, 10, 8, None),
+]
+
+
+@pytest.fixture
+def stats_db(tmp_path):
+    """Small stats database with the production schema subset the templates use."""
+    path = tmp_path / "stats.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE teams (id INTEGER PRIMARY KEY, abbreviation TEXT, name TEXT);
+        CREATE TABLE players (id INTEGER PRIMARY KEY, name TEXT, team_abbr TEXT, age INTEGER);
+        CREATE TABLE player_stats (
+            player_id INTEGER, gp INTEGER, pts INTEGER, reb INTEGER, ast INTEGER, tov INTEGER, fg_pct REAL,
+            three_pct REAL, ts_pct REAL
+        );
+        """
+    )
+    conn.executemany("INSERT INTO teams (abbreviation, name) VALUES (?, ?)", TEAMS)
+    for i, (name, team, age, *stats) in enumerate(PLAYERS, start=1):
+        conn.execute("INSERT INTO players VALUES (?, ?, ?, ?)", (i, name, team, age))
+        conn.execute(
+            "INSERT INTO player_stats VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)", (i, *stats)
+        )
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def compiler(stats_db):
+    return SQLTemplateCompiler.from_database(stats_db, DICTIONARY)
+
+
+def _run(stats_db: str, compiled: CompiledSQL) -> list[tuple]:
+    conn = sqlite3.connect(stats_db)
+    try:
+        return conn.execute(compiled.sql, compiled.params).fetchall()
+    finally:
+        conn.close()
+
+
+class TestNormalization:
+    """Test question normalization."""
+
+    def test_accents_possessives_and_punctuation(self):
+        assert normalize_text("Who's Jokić's best stat?") == "who jokic best stat"
+        assert normalize_text("Nikola Jokić") == "nikola jokic"
+
+    def test_numbers_and_percentages(self):
+        assert normalize_text("more than 1,000 points and 50% FG") == "more than 1000 points and 50% fg"
+
+
+class TestShapes:
+    """Test each supported question shape against the database."""
+
+    def test_top_n_players(self, compiler, stats_db):
+        compiled = compiler.compile("Who are the top 3 scorers?")
+
+        assert compiled.shape == "top_players"
+        assert compiled.params["limit"] == 3
+        assert [row[0] for row in _run(stats_db, compiled)] == ["Jayson Tatum", "LeBron James", "Anthony Davis"]
+
+    def test_singular_question_returns_one_row(self, compiler, stats_db):
+        compiled = compiler.compile("Who has the most assists?")
+
+        assert _run(stats_db, compiled) == [("LeBron James", 574)]
+
+    def test_best_flips_order_for_lower_is_better_stats(self, compiler, stats_db):
+        compiled = compiler.compile("Who has the fewest turnovers on the Celtics?")
+
+        assert _run(stats_db, compiled) == [("Jaylen Brown", 180)]
+
+    def test_percentage_rankings_skip_low_sample_players(self, compiler, stats_db):
+        compiled = compiler.compile("Who has the highest field goal percentage?")
+
+        assert "ps.gp >= :min_games" in compiled.sql
+        assert _run(stats_db, compiled) == [("Anthony Davis", 53.0)]
+
+    def test_player_stat(self, compiler, stats_db):
+        compiled = compiler.compile("How many rebounds does Tatum have?")
+
+        assert compiled.shape == "player_stat"
+        assert _run(stats_db, compiled) == [("Jayson Tatum", 628)]
+
+    def test_player_average_is_per_game(self, compiler, stats_db):
+        compiled = compiler.compile("What is LeBron James' average points per game?")
+
+        assert _run(stats_db, compiled) == [("LeBron James", 24.4)]
+
+    def test_count_above_threshold(self, compiler, stats_db):
+        compiled = compiler.compile("How many players scored over 1,450 points?")
+
+        assert compiled.shape == "count_threshold"
+        assert compiled.params["threshold"] == 1450
+        assert _run(stats_db, compiled) == [(3,)]
+
+    def test_league_average(self, compiler, stats_db):
+        compiled = compiler.compile("What is the average age?")
+
+        assert compiled.shape == "league_aggregate"
+        assert _run(stats_db, compiled) == [(29.4,)]
+
+    def test_league_max_min_skip_low_sample_players(self, compiler, stats_db):
+        compiled = compiler.compile("What is the lowest points per game?")
+
+        assert compiled.shape == "league_aggregate"
+        assert "ps.gp >= :min_games" in compiled.sql
+        assert _run(stats_db, compiled) == [(22.2,)]  # Not Bronny James' 4.0 over 10 games
+
+    def test_team_aggregate(self, compiler, stats_db):
+        compiled = compiler.compile("Total rebounds for the Lakers")
+
+        assert compiled.shape == "team_aggregate"
+        assert _run(stats_db, compiled) == [("Los Angeles Lakers", 1256)]
+
+    def test_team_ranking(self, compiler, stats_db):
+        compiled = compiler.compile("Which team has the most points?")
+
+        assert compiled.shape == "team_ranking"
+        assert _run(stats_db, compiled) == [("Boston Celtics", 3330)]
+
+    def test_roster(self, compiler, stats_db):
+        assert _run(stats_db, compiler.compile("How many players are on the Celtics?")) == [(2,)]
+        assert _run(stats_db, compiler.compile("List the Celtics roster")) == [("Jaylen Brown",), ("Jayson Tatum",)]
+
+
+class TestFallback:
+    """Test questions left to the LLM."""
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "What about his assists?",  # Pronoun needs conversation context
+            "Compare LeBron James and Jayson Tatum",  # Two players
+            "Who has the most points and rebounds?",  # Two stats
+            "Show the most and least turnovers",  # Contradictory cues
+            "Who is the top scorer'; DROP TABLE players; --",
+            "Who has the most offensive rebounds?",  # Column not in the dictionary
+            "Who scored the most points in a game?",  # Single-game high, not points per game
+        ],
+    )
+    def test_unsupported_questions_miss(self, compiler, question):
+        assert compiler.compile(question) is None
+
+    def test_ambiguous_last_name_misses(self, compiler):
+        # Two players named James
+        assert compiler.compile("How many points does James have?") is None
+
+    def test_shared_city_is_not_a_team(self, compiler):
+        assert compiler.compile("Total points for Los Angeles") is None
+
+    def test_stats_are_counted(self, compiler):
+        compiler.compile("Who has the most assists?")
+        compiler.compile("What about his assists?")
+
+        assert compiler.stats.hits == 1
+        assert compiler.stats.misses == 1
+        assert compiler.stats.hit_rate == 0.5
+
+    def test_unreadable_database_gives_no_entity_vocabulary(self, tmp_path):
+        compiler = SQLTemplateCompiler.from_database(str(tmp_path / "missing" / "x.db"), DICTIONARY)
+
+        assert compiler.compile("Total rebounds for the Lakers") is None
+        assert compiler.compile("Who has the most assists?") is not None
+
+
+class TestSkeleton:
+    """Test entity slot extraction."""
+
+    def test_entities_become_slots(self, compiler):
+        skeleton = compiler.skeleton("Top 3 scorers on the Lakers with over 1,000 points besides Tatum?")
+
+        assert skeleton.text == "top {number} scorers on the {team} with over {number} points besides {player}"
+        assert [(slot.kind, slot.value) for slot in skeleton.slots] == [
+            ("number", 3), ("team", "LAL"), ("number", 1000), ("player", "Jayson Tatum"),
+        ]
+        assert skeleton.slots[1].name == "Los Angeles Lakers"
+
+    def test_questions_differing_in_entities_share_skeleton(self, compiler):
+        assert (
+            compiler.skeleton("How many assists did Jayson Tatum record?").text
+            == compiler.skeleton("how many assists did LeBron James record").text
+        )
+
+    def test_number_words_are_not_slots(self, compiler):
+        assert compiler.skeleton("Who has the best three point shooting?").slots == ()
+
+
+class TestCompiledSQL:
+    """Test parameter rendering."""
+
+    def test_render_inlines_quoted_literals(self):
+        compiled = CompiledSQL("player_stat", "SELECT 1 WHERE name = :player LIMIT :limit", {
+            "player": "D'Angelo Russell", "limit": 5,
+        })
+
+        assert compiled.render() == "SELECT 1 WHERE name = 'D''Angelo Russell' LIMIT 5"
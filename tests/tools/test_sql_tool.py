@@ -2,16 +2,23 @@
 FILE: test_sql_tool.py
 STATUS: Active
 RESPONSIBILITY: Unit tests for NBAGSQLTool - SQL query generation and execution
-LAST MAJOR UPDATE: 2026-02-10
+LAST MAJOR UPDATE: 2026-10-16
 MAINTAINER: Shahu
 """
 
+import sqlite3
 from pathlib import Path
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 
-from src.tools.sql_tool import NBAGSQLTool, _build_abbreviations_block, _load_dictionary_from_db
+from src.tools.sql_tool import (
+    NBAGSQLTool,
+    _build_abbreviations_block,
+    _build_derived_tables_block,
+    _has_table,
+    _load_dictionary_from_db,
+)
 
 
 class TestNBAGSQLToolInit:
@@ -204,11 +211,14 @@ SELECT COUNT(*) FROM players
 
 
 class TestExecuteSQL:
-    """Test SQL execution."""
+    """Test SQL execution through SQLDatabase (sql_native_execution=false)."""
 
     @pytest.fixture
-    def mock_tool(self):
+    def mock_tool(self, monkeypatch):
         """Create NBAGSQLTool with mocked dependencies."""
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "sql_native_execution", False)
         with patch("src.tools.sql_tool.SQLDatabase") as mock_db_class, \
              patch("src.tools.sql_tool.ChatGoogleGenerativeAI") as mock_llm_class, \
              patch("src.tools.sql_tool._load_dictionary_from_db", return_value=[]):
@@ -313,6 +323,78 @@ class TestExecuteSQL:
             mock_tool.execute_sql("SELECT * FROM players")
 
 
+class TestNativeExecution:
+    """Test SQL execution on the read-only sqlite3 connections."""
+
+    @pytest.fixture
+    def tool(self):
+        with patch("src.tools.sql_tool.ChatGoogleGenerativeAI"):
+            tool = NBAGSQLTool()
+            yield tool
+            tool.executor.close()
+
+    def test_rows_keep_sqlite_types(self, tool):
+        results = tool.execute_sql(
+            "SELECT p.name, ps.pts, ps.fg_pct FROM players p JOIN player_stats ps ON p.id = ps.player_id "
+            "WHERE p.name = :name",
+            parameters={"name": "LeBron James"},
+        )
+
+        assert list(results[0]) == ["name", "pts", "fg_pct"]
+        assert isinstance(results[0]["pts"], int)
+        assert isinstance(results[0]["fg_pct"], float)
+
+    def test_row_cap(self, tool):
+        results = tool.execute_sql("SELECT name FROM players", max_rows=7)
+
+        assert len(results) == 7
+
+    def test_default_row_cap_from_settings(self, tool, monkeypatch):
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "sql_max_rows", 3)
+
+        assert len(tool.execute_sql("SELECT name FROM players")) == 3
+
+    def test_writes_are_rejected(self, tool):
+        with pytest.raises(sqlite3.OperationalError):
+            tool.execute_sql("CREATE TABLE write_probe (x INTEGER)")
+
+    def test_runaway_query_is_interrupted(self, tool):
+        from src.core.exceptions import QueryCancelledError
+
+        with pytest.raises(QueryCancelledError):
+            tool.execute_sql(
+                "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n",
+                timeout_seconds=0.2,
+            )
+
+    def test_rejected_query_returns_error_for_fallback(self, tool):
+        with patch.object(
+            tool, "generate_sql", return_value="SELECT COUNT(*) FROM players a, players b, players c"
+        ):
+            result = tool.query("How many trios of players are there?")
+
+        assert result["results"] == []
+        assert "too expensive" in result["error"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_aquery_interrupts_sqlite(self, tool):
+        import asyncio
+        import time
+
+        sql = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+        with patch.object(tool, "agenerate_sql", AsyncMock(return_value=sql)):
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(tool.aquery("Count forever"), 0.2)
+
+        # The worker thread gave its connection back instead of running on
+        start = time.monotonic()
+        while tool.executor._idle.qsize() == 0 and time.monotonic() - start < 2:
+            await asyncio.sleep(0.01)
+        assert tool.executor._idle.qsize() == 1
+
+
 class TestQuery:
     """Test end-to-end query method."""
 
@@ -382,6 +464,74 @@ class TestQuery:
         assert "SQL syntax error" in result['error']
 
 
+class TestAsyncQuery:
+    """Test the async SQL path (agenerate_sql / aquery)."""
+
+    @pytest.fixture
+    def mock_tool(self):
+        """Create NBAGSQLTool with a mocked async chain and database."""
+        with patch("src.tools.sql_tool.SQLDatabase") as mock_db_class, \
+             patch("src.tools.sql_tool.ChatGoogleGenerativeAI") as mock_llm_class, \
+             patch("src.tools.sql_tool._load_dictionary_from_db", return_value=[]):
+
+            mock_db_class.from_uri.return_value = MagicMock()
+            mock_llm_class.return_value = MagicMock()
+
+            tool = NBAGSQLTool()
+            tool.sql_chain = MagicMock()
+            tool.sql_chain.ainvoke = AsyncMock()
+            tool.execute_sql = MagicMock()
+
+            yield tool
+
+    @pytest.mark.asyncio
+    async def test_agenerate_sql_cleans_markdown(self, mock_tool):
+        mock_tool.sql_chain.ainvoke.return_value = Mock(content="```sql\nSELECT name FROM players\n```")
+
+        sql = await mock_tool.agenerate_sql("List players")
+
+        assert sql == "SELECT name FROM players"
+        mock_tool.sql_chain.ainvoke.assert_awaited_once_with({"input": "List players"})
+        mock_tool.sql_chain.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aquery_success(self, mock_tool):
+        mock_tool.sql_chain.ainvoke.return_value = Mock(content="SELECT name FROM players LIMIT 1")
+        mock_tool.execute_sql.return_value = [{"name": "LeBron James"}]
+
+        result = await mock_tool.aquery("Who is a famous player?")
+
+        assert result["sql"] == "SELECT name FROM players LIMIT 1"
+        assert result["results"] == [{"name": "LeBron James"}]
+        assert result["error"] is None
+
+    @pytest.mark.asyncio
+    async def test_aquery_rate_limit_backs_off_without_blocking(self, mock_tool):
+        mock_tool.sql_chain.ainvoke.side_effect = [
+            Exception("429 RESOURCE_EXHAUSTED"),
+            Mock(content="SELECT 1"),
+        ]
+        mock_tool.execute_sql.return_value = [{"1": 1}]
+
+        with patch("src.tools.sql_tool.asyncio.sleep", new=AsyncMock()) as mock_sleep, \
+             patch("src.tools.sql_tool.time.sleep") as mock_time_sleep:
+            result = await mock_tool.aquery("Anything")
+
+        assert result["error"] is None
+        mock_sleep.assert_awaited_once()
+        mock_time_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_aquery_error_returns_error_dict(self, mock_tool):
+        mock_tool.sql_chain.ainvoke.side_effect = Exception("LLM API error")
+
+        result = await mock_tool.aquery("Who are the top scorers?")
+
+        assert result["sql"] is None
+        assert result["results"] == []
+        assert "LLM API error" in result["error"]
+
+
 class TestFormatResults:
     """Test result formatting."""
 
@@ -681,3 +831,152 @@ class TestBuildAbbreviationsBlock:
 
         assert "Players table:" in result
         assert "Player_stats table:" not in result
+
+
+class TestDerivedTablesPrompt:
+    """Test advertising player_stats_full in the SQL prompt."""
+
+    def test_block_lists_table_and_per_game_columns(self):
+        result = _build_derived_tables_block(True)
+
+        assert "player_stats_full(player_id, name, team_abbr, team_name" in result
+        assert "ppg (pts/gp)" in result
+        assert "ORDER BY ppg DESC LIMIT 5" in result
+
+    def test_no_block_without_table(self):
+        assert _build_derived_tables_block(False) == ""
+
+    def test_has_table(self, tmp_path):
+        db_path = str(tmp_path / "stats.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE player_stats_full (player_id INTEGER)")
+        conn.close()
+
+        assert _has_table(db_path, "player_stats_full")
+        assert not _has_table(db_path, "missing")
+        assert not _has_table(str(tmp_path / "missing.db"), "player_stats_full")
+
+    @patch("src.tools.sql_tool._has_table", return_value=False)
+    @patch("src.tools.sql_tool.ChatGoogleGenerativeAI")
+    def test_prompt_without_table_keeps_per_game_rule(self, mock_llm_class, mock_has_table):
+        tool = NBAGSQLTool()
+        prompt = tool.few_shot_prompt.format(input="x")
+
+        assert "player_stats_full" not in prompt
+        assert "ALWAYS divide by gp" in prompt
+
+    @patch("src.tools.sql_tool._has_table", return_value=True)
+    @patch("src.tools.sql_tool.ChatGoogleGenerativeAI")
+    def test_prompt_with_table_prefers_it(self, mock_llm_class, mock_has_table):
+        tool = NBAGSQLTool()
+        prompt = tool.few_shot_prompt.format(input="x")
+
+        assert "PRE-JOINED TABLE" in prompt
+        assert "use the precomputed ppg" in prompt
+
+    @patch("src.tools.sql_tool.ChatGoogleGenerativeAI")
+    def test_pre_joined_table_is_not_rewritten(self, mock_llm_class):
+        tool = NBAGSQLTool()
+        sql = "SELECT name, ppg FROM player_stats_full ORDER BY ppg DESC LIMIT 1"
+
+        assert tool._validate_sql_structure(sql, "Who scores the most per game?") == sql
+
+
+class TestTemplateFastPath:
+    """Test common questions bypassing the LLM through the SQL templates."""
+
+    @pytest.fixture
+    def mock_tool(self, monkeypatch):
+        """NBAGSQLTool on the real stats database with the LLM mocked out."""
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "sql_templates_enabled", True)
+        with patch("src.tools.sql_tool.ChatGoogleGenerativeAI") as mock_llm_class:
+            mock_llm_class.return_value = MagicMock()
+            tool = NBAGSQLTool()
+            tool.generate_sql = MagicMock(return_value="SELECT 1 AS one")
+            tool.agenerate_sql = AsyncMock(return_value="SELECT 1 AS one")
+            yield tool
+
+    def test_template_hit_skips_llm(self, mock_tool):
+        result = mock_tool.query("Who are the top 3 scorers?")
+
+        mock_tool.generate_sql.assert_not_called()
+        assert result["error"] is None
+        assert len(result["results"]) == 3
+        assert "LIMIT 3" in result["sql"]  # Parameters inlined for display
+
+    def test_template_miss_falls_back_to_llm(self, mock_tool):
+        result = mock_tool.query("Compare his stats to the league")
+
+        mock_tool.generate_sql.assert_called_once_with("Compare his stats to the league")
+        assert result["results"] == [{"one": 1}]
+
+    @pytest.mark.asyncio
+    async def test_async_template_hit_skips_llm(self, mock_tool):
+        result = await mock_tool.aquery("How many players are on the Celtics?")
+
+        mock_tool.agenerate_sql.assert_not_awaited()
+        assert result["error"] is None
+        assert result["results"][0]["player_count"] > 0
+
+    def test_disabled_templates_always_use_llm(self, mock_tool):
+        mock_tool.templates = None
+
+        mock_tool.query("Who are the top 3 scorers?")
+
+        mock_tool.generate_sql.assert_called_once()
+
+
+class TestGeneratedSQLCache:
+    """Test LLM-generated SQL being reused through the SQL cache."""
+
+    @pytest.fixture
+    def mock_tool(self, monkeypatch, tmp_path):
+        """NBAGSQLTool on the real stats database with the LLM mocked out and a fresh cache."""
+        from src.core.config import settings
+
+        monkeypatch.setattr(settings, "sql_cache_enabled", True)
+        monkeypatch.setattr(settings, "cache_dir", str(tmp_path))
+        with patch("src.tools.sql_tool.ChatGoogleGenerativeAI") as mock_llm_class:
+            mock_llm_class.return_value = MagicMock()
+            tool = NBAGSQLTool()
+            tool.generate_sql = MagicMock(
+                return_value="SELECT p.name, ps.ast FROM players p JOIN player_stats ps "
+                "ON p.id = ps.player_id WHERE p.name LIKE '%Chris Paul%'"
+            )
+            yield tool
+            tool.sql_cache.close()
+
+    def test_same_skeleton_question_skips_llm(self, mock_tool):
+        mock_tool.query("How many assists did Chris Paul record?")
+
+        result = mock_tool.query("How many assists did Trae Young record?")
+
+        mock_tool.generate_sql.assert_called_once()
+        assert [row["name"] for row in result["results"]] == ["Trae Young"]
+        assert "'%Trae Young%'" in result["sql"]
+
+    def test_failed_sql_is_not_cached(self, mock_tool):
+        mock_tool.generate_sql.return_value = "SELECT missing_column FROM players"
+
+        mock_tool.query("How many assists did Chris Paul record?")
+        mock_tool.query("How many assists did Chris Paul record?")
+
+        assert mock_tool.generate_sql.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_query_uses_cache(self, mock_tool):
+        mock_tool.agenerate_sql = AsyncMock(return_value=mock_tool.generate_sql.return_value)
+
+        await mock_tool.aquery("How many assists did Chris Paul record?")
+        result = await mock_tool.aquery("How many assists did Chris Paul record?")
+
+        mock_tool.agenerate_sql.assert_awaited_once()
+        assert result["error"] is None
+
+    def test_cache_version_tracks_prompt(self, mock_tool):
+        version = mock_tool._sql_cache_version()
+        mock_tool.few_shot_prompt.prefix += "\n13. New rule"
+
+        assert mock_tool._sql_cache_version() != version